@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Content-Addressed Artifact Store
+
+Keeps the intermediates of the document pipeline (address crop and its
+JPEG, region crops, preprocessed images, OCR text) under a key derived
+from what produced it: the stage, its parameters and the key or content
+hash of its input. The page raster is keyed by the PDF's SHA-256 and the
+DPI, the address crop by the page key and crop box, and so on down to the
+OCR text. Changing a parameter therefore changes the keys of exactly the
+artifacts downstream of it, while everything else is found in the store
+and costs nothing to "recompute". (Page rasters themselves are keyed but
+not stored; re-rendering one is cheaper than a PNG round trip.)
+
+Layout (under .cache/artifacts by default, not committed):
+    ab/abcdef0123...   artifact bytes, named by the 64-hex-digit key
+
+Usage:
+    from artifact_store import ArtifactStore, artifact_key, file_digest
+
+    store = ArtifactStore()
+    page_key = artifact_key('page', {'pdf': file_digest('P064/P0640001.pdf'), 'dpi': 150})
+    address_key = artifact_key('crop', {'image': page_key, 'box': [133, 425, 1058, 393]})
+    address = store.cached('address', address_key, lambda: crop_region(page, ...), codec='image')
+"""
+
+import io
+import os
+import json
+import hashlib
+import threading
+from typing import Callable, Dict, Optional
+
+
+ARTIFACT_DIR = '.cache/artifacts'
+
+
+def artifact_key(kind: str, params: Dict) -> str:
+    """
+    Derive the key of an artifact from its kind and inputs.
+
+    Args:
+        kind: Artifact kind, e.g. "page" or "ocr"
+        params: JSON-serializable inputs and parameters, including the keys
+                or content hashes of upstream artifacts
+
+    Returns:
+        64-character hex SHA-256 key
+    """
+    payload = json.dumps({'kind': kind, 'params': params}, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def file_digest(path: str) -> str:
+    """Return the SHA-256 hex digest of a file's content."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _encode_image(image) -> bytes:
+    """Encode an image losslessly; fast PNG compression keeps stores quick to fill."""
+    buffer = io.BytesIO()
+    image.save(buffer, 'PNG', compress_level=1)
+    return buffer.getvalue()
+
+
+def _decode_image(content: bytes):
+    """Decode an image written by _encode_image."""
+    from PIL import Image
+
+    image = Image.open(io.BytesIO(content))
+    image.load()
+    return image
+
+
+# (encode, decode) per codec name
+CODECS = {
+    'bytes': (lambda value: value, lambda content: content),
+    'text': (lambda value: value.encode('utf-8'), lambda content: content.decode('utf-8')),
+    'json': (lambda value: json.dumps(value, sort_keys=True).encode('utf-8'),
+             lambda content: json.loads(content.decode('utf-8'))),
+    'image': (_encode_image, _decode_image),
+}
+
+
+class ArtifactStore:
+    """Stores artifacts on disk under their content-addressed keys."""
+
+    def __init__(self, root: str = ARTIFACT_DIR):
+        """
+        Initialize the store.
+
+        Args:
+            root: Directory holding the artifacts (created on first write)
+        """
+        self.root = root
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def path(self, key: str) -> str:
+        """Return the file path of an artifact."""
+        return os.path.join(self.root, key[:2], key)
+
+    def has(self, key: str) -> bool:
+        """Return True if the artifact is stored."""
+        return os.path.exists(self.path(key))
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Read an artifact.
+
+        Args:
+            key: Artifact key
+
+        Returns:
+            The stored bytes, or None if the artifact is missing
+        """
+        try:
+            with open(self.path(key), 'rb') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def put(self, key: str, content: bytes) -> None:
+        """
+        Store an artifact atomically.
+
+        Args:
+            key: Artifact key
+            content: Artifact bytes
+        """
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Unique temporary name, so concurrent writers of the same key do not collide
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(content)
+        os.replace(temp_path, path)
+
+    def cached(self, kind: str, key: str, compute: Callable, codec: str = 'bytes'):
+        """
+        Return a stored artifact, computing and storing it on a miss.
+
+        Args:
+            kind: Artifact kind, used for the hit/miss counters
+            key: Artifact key from artifact_key()
+            compute: Called without arguments to produce the value on a miss
+            codec: How the value is stored: 'bytes', 'text', 'json' or 'image'
+
+        Returns:
+            The artifact value
+        """
+        encode, decode = CODECS[codec]
+        content = self.get(key)
+        if content is not None:
+            self._count(kind, 'hits')
+            return decode(content)
+
+        self._count(kind, 'misses')
+        value = compute()
+        self.put(key, encode(value))
+        return value
+
+    def load(self, kind: str, key: str, codec: str = 'bytes'):
+        """
+        Read and decode an artifact that is known to be stored.
+
+        Args:
+            kind: Artifact kind, used for the hit counter
+            key: Artifact key
+            codec: Codec the artifact was stored with
+
+        Returns:
+            The artifact value
+
+        Raises:
+            KeyError: If the artifact is missing
+        """
+        content = self.get(key)
+        if content is None:
+            raise KeyError(f"Artifact {kind} {key[:12]} is not in {self.root}")
+        self._count(kind, 'hits')
+        return CODECS[codec][1](content)
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Return {kind: {'hits': n, 'misses': n}} since the store was opened."""
+        with self._lock:
+            return {kind: dict(counts) for kind, counts in sorted(self._stats.items())}
+
+    def _count(self, kind: str, outcome: str) -> None:
+        """Increment a hit or miss counter."""
+        with self._lock:
+            counts = self._stats.setdefault(kind, {'hits': 0, 'misses': 0})
+            counts[outcome] += 1
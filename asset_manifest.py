@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+Content-Hashed Asset Manifest
+
+Publishes static assets (address thumbnails, extracted_data.json,
+styles.css) under content-hashed filenames so they can be cached as
+immutable, and records the mapping in asset-manifest.json:
+
+    public/address-images/p064/P0640001.jpg
+        -> assets/public/address-images/p064/P0640001.3f2a1b9c0d.jpg
+
+The image and data stages publish what they write; the page generators
+rewrite src/href references through the manifest. Only the bare files and
+asset-manifest.json are committed: the hashed copies under assets/ are
+build output (gitignored), written locally by publish() and recreated from
+the bare files by the deploy build (`--materialize`, the build command in
+netlify.toml and vercel.json), so history does not carry a second copy of
+every thumbnail. Everything under assets/ is cached for a year; a changed
+file gets a new name, so returning visitors never see a stale copy.
+Thumbnails also carry a low-quality placeholder (dominant colour and a
+tiny preview, computed by extract_pdf_thumbnails.py) that pages inline
+while the image loads.
+
+Usage:
+    # Publish existing files or whole directories
+    python asset_manifest.py public/address-images/p064 extracted_data.json
+
+    # Deploy build: write the hashed copies recorded in the manifest
+    python asset_manifest.py --materialize
+
+    from asset_manifest import AssetManifest
+
+    manifest = AssetManifest()
+    manifest.publish('extracted_data.json')
+    manifest.save()
+"""
+
+import os
+import re
+import json
+import hashlib
+from pathlib import Path
+
+
+ASSET_MANIFEST_PATH = 'asset-manifest.json'
+ASSET_DIR = 'assets'
+
+# Hex digits of the SHA-256 kept in a hashed filename
+HASH_LENGTH = 10
+
+# assets/<logical stem>.<hash><ext>, with or without a leading slash
+HASHED_ASSET_PATTERN = re.compile(rf'^/?{ASSET_DIR}/(.+)\.[0-9a-f]{{{HASH_LENGTH}}}(\.[^./]+)$')
+# Local src/href attribute values (no scheme, query or fragment)
+ASSET_REFERENCE_PATTERN = re.compile(r'\b(src|href)="([^"#?:]+)"')
+
+
+def hashed_asset_path(logical_path, sha256):
+    """
+    Build the hashed filename for an asset.
+
+    Args:
+        logical_path: Site-relative path, e.g. "styles.css"
+        sha256: Hex digest of the asset's content
+
+    Returns:
+        Site-relative hashed path, e.g. "assets/styles.1a2b3c4d5e.css"
+    """
+    stem, extension = os.path.splitext(logical_path)
+    return f"{ASSET_DIR}/{stem}.{sha256[:HASH_LENGTH]}{extension}"
+
+
+def logical_asset_path(reference):
+    """
+    Map a bare or hashed reference back to the asset's logical path.
+
+    Args:
+        reference: Path as written in a page, e.g. "/styles.css" or
+                   "assets/styles.1a2b3c4d5e.css"
+
+    Returns:
+        Site-relative logical path, e.g. "styles.css"
+    """
+    match = HASHED_ASSET_PATTERN.match(reference)
+    if match:
+        return match.group(1) + match.group(2)
+    return reference.lstrip('/')
+
+
+def rewrite_asset_references(html, asset_urls):
+    """
+    Point src/href attributes at the hashed copies of published assets.
+
+    References are matched by logical path whether they are bare or already
+    hashed, so rewriting a previously rewritten page picks up new hashes.
+    Pages are served from the site root, so the rewritten URLs are absolute.
+
+    Args:
+        html: Page HTML
+        asset_urls: {logical path: URL} from AssetManifest.urls()
+
+    Returns:
+        HTML with the references rewritten
+    """
+    if not asset_urls:
+        return html
+
+    def replace(match):
+        url = asset_urls.get(logical_asset_path(match.group(2)))
+        if url is None:
+            return match.group()
+        return f'{match.group(1)}="{url}"'
+
+    return ASSET_REFERENCE_PATTERN.sub(replace, html)
+
+
+class AssetManifest:
+    """Publishes assets under content-hashed names and records the mapping."""
+
+    def __init__(self, path=ASSET_MANIFEST_PATH, root='.'):
+        """
+        Load the manifest, starting empty if there is none.
+
+        Args:
+            path: Manifest path, relative to root
+            root: Site root that logical and hashed paths are relative to
+        """
+        self.path = path
+        self.root = root
+        self.assets = {}
+
+        try:
+            with open(os.path.join(root, path), 'r', encoding='utf-8') as f:
+                self.assets = json.load(f).get('assets', {})
+        except (OSError, ValueError, AttributeError):
+            pass
+        self._saved = json.dumps(self.assets, sort_keys=True)
+
+    def publish(self, logical_path, content=None, placeholder=None):
+        """
+        Write the hashed copy of an asset and record it.
+
+        The copy is only written when it does not exist yet, and the copy
+        recorded for the previous content of the same asset is removed.
+
+        Args:
+            logical_path: Site-relative path of the bare asset
+            content: Asset bytes; read from the bare file when omitted
+            placeholder: Image placeholder to record, e.g. {'color', 'preview'};
+                         kept from the previous entry when omitted and the
+                         content is unchanged
+
+        Returns:
+            Site-relative hashed path
+        """
+        logical_path = logical_asset_path(Path(logical_path).as_posix())
+        if content is None:
+            with open(os.path.join(self.root, logical_path), 'rb') as f:
+                content = f.read()
+
+        sha256 = hashlib.sha256(content).hexdigest()
+        hashed_path = hashed_asset_path(logical_path, sha256)
+        self._write_copy(hashed_path, content)
+
+        previous = self.assets.get(logical_path)
+        if placeholder is None and previous and previous['sha256'] == sha256:
+            placeholder = previous.get('placeholder')
+
+        self.assets[logical_path] = {'file': hashed_path, 'sha256': sha256, 'bytes': len(content)}
+        if placeholder is not None:
+            self.assets[logical_path]['placeholder'] = placeholder
+        if previous and previous['file'] != hashed_path:
+            self._remove(previous['file'])
+        return hashed_path
+
+    def prune(self, prefix=''):
+        """
+        Drop assets whose bare file no longer exists, removing their copies.
+
+        Args:
+            prefix: Only consider logical paths starting with this prefix
+
+        Returns:
+            Number of assets dropped
+        """
+        missing = [
+            logical_path for logical_path in self.assets
+            if logical_path.startswith(prefix)
+            and not os.path.exists(os.path.join(self.root, logical_path))
+        ]
+        for logical_path in missing:
+            self._remove(self.assets.pop(logical_path)['file'])
+        return len(missing)
+
+    def materialize(self):
+        """
+        Write the hashed copy of every recorded asset from its bare file.
+
+        Run by the deploy build, since the copies are not committed.
+
+        Returns:
+            Number of copies written (existing copies are skipped)
+
+        Raises:
+            ValueError: If a bare file is missing or no longer matches the
+                        hash recorded for it; republish it and regenerate
+                        the pages so they do not reference a wrong copy
+        """
+        written = 0
+        stale = []
+        for logical_path, entry in sorted(self.assets.items()):
+            if os.path.exists(os.path.join(self.root, entry['file'])):
+                continue
+            try:
+                with open(os.path.join(self.root, logical_path), 'rb') as f:
+                    content = f.read()
+            except OSError:
+                stale.append(f"{logical_path} (missing)")
+                continue
+            if hashlib.sha256(content).hexdigest() != entry['sha256']:
+                stale.append(f"{logical_path} (changed)")
+                continue
+            self._write_copy(entry['file'], content)
+            written += 1
+        if stale:
+            raise ValueError(f"{len(stale)} assets do not match {self.path}: {', '.join(stale[:5])}")
+        return written
+
+    def url(self, logical_path):
+        """Return the URL of an asset's hashed copy, or of the bare file if it is not published."""
+        entry = self.assets.get(logical_asset_path(logical_path))
+        return '/' + (entry['file'] if entry else logical_asset_path(logical_path))
+
+    def urls(self):
+        """Return {logical path: hashed URL} for every published asset."""
+        return {logical_path: '/' + entry['file'] for logical_path, entry in self.assets.items()}
+
+    def placeholders(self):
+        """Return {logical path: placeholder} for assets recorded with one."""
+        return {
+            logical_path: entry['placeholder']
+            for logical_path, entry in self.assets.items()
+            if 'placeholder' in entry
+        }
+
+    def save(self):
+        """
+        Write the manifest if it changed since it was loaded or last saved.
+
+        Returns:
+            bool: True if the file was written
+        """
+        serialized = json.dumps(self.assets, sort_keys=True)
+        if serialized == self._saved and os.path.exists(os.path.join(self.root, self.path)):
+            return False
+
+        path = os.path.join(self.root, self.path)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': 1, 'assets': self.assets}, f, indent=2, sort_keys=True)
+            f.write('\n')
+        os.replace(temp_path, path)
+        self._saved = serialized
+        return True
+
+    def _write_copy(self, hashed_path, content):
+        """Write a hashed copy atomically unless it already exists."""
+        target = os.path.join(self.root, hashed_path)
+        if os.path.exists(target):
+            return
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        temp_path = f"{target}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(content)
+        os.replace(temp_path, target)
+
+    def _remove(self, hashed_path):
+        """Delete a hashed copy unless another asset still points at it."""
+        if any(entry['file'] == hashed_path for entry in self.assets.values()):
+            return
+        try:
+            os.remove(os.path.join(self.root, hashed_path))
+        except OSError:
+            pass
+
+
+def main():
+    """Publish the files and directories given on the command line, or materialize the manifest."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Publish assets under content-hashed filenames')
+    parser.add_argument('paths', nargs='*', help='Files or directories to publish')
+    parser.add_argument('--manifest', default=ASSET_MANIFEST_PATH,
+                        help=f'Asset manifest to update (default: {ASSET_MANIFEST_PATH})')
+    parser.add_argument('--materialize', action='store_true',
+                        help='Write the hashed copies recorded in the manifest (deploy build)')
+    args = parser.parse_args()
+
+    manifest = AssetManifest(args.manifest)
+    if args.materialize:
+        try:
+            written = manifest.materialize()
+        except ValueError as e:
+            raise SystemExit(f"Error: {e}")
+        print(f"Materialized {written} of {len(manifest.assets)} assets from {args.manifest}")
+        return
+    if not args.paths:
+        parser.error('give files or directories to publish, or --materialize')
+
+    published = 0
+    for path in args.paths:
+        files = sorted(p for p in Path(path).rglob('*') if p.is_file()) if os.path.isdir(path) else [Path(path)]
+        for file_path in files:
+            manifest.publish(file_path.as_posix())
+            published += 1
+
+    pruned = manifest.prune()
+    written = manifest.save()
+    print(f"Published {published} assets ({pruned} removed)")
+    print(f"{'Updated' if written else 'Unchanged'}: {args.manifest}")
+
+
+if __name__ == '__main__':
+    main()
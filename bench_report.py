@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Benchmark Report Helpers
+
+Shared by the benchmark commands: latency percentiles, CPU time and peak
+RSS from getrusage, the commit being measured, and saving and comparing
+JSON reports so a regression shows up as a failed comparison against a
+report from an earlier commit.
+
+Usage:
+    from bench_report import ResourceUsage, compare_reports, latency_summary, save_report
+
+    usage = ResourceUsage()
+    ...                                      # the measured work
+    report = {'images_per_second': 12.5, 'latency_ms': latency_summary(latencies), **usage.stop()}
+    save_report(report, '.cache/benchmarks/ocr-{commit}.json')
+    regressions = compare_reports(report, baseline, [('images_per_second', 'higher')], tolerance=0.05)
+"""
+
+import os
+import json
+import time
+import subprocess
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Sequence, Tuple
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def percentile(values: Sequence[float], q: float) -> float:
+    """
+    Return the q-th percentile of values (nearest rank).
+
+    Args:
+        values: Measurements
+        q: Percentile between 0 and 100
+
+    Returns:
+        The smallest value with at least q% of the values at or below it, or 0.0 if there are none
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * q // 100))
+    return ordered[int(rank) - 1]
+
+
+def latency_summary(seconds: Sequence[float]) -> Dict[str, float]:
+    """Summarize per-item latencies as milliseconds: mean, p50, p95, p99 and max."""
+    milliseconds = [value * 1000 for value in seconds]
+    return {
+        'mean': sum(milliseconds) / len(milliseconds) if milliseconds else 0.0,
+        'p50': percentile(milliseconds, 50),
+        'p95': percentile(milliseconds, 95),
+        'p99': percentile(milliseconds, 99),
+        'max': max(milliseconds, default=0.0),
+    }
+
+
+class ResourceUsage:
+    """Measures CPU time of this process and its children (e.g. tesseract) and their peak RSS."""
+
+    def __init__(self):
+        self._start = self._cpu()
+
+    @staticmethod
+    def _cpu() -> Optional[Tuple[float, float]]:
+        if resource is None:
+            return None
+        own = resource.getrusage(resource.RUSAGE_SELF)
+        children = resource.getrusage(resource.RUSAGE_CHILDREN)
+        return own.ru_utime + own.ru_stime, children.ru_utime + children.ru_stime
+
+    def stop(self) -> Dict[str, Optional[float]]:
+        """
+        Return the usage since the object was created.
+
+        Returns:
+            dict: 'cpu_time' and 'child_cpu_time' in seconds, 'peak_rss_mb' and
+                  'peak_child_rss_mb' (peaks over the process lifetime);
+                  None where getrusage is unavailable
+        """
+        if resource is None:
+            return {'cpu_time': None, 'child_cpu_time': None, 'peak_rss_mb': None, 'peak_child_rss_mb': None}
+        end = self._cpu()
+        # ru_maxrss is in kilobytes on Linux and bytes on macOS
+        scale = 1024 * 1024 if os.uname().sysname == 'Darwin' else 1024
+        return {
+            'cpu_time': end[0] - self._start[0],
+            'child_cpu_time': end[1] - self._start[1],
+            'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale,
+            'peak_child_rss_mb': resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / scale,
+        }
+
+
+def get_commit() -> str:
+    """Return the short hash of the checked-out commit (suffixed -dirty with local changes), or 'unknown'."""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                                text=True, check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'],
+                               capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+    return f"{commit}-dirty" if dirty else commit
+
+
+def report_header(benchmark: str, config: Dict) -> Dict:
+    """Return the fields every report starts with: benchmark name, commit, time and configuration."""
+    return {
+        'benchmark': benchmark,
+        'commit': get_commit(),
+        'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'config': config,
+    }
+
+
+def save_report(report: Dict, path: str) -> str:
+    """
+    Write a report as JSON.
+
+    Args:
+        report: Report dictionary
+        path: Output path; {commit} is replaced with the report's commit
+
+    Returns:
+        The path written
+    """
+    path = path.format(commit=report.get('commit', 'unknown'))
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.{int(time.time())}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    os.replace(temp_path, path)
+    return path
+
+
+def load_report(path: str) -> Dict:
+    """Read a report written by save_report()."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def get_metric(report: Dict, name: str):
+    """Return a metric by dotted name, e.g. 'latency_ms.p95', or None if it is missing."""
+    value = report
+    for part in name.split('.'):
+        if not isinstance(value, dict) or part not in value:
+            return None
+        value = value[part]
+    return value
+
+
+def compare_reports(current: Dict, baseline: Dict, metrics: List[Tuple[str, str]],
+                    tolerance: float = 0.05) -> List[Dict]:
+    """
+    Find metrics that got worse than the baseline by more than the tolerance.
+
+    Args:
+        current: Report of this run
+        baseline: Report to compare against
+        metrics: (dotted metric name, 'higher' or 'lower' is better) pairs
+        tolerance: Allowed relative change in the worse direction, e.g. 0.05 for 5%
+
+    Returns:
+        List of {'metric', 'baseline', 'current', 'change'} for each regression,
+        where change is relative to the baseline
+    """
+    regressions = []
+    for name, better in metrics:
+        old, new = get_metric(baseline, name), get_metric(current, name)
+        if not isinstance(old, (int, float)) or not isinstance(new, (int, float)) or old == 0:
+            continue
+        change = (new - old) / abs(old)
+        if (better == 'higher' and change < -tolerance) or (better == 'lower' and change > tolerance):
+            regressions.append({'metric': name, 'baseline': old, 'current': new, 'change': change})
+    return regressions
+
+
+def print_regressions(regressions: List[Dict], baseline_path: str, tolerance: float) -> None:
+    """Print the result of compare_reports()."""
+    if not regressions:
+        print(f"No regressions against {baseline_path} (tolerance {tolerance:.0%})")
+        return
+    print(f"Regressions against {baseline_path} (tolerance {tolerance:.0%}):")
+    for regression in regressions:
+        print(f"  {regression['metric']:<24} {regression['baseline']:>10.3f} -> "
+              f"{regression['current']:>10.3f} ({regression['change']:+.1%})")
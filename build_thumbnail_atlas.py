@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Thumbnail Atlas Builder
+
+Packs small copies of the address thumbnails (public/address-images/) into
+a few JPEG sprite sheets per collection, each set described by a JSON
+coordinate map. The gallery grid can then draw every card from a handful
+of sheet requests instead of one request per document.
+
+Output layout (bare files, published under content-hashed names in
+asset-manifest.json like the thumbnails themselves):
+    public/atlases/p064/p064-1.jpg ...   sprite sheets
+    public/atlases/p064.json             coordinate map
+
+Coordinate map:
+    {
+        "version": 1,
+        "collection": "P064",
+        "tile": {"width": 320, "height": 119},
+        "sheets": [{"url": "/assets/...", "width": 2560, "height": 1904, "tiles": 128}, ...],
+        "tiles": {"P0640001": [sheet index, x, y], ...}
+    }
+
+Usage:
+    python build_thumbnail_atlas.py
+    python build_thumbnail_atlas.py --collection P064 --tile-size 320x119 --sheet-size 2560x1904
+
+    from build_thumbnail_atlas import pack_atlas
+    pack_atlas(image_paths, 'public/atlases/results/page-1')   # any page of results
+"""
+
+import io
+import os
+import json
+import time
+from pathlib import Path
+
+from PIL import Image
+
+from asset_manifest import AssetManifest
+
+
+THUMBNAIL_DIR = 'public/address-images'
+ATLAS_DIR = 'public/atlases'
+
+# Tile size keeps the 1058x393 crop's aspect ratio at about 30% scale; a
+# sheet of 8 x 16 tiles holds 128 thumbnails
+TILE_SIZE = (320, 119)
+SHEET_SIZE = (2560, 1904)
+SHEET_QUALITY = 80
+
+
+def parse_size(value):
+    """
+    Parse a WIDTHxHEIGHT size.
+
+    Args:
+        value: Size string, e.g. "320x119"
+
+    Returns:
+        tuple: (width, height)
+
+    Raises:
+        ValueError: If the value is not two positive integers
+    """
+    try:
+        width, height = (int(part) for part in value.lower().split('x'))
+    except ValueError:
+        raise ValueError(f"Invalid size '{value}', expected WIDTHxHEIGHT (e.g. 320x119)")
+    if width <= 0 or height <= 0:
+        raise ValueError(f"Invalid size '{value}', width and height must be positive")
+    return width, height
+
+
+def get_sheet_layout(tile_size=TILE_SIZE, sheet_size=SHEET_SIZE):
+    """
+    Work out how many tiles fit on a sheet.
+
+    Args:
+        tile_size: (width, height) of one tile
+        sheet_size: (width, height) of a full sheet
+
+    Returns:
+        tuple: (columns, rows)
+
+    Raises:
+        ValueError: If a tile does not fit on a sheet
+    """
+    columns = sheet_size[0] // tile_size[0]
+    rows = sheet_size[1] // tile_size[1]
+    if columns == 0 or rows == 0:
+        raise ValueError(f"Tile {tile_size[0]}x{tile_size[1]} does not fit on a "
+                         f"{sheet_size[0]}x{sheet_size[1]} sheet")
+    return columns, rows
+
+
+def pack_atlas(image_paths, output_prefix, tile_size=TILE_SIZE, sheet_size=SHEET_SIZE,
+               quality=SHEET_QUALITY):
+    """
+    Pack images into sprite sheets, row by row in the given order.
+
+    Every image is scaled to exactly the tile size. The last sheet is cut
+    down to the rows (and, for a single row, the columns) it uses.
+
+    Args:
+        image_paths: Thumbnail paths; the file stem is the document ID
+        output_prefix: Sheet path prefix, e.g. "public/atlases/p064/p064"
+                       writes p064-1.jpg, p064-2.jpg, ...
+        tile_size: (width, height) of one tile
+        sheet_size: (width, height) of a full sheet
+        quality: JPEG quality of the sheets
+
+    Returns:
+        dict: {'sheets': [{'path', 'width', 'height', 'tiles'}],
+               'tiles': {doc_id: [sheet index, x, y]},
+               'errors': [{'filename', 'error'}]}
+    """
+    columns, rows = get_sheet_layout(tile_size, sheet_size)
+    per_sheet = columns * rows
+    tile_width, tile_height = tile_size
+
+    # Unreadable images are skipped so they do not leave a hole in the grid
+    tiles = []
+    errors = []
+    for image_path in image_paths:
+        image_path = Path(image_path)
+        try:
+            with Image.open(image_path) as image:
+                tiles.append((image_path.stem, image.convert('RGB').resize(tile_size, Image.LANCZOS)))
+        except OSError as e:
+            errors.append({'filename': image_path.name, 'error': f"Cannot read image - {str(e)}"})
+
+    Path(output_prefix).parent.mkdir(parents=True, exist_ok=True)
+    sheets = []
+    positions = {}
+    for sheet_index, start in enumerate(range(0, len(tiles), per_sheet)):
+        sheet_tiles = tiles[start:start + per_sheet]
+        used_rows = -(-len(sheet_tiles) // columns)
+        used_columns = min(columns, len(sheet_tiles))
+        sheet = Image.new('RGB', (used_columns * tile_width, used_rows * tile_height), (255, 255, 255))
+
+        for index, (doc_id, tile) in enumerate(sheet_tiles):
+            x = (index % columns) * tile_width
+            y = (index // columns) * tile_height
+            sheet.paste(tile, (x, y))
+            positions[doc_id] = [sheet_index, x, y]
+
+        path = f"{output_prefix}-{sheet_index + 1}.jpg"
+        buffer = io.BytesIO()
+        sheet.save(buffer, 'JPEG', quality=quality, optimize=True, progressive=True)
+        content = buffer.getvalue()
+        try:
+            with open(path, 'rb') as f:
+                unchanged = f.read() == content
+        except OSError:
+            unchanged = False
+        if not unchanged:
+            with open(path, 'wb') as f:
+                f.write(content)
+
+        sheets.append({'path': path, 'width': sheet.width, 'height': sheet.height,
+                       'tiles': len(sheet_tiles)})
+
+    # Sheets from an earlier, larger atlas
+    sheet_number = len(sheets) + 1
+    while os.path.exists(f"{output_prefix}-{sheet_number}.jpg"):
+        os.remove(f"{output_prefix}-{sheet_number}.jpg")
+        sheet_number += 1
+
+    return {'sheets': sheets, 'tiles': positions, 'errors': errors}
+
+
+def build_collection_atlas(collection, asset_manifest=None, tile_size=TILE_SIZE,
+                           sheet_size=SHEET_SIZE, thumbnail_dir=THUMBNAIL_DIR, atlas_dir=ATLAS_DIR):
+    """
+    Build the sprite sheets and coordinate map of one collection.
+
+    Args:
+        collection: Collection ID, e.g. "P064"
+        asset_manifest: Publish the sheets and the map under content-hashed
+                        names, and reference the hashed sheets from the map
+        tile_size: (width, height) of one tile
+        sheet_size: (width, height) of a full sheet
+        thumbnail_dir: Directory holding <collection>/ thumbnail folders
+        atlas_dir: Output directory for sheets and maps
+
+    Returns:
+        dict: Summary with 'map_path', 'sheets', 'tiles', 'errors' and 'elapsed_time' keys
+    """
+    start_time = time.time()
+    folder = collection.lower()
+    image_paths = sorted(Path(thumbnail_dir, folder).glob('*.jpg'))
+    atlas = pack_atlas(image_paths, f"{atlas_dir}/{folder}/{folder}", tile_size, sheet_size)
+
+    sheets = []
+    for sheet in atlas['sheets']:
+        url = '/' + sheet['path']
+        if asset_manifest is not None:
+            url = '/' + asset_manifest.publish(sheet['path'])
+        sheets.append({'url': url, 'width': sheet['width'], 'height': sheet['height'],
+                       'tiles': sheet['tiles']})
+
+    coordinate_map = {
+        'version': 1,
+        'collection': collection,
+        'tile': {'width': tile_size[0], 'height': tile_size[1]},
+        'sheets': sheets,
+        'tiles': atlas['tiles'],
+    }
+    map_path = f"{atlas_dir}/{folder}.json"
+    content = json.dumps(coordinate_map, separators=(',', ':')).encode('utf-8')
+    with open(map_path, 'wb') as f:
+        f.write(content)
+    if asset_manifest is not None:
+        asset_manifest.publish(map_path, content)
+        asset_manifest.prune(f"{atlas_dir}/")
+
+    return {
+        'map_path': map_path,
+        'sheets': len(sheets),
+        'tiles': len(atlas['tiles']),
+        'errors': atlas['errors'],
+        'elapsed_time': time.time() - start_time,
+    }
+
+
+def main():
+    """Build the atlas of each collection with thumbnails."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Pack thumbnails into sprite sheets with a coordinate map')
+    parser.add_argument('--collection', action='append',
+                        help='Collection to pack, e.g. P064 (repeatable; default: every thumbnail folder)')
+    parser.add_argument('--tile-size', type=parse_size, default=TILE_SIZE,
+                        help=f'Tile size as WIDTHxHEIGHT (default: {TILE_SIZE[0]}x{TILE_SIZE[1]})')
+    parser.add_argument('--sheet-size', type=parse_size, default=SHEET_SIZE,
+                        help=f'Maximum sheet size as WIDTHxHEIGHT (default: {SHEET_SIZE[0]}x{SHEET_SIZE[1]})')
+    args = parser.parse_args()
+
+    collections = args.collection or sorted(
+        entry.upper() for entry in os.listdir(THUMBNAIL_DIR)
+        if os.path.isdir(os.path.join(THUMBNAIL_DIR, entry))
+    )
+    columns, rows = get_sheet_layout(args.tile_size, args.sheet_size)
+    asset_manifest = AssetManifest()
+
+    print("=" * 60)
+    print("Thumbnail Atlas Builder")
+    print("=" * 60)
+    print(f"Tile size:  {args.tile_size[0]}x{args.tile_size[1]} ({columns} x {rows} tiles per sheet)")
+
+    for collection in collections:
+        result = build_collection_atlas(collection, asset_manifest, args.tile_size, args.sheet_size)
+        print(f"{collection}: {result['tiles']} tiles in {result['sheets']} sheets -> "
+              f"{result['map_path']} ({result['elapsed_time']:.2f} seconds)")
+        for error in result['errors']:
+            print(f"  ✗ {error['filename']}: {error['error']}")
+
+    asset_manifest.save()
+    print(f"Asset manifest: {asset_manifest.path}")
+    print("=" * 60)
+
+
+if __name__ == '__main__':
+    main()
@@ -6,24 +6,26 @@ Crop a specific image with custom coordinates and save to public-taluko folder.
 from extract_pdf_thumbnails import crop_image
 from pathlib import Path
 
-def crop_all_images():
-    """Crop all images in p064 folder with specified coordinates."""
+def crop_all_images(source_dir="public/address-images/p064", output_dir="public-gaam",
+                    left=800, top=50, width=226, height=71):
+    """
+    Crop all address images in a folder with specified coordinates.
     
-    # Source directory
-    source_dir = "public/address-images/p064"
-    
-    # Output directory
-    output_dir = "public-gaam"
+    Args:
+        source_dir: Folder of address images
+        output_dir: Folder for the cropped images
+        left: Left coordinate of crop region
+        top: Top coordinate of crop region
+        width: Width of crop region
+        height: Height of crop region
+        
+    Returns:
+        tuple: (success_count, failed_count)
+    """
     
     # Create output directory if it doesn't exist
     Path(output_dir).mkdir(parents=True, exist_ok=True)
     
-    # Crop coordinates
-    left = 800
-    top = 50
-    width = 226
-    height = 71
-    
     # Get all jpg files from source directory
     source_path = Path(source_dir)
     image_files = sorted(source_path.glob("*.jpg"))
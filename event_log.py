@@ -0,0 +1,186 @@
+"""
+Structured Event Log
+
+Buffered JSONL event sink shared by the OCR scripts. Each processing event
+(success, error, progress) becomes one JSON record with a timestamp, image
+name, stage, error type and duration. Records are written to disk in batches
+instead of one print per image, and the console only gets a periodic one-line
+summary so large batches are not slowed down by terminal I/O.
+
+Usage:
+    with EventLog('ocr_events.jsonl') as event_log:
+        event_log.success('P0640001', 'ocr', duration=0.42)
+        event_log.error('P0640002', 'ocr', 'ocr', 'Tesseract failed')
+
+Analyze afterwards, e.g.:
+    import json
+    errors = [r for r in map(json.loads, open('ocr_events.jsonl')) if r['event'] == 'error']
+"""
+
+import os
+import sys
+import json
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, TextIO
+
+
+class EventLog:
+    """Buffered structured event sink with a rate-limited console summary."""
+
+    def __init__(self, path: Optional[str] = None, buffer_size: int = 256,
+                 console_interval: float = 2.0, stream: Optional[TextIO] = None):
+        """
+        Initialize the event log.
+
+        Args:
+            path: JSONL file to append records to (None keeps records in memory only)
+            buffer_size: Number of records to buffer before writing to disk
+            console_interval: Minimum seconds between console summary lines
+                              (0 prints a summary after every event, None disables them)
+            stream: Console stream for summaries (default: sys.stdout)
+        """
+        self.path = path
+        self.buffer_size = max(1, buffer_size)
+        self.console_interval = console_interval
+        self.stream = stream if stream is not None else sys.stdout
+
+        self.counts = {}
+        self.error_counts = {}
+        self.last_error = None
+
+        self._buffer = []
+        self._file = None
+        self._last_report = time.monotonic()
+        self._reported_total = 0
+
+        if path:
+            output_dir = os.path.dirname(path)
+            if output_dir:
+                os.makedirs(output_dir, exist_ok=True)
+            self._file = open(path, 'a', encoding='utf-8')
+
+    def record(self, event: str, image: str = 'N/A', stage: str = '',
+               error_type: Optional[str] = None, message: Optional[str] = None,
+               duration: Optional[float] = None) -> Dict:
+        """
+        Record a structured event.
+
+        Args:
+            event: Event kind ("success", "error", "progress", ...)
+            image: Name of the image being processed (or "N/A" for system events)
+            stage: Pipeline stage (e.g. "file_system", "ocr", "output")
+            error_type: Category of error, for error events
+            message: Free-form detail
+            duration: Seconds spent on this image/stage
+
+        Returns:
+            The record dictionary that was logged
+        """
+        entry = {
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='milliseconds'),
+            'event': event,
+            'image': image,
+            'stage': stage,
+            'error_type': error_type,
+            'message': message,
+            'duration': round(duration, 6) if duration is not None else None
+        }
+
+        self.counts[event] = self.counts.get(event, 0) + 1
+        if event == 'error':
+            key = error_type or stage or 'unknown'
+            self.error_counts[key] = self.error_counts.get(key, 0) + 1
+            self.last_error = entry
+
+        if self._file is not None:
+            self._buffer.append(json.dumps(entry, ensure_ascii=False))
+            if len(self._buffer) >= self.buffer_size:
+                self.flush()
+
+        self._maybe_report()
+        return entry
+
+    def success(self, image: str, stage: str, duration: Optional[float] = None) -> Dict:
+        """Record a successful stage for an image."""
+        return self.record('success', image=image, stage=stage, duration=duration)
+
+    def error(self, image: str, stage: str, error_type: str, message: str,
+              duration: Optional[float] = None) -> Dict:
+        """Record a failed stage for an image."""
+        return self.record('error', image=image, stage=stage, error_type=error_type,
+                           message=message, duration=duration)
+
+    def flush(self) -> None:
+        """Write buffered records to the log file."""
+        if self._file is not None and self._buffer:
+            self._file.write('\n'.join(self._buffer) + '\n')
+            self._file.flush()
+            self._buffer = []
+
+    def close(self) -> None:
+        """Flush remaining records, print a final summary and close the file."""
+        self.flush()
+        if self.console_interval is not None and self.total > self._reported_total:
+            self._report()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    @property
+    def total(self) -> int:
+        """Total number of events recorded."""
+        return sum(self.counts.values())
+
+    def summary(self) -> Dict:
+        """
+        Return event counts.
+
+        Returns:
+            Dictionary with 'total', 'counts', 'error_counts' and 'path' keys
+        """
+        return {
+            'total': self.total,
+            'counts': dict(self.counts),
+            'error_counts': dict(self.error_counts),
+            'path': self.path
+        }
+
+    def _maybe_report(self) -> None:
+        """Print a console summary if the reporting interval has elapsed."""
+        if self.console_interval is None:
+            return
+        if time.monotonic() - self._last_report >= self.console_interval:
+            self._report()
+
+    def _report(self) -> None:
+        """Print a one-line summary of events so far."""
+        parts = [f"{count} {event}" for event, count in sorted(self.counts.items())]
+        line = f"  [{self.total} events] " + ', '.join(parts)
+        if self.last_error is not None:
+            line += (f" | last error [{self.last_error['error_type']}] "
+                     f"{self.last_error['image']}: {self.last_error['message']}")
+        print(line, file=self.stream)
+
+        self._last_report = time.monotonic()
+        self._reported_total = self.total
+
+    def __enter__(self) -> 'EventLog':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+def read_events(path: str) -> List[Dict]:
+    """
+    Load all records from a JSONL event log.
+
+    Args:
+        path: Path to the event log file
+
+    Returns:
+        List of event record dictionaries
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
@@ -15,72 +15,155 @@ Usage:
     main_extract_only()        # Extract PDFs to images only
     main_crop_only()           # Crop existing images only
     main_extract_and_crop()    # Extract and crop in one workflow
+    main_publish_only()        # Publish existing crops to the asset manifest
+
+Cropped address images are also published under content-hashed names in
+assets/ and recorded in asset-manifest.json (see asset_manifest.py), so
+the pages can reference copies that are safe to cache as immutable. Each
+one is recorded with a low-quality placeholder (dominant colour and a
+16px-wide preview) computed from the crop while it is still in memory,
+which pages inline until the full image has loaded.
 """
 
+import io
+import base64
 import fitz  # PyMuPDF
-from PIL import Image
+from PIL import Image, features
 from pathlib import Path
 import time
 
+from asset_manifest import AssetManifest
+from metrics import MetricsRegistry, get_registry, timed
 
-def extract_first_page(pdf_path: Path, output_path: Path, dpi: int = 150) -> tuple:
+
+# Width in pixels of the placeholder preview; the height keeps the aspect ratio
+PLACEHOLDER_WIDTH = 16
+
+
+def render_first_page(pdf_path: Path, dpi: int = 150, colorspace: str = 'rgb') -> Image.Image:
     """
-    Extracts the first page from a PDF and saves as JPEG.
+    Renders the first page of a PDF to an in-memory image.
+    
+    Opening the PDF, rasterizing the page and converting the pixmap are
+    timed as the open, render and convert stages.
     
     Args:
         pdf_path: Path to source PDF file
-        output_path: Path where JPEG should be saved
         dpi: Resolution for rendering (default 150)
+        colorspace: 'rgb' (default) or 'gray' for a single-channel image
     
     Returns:
-        tuple: (success: bool, error_message: str or None)
-    """
-    pdf_document = None
+        PIL Image in RGB (or L) mode
     
-    try:
-        # Open the PDF file using PyMuPDF
+    Raises:
+        ValueError: If the PDF has no pages
+        fitz.FileDataError, fitz.EmptyFileError, OSError: If the PDF cannot be read
+    """
+    # Open the PDF file using PyMuPDF
+    with timed('stage_seconds', stage='open'):
         pdf_document = fitz.open(pdf_path)
-        
+    
+    with pdf_document:
         # Check if PDF has pages (handle empty PDFs)
         if pdf_document.page_count == 0:
-            error_msg = "PDF file is empty (no pages)"
-            return False, error_msg
-        
-        # Get the first page (index 0)
-        first_page = pdf_document[0]
+            raise ValueError("PDF file is empty (no pages)")
         
         # Calculate zoom factor for desired DPI (72 is default PDF DPI)
         zoom = dpi / 72
         matrix = fitz.Matrix(zoom, zoom)
         
-        # Render page to pixmap at specified DPI
-        pixmap = first_page.get_pixmap(matrix=matrix)
-        
-        # Convert pixmap to PIL Image
-        # PyMuPDF pixmap provides image data in RGB or RGBA format
-        img_data = pixmap.samples
-        img_mode = "RGBA" if pixmap.alpha else "RGB"
-        img_size = (pixmap.width, pixmap.height)
-        
-        # Create PIL Image from pixmap data
-        pil_image = Image.frombytes(img_mode, img_size, img_data)
+        # Render the first page (index 0) to pixmap at specified DPI
+        with timed('stage_seconds', stage='render'):
+            pixmap = pdf_document[0].get_pixmap(matrix=matrix,
+                                                colorspace=fitz.csGRAY if colorspace == 'gray' else fitz.csRGB)
+    
+    with timed('stage_seconds', stage='convert'):
+        return pixmap_to_image(pixmap)
+
+
+def pixmap_to_image(pixmap) -> Image.Image:
+    """
+    Converts a PyMuPDF pixmap to a PIL image.
+    
+    Args:
+        pixmap: Grayscale, RGB or RGBA fitz.Pixmap
+    
+    Returns:
+        PIL Image in L or RGB mode; transparency is flattened onto white
+    """
+    # PyMuPDF pixmap provides image data in L, RGB or RGBA format
+    if pixmap.n == 1:
+        return Image.frombytes("L", (pixmap.width, pixmap.height), pixmap.samples)
+    img_mode = "RGBA" if pixmap.alpha else "RGB"
+    pil_image = Image.frombytes(img_mode, (pixmap.width, pixmap.height), pixmap.samples)
+    
+    # Handle transparency by converting to RGB with white background
+    if pil_image.mode == "RGBA":
+        white_background = Image.new("RGB", pil_image.size, (255, 255, 255))
+        white_background.paste(pil_image, mask=pil_image.split()[3])
+        pil_image = white_background
+    
+    return pil_image
+
+
+@timed('stage_seconds', stage='render')
+def render_region_gray(pdf_path: Path, region: tuple, dpi: int = 150):
+    """
+    Renders one region of the first page of a PDF as a grayscale pixmap.
+    
+    Only the clipped region is rasterized, and the pixels are the same as
+    cropping render_first_page() and converting to grayscale.
+    
+    Args:
+        pdf_path: Path to source PDF file
+        region: (left, top, width, height) in pixels at the given DPI
+        dpi: Resolution for rendering (default 150)
+    
+    Returns:
+        fitz.Pixmap with one 8-bit channel; samples_mv exposes its rows
+        without copying (stride equals width), but only while the pixmap
+        is alive
+    
+    Raises:
+        ValueError: If the PDF has no pages
+        fitz.FileDataError, fitz.EmptyFileError, OSError: If the PDF cannot be read
+    """
+    left, top, width, height = region
+    with fitz.open(pdf_path) as pdf_document:
+        if pdf_document.page_count == 0:
+            raise ValueError("PDF file is empty (no pages)")
         
-        # Handle transparency by converting to RGB with white background
-        if pil_image.mode == "RGBA":
-            # Create white background
-            white_background = Image.new("RGB", pil_image.size, (255, 255, 255))
-            # Paste image onto white background using alpha channel as mask
-            white_background.paste(pil_image, mask=pil_image.split()[3])
-            pil_image = white_background
-        elif pil_image.mode != "RGB":
-            # Ensure RGB mode for JPEG compatibility
-            pil_image = pil_image.convert("RGB")
+        zoom = dpi / 72
+        matrix = fitz.Matrix(zoom, zoom)
+        # The clip is given in PDF points, so map the pixel box back through the matrix
+        clip = fitz.Rect(left, top, left + width, top + height) * ~matrix
+        return pdf_document[0].get_pixmap(matrix=matrix, colorspace=fitz.csGRAY, clip=clip, alpha=False)
+
+
+def extract_first_page(pdf_path: Path, output_path: Path, dpi: int = 150) -> tuple:
+    """
+    Extracts the first page from a PDF and saves as JPEG.
+    
+    Args:
+        pdf_path: Path to source PDF file
+        output_path: Path where JPEG should be saved
+        dpi: Resolution for rendering (default 150)
+    
+    Returns:
+        tuple: (success: bool, error_message: str or None)
+    """
+    try:
+        pil_image = render_first_page(pdf_path, dpi)
         
         # Save as JPEG with quality setting of 85 and optimization enabled
-        pil_image.save(output_path, "JPEG", quality=85, optimize=True)
+        save_jpeg(pil_image, output_path)
         
         return True, None
     
+    except ValueError as e:
+        # Handle PDFs without pages
+        return False, str(e)
+    
     except fitz.FileDataError as e:
         # Handle corrupted PDF files
         error_msg = f"Corrupted or invalid PDF file - {str(e)}"
@@ -110,18 +193,105 @@ def extract_first_page(pdf_path: Path, output_path: Path, dpi: int = 150) -> tup
         # Catch-all for any unexpected errors
         error_msg = f"Unexpected error - {str(e)}"
         return False, error_msg
+
+
+def save_jpeg(image: Image.Image, output_path: Path, optimize: bool = True) -> None:
+    """
+    Saves an image as JPEG (quality 85, optimized by default).
     
-    finally:
-        # Ensure PDF document is closed to free resources
-        if pdf_document is not None:
-            try:
-                pdf_document.close()
-            except Exception:
-                # Silently ignore errors during cleanup
-                pass
+    The image is encoded in memory first, so the encode and write stages
+    are timed separately.
+    
+    Args:
+        image: Image to save
+        output_path: Path of the JPEG file
+        optimize: Optimize the Huffman tables (smaller file, slower encode)
+    """
+    with timed('stage_seconds', stage='encode'):
+        buffer = io.BytesIO()
+        image.save(buffer, "JPEG", quality=85, optimize=optimize)
+    with timed('stage_seconds', stage='write'):
+        with open(output_path, 'wb') as f:
+            f.write(buffer.getvalue())
 
 
-def crop_image(image_path: Path, output_path: Path, left: int, top: int, width: int, height: int) -> tuple:
+@timed('stage_seconds', stage='placeholder')
+def make_placeholder(image: Image.Image) -> dict:
+    """
+    Computes a low-quality image placeholder (LQIP) for a thumbnail.
+    
+    The preview is small enough to inline in a page; browsers smooth it when
+    it is scaled up to the card size, which gives the blurred effect.
+    
+    Args:
+        image: Thumbnail image
+    
+    Returns:
+        dict: {'color': dominant colour as '#rrggbb',
+               'preview': data URI of a PLACEHOLDER_WIDTH-wide WebP (PNG if
+               Pillow has no WebP support)}
+    """
+    rgb_image = image.convert("RGB")
+    preview_height = max(1, round(rgb_image.height * PLACEHOLDER_WIDTH / rgb_image.width))
+    preview = rgb_image.resize((PLACEHOLDER_WIDTH, preview_height), Image.BOX)
+    
+    # Most common colour of a 4-colour palette of the preview
+    quantized = preview.quantize(colors=4)
+    _, index = max(quantized.getcolors())
+    red, green, blue = quantized.getpalette()[index * 3:index * 3 + 3]
+    
+    buffer = io.BytesIO()
+    if features.check("webp"):
+        preview.save(buffer, "WEBP", quality=40)
+        mime_type = "image/webp"
+    else:
+        preview.save(buffer, "PNG", optimize=True)
+        mime_type = "image/png"
+    encoded = base64.b64encode(buffer.getvalue()).decode("ascii")
+    
+    return {
+        'color': f"#{red:02x}{green:02x}{blue:02x}",
+        'preview': f"data:{mime_type};base64,{encoded}"
+    }
+
+
+@timed('stage_seconds', stage='crop')
+def crop_region(image: Image.Image, left: int, top: int, width: int, height: int) -> Image.Image:
+    """
+    Crops an in-memory image to specified coordinates.
+    
+    Args:
+        image: Source PIL Image
+        left: Left coordinate of crop region
+        top: Top coordinate of crop region
+        width: Width of crop region
+        height: Height of crop region
+    
+    Returns:
+        Cropped PIL Image
+    
+    Raises:
+        ValueError: If the crop region is not inside the image
+    """
+    # Calculate crop box coordinates (left, top, right, bottom)
+    right = left + width
+    bottom = top + height
+    
+    # Validate that crop region is within image boundaries before cropping
+    if left < 0 or top < 0:
+        raise ValueError(f"Crop coordinates cannot be negative (left={left}, top={top})")
+    
+    if right > image.width or bottom > image.height:
+        raise ValueError(f"Crop region exceeds image boundaries (image: {image.width}x{image.height}, crop: {right}x{bottom})")
+    
+    if width <= 0 or height <= 0:
+        raise ValueError(f"Crop dimensions must be positive (width={width}, height={height})")
+    
+    return image.crop((left, top, right, bottom))
+
+
+def crop_image(image_path: Path, output_path: Path, left: int, top: int, width: int, height: int,
+               placeholders: dict = None) -> tuple:
     """
     Crops an image to specified coordinates and saves the result.
     
@@ -132,40 +302,33 @@ def crop_image(image_path: Path, output_path: Path, left: int, top: int, width:
         top: Top coordinate of crop region
         width: Width of crop region
         height: Height of crop region
+        placeholders: If given, the placeholder of the cropped image (see
+            make_placeholder) is stored here under output_path
     
     Returns:
         tuple: (success: bool, error_message: str or None)
     """
     try:
         # Load the image using PIL
-        image = Image.open(image_path)
-        
-        # Calculate crop box coordinates (left, top, right, bottom)
-        right = left + width
-        bottom = top + height
-        crop_box = (left, top, right, bottom)
-        
-        # Validate that crop region is within image boundaries before cropping
-        if left < 0 or top < 0:
-            error_msg = f"Crop coordinates cannot be negative (left={left}, top={top})"
-            return False, error_msg
-        
-        if right > image.width or bottom > image.height:
-            error_msg = f"Crop region exceeds image boundaries (image: {image.width}x{image.height}, crop: {right}x{bottom})"
-            return False, error_msg
-        
-        if width <= 0 or height <= 0:
-            error_msg = f"Crop dimensions must be positive (width={width}, height={height})"
-            return False, error_msg
+        with timed('stage_seconds', stage='load'):
+            image = Image.open(image_path)
+            image.load()
         
-        # Use image.crop() method to extract the specified region
-        cropped_image = image.crop(crop_box)
+        # Extract the specified region, validating it against the image boundaries
+        try:
+            cropped_image = crop_region(image, left, top, width, height)
+        except ValueError as e:
+            return False, str(e)
         
         # Ensure output directory exists
         output_path.parent.mkdir(parents=True, exist_ok=True)
         
         # Save cropped image as JPEG with quality setting of 85
-        cropped_image.save(output_path, "JPEG", quality=85, optimize=True)
+        save_jpeg(cropped_image, output_path)
+        
+        # Placeholder from the same in-memory crop, so the JPEG is not re-read
+        if placeholders is not None:
+            placeholders[output_path] = make_placeholder(cropped_image)
         
         return True, None
     
@@ -215,7 +378,8 @@ def get_pdf_files(source_dir: Path) -> list:
     return sorted(source_dir.glob('*.pdf'))
 
 
-def process_image_cropping(source_dir: str, output_dir: str, left: int = 133, top: int = 425, width: int = 1058, height: int = 393) -> dict:
+def process_image_cropping(source_dir: str, output_dir: str, left: int = 133, top: int = 425, width: int = 1058, height: int = 393,
+                           asset_manifest: AssetManifest = None) -> dict:
     """
     Crops all images in a directory to specified coordinates.
     
@@ -226,6 +390,7 @@ def process_image_cropping(source_dir: str, output_dir: str, left: int = 133, to
         top: Top coordinate of crop region (default 425)
         width: Width of crop region (default 1058)
         height: Height of crop region (default 393)
+        asset_manifest: Publish each cropped image under its content-hashed name (optional)
     
     Returns:
         dict: Summary with 'success', 'failed', 'errors', 'elapsed_time', and 'output_dir' keys
@@ -237,6 +402,9 @@ def process_image_cropping(source_dir: str, output_dir: str, left: int = 133, to
     # Ensure output directory exists
     ensure_output_directory(output_path)
     
+    # Placeholders for the published crops, keyed by output path
+    placeholders = {} if asset_manifest is not None else None
+    
     # Get list of all image files (jpg, jpeg, png)
     image_files = []
     for ext in ['*.jpg', '*.jpeg', '*.png', '*.JPG', '*.JPEG', '*.PNG']:
@@ -245,9 +413,8 @@ def process_image_cropping(source_dir: str, output_dir: str, left: int = 133, to
     
     total_files = len(image_files)
     
-    # Initialize counters and error tracking
-    success_count = 0
-    failed_count = 0
+    # Counters for this run; also recorded in the default metrics registry
+    metrics = MetricsRegistry(parent=get_registry())
     errors = []
     
     # Start timing
@@ -273,14 +440,18 @@ def process_image_cropping(source_dir: str, output_dir: str, left: int = 133, to
             left=left,
             top=top,
             width=width,
-            height=height
+            height=height,
+            placeholders=placeholders
         )
         
         # Track success and failure counts
         if success:
-            success_count += 1
+            metrics.inc('documents_total', stage='crop', outcome='success')
+            if asset_manifest is not None:
+                asset_manifest.publish(output_file_path.as_posix(),
+                                       placeholder=placeholders.pop(output_file_path))
         else:
-            failed_count += 1
+            metrics.inc('documents_total', stage='crop', outcome='failed')
             # Collect error details
             errors.append({
                 'filename': image_file.name,
@@ -292,15 +463,16 @@ def process_image_cropping(source_dir: str, output_dir: str, left: int = 133, to
     
     # Return summary
     return {
-        'success': success_count,
-        'failed': failed_count,
+        'success': int(metrics.value('documents_total', stage='crop', outcome='success')),
+        'failed': int(metrics.value('documents_total', stage='crop', outcome='failed')),
         'errors': errors,
         'elapsed_time': elapsed_time,
         'output_dir': output_dir
     }
 
 
-def process_pdf_directory(source_dir: str, output_dir: str, address_output_dir: str = None, dpi: int = 150) -> dict:
+def process_pdf_directory(source_dir: str, output_dir: str, address_output_dir: str = None, dpi: int = 150,
+                          asset_manifest: AssetManifest = None) -> dict:
     """
     Processes all PDFs in a directory.
     
@@ -309,6 +481,7 @@ def process_pdf_directory(source_dir: str, output_dir: str, address_output_dir:
         output_dir: Path to output directory for images
         address_output_dir: Path to output directory for cropped address images (optional)
         dpi: Resolution for rendering
+        asset_manifest: Publish each cropped address image under its content-hashed name (optional)
     
     Returns:
         dict: Summary with 'success', 'failed', 'errors', 'elapsed_time', 'output_dir', 
@@ -321,6 +494,9 @@ def process_pdf_directory(source_dir: str, output_dir: str, address_output_dir:
     # Ensure output directory exists
     ensure_output_directory(output_path)
     
+    # Placeholders for the published crops, keyed by output path
+    placeholders = {} if asset_manifest is not None else None
+    
     # Create address-images output directory if specified
     address_output_path = None
     if address_output_dir:
@@ -331,11 +507,8 @@ def process_pdf_directory(source_dir: str, output_dir: str, address_output_dir:
     pdf_files = get_pdf_files(source_path)
     total_files = len(pdf_files)
     
-    # Initialize counters and error tracking
-    success_count = 0
-    failed_count = 0
-    crop_success_count = 0
-    crop_failed_count = 0
+    # Counters for this run; also recorded in the default metrics registry
+    metrics = MetricsRegistry(parent=get_registry())
     errors = []
     
     # Start timing - track elapsed time using time module
@@ -361,7 +534,7 @@ def process_pdf_directory(source_dir: str, output_dir: str, address_output_dir:
         
         # Track success and failure counts during processing
         if success:
-            success_count += 1
+            metrics.inc('documents_total', stage='extract', outcome='success')
             
             # After each successful PDF extraction, call crop_image() with coordinates
             if address_output_path:
@@ -372,21 +545,25 @@ def process_pdf_directory(source_dir: str, output_dir: str, address_output_dir:
                     left=133,
                     top=425,
                     width=1058,
-                    height=393
+                    height=393,
+                    placeholders=placeholders
                 )
                 
                 # Track cropping success and failure counts separately
                 if crop_success:
-                    crop_success_count += 1
+                    metrics.inc('documents_total', stage='crop', outcome='success')
+                    if asset_manifest is not None:
+                        asset_manifest.publish(address_output_file_path.as_posix(),
+                                               placeholder=placeholders.pop(address_output_file_path))
                 else:
-                    crop_failed_count += 1
+                    metrics.inc('documents_total', stage='crop', outcome='failed')
                     # Add cropping errors to the error report
                     errors.append({
                         'filename': pdf_file.name,
                         'error': f"Cropping failed - {crop_error if crop_error else 'Unknown error'}"
                     })
         else:
-            failed_count += 1
+            metrics.inc('documents_total', stage='extract', outcome='failed')
             # Collect error details in a list for final reporting
             errors.append({
                 'filename': pdf_file.name,
@@ -398,8 +575,8 @@ def process_pdf_directory(source_dir: str, output_dir: str, address_output_dir:
     
     # Return summary with success, failed, errors, elapsed_time, output_dir, and cropping stats
     result = {
-        'success': success_count,
-        'failed': failed_count,
+        'success': int(metrics.value('documents_total', stage='extract', outcome='success')),
+        'failed': int(metrics.value('documents_total', stage='extract', outcome='failed')),
         'errors': errors,
         'elapsed_time': elapsed_time,
         'output_dir': output_dir
@@ -407,8 +584,8 @@ def process_pdf_directory(source_dir: str, output_dir: str, address_output_dir:
     
     # Add cropping statistics if address output directory was specified
     if address_output_dir:
-        result['crop_success'] = crop_success_count
-        result['crop_failed'] = crop_failed_count
+        result['crop_success'] = int(metrics.value('documents_total', stage='crop', outcome='success'))
+        result['crop_failed'] = int(metrics.value('documents_total', stage='crop', outcome='failed'))
         result['address_output_dir'] = address_output_dir
     
     return result
@@ -451,15 +628,19 @@ def main_crop_only():
     source_dir = 'public/images/p064'
     output_dir = 'public/address-images/p064'
     
-    # Process image cropping
+    # Process image cropping, publishing hashed copies of the crops
+    asset_manifest = AssetManifest()
     result = process_image_cropping(
         source_dir,
         output_dir,
         left=133,
         top=425,
         width=1058,
-        height=393
+        height=393,
+        asset_manifest=asset_manifest
     )
+    asset_manifest.prune(f"{output_dir}/")
+    asset_manifest.save()
     
     # Create summary report
     print("\n" + "="*60)
@@ -470,6 +651,7 @@ def main_crop_only():
     print(f"Failed:                 {result['failed']}")
     print(f"Total time:             {result['elapsed_time']:.2f} seconds")
     print(f"Output directory:       {result['output_dir']}")
+    print(f"Asset manifest:         {asset_manifest.path}")
     print("="*60)
     
     # Print detailed error list if any failures occurred
@@ -490,8 +672,12 @@ def main_extract_and_crop():
     address_output_dir = 'public/address-images/p064'
     dpi = 150
     
-    # Process PDFs with cropping
-    result = process_pdf_directory(source_dir, output_dir, address_output_dir, dpi)
+    # Process PDFs with cropping, publishing hashed copies of the crops
+    asset_manifest = AssetManifest()
+    result = process_pdf_directory(source_dir, output_dir, address_output_dir, dpi,
+                                   asset_manifest=asset_manifest)
+    asset_manifest.prune(f"{address_output_dir}/")
+    asset_manifest.save()
     
     # Create summary report
     print("\n" + "="*60)
@@ -512,7 +698,75 @@ def main_extract_and_crop():
     # Show address-images output directory path in summary
     if 'address_output_dir' in result:
         print(f"Address output dir:     {result['address_output_dir']}")
+        print(f"Asset manifest:         {asset_manifest.path}")
+    
+    print("="*60)
+    
+    # Print detailed error list if any failures occurred
+    if result['errors']:
+        print("\nDETAILED ERROR LIST:")
+        print("-" * 60)
+        for idx, error in enumerate(result['errors'], start=1):
+            print(f"{idx}. {error['filename']}")
+            print(f"   Error: {error['error']}")
+        print("-" * 60)
+
+
+def publish_thumbnails(source_dir: str, asset_manifest: AssetManifest) -> dict:
+    """
+    Publishes existing thumbnails with their placeholders without re-cropping.
+    
+    Args:
+        source_dir: Path to directory containing cropped images
+        asset_manifest: Manifest to publish the images to
+    
+    Returns:
+        dict: Summary with 'success', 'failed', 'errors', 'elapsed_time', and 'output_dir' keys
+    """
+    image_files = sorted(Path(source_dir).glob('*.jpg'))
+    success_count = 0
+    errors = []
+    start_time = time.time()
+    
+    for image_file in image_files:
+        try:
+            with open(image_file, 'rb') as f:
+                content = f.read()
+            with Image.open(io.BytesIO(content)) as image:
+                placeholder = make_placeholder(image)
+            asset_manifest.publish(image_file.as_posix(), content, placeholder=placeholder)
+            success_count += 1
+        except OSError as e:
+            errors.append({'filename': image_file.name, 'error': f"File system error - {str(e)}"})
+    
+    asset_manifest.prune(f"{source_dir}/")
+    
+    return {
+        'success': success_count,
+        'failed': len(errors),
+        'errors': errors,
+        'elapsed_time': time.time() - start_time,
+        'output_dir': source_dir
+    }
+
+
+def main_publish_only():
+    """Publish existing address images and their placeholders to the asset manifest."""
+    # Configuration
+    source_dir = 'public/address-images/p064'
     
+    asset_manifest = AssetManifest()
+    result = publish_thumbnails(source_dir, asset_manifest)
+    asset_manifest.save()
+    
+    # Create summary report
+    print("\n" + "="*60)
+    print("ASSET PUBLISHING SUMMARY")
+    print("="*60)
+    print(f"Successfully published: {result['success']}")
+    print(f"Failed:                 {result['failed']}")
+    print(f"Total time:             {result['elapsed_time']:.2f} seconds")
+    print(f"Asset manifest:         {asset_manifest.path}")
     print("="*60)
     
     # Print detailed error list if any failures occurred
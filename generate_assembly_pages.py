@@ -6,18 +6,102 @@ This script generates 182 HTML pages (one per assembly constituency) from a temp
 Each page has unique SEO meta tags, titles, and H1 tags while maintaining the same structure.
 
 Usage:
-    python generate_assembly_pages.py
+    python generate_assembly_pages.py [--workers N] [--force]
 
 To regenerate pages:
     1. Update anand.html (template) if needed
     2. Update assembly_constituencies.json if needed
     3. Run: python generate_assembly_pages.py
+
+Only pages whose bytes changed are rewritten. Input and page hashes are
+recorded in build_manifest.json, so a rebuild with unchanged inputs exits
+without rendering anything. Use --force to render every page regardless.
+
+Pages are minified (whitespace, comments, inline CSS and JSON-LD); the
+hosts compress responses themselves. anand.html doubles as the template,
+so it is written unminified. Use --report to print the per-page sizes, and
+--no-minify to write pages exactly as rendered.
+
+The same run writes the per-constituency data files, the static taluko
+and gaam landing pages (see generate_location_pages.py) and sharded
+sitemaps under sitemap.xml. A page's sitemap lastmod only moves when its
+content hash changes.
+
+Stylesheet and thumbnail references point at the content-hashed copies
+recorded in asset-manifest.json (see asset_manifest.py), so those assets
+can be cached as immutable. styles.css is published by this script; the
+thumbnails and data files by the image and OCR stages.
 """
 
 import json
 import re
 import os
+import time
+import hashlib
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
+from urllib.parse import quote, unquote
+from xml.sax.saxutils import escape, unescape
+
+from asset_manifest import (
+    ASSET_DIR,
+    ASSET_MANIFEST_PATH,
+    HASH_LENGTH,
+    AssetManifest,
+    rewrite_asset_references
+)
+
+
+BASE_URL = 'https://sir-2002.gujrera.com/'
+BUILD_MANIFEST_PATH = 'build_manifest.json'
+
+# Document data joined to constituencies: OCR output, collection folders of
+# PDFs (P064/, P070/, ...) and their thumbnails
+DOCUMENTS_PATH = 'extracted_data.json'
+THUMBNAIL_DIR = 'public/address-images'
+# Sprite sheets and coordinate maps written by build_thumbnail_atlas.py
+ATLAS_DIR = 'public/atlases'
+CONSTITUENCY_DATA_DIR = 'data/constituencies'
+
+# Hand-written pages that are not generated but whose asset references are
+# rewritten like the generated ones
+STATIC_PAGES = ('index.html',)
+
+# Assets referenced by the pages that this script publishes under
+# content-hashed names itself
+PAGE_ASSETS = ('styles.css',)
+
+# Sitemap index and shards (sitemap-1.xml, ...). The protocol allows at most
+# 50,000 URLs and 50 MB uncompressed per sitemap file.
+SITEMAP_INDEX_PATH = 'sitemap.xml'
+SITEMAP_MAX_URLS = 50000
+SITEMAP_MAX_BYTES = 50 * 1024 * 1024
+SITEMAP_NAMESPACE = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+SITEMAP_URL_PATTERN = re.compile(r'<loc>([^<]*)</loc>\s*<lastmod>([^<]*)</lastmod>')
+
+
+# Patterns used to locate the per-page slots in the template. They are
+# compiled once and shared by the replace_* helpers and PageTemplate.
+TITLE_PATTERN = re.compile(r'<title>.*?</title>', re.DOTALL)
+CANONICAL_PATTERN = re.compile(r'<link\s+rel="canonical"\s+href="[^"]*"')
+H1_PATTERN = re.compile(r'(<h1>).*?(</h1>)')
+JSON_LD_NAME_PATTERN = re.compile(r'"name":\s*"[^"]*"')
+JSON_LD_DESCRIPTION_PATTERN = re.compile(r'"description":\s*"[^"]*"')
+JSON_LD_URL_PATTERN = re.compile(r'"url":\s*"[^"]*"')
+OG_IMAGE_PATTERN = re.compile(r'<meta\s+property="og:image"\s+content="[^"]*"')
+TWITTER_IMAGE_PATTERN = re.compile(r'<meta\s+name="twitter:image"\s+content="[^"]*"')
+CTA_SECTION_PATTERN = re.compile(r'(\s+<!-- CTA Section for Fillable Form -->)')
+LINKS_SECTION_PATTERN = re.compile(
+    r'[ \t]*<!-- Other Assembly Constituencies Links -->\s*<section class="assembly-links-section.*?</section>',
+    re.DOTALL
+)
+HEAD_END_PATTERN = re.compile(r'</head>')
+DATA_PRELOAD_PATTERN = re.compile(r'[ \t]*<link rel="preload"[^>]*\bdata-constituency-data\b[^>]*>\n?')
+# Collection folders (P064) and the constituency number they hold (64)
+COLLECTION_DIR_PATTERN = re.compile(r'^[A-Za-z]+(\d{3})$')
 
 
 def load_template(template_path='anand.html'):
@@ -46,6 +130,18 @@ def load_assemblies(json_path='assembly_constituencies.json'):
         return None
 
 
+def load_documents(json_path=DOCUMENTS_PATH):
+    """Load the OCR document data (document ID -> taluko and gaam), or {} if there is none."""
+    try:
+        with open(json_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except json.JSONDecodeError as e:
+        print(f"Error parsing {json_path}: {e}")
+        return {}
+
+
 def generate_title(assembly_name):
     """Generate page title for assembly."""
     # Remove parentheses content for title (e.g., "Abdasa" not "Abdasa (SC)")
@@ -65,53 +161,52 @@ def generate_h1(assembly_name):
     return f"{assembly_name} - 2002 Voter List Gujarat"
 
 
+@lru_cache(maxsize=None)
+def meta_tag_pattern(tag_name):
+    """Return the compiled pattern for a <meta name|property="tag_name"> tag."""
+    # Pattern for meta tags: <meta name="..." content="..."> or <meta property="..." content="...">
+    return re.compile(rf'<meta\s+(?:name|property)="{re.escape(tag_name)}"\s+content="[^"]*"')
+
+
 def replace_meta_tag(html, tag_name, attribute, new_value):
     """Replace a meta tag value in HTML."""
-    # Pattern for meta tags: <meta name="..." content="..."> or <meta property="..." content="...">
-    pattern = rf'<meta\s+(?:name|property)="{re.escape(tag_name)}"\s+content="[^"]*"'
     replacement = f'<meta {attribute}="{tag_name}" content="{new_value}"'
-    return re.sub(pattern, replacement, html)
+    return meta_tag_pattern(tag_name).sub(replacement, html)
 
 
 def replace_title(html, new_title):
     """Replace the <title> tag content."""
-    pattern = r'<title>.*?</title>'
     replacement = f'<title>{new_title}</title>'
-    return re.sub(pattern, replacement, html, flags=re.DOTALL)
+    return TITLE_PATTERN.sub(replacement, html)
 
 
 def replace_canonical(html, url):
     """Replace the canonical URL."""
-    pattern = r'<link\s+rel="canonical"\s+href="[^"]*"'
     replacement = f'<link rel="canonical" href="{url}"'
-    return re.sub(pattern, replacement, html)
+    return CANONICAL_PATTERN.sub(replacement, html)
 
 
 def replace_h1(html, new_h1):
     """Replace the H1 tag content."""
     # Find the H1 in the header section
-    pattern = r'(<h1>).*?(</h1>)'
     replacement = f'\\1{new_h1}\\2'
-    return re.sub(pattern, replacement, html, count=1)
+    return H1_PATTERN.sub(replacement, html, count=1)
 
 
 def replace_json_ld(html, assembly_name, description, base_url):
     """Replace JSON-LD structured data."""
     # Find the JSON-LD script tag and update name and description
     # Pattern matches: "name": "content"
-    pattern = r'"name":\s*"[^"]*"'
     replacement = f'"name": "2002 Voter List Gujarat - {assembly_name}"'
-    html = re.sub(pattern, replacement, html, count=1)
+    html = JSON_LD_NAME_PATTERN.sub(replacement, html, count=1)
     
     # Pattern matches: "description": "content"
-    pattern = r'"description":\s*"[^"]*"'
     replacement = f'"description": "{description}"'
-    html = re.sub(pattern, replacement, html, count=1)
+    html = JSON_LD_DESCRIPTION_PATTERN.sub(replacement, html, count=1)
     
     # Update URL in JSON-LD
-    pattern = r'"url":\s*"[^"]*"'
     replacement = f'"url": "{base_url}"'
-    html = re.sub(pattern, replacement, html, count=1)
+    html = JSON_LD_URL_PATTERN.sub(replacement, html, count=1)
     
     return html
 
@@ -119,155 +214,1149 @@ def replace_json_ld(html, assembly_name, description, base_url):
 def replace_og_image(html, base_url):
     """Replace Open Graph and Twitter image URLs."""
     # Replace og:image
-    pattern = r'<meta\s+property="og:image"\s+content="[^"]*"'
     replacement = f'<meta property="og:image" content="{base_url}og-image.jpg"'
-    html = re.sub(pattern, replacement, html)
+    html = OG_IMAGE_PATTERN.sub(replacement, html)
     
     # Replace twitter:image
-    pattern = r'<meta\s+name="twitter:image"\s+content="[^"]*"'
     replacement = f'<meta name="twitter:image" content="{base_url}og-image.jpg"'
-    html = re.sub(pattern, replacement, html)
+    html = TWITTER_IMAGE_PATTERN.sub(replacement, html)
     
     return html
 
 
+_assembly_nav_cache = {}
+
+
+def build_assembly_nav(assemblies):
+    """
+    Build the list items of the constituency navigation.
+    
+    Every page lists every constituency, so the items are built once per
+    list of assemblies and only the current page's item differs.
+    
+    Args:
+        assemblies: List of assembly dictionaries
+        
+    Returns:
+        list: (slug, '<li>...</li>' HTML) pairs in assembly order
+    """
+    key = tuple((assembly['slug'], assembly['full_name']) for assembly in assemblies)
+    nav = _assembly_nav_cache.get(key)
+    if nav is None:
+        nav = _assembly_nav_cache[key] = [
+            (slug, f'\n                <li><a href="{slug}.html">{escape(name)}</a></li>')
+            for slug, name in key
+        ]
+    return nav
+
+
 def generate_assembly_links_html(assemblies, current_slug, base_url):
-    """Generate HTML for assembly links section."""
-    links_html = '''    <!-- Other Assembly Constituencies Links -->
-    <section class="assembly-links-section" style="padding: 40px 20px; background: #ffffff; margin: 40px 0; border-top: 2px solid #e9ecef;">
-        <div style="max-width: 1200px; margin: 0 auto;">
-            <h2 style="text-align: center; color: #007bff; margin-bottom: 20px; font-size: 24px;">Other Assembly Constituencies</h2>
-            <p style="text-align: center; color: #666; margin-bottom: 30px;">Browse 2002 voter list for other assembly constituencies:</p>
-            <div style="display: grid; grid-template-columns: repeat(auto-fill, minmax(180px, 1fr)); gap: 12px; margin-top: 20px;">'''
-    
-    for assembly in assemblies:
-        if assembly['slug'] != current_slug:  # Don't link to current page
-            links_html += f'''
-                <a href="{assembly['slug']}.html" style="display: block; padding: 10px 12px; background: #f8f9fa; border: 1px solid #dee2e6; border-radius: 6px; text-decoration: none; color: #333; transition: all 0.3s ease; text-align: center; font-size: 14px;" onmouseover="this.style.background='#007bff'; this.style.color='#fff'; this.style.borderColor='#007bff';" onmouseout="this.style.background='#f8f9fa'; this.style.color='#333'; this.style.borderColor='#dee2e6';">
-                    {assembly['full_name']}
-                </a>'''
-    
-    links_html += '''
-            </div>
+    """
+    Generate HTML for assembly links section.
+    
+    The links are plain anchors in a list styled from styles.css (no inline
+    styles or scripts), so crawlers and visitors without JavaScript see every
+    constituency. The current one is marked with aria-current.
+    """
+    items = ''.join(
+        item.replace('<a ', '<a aria-current="page" ', 1) if slug == current_slug else item
+        for slug, item in build_assembly_nav(assemblies)
+    )
+    
+    return f'''    <!-- Other Assembly Constituencies Links -->
+    <section class="assembly-links-section assembly-nav">
+        <div class="assembly-nav-container">
+            <h2>Other Assembly Constituencies</h2>
+            <p>Browse 2002 voter list for other assembly constituencies:</p>
+            <ul class="assembly-nav-grid">{items}
+            </ul>
         </div>
     </section>'''
-    
-    return links_html
 
 
 def insert_assembly_links(html, assemblies, current_slug, base_url):
     """Insert assembly links section before the CTA section."""
     links_html = generate_assembly_links_html(assemblies, current_slug, base_url)
     
+    # Replace an existing links section in place (the template may itself be
+    # a generated page) and drop any duplicates
+    if LINKS_SECTION_PATTERN.search(html):
+        sections = iter([links_html])
+        return LINKS_SECTION_PATTERN.sub(lambda match: next(sections, ''), html)
+    
     # Find the CTA section and insert before it
-    pattern = r'(\s+<!-- CTA Section for Fillable Form -->)'
     replacement = f'{links_html}\\n\\1'
-    html = re.sub(pattern, replacement, html)
+    html = CTA_SECTION_PATTERN.sub(replacement, html)
     
     return html
 
 
-def generate_page(html_template, assembly, assemblies_list, base_url='https://sir-2002.gujrera.com/'):
-    """Generate a single assembly page from template."""
-    html = html_template
+def get_collection_files(base_dir='.'):
+    """
+    List the PDFs and thumbnails of every collection folder.
+    
+    Args:
+        base_dir: Site root holding P064/, P070/, ... and public/address-images/
+        
+    Returns:
+        dict: {collection: {'pdfs': [...], 'thumbnails': [...]}} with sorted filenames
+    """
+    collections = {}
+    for entry in sorted(os.listdir(base_dir)):
+        if not COLLECTION_DIR_PATTERN.match(entry) or not os.path.isdir(os.path.join(base_dir, entry)):
+            continue
+        
+        collection = entry.upper()
+        thumbnail_dir = os.path.join(base_dir, THUMBNAIL_DIR, collection.lower())
+        thumbnails = os.listdir(thumbnail_dir) if os.path.isdir(thumbnail_dir) else []
+        collections[collection] = {
+            'pdfs': sorted(f for f in os.listdir(os.path.join(base_dir, entry)) if f.lower().endswith('.pdf')),
+            'thumbnails': sorted(f for f in thumbnails if f.lower().endswith('.jpg')),
+        }
+    return collections
+
+
+def build_constituency_data(assemblies, documents, collection_files, asset_manifest=None):
+    """
+    Join collections to constituencies and build one data file per constituency.
+    
+    A collection belongs to the constituency with the same number
+    (P064 -> 64-Sarkhej, P070 -> 70-Shahpur). Each file holds the taluko/gaam
+    facet index of the constituency's documents, and per collection the URL
+    patterns and ID ranges of the thumbnails and PDFs that exist. Everything
+    is stored as ID ranges, so a page downloads a few KB for its own
+    documents instead of the whole corpus. Thumbnails published in the asset
+    manifest also get a hashed URL pattern, the hash of each file and the
+    dominant colour of its placeholder, and a published sprite-sheet atlas
+    is referenced by the URL of its coordinate map.
+    
+    A constituency without any thumbnails gets no file: its gallery would be
+    empty, so its page keeps the collection-wide gallery instead.
+    
+    Args:
+        assemblies: List of assembly dictionaries
+        documents: extracted_data.json mapping of document ID to taluko and gaam
+        collection_files: Output of get_collection_files()
+        asset_manifest: AssetManifest with the published thumbnails (optional)
+        
+    Returns:
+        dict: {slug: (path, JSON bytes)} for constituencies that have thumbnails,
+              e.g. {"sarkhej": ("data/constituencies/sarkhej.1a2b3c4d5e.json", b'{...}')}
+    """
+    # The OCR module needs Pillow and pytesseract, so only import it when
+    # there is document data to join
+    from gujarati_ocr_json_extractor import FacetIndexBuilder, get_collection_id
+    
+    builder = FacetIndexBuilder()
+    by_collection = {}
+    for doc_id in documents:
+        by_collection.setdefault(get_collection_id(doc_id), set()).add(doc_id)
+    for collection, files in collection_files.items():
+        ids = by_collection.setdefault(collection, set())
+        ids.update(os.path.splitext(f)[0] for f in files['pdfs'] + files['thumbnails'])
+    
+    numbers = {assembly['number']: assembly for assembly in assemblies}
+    joined = {}
+    for collection in sorted(by_collection):
+        match = COLLECTION_DIR_PATTERN.match(collection)
+        assembly = numbers.get(int(match.group(1))) if match else None
+        if assembly is None:
+            continue
+        
+        files = collection_files.get(collection, {'pdfs': [], 'thumbnails': []})
+        _, entries, collections = joined.setdefault(assembly['slug'], (assembly, {}, {}))
+        for doc_id in by_collection[collection]:
+            entries[doc_id] = documents.get(doc_id) or {}
+        thumbnail_dir = f"{THUMBNAIL_DIR}/{collection.lower()}"
+        thumbnail_ids = [os.path.splitext(f)[0] for f in files['thumbnails']]
+        collections[collection] = {
+            'thumbnail_url': f"/{thumbnail_dir}/{{id}}.jpg",
+            'pdf_url': f"/{collection}/{{id}}.pdf",
+            'thumbnails': builder.compress_id_ranges(thumbnail_ids),
+            'pdfs': builder.compress_id_ranges([os.path.splitext(f)[0] for f in files['pdfs']]),
+        }
+        
+        # Hashes and placeholder colours follow the order of the expanded
+        # thumbnail ranges, with null for thumbnails that are not published
+        published = asset_manifest.assets if asset_manifest is not None else {}
+        entries = [published.get(f"{thumbnail_dir}/{doc_id}.jpg") for doc_id in sorted(set(thumbnail_ids))]
+        if any(entries):
+            collections[collection]['thumbnail_asset_url'] = f"/{ASSET_DIR}/{thumbnail_dir}/{{id}}.{{hash}}.jpg"
+            collections[collection]['thumbnail_hashes'] = [
+                entry['sha256'][:HASH_LENGTH] if entry else None for entry in entries
+            ]
+        if any(entry and 'placeholder' in entry for entry in entries):
+            collections[collection]['thumbnail_colors'] = [
+                entry['placeholder']['color'] if entry and 'placeholder' in entry else None
+                for entry in entries
+            ]
+        atlas = published.get(f"{ATLAS_DIR}/{collection.lower()}.json")
+        if atlas:
+            collections[collection]['atlas_url'] = '/' + atlas['file']
+    
+    data_files = {}
+    for slug, (assembly, entries, collections) in joined.items():
+        if not any(collection['thumbnails'] for collection in collections.values()):
+            continue
+        data = {
+            'version': 1,
+            'constituency': {'number': assembly['number'], 'name': assembly['name'], 'slug': slug},
+            'collections': collections,
+            'facets': builder.build(entries, source=DOCUMENTS_PATH),
+        }
+        content = json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        path = f"{CONSTITUENCY_DATA_DIR}/{slug}.{hashlib.sha256(content).hexdigest()[:10]}.json"
+        data_files[slug] = (path, content)
+    return data_files
+
+
+def generate_data_preload_html(data_file):
+    """Generate the <head> preload tag for a page's constituency data, if it has any."""
+    if not data_file:
+        return ''
+    return (f'    <link rel="preload" href="{data_file}" as="fetch" type="application/json" '
+            f'crossorigin="anonymous" data-constituency-data>\n')
+
+
+def insert_constituency_data(html, data_file):
+    """Insert (or replace) the constituency data preload before </head>."""
+    preload_html = generate_data_preload_html(data_file)
+    
+    if DATA_PRELOAD_PATTERN.search(html):
+        blocks = iter([preload_html])
+        return DATA_PRELOAD_PATTERN.sub(lambda match: next(blocks, ''), html)
+    
+    return HEAD_END_PATTERN.sub(lambda match: preload_html + match.group(), html, count=1)
+
+
+class PageTemplate:
+    """
+    Template parsed once into literal segments and named slots.
+    
+    Slots are located with the same patterns (and the same first/all match
+    rules) that the replace_* helpers and insert_assembly_links apply one
+    after another, so rendering a page is a single join that yields the same
+    bytes as running those helpers in sequence.
+    """
+    
+    # (slot name, pattern, replace only the first match, insert before match)
+    SLOTS = [
+        ('title', TITLE_PATTERN, False, False),
+        ('meta:description', meta_tag_pattern('description'), False, False),
+        ('meta:og:title', meta_tag_pattern('og:title'), False, False),
+        ('meta:og:description', meta_tag_pattern('og:description'), False, False),
+        ('meta:og:url', meta_tag_pattern('og:url'), False, False),
+        ('meta:twitter:title', meta_tag_pattern('twitter:title'), False, False),
+        ('meta:twitter:description', meta_tag_pattern('twitter:description'), False, False),
+        ('canonical', CANONICAL_PATTERN, False, False),
+        ('h1', H1_PATTERN, True, False),
+        ('json_ld:name', JSON_LD_NAME_PATTERN, True, False),
+        ('json_ld:description', JSON_LD_DESCRIPTION_PATTERN, True, False),
+        ('json_ld:url', JSON_LD_URL_PATTERN, True, False),
+        ('og:image', OG_IMAGE_PATTERN, False, False),
+        ('twitter:image', TWITTER_IMAGE_PATTERN, False, False),
+    ]
+    
+    # Generated blocks: (slot name, pattern for an existing block, pattern
+    # to insert before when there is none, insert only at the first match,
+    # text added after an inserted block)
+    BLOCKS = [
+        ('links', LINKS_SECTION_PATTERN, CTA_SECTION_PATTERN, False, '\n'),
+        ('data_preload', DATA_PRELOAD_PATTERN, HEAD_END_PATTERN, True, ''),
+    ]
     
-    # Generate values
+    def __init__(self, html):
+        """
+        Parse the template into segments.
+        
+        Args:
+            html: Template HTML
+            
+        Raises:
+            ValueError: If two slots overlap in the template
+        """
+        spans = []
+        for name, pattern, first_only, insert in self.SLOTS:
+            for match in pattern.finditer(html):
+                end = match.start() if insert else match.end()
+                spans.append((match.start(), end, name, ''))
+                if first_only:
+                    break
+        
+        # Blocks: replace an existing block in place and drop duplicates,
+        # otherwise insert a new one at the anchor (the template may itself
+        # be a generated page)
+        for name, pattern, anchor, first_only, suffix in self.BLOCKS:
+            blocks = list(pattern.finditer(html))
+            if blocks:
+                for index, match in enumerate(blocks):
+                    spans.append((match.start(), match.end(), name if index == 0 else None, ''))
+                continue
+            for match in anchor.finditer(html):
+                spans.append((match.start(), match.start(), name, suffix))
+                if first_only:
+                    break
+        spans.sort(key=lambda span: span[:2])
+        
+        self.segments = []
+        self.slot_names = set()
+        position = 0
+        for start, end, name, suffix in spans:
+            if start < position:
+                raise ValueError(f"Template slot '{name}' overlaps another slot at offset {start}")
+            self.segments.append(html[position:start])
+            if name is not None:
+                self.segments.append((name,))
+                self.slot_names.add(name)
+            if suffix:
+                self.segments.append(suffix)
+            position = end
+        self.segments.append(html[position:])
+        
+        # UTF-8 literals for render_bytes(); joining bytes avoids re-encoding
+        # the (mostly Gujarati, non-ASCII) template text for every page.
+        self.encoded_segments = [
+            segment.encode('utf-8') if isinstance(segment, str) else segment
+            for segment in self.segments
+        ]
+    
+    def render(self, values):
+        """
+        Render the template.
+        
+        Args:
+            values: Dictionary mapping slot names to replacement text
+            
+        Returns:
+            Rendered HTML
+        """
+        return ''.join(
+            segment if isinstance(segment, str) else values[segment[0]]
+            for segment in self.segments
+        )
+    
+    def render_bytes(self, values):
+        """
+        Render the template directly to UTF-8 bytes.
+        
+        Args:
+            values: Dictionary mapping slot names to replacement text
+            
+        Returns:
+            Rendered HTML encoded as UTF-8
+        """
+        return b''.join(
+            segment if isinstance(segment, bytes) else values[segment[0]].encode('utf-8')
+            for segment in self.encoded_segments
+        )
+
+
+_template_cache = {}
+
+
+def compile_template(html_template):
+    """Return the PageTemplate for a template string, parsing it only once."""
+    template = _template_cache.get(html_template)
+    if template is None:
+        template = _template_cache[html_template] = PageTemplate(html_template)
+    return template
+
+
+def get_page_values(assembly, links_html, base_url=BASE_URL, data_file=None):
+    """Compute the slot values for a single assembly page."""
     title = generate_title(assembly['name'])
     description = generate_description(assembly['name'])
     h1 = generate_h1(assembly['name'])
     page_url = f"{base_url}{assembly['slug']}.html"
     
-    # Replace title
-    html = replace_title(html, title)
+    return {
+        'title': f'<title>{title}</title>',
+        'meta:description': f'<meta name="description" content="{description}"',
+        'meta:og:title': f'<meta property="og:title" content="{title}"',
+        'meta:og:description': f'<meta property="og:description" content="{description}"',
+        'meta:og:url': f'<meta property="og:url" content="{page_url}"',
+        'meta:twitter:title': f'<meta name="twitter:title" content="{title}"',
+        'meta:twitter:description': f'<meta name="twitter:description" content="{description}"',
+        'canonical': f'<link rel="canonical" href="{page_url}"',
+        'h1': f'<h1>{h1}</h1>',
+        'json_ld:name': f'"name": "2002 Voter List Gujarat - {assembly["name"]}"',
+        'json_ld:description': f'"description": "{description}"',
+        'json_ld:url': f'"url": "{base_url}"',
+        'og:image': f'<meta property="og:image" content="{base_url}og-image.jpg"',
+        'twitter:image': f'<meta name="twitter:image" content="{base_url}og-image.jpg"',
+        'links': links_html,
+        'data_preload': generate_data_preload_html(data_file),
+    }
+
+
+def generate_page(html_template, assembly, assemblies_list, base_url=BASE_URL, data_file=None):
+    """Generate a single assembly page from template."""
+    template = compile_template(html_template)
+    links_html = generate_assembly_links_html(assemblies_list, assembly['slug'], base_url)
+    return template.render(get_page_values(assembly, links_html, base_url, data_file))
+
+
+# Tokens the HTML minifier treats specially: comments, elements whose body
+# must not be reflowed (the body is group 4), and ordinary tags
+HTML_TOKEN_PATTERN = re.compile(
+    r'<!--.*?-->'
+    r'|(<(script|style|pre|textarea)\b(?:"[^"]*"|\'[^\']*\'|[^\'">])*>)(.*?)(</\2\s*>)'
+    r'|<[!/]?[a-zA-Z](?:"[^"]*"|\'[^\']*\'|[^\'">])*>',
+    re.DOTALL | re.IGNORECASE
+)
+# HTML whitespace only; \s would also match non-breaking spaces
+HTML_WHITESPACE_PATTERN = re.compile(r'[ \t\r\n\f]+')
+QUOTED_PATTERN = re.compile(r'("[^"]*"|\'[^\']*\')')
+CSS_STRING_OR_COMMENT_PATTERN = re.compile(
+    r'("(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\')|/\*.*?\*/', re.DOTALL
+)
+CSS_STRING_PATTERN = re.compile(r'("(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\')')
+CSS_PUNCTUATION_PATTERN = re.compile(r'\s*([{};,>])\s*')
+# Space before a colon inside a declaration (not a selector like "a :hover")
+CSS_DECLARATION_COLON_PATTERN = re.compile(r'\s+:(?=[^{}]*[;}])')
+JSON_LD_TYPE_PATTERN = re.compile(r'type\s*=\s*["\']application/ld\+json["\']', re.IGNORECASE)
+
+
+def _collapse_whitespace(text):
+    """Collapse a whitespace run to one newline (if it had one) or one space."""
+    return HTML_WHITESPACE_PATTERN.sub(
+        lambda match: '\n' if '\n' in match.group() else ' ', text
+    )
+
+
+def minify_css(css):
+    """
+    Minify a stylesheet or a style attribute value.
     
-    # Replace meta description
-    html = replace_meta_tag(html, 'description', 'name', description)
+    Comments and redundant whitespace are removed; quoted strings are kept
+    as they are.
+    """
+    css = CSS_STRING_OR_COMMENT_PATTERN.sub(lambda match: match.group(1) or '', css)
     
-    # Replace Open Graph tags
-    html = replace_meta_tag(html, 'og:title', 'property', title)
-    html = replace_meta_tag(html, 'og:description', 'property', description)
-    html = replace_meta_tag(html, 'og:url', 'property', page_url)
+    parts = CSS_STRING_PATTERN.split(css)
+    for index in range(0, len(parts), 2):
+        part = re.sub(r'\s+', ' ', parts[index])
+        part = CSS_PUNCTUATION_PATTERN.sub(r'\1', part)
+        part = CSS_DECLARATION_COLON_PATTERN.sub(':', part)
+        parts[index] = re.sub(r':\s+', ':', part).replace(';}', '}')
+    return ''.join(parts).strip()
+
+
+def minify_json_ld(text):
+    """Re-serialize a JSON-LD block compactly, leaving it unchanged if it does not parse."""
+    try:
+        data = json.loads(text)
+    except ValueError:
+        return text
+    compact = json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+    return compact.replace('</', '<\\/')
+
+
+def _minify_tag(tag):
+    """Collapse whitespace between attributes and minify style attributes."""
+    parts = QUOTED_PATTERN.split(tag)
+    for index, part in enumerate(parts):
+        if index % 2 == 0:
+            part = HTML_WHITESPACE_PATTERN.sub(' ', part)
+            part = re.sub(r' ?= ?', '=', part)
+            parts[index] = re.sub(r' (/?>)$', r'\1', part)
+        elif re.search(r'\bstyle=$', parts[index - 1], re.IGNORECASE):
+            declarations = minify_css('{' + part[1:-1] + '}')[1:-1]
+            parts[index] = part[0] + declarations + part[-1]
+    return ''.join(parts)
+
+
+def minify_html(html):
+    """
+    Minify an HTML page without changing how it renders.
     
-    # Replace Twitter Card tags
-    html = replace_meta_tag(html, 'twitter:title', 'name', title)
-    html = replace_meta_tag(html, 'twitter:description', 'name', description)
+    Whitespace runs in text and between tags are collapsed to a single
+    character rather than removed, so inline spacing is preserved. Comments
+    are dropped (conditional comments are kept), <style> blocks and style
+    attributes are minified as CSS, and JSON-LD is re-serialized compactly.
+    Other scripts and <pre>/<textarea> bodies are left untouched.
     
-    # Replace canonical URL
-    html = replace_canonical(html, page_url)
+    Args:
+        html: Page HTML
+        
+    Returns:
+        Minified HTML
+    """
+    output = []
+    text = []
+    position = 0
     
-    # Replace H1
-    html = replace_h1(html, h1)
+    for match in HTML_TOKEN_PATTERN.finditer(html):
+        # Text on both sides of a dropped comment is collapsed as one run
+        text.append(html[position:match.start()])
+        position = match.end()
+        token = match.group()
+        
+        if token.startswith('<!--') and not token.startswith('<!--[if'):
+            continue
+        
+        output.append(_collapse_whitespace(''.join(text)))
+        text = []
+        
+        if token.startswith('<!--'):
+            output.append(token)
+        elif match.group(1) is None:
+            output.append(_minify_tag(token))
+        else:
+            open_tag, element, body, close_tag = match.group(1, 2, 3, 4)
+            element = element.lower()
+            if element == 'style':
+                body = minify_css(body)
+            elif element == 'script' and JSON_LD_TYPE_PATTERN.search(open_tag):
+                body = minify_json_ld(body)
+            output.append(_minify_tag(open_tag) + body + close_tag)
     
-    # Replace JSON-LD structured data
-    html = replace_json_ld(html, assembly['name'], description, base_url)
+    text.append(html[position:])
+    output.append(_collapse_whitespace(''.join(text)))
+    return ''.join(output).strip() + '\n'
+
+
+def hash_bytes(data):
+    """Return the SHA-256 hex digest of data."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def hash_file(path):
+    """Return the SHA-256 hex digest of a file, or None if it cannot be read."""
+    try:
+        with open(path, 'rb') as f:
+            return hash_bytes(f.read())
+    except OSError:
+        return None
+
+
+def get_build_inputs(template_path, assemblies_path, base_url, options=None,
+                     static_pages=STATIC_PAGES, documents_path=DOCUMENTS_PATH, base_dir='.'):
+    """Hash everything that determines the generated pages."""
+    collections = json.dumps(get_collection_files(base_dir), sort_keys=True).encode('utf-8')
+    return {
+        'generator': hash_file(os.path.abspath(__file__)),
+        'location_generator': hash_file(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                     'generate_location_pages.py')),
+        'template': hash_file(template_path),
+        'assemblies': hash_file(assemblies_path),
+        'documents': hash_file(documents_path),
+        'collections': hash_bytes(collections),
+        'base_url': base_url,
+        'options': options or {},
+        'static_pages': {path: hash_file(path) for path in static_pages},
+        'asset_manifest': hash_file(os.path.join(base_dir, ASSET_MANIFEST_PATH)),
+    }
+
+
+def load_build_manifest(manifest_path=BUILD_MANIFEST_PATH):
+    """Load the previous build manifest, or None if there is none."""
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def save_build_manifest(manifest, manifest_path=BUILD_MANIFEST_PATH):
+    """Write the build manifest."""
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2, sort_keys=True)
+
+
+def is_build_current(manifest, inputs, output_dir='.'):
+    """
+    Check whether a previous build is still valid.
     
-    # Replace OG image URLs
-    html = replace_og_image(html, base_url)
+    The build is current when every input hash matches and every recorded
+    page and asset still exists with its recorded size.
+    """
+    if not manifest or manifest.get('inputs') != inputs:
+        return False
     
-    # Insert assembly links section
-    html = insert_assembly_links(html, assemblies_list, assembly['slug'], base_url)
+    files = list(manifest.get('pages', {}).items()) + list(manifest.get('assets', {}).items())
+    expected = [(filename, page['bytes']) for filename, page in files]
     
-    return html
+    for filename, size in expected:
+        try:
+            if os.path.getsize(os.path.join(output_dir, filename)) != size:
+                return False
+        except OSError:
+            return False
+    return True
+
+
+def write_if_changed(path, content, previous_hash=None):
+    """
+    Write content to path unless the file already holds the same bytes.
+    
+    Args:
+        path: Output file path
+        content: Page bytes
+        previous_hash: Hash recorded for this file by the last build, if any
+        
+    Returns:
+        tuple: (sha256 hex digest of content, whether the file was written)
+    """
+    content_hash = hash_bytes(content)
+    
+    try:
+        size = os.path.getsize(path)
+    except OSError:
+        size = None
+    
+    if size == len(content):
+        if previous_hash is not None:
+            unchanged = previous_hash == content_hash
+        else:
+            unchanged = hash_file(path) == content_hash
+        if unchanged:
+            return content_hash, False
+    
+    with open(path, 'wb') as f:
+        f.write(content)
+    return content_hash, True
+
+
+# Outcome of building one page. bytes is the size written to disk,
+# source_bytes and minified_bytes the size before and after minification.
+PageResult = namedtuple(
+    'PageResult',
+    ['filename', 'sha256', 'bytes', 'written', 'error', 'source_bytes', 'minified_bytes']
+)
 
+# Per-process state for worker pools, set by _init_worker
+_worker_state = {}
 
-def main():
-    """Main function to generate all assembly pages."""
+
+def _init_worker(template, assemblies, base_url, output_dir, minify=False,
+                 source_pages=(), data_files=None):
+    """Parse the template once in each worker process."""
+    _worker_state['template'] = compile_template(template)
+    _worker_state['assemblies'] = assemblies
+    _worker_state['base_url'] = base_url
+    _worker_state['output_dir'] = output_dir
+    _worker_state['minify'] = minify
+    _worker_state['source_pages'] = frozenset(source_pages)
+    _worker_state['data_files'] = data_files or {}
+
+
+def _render_and_write(job):
+    """Render one page and write it if its bytes changed."""
+    assembly, previous = job
+    filename = f"{assembly['slug']}.html"
+    path = os.path.join(_worker_state['output_dir'], filename)
+    
+    try:
+        links_html = generate_assembly_links_html(
+            _worker_state['assemblies'], assembly['slug'], _worker_state['base_url']
+        )
+        values = get_page_values(assembly, links_html, _worker_state['base_url'],
+                                 _worker_state['data_files'].get(assembly['slug']))
+        
+        if _worker_state['minify']:
+            html = _worker_state['template'].render(values)
+            source = html.encode('utf-8')
+            minified = minify_html(html).encode('utf-8')
+        else:
+            source = minified = _worker_state['template'].render_bytes(values)
+        content = source if filename in _worker_state['source_pages'] else minified
+        
+        content_hash, written = write_if_changed(path, content, previous.get('sha256'))
+        return PageResult(filename, content_hash, len(content), written, None,
+                          len(source), len(minified))
+    except Exception as e:
+        return PageResult(filename, None, 0, False, str(e), 0, 0)
+
+
+def build_pages(template, assemblies, output_dir='.', base_url=BASE_URL,
+                previous_pages=None, workers=1, minify=False,
+                source_pages=(), data_files=None):
+    """
+    Render all pages, writing only those whose bytes changed.
+    
+    Args:
+        template: Template HTML
+        assemblies: List of assembly dictionaries
+        output_dir: Directory to write pages into
+        base_url: Site base URL
+        previous_pages: 'pages' mapping from the previous build manifest
+        workers: Number of worker processes (1 renders in this process)
+        minify: Minify pages with minify_html
+        source_pages: Filenames written unminified because they double as
+                      hand-edited sources (the template)
+        data_files: Constituency data path per slug, preloaded by its page
+        
+    Returns:
+        List of PageResult tuples in assembly order
+    """
+    previous_pages = previous_pages or {}
+    jobs = [
+        (assembly, previous_pages.get(f"{assembly['slug']}.html", {}))
+        for assembly in assemblies
+    ]
+    init_args = (template, assemblies, base_url, output_dir, minify, source_pages, data_files)
+    
+    if workers > 1 and len(jobs) > 1:
+        chunksize = max(1, len(jobs) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=init_args) as executor:
+            return list(executor.map(_render_and_write, jobs, chunksize=chunksize))
+    
+    _init_worker(*init_args)
+    return [_render_and_write(job) for job in jobs]
+
+
+def get_page_url(filename, base_url=BASE_URL):
+    """Return the public URL of a generated page (index.html maps to the site root)."""
+    if filename == 'index.html':
+        return base_url
+    return base_url + quote(filename)
+
+
+def split_sitemap_urls(urls, max_urls=SITEMAP_MAX_URLS, max_bytes=SITEMAP_MAX_BYTES):
+    """
+    Split (url, lastmod) pairs into sitemap shards within the protocol limits.
+    
+    Args:
+        urls: (url, lastmod) pairs in a stable order
+        max_urls: Maximum URLs per shard
+        max_bytes: Maximum uncompressed bytes per shard
+        
+    Returns:
+        List of (rendered <url> entries, latest lastmod) tuples, one per shard
+    """
+    overhead = len(render_sitemap([]).encode('utf-8'))
+    shards = []
+    size = overhead
+    
+    for url, lastmod in urls:
+        entry = f"<url><loc>{escape(url)}</loc><lastmod>{lastmod}</lastmod></url>\n"
+        entry_size = len(entry.encode('utf-8'))
+        if not shards or len(shards[-1][0]) >= max_urls or size + entry_size > max_bytes:
+            shards.append(([], lastmod))
+            size = overhead
+        entries, latest = shards[-1]
+        entries.append(entry)
+        shards[-1] = (entries, max(latest, lastmod))
+        size += entry_size
+    
+    return shards
+
+
+def render_sitemap(entries, tag='urlset'):
+    """Render a sitemap (urlset) or sitemap index (sitemapindex) document."""
+    return (f'<?xml version="1.0" encoding="UTF-8"?>\n'
+            f'<{tag} xmlns="{SITEMAP_NAMESPACE}">\n{"".join(entries)}</{tag}>\n')
+
+
+def load_sitemap_lastmods(output_dir='.', base_url=BASE_URL):
+    """
+    Read the lastmod of every page from the sitemaps already on disk.
+    
+    The build manifest is not committed, so on a fresh checkout the
+    committed sitemaps are the only record of when unchanged pages last
+    changed.
+    
+    Returns:
+        dict: {filename: lastmod}
+    """
+    lastmods = {}
+    for path in sorted(Path(output_dir).glob('sitemap-*.xml')):
+        try:
+            text = path.read_text(encoding='utf-8')
+        except OSError:
+            continue
+        for url, lastmod in SITEMAP_URL_PATTERN.findall(text):
+            url = unescape(url)
+            if url == base_url:
+                lastmods['index.html'] = lastmod
+            elif url.startswith(base_url):
+                lastmods[unquote(url[len(base_url):])] = lastmod
+    return lastmods
+
+
+def get_updated_time(filename, content_hash, written, previous, known_lastmods, now):
+    """
+    Decide a page's 'updated' time for the manifest and sitemap lastmod.
+    
+    Args:
+        filename: Page filename
+        content_hash: SHA-256 of the page as built now
+        written: Whether this build rewrote the page
+        previous: The page's entry in the previous build manifest, if any
+        known_lastmods: lastmod values from the existing sitemaps
+        now: Current build time
+        
+    Returns:
+        The previous time if the page is unchanged, otherwise now
+    """
+    if written:
+        return now
+    if previous.get('sha256') == content_hash and previous.get('updated'):
+        return previous['updated']
+    return known_lastmods.get(filename, now)
+
+
+def build_sitemaps(pages, output_dir='.', base_url=BASE_URL, previous_assets=None):
+    """
+    Write sharded sitemaps and the sitemap index.
+    
+    lastmod comes from each page's 'updated' time in the build manifest,
+    which only moves when the page's content hash changes. URLs are sorted
+    by filename so shards are stable, and a shard is only rendered and
+    written when its URLs or lastmod values changed.
+    
+    Args:
+        pages: Mapping of filename to manifest entry with an 'updated' time
+        output_dir: Site root
+        base_url: Site base URL
+        previous_assets: 'assets' mapping from the previous build manifest
+        
+    Returns:
+        dict: Manifest asset entries for the index and every shard
+    """
+    previous_assets = previous_assets or {}
+    urls = [
+        (get_page_url(filename, base_url), pages[filename]['updated'])
+        for filename in sorted(pages)
+    ]
+    
+    assets = {}
+    index_entries = []
+    for number, (entries, lastmod) in enumerate(split_sitemap_urls(urls), start=1):
+        filename = f"sitemap-{number}.xml"
+        key = hash_bytes(''.join(entries).encode('utf-8'))
+        
+        previous = previous_assets.get(filename, {})
+        if previous.get('entries') == key and os.path.exists(os.path.join(output_dir, filename)):
+            assets[filename] = previous
+        else:
+            content = render_sitemap(entries).encode('utf-8')
+            content_hash, _ = write_if_changed(os.path.join(output_dir, filename), content)
+            assets[filename] = {'sha256': content_hash, 'bytes': len(content), 'entries': key,
+                                'urls': len(entries)}
+        
+        index_entries.append(
+            f"<sitemap><loc>{escape(base_url + filename)}</loc><lastmod>{lastmod}</lastmod></sitemap>\n"
+        )
+    
+    content = render_sitemap(index_entries, 'sitemapindex').encode('utf-8')
+    content_hash, _ = write_if_changed(os.path.join(output_dir, SITEMAP_INDEX_PATH), content)
+    assets[SITEMAP_INDEX_PATH] = {'sha256': content_hash, 'bytes': len(content)}
+    return assets
+
+
+def print_size_report(entries, per_page=False):
+    """
+    Print page sizes before and after minification.
+    
+    Args:
+        entries: Build manifest 'pages' and 'assets' entries; those without
+                 source_bytes are skipped
+        per_page: Print one line per page as well as the totals
+    """
+    rows = [
+        (filename, entry['source_bytes'], entry['minified_bytes'])
+        for filename, entry in entries.items()
+        if 'source_bytes' in entry
+    ]
+    
+    def kb(size):
+        return f"{size / 1024:.1f} KB"
+    
+    if per_page:
+        print(f"{'Page':<28} {'Source':>10} {'Minified':>10}")
+        for row in rows:
+            print(f"{row[0]:<28} " + ' '.join(f"{kb(size):>10}" for size in row[1:]))
+    
+    print(f"Page size ({len(rows)} pages): {kb(sum(row[1] for row in rows))} source, "
+          f"{kb(sum(row[2] for row in rows))} minified")
+
+
+def parse_args(argv=None):
+    """Parse the command-line options of main()."""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Generate assembly constituency pages')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='Worker processes to use when the template changed (default: CPU count)')
+    parser.add_argument('--force', action='store_true',
+                        help='Render every page even if the inputs are unchanged')
+    parser.add_argument('--no-minify', action='store_true',
+                        help='Write pages exactly as rendered from the template')
+    parser.add_argument('--report', action='store_true',
+                        help='Print the before/after size of every page')
+    parser.add_argument('--build-manifest', default=BUILD_MANIFEST_PATH,
+                        help=f'Record of the last build, used to skip unchanged pages (default: {BUILD_MANIFEST_PATH})')
+    return parser.parse_args(argv)
+
+
+def publish_page_assets(paths=PAGE_ASSETS):
+    """
+    Publish the assets the pages reference under content-hashed names.
+    
+    Returns:
+        The saved AssetManifest
+    """
+    asset_manifest = AssetManifest()
+    for path in paths:
+        if os.path.exists(path):
+            asset_manifest.publish(path)
+    asset_manifest.save()
+    return asset_manifest
+
+
+def collect_page_entries(results, previous_pages, known_lastmods, now):
+    """
+    Turn page results into build manifest entries.
+    
+    Args:
+        results: PageResult tuples of the generated pages
+        previous_pages: 'pages' mapping from the previous build manifest
+        known_lastmods: lastmod values from the existing sitemaps
+        now: Current build time
+        
+    Returns:
+        tuple: ({filename: manifest entry}, written count, failed count)
+    """
+    pages = {}
+    written_count = 0
+    failed_count = 0
+    
+    for result in results:
+        if result.error:
+            print(f"  ✗ Error generating {result.filename}: {result.error}")
+            failed_count += 1
+            continue
+        
+        previous = previous_pages.get(result.filename, {})
+        if result.written:
+            written_count += 1
+        updated = get_updated_time(result.filename, result.sha256, result.written,
+                                   previous, known_lastmods, now)
+        pages[result.filename] = {
+            'sha256': result.sha256,
+            'bytes': result.bytes,
+            'updated': updated,
+            'source_bytes': result.source_bytes,
+            'minified_bytes': result.minified_bytes,
+        }
+    
+    return pages, written_count, failed_count
+
+
+def write_constituency_data(data_files, data_dir=CONSTITUENCY_DATA_DIR):
+    """
+    Write the per-constituency data files and remove any others.
+    
+    Data files are content-addressed, so any other file in the directory is
+    left over from an earlier build (even one without a manifest).
+    
+    Args:
+        data_files: {slug: (path, bytes)} from build_constituency_data()
+        data_dir: Directory holding the data files
+        
+    Returns:
+        dict: Manifest asset entries of the data files
+    """
+    assets = {}
+    for path, content in data_files.values():
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        content_hash, _ = write_if_changed(path, content)
+        assets[path] = {'sha256': content_hash, 'bytes': len(content)}
+    
+    if os.path.isdir(data_dir):
+        for filename in os.listdir(data_dir):
+            path = f"{data_dir}/{filename}"
+            if filename.endswith('.json') and path not in assets:
+                os.remove(path)
+    return assets
+
+
+def update_static_pages(asset_urls, previous_assets, known_lastmods, now, minify=True,
+                        static_pages=STATIC_PAGES):
+    """
+    Rewrite the asset references of the hand-written pages in place.
+    
+    The pages stay readable on disk; they are only minified to report the
+    size they would have.
+    
+    Args:
+        asset_urls: {logical path: hashed URL} from AssetManifest.urls()
+        previous_assets: 'assets' mapping from the previous build manifest
+        known_lastmods: lastmod values from the existing sitemaps
+        now: Current build time
+        minify: Report the minified size
+        static_pages: Hand-written page filenames
+        
+    Returns:
+        dict: Manifest asset entries of the pages that exist
+    """
+    assets = {}
+    for filename in static_pages:
+        try:
+            with open(filename, 'rb') as f:
+                content = f.read()
+        except OSError:
+            continue
+        content = rewrite_asset_references(content.decode('utf-8'), asset_urls).encode('utf-8')
+        write_if_changed(filename, content)
+        minified = minify_html(content.decode('utf-8')).encode('utf-8') if minify else content
+        content_hash = hash_bytes(content)
+        updated = get_updated_time(filename, content_hash, False, previous_assets.get(filename, {}),
+                                   known_lastmods, now)
+        assets[filename] = {
+            'sha256': content_hash,
+            'bytes': len(content),
+            'source_bytes': len(content),
+            'minified_bytes': len(minified),
+            'updated': updated,
+        }
+    return assets
+
+
+def remove_stale_assets(previous_assets, assets):
+    """Remove files the previous build recorded as assets that this build did not produce."""
+    for filename in previous_assets:
+        if filename not in assets and os.path.exists(filename):
+            os.remove(filename)
+
+
+def print_build_summary(assemblies, location_results, pages, assets, written_count, failed_count,
+                        data_files, asset_urls, elapsed_time, per_page=False):
+    """Print the counts, sizes and outputs of a build."""
+    print("\n[4/4] Generation complete!")
+    print("=" * 60)
+    print(f"Total assemblies: {len(assemblies)}")
+    print(f"Taluko and gaam pages: {len(location_results)}")
+    print(f"Successfully generated: {len(pages)}")
+    print(f"Written (changed): {written_count}")
+    print(f"Unchanged (skipped): {len(pages) - written_count}")
+    print_size_report({**pages, **assets}, per_page)
+    for path, content in data_files.values():
+        print(f"Constituency data: {path} ({len(content) / 1024:.1f} KB)")
+    print(f"Hashed assets: {len(asset_urls)} in {ASSET_MANIFEST_PATH}")
+    sitemap_shards = [asset for name, asset in assets.items() if name.startswith('sitemap-')]
+    print(f"Sitemaps: {sum(asset['urls'] for asset in sitemap_shards)} URLs in "
+          f"{len(sitemap_shards)} file{'s' if len(sitemap_shards) != 1 else ''} + {SITEMAP_INDEX_PATH}")
+    if failed_count > 0:
+        print(f"Failed: {failed_count}")
+    print(f"Generation time: {elapsed_time * 1000:.1f} ms")
+    print("=" * 60)
+    print("\nTo regenerate pages with updates:")
+    print("  1. Update anand.html (template) if needed")
+    print("  2. Update assembly_constituencies.json if needed")
+    print("  3. Run: python generate_assembly_pages.py")
+
+
+def main(argv=None):
+    """
+    Main function to generate all assembly pages.
+    
+    Args:
+        argv: Command-line arguments (default: sys.argv[1:])
+    """
+    args = parse_args(argv)
+    
+    template_path = 'anand.html'
+    assemblies_path = 'assembly_constituencies.json'
+    base_url = BASE_URL
+    
     print("=" * 60)
     print("Assembly Constituency Page Generator")
     print("=" * 60)
     
+    # Publish the page assets first so the input hashes see their manifest
+    asset_manifest = publish_page_assets()
+    asset_urls = asset_manifest.urls()
+    options = {'minify': not args.no_minify}
+    
+    # Check previous build
+    manifest = load_build_manifest(args.build_manifest)
+    inputs = get_build_inputs(template_path, assemblies_path, base_url, options)
+    if not args.force and is_build_current(manifest, inputs):
+        print("\n✓ Inputs unchanged since last build - nothing to do")
+        print(f"  (delete {args.build_manifest} or pass --force to rebuild)")
+        return
+    
     # Load template
     print("\n[1/4] Loading template...")
-    template = load_template()
+    template = load_template(template_path)
     if not template:
         return
+    template = rewrite_asset_references(template, asset_urls)
     print("✓ Template loaded successfully")
     
     # Load assembly data
     print("\n[2/4] Loading assembly data...")
-    assemblies = load_assemblies()
+    assemblies = load_assemblies(assemblies_path)
     if not assemblies:
         return
     print(f"✓ Loaded {len(assemblies)} assemblies")
     
-    # Generate pages
-    print("\n[3/4] Generating pages...")
-    generated_count = 0
-    failed_count = 0
-    base_url = 'https://sir-2002.gujrera.com/'
+    documents = load_documents()
+    collection_files = get_collection_files()
+    try:
+        data_files = build_constituency_data(assemblies, documents, collection_files, asset_manifest)
+    except ImportError as e:
+        print(f"⚠ Skipping constituency data ({e})")
+        data_files = {}
+    document_total = sum(json.loads(content)['facets']['total'] for _, content in data_files.values())
+    print(f"✓ Joined {document_total} documents to {len(data_files)} constituencies")
     
-    for assembly in assemblies:
-        try:
-            # Generate page content
-            page_content = generate_page(template, assembly, assemblies, base_url)
-            
-            # Write to file
-            output_file = f"{assembly['slug']}.html"
-            with open(output_file, 'w', encoding='utf-8') as f:
-                f.write(page_content)
-            
-            generated_count += 1
-            if generated_count % 20 == 0:
-                print(f"  Generated {generated_count} pages...")
-                
-        except Exception as e:
-            print(f"  ✗ Error generating {assembly['slug']}.html: {e}")
-            failed_count += 1
+    # Generate pages; a template change re-renders everything, so spread it
+    # across a worker pool
+    template_changed = not manifest or manifest.get('inputs', {}).get('template') != inputs['template']
+    workers = max(1, args.workers) if template_changed else 1
+    # Recorded hashes only carry over when the output options are the same as last time
+    same_options = (manifest or {}).get('inputs', {}).get('options') == options
+    previous_pages = (manifest or {}).get('pages', {}) if same_options else {}
     
-    # Summary
-    print("\n[4/4] Generation complete!")
-    print("=" * 60)
-    print(f"Total assemblies: {len(assemblies)}")
-    print(f"Successfully generated: {generated_count}")
-    if failed_count > 0:
-        print(f"Failed: {failed_count}")
-    print("=" * 60)
-    print("\nTo regenerate pages with updates:")
-    print("  1. Update anand.html (template) if needed")
-    print("  2. Update assembly_constituencies.json if needed")
-    print("  3. Run: python generate_assembly_pages.py")
+    print(f"\n[3/4] Generating pages ({workers} worker{'s' if workers != 1 else ''})...")
+    start_time = time.perf_counter()
+    results = build_pages(template, assemblies, '.', base_url, previous_pages, workers,
+                          minify=options['minify'], source_pages={os.path.basename(template_path)},
+                          data_files={slug: path for slug, (path, _) in data_files.items()})
+    
+    # Taluko and gaam landing pages
+    try:
+        from generate_location_pages import build_location_pages
+        location_results = build_location_pages(documents, collection_files, '.', base_url,
+                                                previous_pages, asset_urls, asset_manifest.placeholders())
+    except ImportError as e:
+        print(f"⚠ Skipping taluko and gaam pages ({e})")
+        location_results = []
+    elapsed_time = time.perf_counter() - start_time
+    
+    now = datetime.now(timezone.utc).isoformat(timespec='seconds')
+    known_lastmods = load_sitemap_lastmods('.', base_url)
+    pages, written_count, failed_count = collect_page_entries(results + location_results, previous_pages,
+                                                              known_lastmods, now)
+    
+    previous_assets = (manifest or {}).get('assets', {})
+    assets = write_constituency_data(data_files)
+    assets.update(update_static_pages(asset_urls, previous_assets, known_lastmods, now, options['minify']))
+    
+    # Sitemaps, with lastmod taken from each page's recorded update time
+    sitemap_pages = dict(pages)
+    sitemap_pages.update((filename, assets[filename]) for filename in STATIC_PAGES if filename in assets)
+    assets.update(build_sitemaps(sitemap_pages, '.', base_url, previous_assets))
+    remove_stale_assets(previous_assets, assets)
+    
+    # Record inputs as they are after the build (the template may be one of
+    # the generated pages) so an unchanged rebuild short-circuits
+    if failed_count == 0:
+        save_build_manifest({
+            'version': 1,
+            'inputs': get_build_inputs(template_path, assemblies_path, base_url, options),
+            'pages': pages,
+            'assets': assets,
+        }, args.build_manifest)
+    
+    print_build_summary(assemblies, location_results, pages, assets, written_count, failed_count,
+                        data_files, asset_urls, elapsed_time, args.report)
 
 
 if __name__ == '__main__':
     main()
-
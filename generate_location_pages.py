@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+"""
+Taluko and Gaam Landing Page Generator
+
+Writes one static page per taluko and per gaam from the aggregated OCR data
+(extracted_data.json). Each page lists the matching documents with
+lazy-loaded thumbnails and PDF links, so it works without any JavaScript
+filtering and can be served straight from the CDN.
+
+Output layout:
+    talukos/index.html                  all talukos
+    talukos/<taluko>.html               gaams and documents of one taluko
+    talukos/<taluko>/<gaam>.html        documents of one gaam
+
+Slugs keep the Gujarati names (browsers show them as-is and encode them on
+the wire). Pages are rendered with plain string formatting and written only
+when their bytes change, so regenerating thousands of pages after a small
+data change rewrites only the affected ones. Stylesheet and thumbnail
+references point at the hashed copies in asset-manifest.json when given,
+and each thumbnail's placeholder colour and preview are inlined as the
+card background so the grid is not blank while images lazy-load.
+
+The pages are built by generate_assembly_pages.py, which records them in
+its build manifest:
+    python generate_assembly_pages.py
+"""
+
+import os
+import re
+import html
+import unicodedata
+from urllib.parse import quote
+
+from asset_manifest import rewrite_asset_references
+from generate_assembly_pages import (
+    BASE_URL,
+    PageResult,
+    write_if_changed
+)
+
+
+LOCATION_DIR = 'talukos'
+
+# Thumbnail size written by extract_pdf_thumbnails.py, used so the browser
+# can reserve space for lazy-loaded images
+THUMBNAIL_WIDTH = 1058
+THUMBNAIL_HEIGHT = 393
+
+# Thumbnails above the fold are loaded eagerly
+EAGER_THUMBNAILS = 2
+
+SLUG_UNSAFE_PATTERN = re.compile(r'[\s/\\?#%&"\'<>.]+')
+
+
+def location_slug(name):
+    """
+    Build a URL and filename safe slug from a taluko or gaam name.
+
+    Args:
+        name: Gujarati (or any) name, e.g. "સાબરમતી ગામ"
+
+    Returns:
+        Slug with separators replaced by hyphens, e.g. "સાબરમતી-ગામ"
+    """
+    slug = SLUG_UNSAFE_PATTERN.sub('-', unicodedata.normalize('NFC', name.strip()))
+    return slug.strip('-') or 'unknown'
+
+
+def _unique_slug(name, used):
+    """Return the slug for name, suffixed with -2, -3, ... if it is already taken."""
+    base = location_slug(name)
+    slug = base
+    counter = 2
+    while slug in used:
+        slug = f"{base}-{counter}"
+        counter += 1
+    used.add(slug)
+    return slug
+
+
+def group_documents(documents, collection_files, placeholders=None):
+    """
+    Group documents by taluko and gaam.
+
+    Args:
+        documents: extracted_data.json mapping of document ID to taluko and gaam
+        collection_files: Output of generate_assembly_pages.get_collection_files()
+        placeholders: {thumbnail path: placeholder} from AssetManifest.placeholders()
+
+    Returns:
+        List of taluko dictionaries in Gujarati order:
+        [{name, slug, count, gaams: [{name, slug, documents: [{id, thumbnail, placeholder, pdf}]}]}]
+        Documents without both a taluko and a gaam are left out.
+    """
+    # The OCR module needs Pillow and pytesseract, so only import it when
+    # there is document data to group
+    from gujarati_ocr_json_extractor import get_collection_id, gujarati_sort_key
+
+    files = {
+        collection: (set(entry['thumbnails']), set(entry['pdfs']))
+        for collection, entry in collection_files.items()
+    }
+    placeholders = placeholders or {}
+
+    tree = {}
+    for doc_id, entry in documents.items():
+        taluko = unicodedata.normalize('NFC', ((entry or {}).get('taluko') or '').strip())
+        gaam = unicodedata.normalize('NFC', ((entry or {}).get('gaam') or '').strip())
+        if not taluko or not gaam:
+            continue
+        tree.setdefault(taluko, {}).setdefault(gaam, []).append(doc_id)
+
+    talukos = []
+    # talukos/index.html lists the talukos, so no taluko may take its name
+    taluko_slugs = {'index'}
+    for taluko in sorted(tree, key=gujarati_sort_key):
+        gaams = []
+        gaam_slugs = set()
+        for gaam in sorted(tree[taluko], key=gujarati_sort_key):
+            entries = []
+            for doc_id in sorted(tree[taluko][gaam]):
+                collection = get_collection_id(doc_id)
+                thumbnails, pdfs = files.get(collection, (set(), set()))
+                thumbnail = f"public/address-images/{collection.lower()}/{doc_id}.jpg"
+                has_thumbnail = f"{doc_id}.jpg" in thumbnails
+                entries.append({
+                    'id': doc_id,
+                    'thumbnail': f"/{thumbnail}" if has_thumbnail else None,
+                    'placeholder': placeholders.get(thumbnail) if has_thumbnail else None,
+                    'pdf': f"/{collection}/{doc_id}.pdf" if f"{doc_id}.pdf" in pdfs else None,
+                })
+            gaams.append({'name': gaam, 'slug': _unique_slug(gaam, gaam_slugs), 'documents': entries})
+
+        talukos.append({
+            'name': taluko,
+            'slug': _unique_slug(taluko, taluko_slugs),
+            'count': sum(len(gaam['documents']) for gaam in gaams),
+            'gaams': gaams,
+        })
+    return talukos
+
+
+def _render_page(title, description, path, breadcrumb, heading, body, base_url):
+    """Wrap page content in the shared page layout."""
+    title = html.escape(title)
+    description = html.escape(description)
+    canonical = html.escape(base_url + quote(path))
+    crumbs = ' › '.join(
+        f'<a href="{html.escape(href)}">{html.escape(label)}</a>' if href else html.escape(label)
+        for label, href in breadcrumb
+    )
+
+    return (
+        '<!DOCTYPE html>\n'
+        '<html lang="gu">\n'
+        '<head>\n'
+        '<meta charset="UTF-8">\n'
+        '<meta name="viewport" content="width=device-width, initial-scale=1.0">\n'
+        f'<title>{title}</title>\n'
+        f'<meta name="description" content="{description}">\n'
+        f'<meta property="og:title" content="{title}">\n'
+        f'<meta property="og:description" content="{description}">\n'
+        f'<meta property="og:url" content="{canonical}">\n'
+        f'<link rel="canonical" href="{canonical}">\n'
+        '<link rel="stylesheet" href="/styles.css">\n'
+        '</head>\n'
+        '<body>\n'
+        '<header class="header">\n'
+        '<div class="header-content">\n'
+        f'<h1>{html.escape(heading)}</h1>\n'
+        f'<p class="collection-description">{description}</p>\n'
+        '</div>\n'
+        '</header>\n'
+        f'<nav class="location-breadcrumb" aria-label="Breadcrumb">{crumbs}</nav>\n'
+        f'<main class="main-content">\n{body}</main>\n'
+        '<footer class="footer">\n'
+        '<div class="footer-content">\n'
+        '<p>Browse historical electoral records from Gujarat\'s 2002 voter list organized by taluko and gaam.</p>\n'
+        '</div>\n'
+        '</footer>\n'
+        '</body>\n'
+        '</html>\n'
+    )
+
+
+def render_document_cards(documents):
+    """Render the document grid with lazy-loaded thumbnails."""
+    cards = []
+    for index, document in enumerate(documents):
+        doc_id = html.escape(document['id'])
+        image = ''
+        if document['thumbnail']:
+            loading = 'eager' if index < EAGER_THUMBNAILS else 'lazy'
+            style = ''
+            if document.get('placeholder'):
+                placeholder = document['placeholder']
+                style = (f' style="background:{html.escape(placeholder["color"])} '
+                         f'url({html.escape(placeholder["preview"])}) center/cover no-repeat"')
+            image = (f'<div class="image-wrapper"{style}><img src="{html.escape(document["thumbnail"])}" '
+                     f'alt="{doc_id}" width="{THUMBNAIL_WIDTH}" height="{THUMBNAIL_HEIGHT}" '
+                     f'loading="{loading}" decoding="async"></div>')
+        link = ''
+        if document['pdf']:
+            link = (f'<a class="pdf-link-button" href="{html.escape(document["pdf"])}" '
+                    f'target="_blank" rel="noopener">📄 Open PDF</a>')
+        cards.append(f'<article class="image-card">{image}<div class="card-metadata">'
+                     f'<div class="card-filename">{doc_id}</div>{link}</div></article>\n')
+    return f'<section class="gallery-grid">\n{"".join(cards)}</section>\n'
+
+
+def render_location_links(items):
+    """Render a list of (label, count, href) links."""
+    links = ''.join(
+        f'<a class="assembly-link" href="{html.escape(href)}">{html.escape(label)} ({count})</a>\n'
+        for label, count, href in items
+    )
+    return f'<div class="assembly-nav-grid location-links">\n{links}</div>\n'
+
+
+def render_index_page(talukos, base_url=BASE_URL):
+    """Render talukos/index.html."""
+    body = render_location_links(
+        (taluko['name'], taluko['count'], quote(f"{taluko['slug']}.html")) for taluko in talukos
+    )
+    return _render_page(
+        'Talukos - 2002 Voter List Gujarat',
+        'Browse 2002 voter list gujarat electoral records by taluko and gaam.',
+        f'{LOCATION_DIR}/index.html',
+        [('Home', '/'), ('Talukos', None)],
+        'Talukos - 2002 Voter List Gujarat',
+        body,
+        base_url
+    )
+
+
+def render_taluko_page(taluko, base_url=BASE_URL):
+    """Render talukos/<taluko>.html: its gaams and all its documents."""
+    name = taluko['name']
+    body = render_location_links(
+        (gaam['name'], len(gaam['documents']), quote(f"{taluko['slug']}/{gaam['slug']}.html"))
+        for gaam in taluko['gaams']
+    )
+    body += render_document_cards(
+        [document for gaam in taluko['gaams'] for document in gaam['documents']]
+    )
+    return _render_page(
+        f'{name} Taluko - 2002 Voter List Gujarat',
+        f'2002 voter list gujarat records for {name} taluko: {taluko["count"]} documents '
+        f'in {len(taluko["gaams"])} gaams.',
+        f'{LOCATION_DIR}/{taluko["slug"]}.html',
+        [('Home', '/'), ('Talukos', 'index.html'), (name, None)],
+        f'{name} - 2002 Voter List Gujarat',
+        body,
+        base_url
+    )
+
+
+def render_gaam_page(taluko, gaam, base_url=BASE_URL):
+    """Render talukos/<taluko>/<gaam>.html: the documents of one gaam."""
+    name = gaam['name']
+    count = len(gaam['documents'])
+    return _render_page(
+        f'{name}, {taluko["name"]} - 2002 Voter List Gujarat',
+        f'2002 voter list gujarat records for {name} gaam in {taluko["name"]} taluko: '
+        f'{count} document{"s" if count != 1 else ""}.',
+        f'{LOCATION_DIR}/{taluko["slug"]}/{gaam["slug"]}.html',
+        [('Home', '/'), ('Talukos', '../index.html'),
+         (taluko['name'], quote(f"../{taluko['slug']}.html")), (name, None)],
+        f'{name}, {taluko["name"]} - 2002 Voter List Gujarat',
+        render_document_cards(gaam['documents']),
+        base_url
+    )
+
+
+def render_location_pages(talukos, base_url=BASE_URL):
+    """
+    Render every landing page.
+
+    Args:
+        talukos: Output of group_documents()
+        base_url: Site base URL
+
+    Yields:
+        tuple: (relative filename, HTML)
+    """
+    yield f'{LOCATION_DIR}/index.html', render_index_page(talukos, base_url)
+    for taluko in talukos:
+        yield f'{LOCATION_DIR}/{taluko["slug"]}.html', render_taluko_page(taluko, base_url)
+        for gaam in taluko['gaams']:
+            yield (f'{LOCATION_DIR}/{taluko["slug"]}/{gaam["slug"]}.html',
+                   render_gaam_page(taluko, gaam, base_url))
+
+
+def build_location_pages(documents, collection_files, output_dir='.', base_url=BASE_URL,
+                         previous_pages=None, asset_urls=None, placeholders=None):
+    """
+    Render all taluko and gaam pages, writing only those whose bytes changed.
+
+    Any other HTML file under talukos/ (e.g. the page of a renamed gaam) is
+    removed, along with directories left empty, so stale pages go away even
+    without a previous build manifest.
+
+    Args:
+        documents: extracted_data.json mapping of document ID to taluko and gaam
+        collection_files: Output of generate_assembly_pages.get_collection_files()
+        output_dir: Site root to write talukos/ into
+        base_url: Site base URL
+        previous_pages: 'pages' mapping from the previous build manifest
+        asset_urls: {logical path: hashed URL} from AssetManifest.urls() (optional)
+        placeholders: {logical path: placeholder} from AssetManifest.placeholders() (optional)
+
+    Returns:
+        List of PageResult tuples
+    """
+    previous_pages = previous_pages or {}
+    results = []
+    created_dirs = set()
+
+    for filename, page in render_location_pages(group_documents(documents, collection_files, placeholders), base_url):
+        path = os.path.join(output_dir, filename)
+        previous = previous_pages.get(filename, {})
+        try:
+            directory = os.path.dirname(path)
+            if directory not in created_dirs:
+                os.makedirs(directory, exist_ok=True)
+                created_dirs.add(directory)
+
+            content = rewrite_asset_references(page, asset_urls).encode('utf-8')
+            content_hash, written = write_if_changed(path, content, previous.get('sha256'))
+            results.append(PageResult(filename, content_hash, len(content), written, None,
+                                      len(content), len(content)))
+        except Exception as e:
+            results.append(PageResult(filename, None, 0, False, str(e), 0, 0))
+
+    remove_stale_pages(output_dir, {result.filename for result in results})
+    return results
+
+
+def remove_stale_pages(output_dir, produced):
+    """
+    Remove generated pages under talukos/ that were not produced by this build.
+
+    Args:
+        output_dir: Site root containing talukos/
+        produced: Relative filenames written (or kept) by this build
+
+    Returns:
+        List of removed relative filenames
+    """
+    removed = []
+    location_dir = os.path.join(output_dir, LOCATION_DIR)
+    for directory, _, filenames in os.walk(location_dir, topdown=False):
+        for name in filenames:
+            path = os.path.join(directory, name)
+            filename = os.path.relpath(path, output_dir).replace(os.sep, '/')
+            if name.endswith('.html') and filename not in produced:
+                os.remove(path)
+                removed.append(filename)
+        if directory != location_dir:
+            try:
+                os.rmdir(directory)
+            except OSError:
+                pass
+    return removed
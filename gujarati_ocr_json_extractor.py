@@ -7,12 +7,21 @@ and consolidates the results into a structured JSON file.
 """
 
 import os
+import re
 import json
+import time
+import hashlib
+import unicodedata
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from PIL import Image
 import pytesseract
 
+from asset_manifest import AssetManifest
+from event_log import EventLog
+from metrics import MetricsRegistry, get_registry, timed
+from ocr_backends import OCRBackend, get_default_backend
+
 
 class ImageDiscovery:
     """Discovers and enumerates image files from source directories."""
@@ -116,20 +125,23 @@ class ImageDiscovery:
 class OCRProcessor:
     """Extracts Gujarati text from images using OCR."""
     
-    def __init__(self, language: str = 'guj', error_logger: Optional['ErrorLogger'] = None):
+    def __init__(self, language: str = 'guj', error_logger: Optional['ErrorLogger'] = None,
+                 backend: Optional[OCRBackend] = None):
         """
         Initialize OCRProcessor with language configuration.
         
         Args:
             language: Tesseract language code (default: 'guj' for Gujarati)
             error_logger: ErrorLogger instance for logging errors
+            backend: OCR engine to use (default: ocr_backends.get_default_backend())
         """
         self.language = language
         self.error_logger = error_logger
+        self.backend = backend
     
     def extract_text(self, image_path: str) -> Optional[str]:
         """
-        Extract text from image using pytesseract.
+        Extract text from image using the configured OCR backend.
         
         Args:
             image_path: Full path to the image file
@@ -139,13 +151,22 @@ class OCRProcessor:
         """
         try:
             # Load image using Pillow
-            image = Image.open(image_path)
+            with timed('stage_seconds', stage='load'):
+                image = Image.open(image_path)
+                image.load()
             
-            # Configure Tesseract for Gujarati language
-            custom_config = f'--oem 3 --psm 6 -l {self.language}'
+            # Configure Tesseract: LSTM engine, single uniform block of text
+            custom_config = '--oem 3 --psm 6'
             
             # Perform OCR extraction
-            extracted_text = pytesseract.image_to_string(image, config=custom_config)
+            backend = self.backend or get_default_backend()
+            with timed('stage_seconds', stage='ocr'):
+                extracted_text = backend.extract(
+                    image,
+                    language=self.language,
+                    config=custom_config,
+                    image_name=os.path.splitext(os.path.basename(image_path))[0]
+                )
             
             # Strip whitespace and return
             return extracted_text.strip()
@@ -258,6 +279,162 @@ class DataAggregator:
         return self._data
 
 
+# Extracts the collection ID (e.g. "P064") from an image name ("P0640001")
+COLLECTION_PATTERN = re.compile(r'^([A-Za-z]+\d{3})\d+$')
+
+
+def get_collection_id(image_name: str) -> str:
+    """
+    Derive the collection ID from an image name.
+    
+    Args:
+        image_name: Base filename without extension (e.g., "P0640001")
+        
+    Returns:
+        Collection ID (e.g., "P064"), or "misc" if the name does not match
+    """
+    match = COLLECTION_PATTERN.match(image_name)
+    return match.group(1).upper() if match else 'misc'
+
+
+def gujarati_sort_key(text: Optional[str]) -> Tuple[int, ...]:
+    """
+    Build a sort key that orders Gujarati strings in dictionary order.
+    
+    Unicode code point order already matches the Gujarati varnamala for
+    vowels, consonants and vowel signs, with the exception of LLA (ળ), which
+    the alphabet places after HA (હ). Text is NFC-normalized first so that
+    composed and decomposed forms of the same word sort together.
+    
+    Args:
+        text: Gujarati text to build a key for (None sorts first)
+        
+    Returns:
+        Tuple of integer ranks suitable for use as a sort key
+    """
+    if not text:
+        return ()
+    
+    ranks = []
+    for char in unicodedata.normalize('NFC', text.strip()):
+        if char == '\u0AB3':
+            # ળ sorts immediately after હ (U+0AB9)
+            ranks.append(0x0AB9 * 2 + 1)
+        else:
+            ranks.append(ord(char) * 2)
+    return tuple(ranks)
+
+
+class FacetIndexBuilder:
+    """Builds a compact taluko -> gaam -> document ID facet index."""
+    
+    # Splits document IDs such as "P0640001" into prefix and numeric suffix
+    ID_PATTERN = re.compile(r'^(.*?)(\d+)$')
+    
+    def build(self, data: Dict, source: str = 'extracted_data.json') -> Dict:
+        """
+        Build the facet index from aggregated data.
+        
+        Talukos and gaams are listed in Gujarati collation order and each
+        gaam carries its document IDs compressed into sorted inclusive ranges,
+        so the gallery can populate dropdowns and filter without scanning
+        every document. Documents with a taluko but no gaam are counted
+        under their taluko, in its 'unassigned' bucket; the top-level
+        'unassigned' bucket holds the documents without a taluko.
+        
+        Args:
+            data: Dictionary mapping image names to their taluko and gaam data
+                  Format: {image_name: {taluko: "text", gaam: "text"}}
+            source: Name of the data file the index was built from
+            
+        Returns:
+            Dictionary with 'version', 'source', 'total', 'talukos' and
+            'unassigned' keys
+        """
+        tree = {}
+        without_gaam = {}
+        unassigned = []
+        
+        for image_name, entry in data.items():
+            taluko = (entry or {}).get('taluko')
+            gaam = (entry or {}).get('gaam')
+            taluko = taluko.strip() if taluko else ''
+            gaam = gaam.strip() if gaam else ''
+            
+            if not taluko:
+                unassigned.append(image_name)
+                continue
+            
+            gaams = tree.setdefault(taluko, {})
+            if not gaam:
+                without_gaam.setdefault(taluko, []).append(image_name)
+                continue
+            
+            gaams.setdefault(gaam, []).append(image_name)
+        
+        talukos = []
+        for taluko in sorted(tree, key=gujarati_sort_key):
+            gaams = []
+            for gaam in sorted(tree[taluko], key=gujarati_sort_key):
+                ids = tree[taluko][gaam]
+                gaams.append({
+                    'name': gaam,
+                    'count': len(ids),
+                    'ranges': self.compress_id_ranges(ids)
+                })
+            ids = without_gaam.get(taluko, [])
+            talukos.append({
+                'name': taluko,
+                'count': sum(gaam['count'] for gaam in gaams) + len(ids),
+                'gaams': gaams,
+                'unassigned': {
+                    'count': len(ids),
+                    'ranges': self.compress_id_ranges(ids)
+                }
+            })
+        
+        return {
+            'version': 1,
+            'source': source,
+            'total': len(data),
+            'talukos': talukos,
+            'unassigned': {
+                'count': len(unassigned),
+                'ranges': self.compress_id_ranges(unassigned)
+            }
+        }
+    
+    def compress_id_ranges(self, ids: List[str]) -> List[List[str]]:
+        """
+        Collapse document IDs into sorted inclusive [first, last] ranges.
+        
+        IDs are consecutive when they share a prefix and zero-padded width
+        and their numeric suffixes differ by one (e.g. P0640001..P0640005).
+        
+        Args:
+            ids: Document IDs in any order
+            
+        Returns:
+            List of [first_id, last_id] pairs
+        """
+        ranges = []
+        previous = None
+        
+        for doc_id in sorted(set(ids)):
+            match = self.ID_PATTERN.match(doc_id)
+            current = (match.group(1), len(match.group(2)), int(match.group(2))) if match else None
+            
+            if (ranges and previous is not None and current is not None
+                    and current[:2] == previous[:2] and current[2] == previous[2] + 1):
+                ranges[-1][1] = doc_id
+            else:
+                ranges.append([doc_id, doc_id])
+            
+            previous = current
+        
+        return ranges
+
+
 class JSONOutputWriter:
     """Generates and writes JSON output file."""
     
@@ -270,7 +447,7 @@ class JSONOutputWriter:
         """
         self.error_logger = error_logger
     
-    def write_json(self, data: Dict, output_path: str) -> bool:
+    def write_json(self, data: Dict, output_path: str, compact: bool = False) -> bool:
         """
         Write aggregated data to JSON file.
         
@@ -278,6 +455,7 @@ class JSONOutputWriter:
             data: Dictionary mapping image names to their taluko and gaam data
                   Format: {image_name: {taluko: "text", gaam: "text"}}
             output_path: Full path to the output JSON file
+            compact: Write without indentation or extra whitespace
             
         Returns:
             True if file was written successfully, False otherwise
@@ -290,7 +468,10 @@ class JSONOutputWriter:
             
             # Write JSON file with proper formatting
             with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+                if compact:
+                    json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+                else:
+                    json.dump(data, f, ensure_ascii=False, indent=2)
             
             return True
             
@@ -378,16 +559,220 @@ class JSONOutputWriter:
             return False
 
 
+class ShardedJSONOutputWriter(JSONOutputWriter):
+    """Writes aggregated data as small content-hashed shards with a manifest."""
+    
+    MANIFEST_NAME = 'manifest.json'
+    
+    def __init__(self, error_logger: Optional['ErrorLogger'] = None,
+                 max_entries: int = 500, max_bytes: int = 64 * 1024,
+                 shard_by_taluko: bool = False):
+        """
+        Initialize ShardedJSONOutputWriter with shard size limits.
+        
+        Args:
+            error_logger: ErrorLogger instance for logging errors
+            max_entries: Maximum number of documents per shard file
+            max_bytes: Maximum serialized size of a shard file in bytes
+            shard_by_taluko: Split each collection further by taluko
+        """
+        super().__init__(error_logger=error_logger)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.shard_by_taluko = shard_by_taluko
+    
+    def split_entries(self, entries: List[Tuple[str, Dict]]) -> List[List[Tuple[str, Dict]]]:
+        """
+        Split entries into chunks bounded by max_entries and max_bytes.
+        
+        A single entry larger than max_bytes still gets a shard of its own.
+        
+        Args:
+            entries: Sorted list of (image_name, entry) pairs
+            
+        Returns:
+            List of chunks, each a list of (image_name, entry) pairs
+        """
+        chunks = []
+        current = []
+        current_bytes = 2  # enclosing braces
+        
+        for image_name, entry in entries:
+            entry_bytes = len(json.dumps({image_name: entry}, ensure_ascii=False,
+                                         separators=(',', ':')).encode('utf-8')) - 1
+            
+            if current and (len(current) >= self.max_entries
+                            or current_bytes + entry_bytes > self.max_bytes):
+                chunks.append(current)
+                current = []
+                current_bytes = 2
+            
+            current.append((image_name, entry))
+            current_bytes += entry_bytes
+        
+        if current:
+            chunks.append(current)
+        
+        return chunks
+    
+    def write_shards(self, data: Dict, output_dir: str) -> Optional[Dict]:
+        """
+        Write aggregated data as content-hashed shard files plus a manifest.
+        
+        Shards are named "<collection>[-t<NN>]-<part>.<hash>.json" so they can
+        be cached indefinitely; the root manifest.json maps collections (and
+        talukos when enabled) to their shard files. Shards referenced by a
+        previous manifest but no longer needed are removed.
+        
+        Args:
+            data: Dictionary mapping image names to their taluko and gaam data
+                  Format: {image_name: {taluko: "text", gaam: "text"}}
+            output_dir: Directory to write shard files and manifest into
+            
+        Returns:
+            The manifest dictionary, or None if writing failed
+        """
+        if not self.validate_output_directory(output_dir):
+            return None
+        
+        # Group entries by collection (and taluko)
+        groups = {}
+        for image_name in sorted(data):
+            entry = data[image_name]
+            collection_id = get_collection_id(image_name)
+            taluko = ((entry or {}).get('taluko') or '').strip() if self.shard_by_taluko else None
+            groups.setdefault(collection_id, {}).setdefault(taluko, []).append((image_name, entry))
+        
+        manifest = {
+            'version': 1,
+            'max_entries': self.max_entries,
+            'max_bytes': self.max_bytes,
+            'collections': {}
+        }
+        written_files = set()
+        
+        for collection_id in sorted(groups):
+            collection = {'count': 0}
+            talukos = groups[collection_id]
+            
+            for taluko_number, taluko in enumerate(sorted(talukos, key=gujarati_sort_key)):
+                if self.shard_by_taluko:
+                    prefix = f"{collection_id}-t{taluko_number:02d}"
+                else:
+                    prefix = collection_id
+                
+                shards = []
+                for part, chunk in enumerate(self.split_entries(talukos[taluko])):
+                    shard_info = self._write_shard(dict(chunk), output_dir, f"{prefix}-{part:03d}")
+                    if shard_info is None:
+                        return None
+                    written_files.add(shard_info['file'])
+                    shards.append(shard_info)
+                
+                count = len(talukos[taluko])
+                collection['count'] += count
+                
+                if not self.shard_by_taluko:
+                    collection['shards'] = shards
+                elif taluko:
+                    collection.setdefault('talukos', {})[taluko] = {'count': count, 'shards': shards}
+                else:
+                    collection['unassigned'] = {'count': count, 'shards': shards}
+            
+            manifest['collections'][collection_id] = collection
+        
+        manifest_path = os.path.join(output_dir, self.MANIFEST_NAME)
+        stale_files = self._get_manifest_files(manifest_path) - written_files
+        
+        if not self.write_json(manifest, manifest_path):
+            return None
+        
+        for filename in stale_files:
+            try:
+                os.remove(os.path.join(output_dir, filename))
+            except OSError:
+                pass
+        
+        return manifest
+    
+    def _write_shard(self, chunk: Dict, output_dir: str, prefix: str) -> Optional[Dict]:
+        """Serialize one shard, name it by content hash and write it."""
+        payload = json.dumps(chunk, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        digest = hashlib.sha256(payload).hexdigest()[:12]
+        filename = f"{prefix}.{digest}.json"
+        shard_path = os.path.join(output_dir, filename)
+        
+        # Identical content already on disk under the same name
+        if not os.path.exists(shard_path):
+            try:
+                with open(shard_path, 'wb') as f:
+                    f.write(payload)
+            except OSError as e:
+                if self.error_logger:
+                    self.error_logger.log_error(
+                        'N/A',
+                        'output',
+                        f"OS error writing shard {shard_path}: {str(e)}"
+                    )
+                return None
+        
+        image_names = list(chunk)
+        return {
+            'file': filename,
+            'count': len(image_names),
+            'bytes': len(payload),
+            'first': image_names[0],
+            'last': image_names[-1]
+        }
+    
+    def _get_manifest_files(self, manifest_path: str) -> set:
+        """Return the shard filenames referenced by an existing manifest."""
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return set()
+        
+        files = set()
+        for collection in manifest.get('collections', {}).values():
+            groups = [collection] + list(collection.get('talukos', {}).values())
+            if 'unassigned' in collection:
+                groups.append(collection['unassigned'])
+            for group in groups:
+                for shard in group.get('shards', []):
+                    files.add(shard['file'])
+        return files
+
+
+# Errors kept in memory by an ErrorLogger; the counts and the event log cover the rest
+MAX_RETAINED_ERRORS = 500
+
+
 class ErrorLogger:
     """Captures and reports processing errors."""
     
-    def __init__(self):
-        """Initialize the error logger."""
+    def __init__(self, event_log: Optional[EventLog] = None,
+                 max_retained_errors: Optional[int] = MAX_RETAINED_ERRORS):
+        """
+        Initialize the error logger.
+        
+        Args:
+            event_log: EventLog to send structured records to. When set, errors
+                       are written there (with a rate-limited console summary)
+                       instead of being printed one by one.
+            max_retained_errors: Maximum number of errors kept in memory for
+                                 get_summary() (default MAX_RETAINED_ERRORS;
+                                 None keeps all of them). Every error is still
+                                 counted and sent to the event log.
+        """
         self.errors = []
-        self.success_count = 0
-        self.failure_count = 0
+        # Counts of this logger; also recorded in the default metrics registry
+        self.metrics = MetricsRegistry(parent=get_registry())
+        self.event_log = event_log
+        self.max_retained_errors = max_retained_errors
     
-    def log_error(self, image_name: str, error_type: str, message: str) -> None:
+    def log_error(self, image_name: str, error_type: str, message: str,
+                  duration: Optional[float] = None) -> None:
         """
         Record an error with context.
         
@@ -395,21 +780,48 @@ class ErrorLogger:
             image_name: Name of the image being processed (or "N/A" for system errors)
             error_type: Category of error (e.g., "file_system", "ocr", "output")
             message: Detailed error message
+            duration: Seconds spent before the error occurred (optional)
         """
         error_entry = {
             'image_name': image_name,
             'error_type': error_type,
             'message': message
         }
-        self.errors.append(error_entry)
-        self.failure_count += 1
+        if self.max_retained_errors is None or len(self.errors) < self.max_retained_errors:
+            self.errors.append(error_entry)
+        self.metrics.inc('ocr_results_total', outcome='failed')
+        self.metrics.inc('errors_total', error_type=error_type)
         
-        # Print error to console for immediate visibility
-        print(f"ERROR [{error_type}] {image_name}: {message}")
+        if self.event_log is not None:
+            self.event_log.error(image_name, error_type, error_type, message, duration=duration)
+        else:
+            # Print error to console for immediate visibility
+            print(f"ERROR [{error_type}] {image_name}: {message}")
     
-    def log_success(self) -> None:
-        """Increment the success counter."""
-        self.success_count += 1
+    def log_success(self, image_name: str = 'N/A', stage: str = 'ocr',
+                    duration: Optional[float] = None) -> None:
+        """
+        Increment the success counter.
+        
+        Args:
+            image_name: Name of the image that was processed
+            stage: Pipeline stage that succeeded
+            duration: Seconds spent on the image (optional)
+        """
+        self.metrics.inc('ocr_results_total', outcome='success')
+        
+        if self.event_log is not None:
+            self.event_log.success(image_name, stage, duration=duration)
+    
+    @property
+    def success_count(self) -> int:
+        """Number of successes logged."""
+        return int(self.metrics.value('ocr_results_total', outcome='success'))
+    
+    @property
+    def failure_count(self) -> int:
+        """Number of errors logged."""
+        return int(self.metrics.value('ocr_results_total', outcome='failed'))
     
     def get_summary(self) -> Dict:
         """
@@ -426,69 +838,24 @@ class ErrorLogger:
         }
 
 
-def main():
-    """Main execution flow for the OCR extraction system."""
-    print("Gujarati OCR JSON Extractor")
-    print("=" * 50)
-    
-    # Initialize error logger
-    error_logger = ErrorLogger()
-    
-    # Initialize components
-    image_discovery = ImageDiscovery(error_logger=error_logger)
-    ocr_processor = OCRProcessor(language='guj', error_logger=error_logger)
-    data_aggregator = DataAggregator()
-    json_writer = JSONOutputWriter(error_logger=error_logger)
-    
-    # Define input directories and output file
-    taluko_dir = 'public-taluko'
-    gaam_dir = 'public-gaam'
-    output_file = 'extracted_data.json'
-    
-    print(f"\nDiscovering images in {taluko_dir}/...")
-    taluko_images = image_discovery.discover_images(taluko_dir)
-    print(f"Found {len(taluko_images)} taluko images")
-    
-    print(f"\nDiscovering images in {gaam_dir}/...")
-    gaam_images = image_discovery.discover_images(gaam_dir)
-    print(f"Found {len(gaam_images)} gaam images")
-    
-    # Process taluko images
-    print(f"\nProcessing taluko images...")
-    for image_path in taluko_images:
-        image_name = image_discovery.get_image_name(image_path)
-        print(f"  Processing {image_name}...", end=' ')
-        
-        extracted_text = ocr_processor.extract_text(image_path)
-        
-        if extracted_text is not None:
-            data_aggregator.add_taluko_entry(image_name, extracted_text)
-            error_logger.log_success()
-            print("[OK]")
-        else:
-            print("[FAIL]")
-    
-    # Process gaam images
-    print(f"\nProcessing gaam images...")
-    for image_path in gaam_images:
-        image_name = image_discovery.get_image_name(image_path)
-        print(f"  Processing {image_name}...", end=' ')
+def write_outputs(aggregated_data: Dict, output_file: str = 'extracted_data.json',
+                  facets_file: str = 'extracted_data.facets.json', shards_dir: str = 'data',
+                  error_logger: Optional[ErrorLogger] = None) -> bool:
+    """
+    Write the aggregated data, its facet index and per-collection shards,
+    and publish content-hashed copies of the data files.
+    
+    Args:
+        aggregated_data: Output of DataAggregator.get_aggregated_data()
+        output_file: Path of the aggregated JSON file
+        facets_file: Path of the taluko -> gaam facet index
+        shards_dir: Directory for the per-collection shards
+        error_logger: ErrorLogger instance for logging errors
         
-        extracted_text = ocr_processor.extract_text(image_path)
-        
-        if extracted_text is not None:
-            data_aggregator.add_gaam_entry(image_name, extracted_text)
-            error_logger.log_success()
-            print("[OK]")
-        else:
-            print("[FAIL]")
-    
-    # Get aggregated data
-    aggregated_data = data_aggregator.get_aggregated_data()
-    
-    print(f"\n" + "=" * 50)
-    print(f"Processing complete!")
-    print(f"Total entries aggregated: {len(aggregated_data)}")
+    Returns:
+        True if the aggregated JSON file was written
+    """
+    json_writer = JSONOutputWriter(error_logger=error_logger)
     
     # Generate final JSON output file
     print(f"\nGenerating JSON output file: {output_file}...")
@@ -499,18 +866,112 @@ def main():
     else:
         print(f"[ERROR] Failed to create JSON file: {output_file}")
     
-    # Display processing summary
-    summary = error_logger.get_summary()
-    print(f"\n" + "=" * 50)
-    print(f"Processing Summary:")
-    print(f"  Total images processed: {summary['total_processed']}")
-    print(f"  Successful extractions: {summary['successful']}")
-    print(f"  Failed extractions: {summary['failed']}")
-    print(f"  Data entries created: {len(aggregated_data)}")
+    # Generate taluko -> gaam facet index alongside the data file
+    print(f"\nGenerating facet index: {facets_file}...")
+    facet_index = FacetIndexBuilder().build(aggregated_data, source=output_file)
+    if json_writer.write_json(facet_index, facets_file, compact=True):
+        print(f"[SUCCESS] Facet index created: {len(facet_index['talukos'])} talukos")
+    else:
+        print(f"[ERROR] Failed to create facet index: {facets_file}")
+    
+    # Generate per-collection shards for pages that need only one slice
+    print(f"\nGenerating data shards in {shards_dir}/...")
+    sharded_writer = ShardedJSONOutputWriter(error_logger=error_logger)
+    manifest = sharded_writer.write_shards(aggregated_data, shards_dir)
+    if manifest is not None:
+        print(f"[SUCCESS] Shards written for {len(manifest['collections'])} collections")
+    else:
+        print(f"[ERROR] Failed to write data shards: {shards_dir}")
+    
+    # Publish content-hashed copies of the data files for immutable caching
+    asset_manifest = AssetManifest()
+    for data_file in (output_file, facets_file):
+        if os.path.exists(data_file):
+            print(f"Published {data_file} as {asset_manifest.publish(data_file)}")
+    asset_manifest.save()
+    
+    return write_success
+
+
+def main():
+    """Main execution flow for the OCR extraction system."""
+    print("Gujarati OCR JSON Extractor")
+    print("=" * 50)
+    
+    # Initialize structured event log and error logger
+    events_file = 'ocr_events.jsonl'
+    event_log = EventLog(events_file)
+    error_logger = ErrorLogger(event_log=event_log)
+    
+    try:
+        # Initialize components
+        image_discovery = ImageDiscovery(error_logger=error_logger)
+        ocr_processor = OCRProcessor(language='guj', error_logger=error_logger)
+        data_aggregator = DataAggregator()
+        
+        # Define input directories and output file
+        taluko_dir = 'public-taluko'
+        gaam_dir = 'public-gaam'
+        output_file = 'extracted_data.json'
+        facets_file = 'extracted_data.facets.json'
+        shards_dir = 'data'
+        
+        print(f"\nDiscovering images in {taluko_dir}/...")
+        taluko_images = image_discovery.discover_images(taluko_dir)
+        print(f"Found {len(taluko_images)} taluko images")
+        
+        print(f"\nDiscovering images in {gaam_dir}/...")
+        gaam_images = image_discovery.discover_images(gaam_dir)
+        print(f"Found {len(gaam_images)} gaam images")
+        
+        # Process taluko images
+        print(f"\nProcessing taluko images...")
+        for image_path in taluko_images:
+            image_name = image_discovery.get_image_name(image_path)
+            start_time = time.perf_counter()
+            
+            extracted_text = ocr_processor.extract_text(image_path)
+            
+            if extracted_text is not None:
+                data_aggregator.add_taluko_entry(image_name, extracted_text)
+                error_logger.log_success(image_name, 'ocr_taluko', time.perf_counter() - start_time)
+        
+        # Process gaam images
+        print(f"\nProcessing gaam images...")
+        for image_path in gaam_images:
+            image_name = image_discovery.get_image_name(image_path)
+            start_time = time.perf_counter()
+            
+            extracted_text = ocr_processor.extract_text(image_path)
+            
+            if extracted_text is not None:
+                data_aggregator.add_gaam_entry(image_name, extracted_text)
+                error_logger.log_success(image_name, 'ocr_gaam', time.perf_counter() - start_time)
+        
+        # Get aggregated data
+        aggregated_data = data_aggregator.get_aggregated_data()
+        
+        print(f"\n" + "=" * 50)
+        print(f"Processing complete!")
+        print(f"Total entries aggregated: {len(aggregated_data)}")
+        
+        write_success = write_outputs(aggregated_data, output_file, facets_file, shards_dir, error_logger)
+        
+        # Display processing summary
+        summary = error_logger.get_summary()
+        print(f"\n" + "=" * 50)
+        print(f"Processing Summary:")
+        print(f"  Total images processed: {summary['total_processed']}")
+        print(f"  Successful extractions: {summary['successful']}")
+        print(f"  Failed extractions: {summary['failed']}")
+        print(f"  Data entries created: {len(aggregated_data)}")
+    finally:
+        event_log.close()
+    print(f"  Event log: {events_file}")
     
     if summary['failed'] > 0:
         print(f"\n[WARNING] Errors encountered: {summary['failed']}")
-        print("Review the error messages above for details.")
+        print(f"Review {events_file} for details.")
     
     if write_success and len(aggregated_data) > 0:
         print(f"\n[SUCCESS] Extraction complete! Check {output_file} for results.")
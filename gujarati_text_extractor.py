@@ -35,11 +35,16 @@ except ImportError as e:
     print("Please run: pip install -r requirements.txt")
     sys.exit(1)
 
+from event_log import EventLog
+from metrics import MetricsRegistry, get_registry, timed
+from ocr_backends import OCRBackend, get_default_backend
+
 
 # ============================================================================
 # Image Processing Module
 # ============================================================================
 
+@timed('stage_seconds', stage='load')
 def load_image(image_path: str) -> Optional[Image.Image]:
     """
     Load an image file using PIL.
@@ -153,7 +158,8 @@ def enhance_sharpness(image: Image.Image, factor: float = 1.2) -> Image.Image:
         raise Exception(f"Failed to enhance sharpness: {str(e)}")
 
 
-def reduce_noise_opencv(image: Image.Image) -> Image.Image:
+def reduce_noise_opencv(image: Image.Image, diameter: int = 9, sigma_color: float = 75,
+                        sigma_space: float = 75) -> Image.Image:
     """
     Apply noise reduction using OpenCV bilateral filtering.
     
@@ -162,6 +168,9 @@ def reduce_noise_opencv(image: Image.Image) -> Image.Image:
     
     Args:
         image: PIL Image object (should be grayscale)
+        diameter: Pixel neighbourhood diameter of the filter
+        sigma_color: How different intensities may be and still be mixed
+        sigma_space: How far apart pixels may be and still be mixed
         
     Returns:
         Noise-reduced PIL Image object
@@ -172,7 +181,7 @@ def reduce_noise_opencv(image: Image.Image) -> Image.Image:
         
         # Apply bilateral filter for noise reduction
         # Parameters: image, diameter, sigma_color, sigma_space
-        denoised = cv2.bilateralFilter(image_array, 9, 75, 75)
+        denoised = cv2.bilateralFilter(image_array, diameter, sigma_color, sigma_space)
         
         # Convert back to PIL Image
         result_image = Image.fromarray(denoised)
@@ -181,18 +190,26 @@ def reduce_noise_opencv(image: Image.Image) -> Image.Image:
         raise Exception(f"Failed to reduce noise: {str(e)}")
 
 
-def preprocess_image(image: Image.Image) -> Image.Image:
+@timed('stage_seconds', stage='preprocess')
+def preprocess_image(image: Image.Image, contrast: float = 1.5, brightness: float = 1.1,
+                     sharpness: float = 1.2, denoise: Optional[Tuple[int, float, float]] = None) -> Image.Image:
     """
     Apply preprocessing techniques to improve OCR accuracy.
     
     Preprocessing includes:
     - Conversion to grayscale
+    - Noise reduction (only when denoise is given)
     - Contrast enhancement
     - Brightness enhancement
     - Sharpness enhancement
     
     Args:
         image: PIL Image object
+        contrast: Contrast enhancement factor
+        brightness: Brightness enhancement factor
+        sharpness: Sharpness enhancement factor
+        denoise: (diameter, sigma_color, sigma_space) of a bilateral filter
+                 applied first, or None to skip it
         
     Returns:
         Preprocessed PIL Image object
@@ -201,14 +218,17 @@ def preprocess_image(image: Image.Image) -> Image.Image:
         # Convert to grayscale
         image = convert_to_grayscale(image)
         
+        if denoise is not None:
+            image = reduce_noise_opencv(image, *denoise)
+        
         # Enhance contrast
-        image = enhance_contrast(image, factor=1.5)
+        image = enhance_contrast(image, factor=contrast)
         
         # Enhance brightness
-        image = enhance_brightness(image, factor=1.1)
+        image = enhance_brightness(image, factor=brightness)
         
         # Enhance sharpness
-        image = enhance_sharpness(image, factor=1.2)
+        image = enhance_sharpness(image, factor=sharpness)
         
         return image
     except Exception as e:
@@ -251,13 +271,18 @@ def get_image_files(source_dir: str) -> List[str]:
 # OCR Engine Module
 # ============================================================================
 
-def extract_text_from_image(image: Image.Image, language: str = 'guj') -> str:
+@timed('stage_seconds', stage='ocr')
+def extract_text_from_image(image: Image.Image, language: str = 'guj',
+                            backend: Optional[OCRBackend] = None,
+                            image_name: Optional[str] = None) -> str:
     """
     Extract Gujarati text from image using Tesseract OCR.
     
     Args:
         image: PIL Image object
         language: Language code for OCR (default: 'guj' for Gujarati)
+        backend: OCR engine to use (default: ocr_backends.get_default_backend())
+        image_name: Base name of the source image (used by fixture backends)
         
     Returns:
         Extracted text string
@@ -266,7 +291,8 @@ def extract_text_from_image(image: Image.Image, language: str = 'guj') -> str:
         Exception: If OCR processing fails (Tesseract not installed, language data missing, etc.)
     """
     try:
-        text = pytesseract.image_to_string(image, lang=language)
+        text = (backend or get_default_backend()).extract(image, language=language,
+                                                          image_name=image_name)
         return text
     except pytesseract.TesseractNotFoundError:
         raise Exception(
@@ -290,25 +316,24 @@ def extract_text_from_image(image: Image.Image, language: str = 'guj') -> str:
             raise Exception(f"OCR extraction failed: {str(e)}")
 
 
-def get_confidence_score(image: Image.Image, language: str = 'guj') -> float:
+def get_confidence_score(image: Image.Image, language: str = 'guj',
+                         backend: Optional[OCRBackend] = None,
+                         image_name: Optional[str] = None) -> float:
     """
     Extract confidence score from OCR result.
     
     Args:
         image: PIL Image object
         language: Language code for OCR
+        backend: OCR engine to use (default: ocr_backends.get_default_backend())
+        image_name: Base name of the source image (used by fixture backends)
         
     Returns:
         Confidence score (0-100). Returns 0.0 if no text detected or confidence cannot be determined.
     """
     try:
-        data = pytesseract.image_to_data(image, lang=language, output_type=pytesseract.Output.DICT)
-        confidences = [int(conf) for conf in data['confidence'] if int(conf) > 0]
-        
-        if confidences:
-            avg_confidence = sum(confidences) / len(confidences)
-            return avg_confidence
-        return 0.0
+        return (backend or get_default_backend()).confidence(image, language=language,
+                                                             image_name=image_name)
     except pytesseract.TesseractNotFoundError:
         raise Exception(
             "Tesseract OCR is not installed or not found in system PATH. "
@@ -370,6 +395,7 @@ def ensure_output_directory(output_path: str) -> None:
         raise Exception(f"Failed to create output directory {output_path}: {str(e)}")
 
 
+@timed('stage_seconds', stage='write')
 def save_extracted_text(text: str, output_path: str) -> None:
     """
     Write extracted text to output file.
@@ -397,13 +423,15 @@ def save_extracted_text(text: str, output_path: str) -> None:
 # Batch Processing Module
 # ============================================================================
 
-def process_single_image(image_path: str, output_path: str) -> Dict:
+def process_single_image(image_path: str, output_path: str,
+                         backend: Optional[OCRBackend] = None) -> Dict:
     """
     Extract text from a single image and save to output file.
     
     Args:
         image_path: Path to input image
         output_path: Path to output text file
+        backend: OCR engine to use (default: ocr_backends.get_default_backend())
         
     Returns:
         Dictionary with processing result
@@ -428,10 +456,11 @@ def process_single_image(image_path: str, output_path: str) -> Dict:
         preprocessed_image = preprocess_image(image)
         
         # Extract text
-        text = extract_text_from_image(preprocessed_image)
+        image_name = Path(image_path).stem
+        text = extract_text_from_image(preprocessed_image, backend=backend, image_name=image_name)
         
         # Get confidence score
-        confidence = get_confidence_score(preprocessed_image)
+        confidence = get_confidence_score(preprocessed_image, backend=backend, image_name=image_name)
         
         # Save extracted text
         save_extracted_text(text, output_path)
@@ -490,17 +519,25 @@ def process_image_for_testing(image_path: str, output_dir: str = 'output') -> Di
     return result
 
 
-def process_image_directory(source_dir: str, output_dir: str = 'output') -> Dict:
+def process_image_directory(source_dir: str, output_dir: str = 'output',
+                            event_log: Optional[EventLog] = None,
+                            backend: Optional[OCRBackend] = None) -> Dict:
     """
     Batch process all images in source directory.
     
     Args:
         source_dir: Path to source directory containing images
         output_dir: Path to output directory for text files
+        event_log: Optional EventLog receiving one structured record per image.
+                   When set, per-image console lines are replaced by the
+                   event log's rate-limited summary.
+        backend: OCR engine to use (default: ocr_backends.get_default_backend())
         
     Returns:
         Dictionary with processing summary
     """
+    # Counters for this run; also recorded in the default metrics registry
+    metrics = MetricsRegistry(parent=get_registry())
     results = {
         'success': 0,
         'failed': 0,
@@ -527,35 +564,51 @@ def process_image_directory(source_dir: str, output_dir: str = 'output') -> Dict
         # Process each image
         for idx, image_path in enumerate(image_files, 1):
             # Log progress
-            log_progress(idx, len(image_files), os.path.basename(image_path))
+            if event_log is None:
+                log_progress(idx, len(image_files), os.path.basename(image_path))
             
             # Generate output filename
             base_name = Path(image_path).stem
             output_path = os.path.join(output_dir, f"{base_name}.txt")
             
             # Process image
-            result = process_single_image(image_path, output_path)
+            image_start = time.perf_counter()
+            result = process_single_image(image_path, output_path, backend=backend)
+            duration = time.perf_counter() - image_start
             
             if result['success']:
-                results['success'] += 1
+                metrics.inc('documents_total', stage='ocr', outcome='success')
+                if event_log is not None:
+                    event_log.success(result['filename'], 'ocr', duration=duration)
             else:
-                results['failed'] += 1
+                metrics.inc('documents_total', stage='ocr', outcome='failed')
                 error_info = {
                     'filename': result['filename'],
                     'error': result['error']
                 }
                 results['errors'].append(error_info)
-                log_error(result['filename'], result['error'])
+                if event_log is not None:
+                    event_log.error(result['filename'], 'ocr', 'processing', result['error'],
+                                    duration=duration)
+                else:
+                    log_error(result['filename'], result['error'])
     
     except Exception as e:
-        log_error("batch_processing", str(e))
+        if event_log is not None:
+            event_log.error('batch_processing', 'batch', 'batch_processing', str(e))
+        else:
+            log_error("batch_processing", str(e))
         results['errors'].append({
             'filename': 'batch_processing',
             'error': str(e)
         })
     
     finally:
+        results['success'] = int(metrics.value('documents_total', stage='ocr', outcome='success'))
+        results['failed'] = int(metrics.value('documents_total', stage='ocr', outcome='failed'))
         results['elapsed_time'] = time.time() - start_time
+        if event_log is not None:
+            event_log.flush()
     
     return results
 
@@ -647,19 +700,26 @@ def main_test_single_image(image_path: Optional[str] = None, output_dir: str = '
         print(f"Error during single image testing: {str(e)}")
 
 
-def main_process_directory(source_dir: str = 'P064', output_dir: str = 'output') -> None:
+def main_process_directory(source_dir: str = 'P064', output_dir: str = 'output',
+                           event_log_path: Optional[str] = None) -> None:
     """
     Batch process all images in directory.
     
     Args:
         source_dir: Source directory containing images
         output_dir: Output directory for text files
+        event_log_path: JSONL file for structured per-image events (optional)
     """
     try:
         print(f"Starting batch processing from: {source_dir}")
         print(f"Output directory: {output_dir}\n")
         
-        results = process_image_directory(source_dir, output_dir)
+        if event_log_path:
+            with EventLog(event_log_path) as event_log:
+                results = process_image_directory(source_dir, output_dir, event_log=event_log)
+            print(f"Event log: {event_log_path}")
+        else:
+            results = process_image_directory(source_dir, output_dir)
         generate_summary_report(results)
         
     except Exception as e:
@@ -672,6 +732,7 @@ def main() -> None:
     
     Supports command-line arguments:
         python gujarati_text_extractor.py [--test] [--source SOURCE_DIR] [--output OUTPUT_DIR]
+                                          [--event-log EVENTS.jsonl]
     """
     import argparse
     
@@ -697,13 +758,17 @@ def main() -> None:
         '--image',
         help='Specific image file to process (for testing)'
     )
+    parser.add_argument(
+        '--event-log',
+        help='Write structured per-image events to this JSONL file instead of printing each one'
+    )
     
     args = parser.parse_args()
     
     if args.test:
         main_test_single_image(args.image, args.output)
     else:
-        main_process_directory(args.source, args.output)
+        main_process_directory(args.source, args.output, args.event_log)
 
 
 if __name__ == '__main__':
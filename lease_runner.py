@@ -0,0 +1,387 @@
+#!/usr/bin/env python3
+"""
+Lease-Based Work Distribution over a Shared Filesystem
+
+Lets workers on several hosts share one run through a directory on a
+shared filesystem (e.g. NFS), without a message broker. A run is planned
+once into batches; each worker then repeatedly claims a batch by creating
+its lease file with O_CREAT | O_EXCL (atomic on local filesystems and on
+NFSv3+), renews the lease from a heartbeat thread while it works, and
+commits the result as a per-worker shard plus an exclusive "done" marker.
+A lease that is not renewed within its TTL (the worker died or hung) is
+reclaimed by the next worker that finds it. The shards are merged at the
+end.
+
+Layout of the work directory:
+    batches/000001.json          batch items, written by plan()
+    leases/000001.lease          {"worker", "host", "pid", "acquired", "expires"}
+    shards/<worker>/000001.json  batch results of one worker
+    done/000001.json             {"worker", "shard", "completed"}; exactly one per batch
+
+Commits are idempotent: if a slow worker and the worker that reclaimed its
+lease both finish a batch, only the first done marker counts. Lease expiry
+compares wall-clock times written by different hosts, so the hosts' clocks
+should be kept in sync (NTP); the TTL should be well above any skew.
+
+Usage:
+    from lease_runner import LeaseQueue, run_worker
+
+    queue = LeaseQueue('/mnt/shared/run-1')
+    queue.plan(items, batch_size=25)           # once, on any host
+    run_worker(queue, process_batch)           # on every host
+    results = queue.merge()                    # once, when status()['done'] == total
+"""
+
+import os
+import json
+import time
+import uuid
+import socket
+import threading
+from typing import Callable, Dict, List, Optional
+
+
+LEASE_TTL = 60.0
+
+
+def _write_json_atomic(path: str, data) -> None:
+    """Write JSON to a temporary file and rename it into place."""
+    temp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(temp_path, path)
+
+
+def _read_json(path: str):
+    """Read a JSON file, returning None if it is missing or not complete yet."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+class LeaseQueue:
+    """Batches of work claimed through lease files in a shared directory."""
+
+    def __init__(self, work_dir: str, worker_id: Optional[str] = None, lease_ttl: float = LEASE_TTL):
+        """
+        Open a work directory.
+
+        Args:
+            work_dir: Shared directory of the run (created if missing)
+            worker_id: Unique name of this worker (default: host-pid-random)
+            lease_ttl: Seconds a lease stays valid without renewal
+        """
+        self.work_dir = work_dir
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self.lease_ttl = lease_ttl
+        self.reclaimed = 0
+        for name in ('batches', 'leases', 'shards', 'done'):
+            os.makedirs(os.path.join(work_dir, name), exist_ok=True)
+
+    def plan(self, items: List, batch_size: int) -> int:
+        """
+        Split items into batch files.
+
+        Planning is idempotent: batches that already exist are left alone,
+        so every host can run it (or it can be re-run) safely.
+
+        Args:
+            items: JSON-serializable work items, in processing order
+            batch_size: Items per batch
+
+        Returns:
+            Number of batches in the run
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        count = 0
+        for count, start in enumerate(range(0, len(items), batch_size), start=1):
+            path = self._path('batches', f"{count:06d}.json")
+            if not os.path.exists(path):
+                _write_json_atomic(path, items[start:start + batch_size])
+        return count
+
+    def batch_ids(self) -> List[str]:
+        """Return the IDs of all planned batches."""
+        return sorted(name[:-5] for name in os.listdir(self._path('batches')) if name.endswith('.json'))
+
+    def load_batch(self, batch_id: str) -> List:
+        """Return the items of a batch."""
+        return _read_json(self._path('batches', f"{batch_id}.json"))
+
+    def is_done(self, batch_id: str) -> bool:
+        """Return True if the batch has been committed."""
+        return os.path.exists(self._path('done', f"{batch_id}.json"))
+
+    def claim(self, skip: Optional[set] = None) -> Optional[str]:
+        """
+        Lease the first batch that is neither done nor validly leased.
+
+        Args:
+            skip: Batch IDs not to claim (e.g. ones that failed on this worker)
+
+        Returns:
+            The claimed batch ID, or None if no batch is available right now
+        """
+        for batch_id in self.batch_ids():
+            if (skip and batch_id in skip) or self.is_done(batch_id):
+                continue
+            if self._acquire(batch_id):
+                return batch_id
+        return None
+
+    def renew(self, batch_id: str) -> bool:
+        """
+        Extend this worker's lease on a batch.
+
+        Returns:
+            False if the lease was lost (reclaimed by another worker)
+        """
+        lease = self._read_lease(batch_id)
+        if lease is None or lease.get('worker') != self.worker_id:
+            return False
+        _write_json_atomic(self._lease_path(batch_id), self._lease_record(lease['acquired']))
+        return True
+
+    def release(self, batch_id: str) -> None:
+        """Give up this worker's lease on a batch, if it still holds it."""
+        lease = self._read_lease(batch_id)
+        if lease is not None and lease.get('worker') == self.worker_id:
+            try:
+                os.remove(self._lease_path(batch_id))
+            except FileNotFoundError:
+                pass
+
+    def complete(self, batch_id: str, results) -> bool:
+        """
+        Commit a batch: write this worker's shard, then the done marker.
+
+        Args:
+            batch_id: Batch processed by this worker
+            results: JSON-serializable batch results
+
+        Returns:
+            True if this worker's result was committed, False if another
+            worker had already committed the batch
+        """
+        shard_dir = self._path('shards', self.worker_id)
+        os.makedirs(shard_dir, exist_ok=True)
+        shard_path = os.path.join(shard_dir, f"{batch_id}.json")
+        _write_json_atomic(shard_path, results)
+
+        marker = {'worker': self.worker_id, 'shard': os.path.relpath(shard_path, self.work_dir),
+                  'completed': time.time()}
+        try:
+            fd = os.open(self._path('done', f"{batch_id}.json"), os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+        except FileExistsError:
+            os.remove(shard_path)
+            self.release(batch_id)
+            return False
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(marker, f)
+        self.release(batch_id)
+        return True
+
+    def status(self) -> Dict[str, int]:
+        """
+        Count batches by state.
+
+        Returns:
+            {'total', 'done', 'leased', 'expired', 'pending'}
+        """
+        counts = {'total': 0, 'done': 0, 'leased': 0, 'expired': 0, 'pending': 0}
+        now = time.time()
+        for batch_id in self.batch_ids():
+            counts['total'] += 1
+            if self.is_done(batch_id):
+                counts['done'] += 1
+            elif not os.path.exists(self._lease_path(batch_id)):
+                counts['pending'] += 1
+            elif self._is_expired(batch_id, now):
+                counts['expired'] += 1
+            else:
+                counts['leased'] += 1
+        return counts
+
+    def merge(self) -> List:
+        """
+        Collect the committed results of every batch, in batch order.
+
+        Returns:
+            List of batch results; batches that are not done are left out
+        """
+        results = []
+        for batch_id in self.batch_ids():
+            marker = _read_json(self._path('done', f"{batch_id}.json"))
+            if marker is not None:
+                results.append(_read_json(os.path.join(self.work_dir, marker['shard'])))
+        return results
+
+    def _acquire(self, batch_id: str) -> bool:
+        """Create the lease file exclusively, reclaiming it first if it has expired."""
+        path = self._lease_path(batch_id)
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+        except FileExistsError:
+            if not self._is_expired(batch_id, time.time()) or not self._reclaim(batch_id):
+                return False
+            try:
+                fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+            except FileExistsError:
+                return False
+            self.reclaimed += 1
+
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(self._lease_record(time.time()), f)
+        # The batch may have been committed between the done check and the lease
+        if self.is_done(batch_id):
+            self.release(batch_id)
+            return False
+        return True
+
+    def _reclaim(self, batch_id: str) -> bool:
+        """
+        Move an expired lease out of the way.
+
+        Renaming is atomic, so only one of several workers reclaiming the
+        same lease succeeds. If the owner renewed the lease in the meantime,
+        it is put back.
+        """
+        path = self._lease_path(batch_id)
+        stale_path = f"{path}.{self.worker_id}.stale"
+        try:
+            os.rename(path, stale_path)
+        except FileNotFoundError:
+            return False
+
+        lease = _read_json(stale_path)
+        if lease is not None and lease.get('expires', 0) > time.time():
+            try:
+                os.link(stale_path, path)
+            except FileExistsError:
+                pass
+            os.remove(stale_path)
+            return False
+        os.remove(stale_path)
+        return True
+
+    def _is_expired(self, batch_id: str, now: float) -> bool:
+        """Return True if a lease is past its expiry (or unreadable and older than the TTL)."""
+        lease = self._read_lease(batch_id)
+        if lease is not None:
+            return lease.get('expires', 0) < now
+        # Being written right now, or left half-written by a crash
+        try:
+            return os.path.getmtime(self._lease_path(batch_id)) + self.lease_ttl < now
+        except FileNotFoundError:
+            return False
+
+    def _lease_record(self, acquired: float) -> Dict:
+        """Build the lease content for this worker."""
+        now = time.time()
+        return {'worker': self.worker_id, 'host': socket.gethostname(), 'pid': os.getpid(),
+                'acquired': acquired, 'expires': now + self.lease_ttl}
+
+    def _read_lease(self, batch_id: str) -> Optional[Dict]:
+        """Read a lease file."""
+        return _read_json(self._lease_path(batch_id))
+
+    def _lease_path(self, batch_id: str) -> str:
+        """Return the lease file path of a batch."""
+        return self._path('leases', f"{batch_id}.lease")
+
+    def _path(self, *parts: str) -> str:
+        """Return a path inside the work directory."""
+        return os.path.join(self.work_dir, *parts)
+
+
+class Heartbeat:
+    """Renews a lease from a background thread while a batch is processed."""
+
+    def __init__(self, queue: LeaseQueue, batch_id: str, interval: Optional[float] = None):
+        """
+        Initialize the heartbeat.
+
+        Args:
+            queue: Queue holding the lease
+            batch_id: Leased batch
+            interval: Seconds between renewals (default: a third of the TTL)
+        """
+        self.queue = queue
+        self.batch_id = batch_id
+        self.interval = interval if interval is not None else queue.lease_ttl / 3
+        self.lost = False
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self) -> None:
+        """Renew until stopped or the lease is lost."""
+        while not self._stop.wait(self.interval):
+            if not self.queue.renew(self.batch_id):
+                self.lost = True
+                return
+
+    def __enter__(self) -> 'Heartbeat':
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self._stop.set()
+        self._thread.join()
+
+
+def run_worker(queue: LeaseQueue, process_batch: Callable, poll_interval: float = 2.0,
+               max_batches: Optional[int] = None) -> Dict:
+    """
+    Claim and process batches until the whole run is done.
+
+    While other workers hold the remaining batches, the worker waits and
+    polls, so it can take over their batches if their leases expire.
+
+    Args:
+        queue: LeaseQueue of the run
+        process_batch: Called with a batch's items; returns its JSON-serializable result
+        poll_interval: Seconds to wait when every open batch is leased
+        max_batches: Stop after processing this many batches
+
+    Returns:
+        dict: Summary with 'worker', 'batches', 'items', 'failed', 'lost',
+              'reclaimed' and 'elapsed_time' keys
+    """
+    start_time = time.time()
+    summary = {'worker': queue.worker_id, 'batches': 0, 'items': 0, 'failed': [], 'lost': 0}
+    failed = set()
+
+    while max_batches is None or summary['batches'] < max_batches:
+        batch_id = queue.claim(skip=failed)
+        if batch_id is None:
+            open_batches = [b for b in queue.batch_ids() if b not in failed and not queue.is_done(b)]
+            if not open_batches:
+                break
+            time.sleep(poll_interval)
+            continue
+
+        items = queue.load_batch(batch_id)
+        with Heartbeat(queue, batch_id) as heartbeat:
+            try:
+                results = process_batch(items)
+            except Exception as e:
+                # Leave the batch to other workers
+                print(f"ERROR [batch] {batch_id}: {e}")
+                failed.add(batch_id)
+                queue.release(batch_id)
+                continue
+
+        # A lost lease still commits: the done marker decides which result counts
+        if heartbeat.lost:
+            summary['lost'] += 1
+        if queue.complete(batch_id, results):
+            summary['batches'] += 1
+            summary['items'] += len(items)
+
+    summary['failed'] = sorted(failed)
+    summary['reclaimed'] = queue.reclaimed
+    summary['elapsed_time'] = time.time() - start_time
+    return summary
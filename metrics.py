@@ -0,0 +1,431 @@
+#!/usr/bin/env python3
+"""
+Metrics Registry
+
+One place for the counters, gauges and timing histograms of every stage
+(load, render, crop, preprocess, OCR, encode, write), instead of each
+script keeping its own success/failed counts and printing its own
+timings. At the end of a run the registry is dumped as JSON (for the
+benchmark tooling and ad-hoc analysis) and in the Prometheus text format
+(for a node_exporter textfile collector or a push gateway).
+
+Timings go into fixed-bucket histograms, so memory does not grow with the
+number of images and p50/p95/p99 are estimated from the buckets the same
+way Prometheus' histogram_quantile() does.
+
+A registry can have a parent: everything recorded in it is also recorded
+in the parent. Functions that report their own counts (e.g.
+process_pdf_directory) record them in a registry of their own whose parent
+is the process-wide default, so their summary only covers their own run
+while the default registry sees every run.
+
+Registries live in one process; worker processes record in their own
+default registry, which the parent can merge() from to_dict() output.
+
+Usage:
+    from metrics import get_registry, timed
+
+    @timed('stage_seconds', stage='ocr')
+    def extract(image): ...
+
+    registry = get_registry()
+    with registry.time('stage_seconds', stage='encode'):
+        content = encode_jpeg(image)
+    registry.inc('documents_total', stage='render', outcome='success')
+    registry.set('queue_depth', 3, stage='ocr')
+
+    registry.print_summary()
+    registry.write('.cache/metrics')      # metrics.json and metrics.prom
+"""
+
+import os
+import re
+import json
+import time
+import bisect
+import functools
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+# Upper bounds in seconds, from a cached crop (~1 ms) to a slow OCR call
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Prefix of the metric names in the Prometheus output
+PROMETHEUS_PREFIX = 'sirgujarat_'
+
+METRICS_DIR = '.cache/metrics'
+
+# HELP lines for the metrics the pipeline records
+DESCRIPTIONS = {
+    'stage_seconds': 'Time spent in one step of processing an item',
+    'pipeline_stage_seconds': 'Time a pipeline stage spent on one item, including cache lookups',
+    'pipeline_items_total': 'Items processed by a pipeline stage, by outcome',
+    'pipeline_queue_peak': 'Most items waiting in a pipeline stage queue during the last run',
+    'documents_total': 'PDFs and images processed, by stage and outcome',
+    'ocr_results_total': 'OCR results recorded by the error logger, by outcome',
+    'errors_total': 'Errors recorded by the error logger, by error type',
+}
+
+
+def _labels_key(labels: Dict) -> Tuple:
+    """Return a hashable, ordered form of a label set."""
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _quantile(bounds: Sequence[float], counts: List[int], state: Dict, q: float) -> float:
+    """Estimate a quantile from bucket counts by linear interpolation within the bucket."""
+    if not state['count']:
+        return 0.0
+    rank = q * state['count']
+    cumulative = 0
+    for index, count in enumerate(counts):
+        if count and cumulative + count >= rank:
+            if index == len(bounds):
+                # Overflow bucket: no upper bound to interpolate to
+                return state['max']
+            lower = bounds[index - 1] if index else 0.0
+            estimate = lower + (bounds[index] - lower) * (rank - cumulative) / count
+            return min(max(estimate, state['min']), state['max'])
+        cumulative += count
+    return state['max']
+
+
+class _Timer:
+    """Times a block or every call of a function into a histogram."""
+
+    def __init__(self, registry: Optional['MetricsRegistry'], name: str, labels: Dict):
+        self.registry = registry
+        self.name = name
+        self.labels = labels
+        self._starts = threading.local()
+
+    def _observe(self, seconds: float) -> None:
+        (self.registry or get_registry()).observe(self.name, seconds, **self.labels)
+
+    def __enter__(self):
+        starts = getattr(self._starts, 'stack', None)
+        if starts is None:
+            starts = self._starts.stack = []
+        starts.append(time.perf_counter())
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._observe(time.perf_counter() - self._starts.stack.pop())
+        return False
+
+    def __call__(self, func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self._observe(time.perf_counter() - start)
+        return wrapper
+
+
+class MetricsRegistry:
+    """Thread-safe counters, gauges and timing histograms with labels."""
+
+    def __init__(self, parent: Optional['MetricsRegistry'] = None, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        """
+        Initialize an empty registry.
+
+        Args:
+            parent: Registry that also receives everything recorded here
+            buckets: Histogram upper bounds in seconds, ascending
+        """
+        if list(buckets) != sorted(buckets) or not buckets:
+            raise ValueError("buckets must be a non-empty ascending sequence")
+        self.parent = parent
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._kinds = {}
+        self._counters = {}
+        self._gauges = {}
+        self._histograms = {}
+
+    def _check_kind(self, name: str, kind: str) -> None:
+        """Reject recording a metric as a different kind than before (called with the lock held)."""
+        known = self._kinds.setdefault(name, kind)
+        if known != kind:
+            raise ValueError(f"Metric '{name}' is a {known}, not a {kind}")
+
+    def inc(self, name: str, amount: float = 1, **labels) -> None:
+        """
+        Increase a counter.
+
+        Args:
+            name: Metric name, e.g. 'documents_total'
+            amount: Non-negative increment
+            **labels: Label values, e.g. stage='render', outcome='success'
+        """
+        if amount < 0:
+            raise ValueError(f"Counter '{name}' cannot decrease")
+        key = _labels_key(labels)
+        with self._lock:
+            self._check_kind(name, 'counter')
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + amount
+        if self.parent is not None:
+            self.parent.inc(name, amount, **labels)
+
+    def set(self, name: str, value: float, **labels) -> None:
+        """Set a gauge to a value."""
+        key = _labels_key(labels)
+        with self._lock:
+            self._check_kind(name, 'gauge')
+            self._gauges.setdefault(name, {})[key] = value
+        if self.parent is not None:
+            self.parent.set(name, value, **labels)
+
+    def observe(self, name: str, seconds: float, **labels) -> None:
+        """
+        Record a duration in a histogram.
+
+        Args:
+            name: Metric name, e.g. 'stage_seconds'
+            seconds: Measured duration
+            **labels: Label values, e.g. stage='ocr'
+        """
+        key = _labels_key(labels)
+        with self._lock:
+            self._check_kind(name, 'histogram')
+            series = self._histograms.setdefault(name, {})
+            state = series.get(key)
+            if state is None:
+                state = series[key] = {'counts': [0] * (len(self.buckets) + 1), 'sum': 0.0, 'count': 0,
+                                       'min': seconds, 'max': seconds}
+            state['counts'][bisect.bisect_left(self.buckets, seconds)] += 1
+            state['sum'] += seconds
+            state['count'] += 1
+            state['min'] = min(state['min'], seconds)
+            state['max'] = max(state['max'], seconds)
+        if self.parent is not None:
+            self.parent.observe(name, seconds, **labels)
+
+    def time(self, name: str, **labels) -> _Timer:
+        """
+        Time a block or a function into a histogram.
+
+        Usable as a context manager (with registry.time('stage_seconds', stage='ocr'): ...)
+        or a decorator (@registry.time('stage_seconds', stage='ocr')).
+        """
+        return _Timer(self, name, labels)
+
+    def value(self, name: str, **labels) -> float:
+        """Return a counter or gauge value (0 if nothing was recorded with these labels)."""
+        key = _labels_key(labels)
+        with self._lock:
+            series = self._counters.get(name) or self._gauges.get(name) or {}
+            return series.get(key, 0)
+
+    def total(self, name: str, **labels) -> float:
+        """Return the sum of a counter over every series matching the given labels."""
+        wanted = set(_labels_key(labels))
+        with self._lock:
+            return sum(value for key, value in self._counters.get(name, {}).items() if wanted <= set(key))
+
+    def merge(self, data: Dict) -> None:
+        """
+        Add the metrics of another registry, e.g. one from a worker process.
+
+        Args:
+            data: Output of to_dict(); histograms must use the same buckets
+        """
+        for name, series in data.get('counters', {}).items():
+            for entry in series:
+                self.inc(name, entry['value'], **entry['labels'])
+        for name, series in data.get('gauges', {}).items():
+            for entry in series:
+                self.set(name, entry['value'], **entry['labels'])
+        for name, series in data.get('histograms', {}).items():
+            for entry in series:
+                if entry['buckets'] and [bound for bound, _ in entry['buckets'][:-1]] != list(self.buckets):
+                    raise ValueError(f"Histogram '{name}' uses different buckets")
+                self._merge_histogram(name, entry)
+
+    def _merge_histogram(self, name: str, entry: Dict) -> None:
+        """Add one serialized histogram series."""
+        if not entry['count']:
+            return
+        cumulative = [count for _, count in entry['buckets']]
+        counts = [count - previous for count, previous in zip(cumulative, [0] + cumulative[:-1])]
+        key = _labels_key(entry['labels'])
+        with self._lock:
+            self._check_kind(name, 'histogram')
+            series = self._histograms.setdefault(name, {})
+            state = series.get(key)
+            if state is None:
+                state = series[key] = {'counts': [0] * (len(self.buckets) + 1), 'sum': 0.0, 'count': 0,
+                                       'min': entry['min'], 'max': entry['max']}
+            state['counts'] = [a + b for a, b in zip(state['counts'], counts)]
+            state['sum'] += entry['sum']
+            state['count'] += entry['count']
+            state['min'] = min(state['min'], entry['min'])
+            state['max'] = max(state['max'], entry['max'])
+        if self.parent is not None:
+            self.parent._merge_histogram(name, entry)
+
+    def to_dict(self) -> Dict:
+        """
+        Return a JSON-serializable snapshot.
+
+        Returns:
+            dict: {'counters': {name: [{'labels', 'value'}]}, 'gauges': (same),
+                   'histograms': {name: [{'labels', 'count', 'sum', 'min', 'max',
+                   'mean', 'p50', 'p95', 'p99', 'buckets'}]}}, where buckets is a
+                   list of [upper bound, cumulative count] ending with ['+Inf', count]
+                   and durations are in seconds
+        """
+        with self._lock:
+            snapshot = {
+                'counters': {name: [{'labels': dict(key), 'value': value} for key, value in sorted(series.items())]
+                             for name, series in sorted(self._counters.items())},
+                'gauges': {name: [{'labels': dict(key), 'value': value} for key, value in sorted(series.items())]
+                           for name, series in sorted(self._gauges.items())},
+                'histograms': {},
+            }
+            for name, series in sorted(self._histograms.items()):
+                entries = snapshot['histograms'][name] = []
+                for key, state in sorted(series.items()):
+                    cumulative, buckets = 0, []
+                    for bound, count in zip(list(self.buckets) + ['+Inf'], state['counts']):
+                        cumulative += count
+                        buckets.append([bound, cumulative])
+                    entries.append({
+                        'labels': dict(key),
+                        'count': state['count'],
+                        'sum': state['sum'],
+                        'min': state['min'],
+                        'max': state['max'],
+                        'mean': state['sum'] / state['count'],
+                        **{f"p{q}": _quantile(self.buckets, state['counts'], state, q / 100) for q in (50, 95, 99)},
+                        'buckets': buckets,
+                    })
+        return snapshot
+
+    def to_prometheus(self, prefix: str = PROMETHEUS_PREFIX) -> str:
+        """Return the metrics in the Prometheus text exposition format."""
+        snapshot = self.to_dict()
+        lines = []
+
+        def header(name, kind):
+            metric = _metric_name(prefix + name)
+            if name in DESCRIPTIONS:
+                lines.append(f"# HELP {metric} {DESCRIPTIONS[name]}")
+            lines.append(f"# TYPE {metric} {kind}")
+            return metric
+
+        for kind, section in (('counter', 'counters'), ('gauge', 'gauges')):
+            for name, series in snapshot[section].items():
+                metric = header(name, kind)
+                for entry in series:
+                    lines.append(f"{metric}{_format_labels(entry['labels'])} {_format_value(entry['value'])}")
+
+        for name, series in snapshot['histograms'].items():
+            metric = header(name, 'histogram')
+            for entry in series:
+                for bound, count in entry['buckets']:
+                    le = bound if bound == '+Inf' else _format_value(bound)
+                    lines.append(f"{metric}_bucket{_format_labels(dict(entry['labels'], le=le))} {count}")
+                labels = _format_labels(entry['labels'])
+                lines.append(f"{metric}_sum{labels} {_format_value(entry['sum'])}")
+                lines.append(f"{metric}_count{labels} {entry['count']}")
+        return '\n'.join(lines) + '\n' if lines else ''
+
+    def write(self, directory: str = METRICS_DIR) -> Tuple[str, str]:
+        """
+        Dump the registry as metrics.json and metrics.prom.
+
+        Args:
+            directory: Output directory (created if missing)
+
+        Returns:
+            (JSON path, Prometheus text path)
+        """
+        os.makedirs(directory, exist_ok=True)
+        json_path = os.path.join(directory, 'metrics.json')
+        prom_path = os.path.join(directory, 'metrics.prom')
+        for path, content in ((json_path, json.dumps(self.to_dict(), indent=2) + '\n'),
+                              (prom_path, self.to_prometheus())):
+            # Atomic, so a textfile collector never reads half a file
+            temp_path = f"{path}.{os.getpid()}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                f.write(content)
+            os.replace(temp_path, path)
+        return json_path, prom_path
+
+    def print_summary(self) -> None:
+        """Print the timing histograms (in milliseconds) and the counters."""
+        snapshot = self.to_dict()
+        if snapshot['histograms']:
+            print(f"{'timing':<44}{'count':>8}{'mean':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}")
+            print("-" * 97)
+            for name, series in snapshot['histograms'].items():
+                for entry in series:
+                    label = f"{name}{_format_labels(entry['labels'])}"
+                    stats = ''.join(f"{1000 * entry[key]:>9.1f}" for key in ('mean', 'p50', 'p95', 'p99', 'max'))
+                    print(f"{label:<44}{entry['count']:>8}{stats}")
+            print("-" * 97)
+            print("Milliseconds; percentiles estimated from histogram buckets")
+        for section in ('counters', 'gauges'):
+            for name, series in snapshot[section].items():
+                for entry in series:
+                    print(f"{name}{_format_labels(entry['labels'])} {_format_value(entry['value'])}")
+
+
+def _metric_name(name: str) -> str:
+    """Replace characters Prometheus does not allow in metric names."""
+    return re.sub(r'[^a-zA-Z0-9_:]', '_', name)
+
+
+def _format_labels(labels: Dict) -> str:
+    """Format a label set as {name="value",...}, escaping the values."""
+    if not labels:
+        return ''
+    pairs = []
+    for name, value in labels.items():
+        value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        pairs.append(f'{_metric_name(name)}="{value}"')
+    return '{' + ','.join(pairs) + '}'
+
+
+def _format_value(value: float) -> str:
+    """Format a sample value, without a trailing .0 for whole numbers."""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+_default_registry = None
+
+
+def get_registry() -> MetricsRegistry:
+    """Return the process-wide default registry."""
+    global _default_registry
+    if _default_registry is None:
+        _default_registry = MetricsRegistry()
+    return _default_registry
+
+
+def set_registry(registry: Optional[MetricsRegistry]) -> None:
+    """
+    Replace the process-wide default registry.
+
+    Args:
+        registry: Registry to use, or None to start over with an empty one
+    """
+    global _default_registry
+    _default_registry = registry
+
+
+def timed(name: str, **labels) -> _Timer:
+    """
+    Time a block or a function into a histogram of the default registry.
+
+    The registry is looked up when the time is recorded, so functions
+    decorated at import time report to the registry set by set_registry().
+    """
+    return _Timer(None, name, labels)
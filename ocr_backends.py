@@ -0,0 +1,338 @@
+"""
+OCR Backends
+
+Pluggable OCR engines used by OCRProcessor and extract_text_from_image.
+
+Backends:
+- PytesseractBackend: runs the Tesseract CLI through pytesseract (default)
+- TesserocrBackend: keeps a Tesseract engine loaded in-process via tesserocr
+  (optional dependency; avoids spawning a process and reloading the
+  traineddata for every image)
+- FakeOCRBackend: returns canned text from a fixture map such as
+  extracted_data.json, so the rest of the pipeline can be tested and
+  profiled without the Tesseract binary
+
+Every backend exposes extract() for one image and extract_many() for a batch.
+
+Usage:
+    from ocr_backends import FakeOCRBackend, set_default_backend
+
+    set_default_backend(FakeOCRBackend.from_extracted_data('extracted_data.json', 'gaam'))
+"""
+
+import os
+import re
+import json
+import time
+import threading
+from typing import Dict, Iterable, List, Optional, Union
+
+from PIL import Image
+
+try:
+    import pytesseract
+except ImportError:
+    pytesseract = None
+
+try:
+    import tesserocr
+except ImportError:
+    tesserocr = None
+
+
+ImageInput = Union[str, Image.Image]
+
+
+def get_image_name(image: ImageInput, image_name: Optional[str] = None) -> Optional[str]:
+    """
+    Work out the base image name (e.g. "P0640001") for an OCR input.
+
+    Args:
+        image: Image path or PIL Image
+        image_name: Explicit name, used as-is when given
+
+    Returns:
+        Base filename without extension, or None if it cannot be determined
+    """
+    if image_name:
+        return image_name
+
+    path = image if isinstance(image, str) else getattr(image, 'filename', None)
+    if not path:
+        return None
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+class OCRBackend:
+    """Base class for OCR engines."""
+
+    name = 'base'
+
+    def extract(self, image: ImageInput, language: str = 'guj', config: str = '',
+                image_name: Optional[str] = None) -> str:
+        """
+        Extract text from a single image.
+
+        Args:
+            image: Image path or PIL Image
+            language: Tesseract language code (default: 'guj' for Gujarati)
+            config: Extra Tesseract options (e.g. '--oem 3 --psm 6')
+            image_name: Base image name, used by backends that key on it
+
+        Returns:
+            Extracted text
+        """
+        raise NotImplementedError
+
+    def extract_many(self, images: Iterable[ImageInput], language: str = 'guj',
+                     config: str = '', image_names: Optional[List[str]] = None) -> List[str]:
+        """
+        Extract text from a batch of images.
+
+        Args:
+            images: Image paths or PIL Images
+            language: Tesseract language code
+            config: Extra Tesseract options
+            image_names: Optional base names, parallel to images
+
+        Returns:
+            List of extracted texts in input order
+        """
+        images = list(images)
+        names = image_names if image_names is not None else [None] * len(images)
+        return [
+            self.extract(image, language=language, config=config, image_name=name)
+            for image, name in zip(images, names)
+        ]
+
+    def confidence(self, image: ImageInput, language: str = 'guj', config: str = '',
+                   image_name: Optional[str] = None) -> float:
+        """
+        Return the mean word confidence (0-100) for an image.
+
+        Args:
+            image: Image path or PIL Image
+            language: Tesseract language code
+            config: Extra Tesseract options
+            image_name: Base image name, used by backends that key on it
+
+        Returns:
+            Confidence score, 0.0 if no text was detected
+        """
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Release any engine resources."""
+
+    def __enter__(self) -> 'OCRBackend':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+class PytesseractBackend(OCRBackend):
+    """Runs the Tesseract CLI through pytesseract, one process per image."""
+
+    name = 'pytesseract'
+
+    def __init__(self):
+        """Initialize the backend, checking that pytesseract is importable."""
+        if pytesseract is None:
+            raise ImportError("pytesseract is not installed. Please run: pip install -r requirements.txt")
+
+    def extract(self, image: ImageInput, language: str = 'guj', config: str = '',
+                image_name: Optional[str] = None) -> str:
+        """Extract text with pytesseract.image_to_string."""
+        return pytesseract.image_to_string(image, lang=language, config=config)
+
+    def confidence(self, image: ImageInput, language: str = 'guj', config: str = '',
+                   image_name: Optional[str] = None) -> float:
+        """Mean word confidence from pytesseract.image_to_data."""
+        data = pytesseract.image_to_data(image, lang=language, config=config,
+                                         output_type=pytesseract.Output.DICT)
+        confidences = [float(conf) for conf in data['conf'] if float(conf) > 0]
+        if confidences:
+            return sum(confidences) / len(confidences)
+        return 0.0
+
+
+class TesserocrBackend(OCRBackend):
+    """Keeps Tesseract loaded in-process through tesserocr."""
+
+    name = 'tesserocr'
+
+    # Parses the page segmentation mode out of a pytesseract-style config string
+    PSM_PATTERN = re.compile(r'--psm\s+(\d+)')
+
+    def __init__(self, psm: int = 6):
+        """
+        Initialize the backend.
+
+        Args:
+            psm: Default Tesseract page segmentation mode (6 = single block)
+        """
+        if tesserocr is None:
+            raise ImportError("tesserocr is not installed. Please run: pip install tesserocr")
+
+        self.psm = psm
+        self._local = threading.local()
+        self._apis = []
+        self._lock = threading.Lock()
+
+    def _get_api(self, language: str, psm: int):
+        """Return this thread's engine for the language, creating it once."""
+        apis = getattr(self._local, 'apis', None)
+        if apis is None:
+            apis = self._local.apis = {}
+
+        key = (language, psm)
+        if key not in apis:
+            api = tesserocr.PyTessBaseAPI(lang=language, psm=psm)
+            apis[key] = api
+            with self._lock:
+                self._apis.append(api)
+        return apis[key]
+
+    def _set_image(self, image: ImageInput, language: str, config: str):
+        """Load the image into the engine and return the engine."""
+        match = self.PSM_PATTERN.search(config or '')
+        psm = int(match.group(1)) if match else self.psm
+        api = self._get_api(language, psm)
+
+        if isinstance(image, str):
+            with Image.open(image) as loaded:
+                loaded.load()
+                api.SetImage(loaded)
+        else:
+            api.SetImage(image)
+        return api
+
+    def extract(self, image: ImageInput, language: str = 'guj', config: str = '',
+                image_name: Optional[str] = None) -> str:
+        """Extract text with the persistent engine."""
+        return self._set_image(image, language, config).GetUTF8Text()
+
+    def confidence(self, image: ImageInput, language: str = 'guj', config: str = '',
+                   image_name: Optional[str] = None) -> float:
+        """Mean word confidence from the persistent engine."""
+        api = self._set_image(image, language, config)
+        api.Recognize()
+        return float(max(api.MeanTextConf(), 0))
+
+    def close(self) -> None:
+        """End all engines created by this backend."""
+        with self._lock:
+            for api in self._apis:
+                api.End()
+            self._apis = []
+        self._local = threading.local()
+
+
+class FakeOCRBackend(OCRBackend):
+    """Returns canned text from a fixture map instead of running OCR."""
+
+    name = 'fake'
+
+    def __init__(self, texts: Optional[Dict[str, str]] = None, default: str = '',
+                 latency: float = 0.0, confidence_score: float = 100.0):
+        """
+        Initialize the backend.
+
+        Args:
+            texts: Mapping of image name (e.g. "P0640001") to text
+            default: Text returned for images not in the map
+            latency: Seconds to sleep per image, to simulate engine cost
+            confidence_score: Confidence reported for known images
+        """
+        self.texts = dict(texts or {})
+        self.default = default
+        self.latency = latency
+        self.confidence_score = confidence_score
+        self.calls = 0
+
+    @classmethod
+    def from_extracted_data(cls, json_path: str = 'extracted_data.json',
+                            field: str = 'gaam', **kwargs) -> 'FakeOCRBackend':
+        """
+        Build a fake backend from an extracted_data.json style file.
+
+        Args:
+            json_path: Path to the aggregated JSON data
+            field: Which field to return as OCR text ('taluko' or 'gaam')
+            **kwargs: Passed through to the constructor
+
+        Returns:
+            FakeOCRBackend returning the given field for each image
+        """
+        with open(json_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        texts = {
+            image_name: entry[field]
+            for image_name, entry in data.items()
+            if entry and entry.get(field) is not None
+        }
+        return cls(texts, **kwargs)
+
+    def extract(self, image: ImageInput, language: str = 'guj', config: str = '',
+                image_name: Optional[str] = None) -> str:
+        """Return the fixture text for the image."""
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        return self.texts.get(get_image_name(image, image_name), self.default)
+
+    def confidence(self, image: ImageInput, language: str = 'guj', config: str = '',
+                   image_name: Optional[str] = None) -> float:
+        """Return the configured confidence for known images, 0.0 otherwise."""
+        if get_image_name(image, image_name) in self.texts:
+            return self.confidence_score
+        return 0.0
+
+
+BACKENDS = {
+    PytesseractBackend.name: PytesseractBackend,
+    TesserocrBackend.name: TesserocrBackend,
+    FakeOCRBackend.name: FakeOCRBackend,
+}
+
+_default_backend = None
+
+
+def create_backend(name: str, **kwargs) -> OCRBackend:
+    """
+    Create a backend by name.
+
+    Args:
+        name: One of 'pytesseract', 'tesserocr' or 'fake'
+        **kwargs: Passed to the backend constructor
+
+    Returns:
+        OCRBackend instance
+
+    Raises:
+        ValueError: If the backend name is unknown
+    """
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown OCR backend '{name}'. Choose from: {', '.join(sorted(BACKENDS))}")
+    return BACKENDS[name](**kwargs)
+
+
+def get_default_backend() -> OCRBackend:
+    """Return the process-wide default backend (pytesseract unless overridden)."""
+    global _default_backend
+    if _default_backend is None:
+        _default_backend = PytesseractBackend()
+    return _default_backend
+
+
+def set_default_backend(backend: Optional[OCRBackend]) -> None:
+    """
+    Override the process-wide default backend.
+
+    Args:
+        backend: Backend to use, or None to go back to pytesseract
+    """
+    global _default_backend
+    _default_backend = backend
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+OCR Accuracy and Throughput Benchmark
+
+Runs the OCR stage (preprocessing and the OCR backend) over a sample of
+region crops and reports:
+
+    images/sec, latency per image (mean, p50, p95, p99, max)
+    CPU time of this process and of its children (pytesseract runs the
+        tesseract binary as a child process), peak RSS of both
+    character accuracy (1 - CER) and field accuracy (exact matches)
+        against the hand-checked extracted_data.json, overall and per region
+
+Crops come from the raw raster cache and are mapped before timing starts,
+so rendering and decoding are not part of the numbers; the first crops
+are OCRed as warm-up (tesseract loads its language data) and not timed.
+
+Reports are saved as JSON (by default .cache/benchmarks/ocr-<commit>.json)
+and can be compared with the report of an earlier commit; the comparison
+fails if throughput, p95 latency, accuracy or peak memory got worse by
+more than the tolerance.
+
+Usage:
+    python sirgujarat.py --collection P064 ocr-bench --limit 200 --seed 1
+    python sirgujarat.py ocr-bench --compare .cache/benchmarks/ocr-ac89d21.json
+
+    from ocr_benchmark import run_ocr_benchmark, print_ocr_report
+
+    report = run_ocr_benchmark(documents, {'gaam': (800, 50, 226, 71)}, backend='pytesseract')
+    print_ocr_report(report)
+"""
+
+import time
+import random
+from typing import Dict, List, Optional
+
+from bench_report import ResourceUsage, latency_summary, report_header
+from pipeline import ADDRESS_REGION, OCR_CONFIG, PREPROCESS_PARAMS
+from preprocess_sweep import edit_distance, load_ground_truth, normalize_text
+from raster_cache import RASTER_CACHE_DIR, RASTER_CACHE_MAX_BYTES, RasterCache, page_region
+
+
+# (metric, which direction is better) checked by --compare
+REGRESSION_METRICS = [
+    ('images_per_second', 'higher'),
+    ('latency_ms.p95', 'lower'),
+    ('char_accuracy', 'higher'),
+    ('field_accuracy', 'higher'),
+    ('peak_rss_mb', 'lower'),
+]
+
+# Mismatches kept in the report as examples
+MAX_MISMATCHES = 20
+
+
+def select_sample(documents: List[Dict], size: Optional[int] = None, seed: Optional[int] = None) -> List[Dict]:
+    """
+    Choose the documents to benchmark.
+
+    Args:
+        documents: discover_documents() items
+        size: Sample size (None: all documents)
+        seed: Random seed; without one the first documents are taken, so
+              runs on different commits see the same sample either way
+
+    Returns:
+        The sample, in document order
+    """
+    if size is None or size >= len(documents):
+        return list(documents)
+    if seed is None:
+        return documents[:size]
+    chosen = set(random.Random(seed).sample(range(len(documents)), size))
+    return [document for index, document in enumerate(documents) if index in chosen]
+
+
+def run_ocr_benchmark(documents: List[Dict], regions: Dict[str, tuple], backend: str = 'pytesseract',
+                      preprocess: bool = True, output_file: str = 'extracted_data.json',
+                      cache_root: str = RASTER_CACHE_DIR, cache_max_bytes: int = RASTER_CACHE_MAX_BYTES,
+                      dpi: int = 150, address_region: tuple = ADDRESS_REGION, warmup: int = 1,
+                      sample: Optional[Dict] = None, preprocess_params: Optional[Dict] = None) -> Dict:
+    """
+    OCR the region crops of the documents and measure speed and accuracy.
+
+    Only crops with a hand-checked value in output_file are benchmarked.
+
+    Args:
+        documents: Sample from select_sample()
+        regions: {region name: (left, top, width, height)} within the address crop
+        backend: OCR backend name ('fake' replays output_file)
+        preprocess: Apply gujarati_text_extractor.preprocess_image before OCR
+        output_file: Hand-checked extracted_data.json
+        cache_root: Raster cache directory
+        cache_max_bytes: Raster cache size cap
+        dpi: Render resolution
+        address_region: Address box on the page
+        warmup: Crops OCRed before timing starts
+        sample: How the sample was chosen, recorded in the report config
+        preprocess_params: preprocess_image keyword arguments (default: PREPROCESS_PARAMS),
+                           recorded in the report config
+
+    Returns:
+        Report dictionary (see print_ocr_report())
+    """
+    from PIL import Image
+    from gujarati_text_extractor import preprocess_image
+    from ocr_backends import FakeOCRBackend, create_backend
+
+    preprocess_params = dict(PREPROCESS_PARAMS, **(preprocess_params or {}))
+    report = report_header('ocr', {
+        'backend': backend, 'preprocess': preprocess, 'dpi': dpi, 'ocr_config': OCR_CONFIG,
+        'preprocess_params': preprocess_params if preprocess else None,
+        'regions': {name: list(box) for name, box in regions.items()},
+        'sample': dict(sample or {}, documents=len(documents)),
+    })
+
+    cache = RasterCache(cache_root, cache_max_bytes)
+    samples = load_ground_truth(output_file, documents, regions)
+    for item in samples:
+        item['raster'] = cache.get(item['pdf_path'], page_region(address_region, regions[item['region']]), dpi)
+
+    if backend == 'fake':
+        backends = {region: FakeOCRBackend.from_extracted_data(output_file, field=region) for region in regions}
+    else:
+        shared = create_backend(backend)
+        backends = {region: shared for region in regions}
+
+    def recognize(item):
+        image = Image.fromarray(item['raster'])
+        if preprocess:
+            image = preprocess_image(image, **preprocess_params)
+        return backends[item['region']].extract(image, language='guj', config=OCR_CONFIG,
+                                                image_name=item['image_name'])
+
+    for item in samples[:warmup]:
+        recognize(item)
+
+    latencies = []
+    per_region = {region: {'images': 0, 'chars': 0, 'char_errors': 0, 'exact': 0} for region in regions}
+    mismatches = []
+    errors = 0
+    usage = ResourceUsage()
+    start = time.perf_counter()
+    for item in samples:
+        item_start = time.perf_counter()
+        error = None
+        try:
+            text = recognize(item)
+        except Exception as e:
+            errors += 1
+            text, error = '', str(e)
+        latencies.append(time.perf_counter() - item_start)
+
+        text = normalize_text(text)
+        counts = per_region[item['region']]
+        counts['images'] += 1
+        counts['chars'] += len(item['truth'])
+        counts['char_errors'] += edit_distance(item['truth'], text)
+        if text == item['truth']:
+            counts['exact'] += 1
+        elif len(mismatches) < MAX_MISMATCHES:
+            mismatch = {'image_name': item['image_name'], 'region': item['region'], 'expected': item['truth']}
+            mismatch.update({'error': error} if error else {'got': text})
+            mismatches.append(mismatch)
+    elapsed = time.perf_counter() - start
+    resources = usage.stop()
+    for instance in set(backends.values()):
+        instance.close()
+
+    def accuracy(counts):
+        return {
+            'images': counts['images'],
+            'char_accuracy': 1 - counts['char_errors'] / counts['chars'] if counts['chars'] else 0.0,
+            'field_accuracy': counts['exact'] / counts['images'] if counts['images'] else 0.0,
+        }
+
+    total = {key: sum(counts[key] for counts in per_region.values())
+             for key in ('images', 'chars', 'char_errors', 'exact')}
+    cpu_time = sum(resources[key] or 0.0 for key in ('cpu_time', 'child_cpu_time'))
+    report.update({
+        'images': len(samples),
+        'errors': errors,
+        'elapsed_time': elapsed,
+        'images_per_second': len(samples) / elapsed if elapsed else 0.0,
+        'latency_ms': latency_summary(latencies),
+        'cpu_per_image_ms': 1000 * cpu_time / len(samples) if samples else 0.0,
+        **resources,
+        **{key: value for key, value in accuracy(total).items() if key != 'images'},
+        'regions': {region: accuracy(counts) for region, counts in per_region.items()},
+        'mismatches': mismatches,
+    })
+    return report
+
+
+def print_ocr_report(report: Dict) -> None:
+    """Print an OCR benchmark report."""
+    config = report['config']
+    latency = report['latency_ms']
+    print(f"OCR benchmark at {report['commit']}: {report['images']} crops of "
+          f"{config['sample']['documents']} documents, {config['backend']} backend"
+          f"{', preprocessed' if config['preprocess'] else ''}")
+    print("-" * 60)
+    print(f"Throughput:   {report['images_per_second']:.1f} images/second ({report['elapsed_time']:.2f} seconds)")
+    print(f"Latency (ms): mean {latency['mean']:.1f}  p50 {latency['p50']:.1f}  p95 {latency['p95']:.1f}  "
+          f"p99 {latency['p99']:.1f}  max {latency['max']:.1f}")
+    if report['cpu_time'] is not None:
+        print(f"CPU time:     {report['cpu_time']:.2f} s + {report['child_cpu_time']:.2f} s in child processes "
+              f"({report['cpu_per_image_ms']:.1f} ms/image)")
+        print(f"Peak RSS:     {report['peak_rss_mb']:.0f} MB, child processes {report['peak_child_rss_mb']:.0f} MB")
+    errors = f", {report['errors']} errors" if report['errors'] else ''
+    print(f"Accuracy:     {report['char_accuracy']:.2%} characters, {report['field_accuracy']:.2%} fields{errors}")
+    for region, counts in report['regions'].items():
+        print(f"  {region:<10} {counts['images']:>5} crops  {counts['char_accuracy']:.2%} characters  "
+              f"{counts['field_accuracy']:.2%} fields")
+    for mismatch in report['mismatches'][:5]:
+        if 'error' in mismatch:
+            print(f"  {mismatch['image_name']} {mismatch['region']}: {mismatch['error']}")
+        else:
+            print(f"  {mismatch['image_name']} {mismatch['region']}: expected {mismatch['expected']!r}, "
+                  f"got {mismatch['got']!r}")
@@ -0,0 +1,943 @@
+#!/usr/bin/env python3
+"""
+End-to-End Pipeline Orchestrator
+
+Runs render -> crop -> preprocess -> OCR -> aggregate as concurrent stages
+connected by bounded queues, then publishes the results. Each stage has its
+own worker threads; a full queue blocks the stage feeding it, so a slow OCR
+stage holds back rendering instead of letting rendered pages pile up in
+memory. OCR starts on the first document while later ones are still
+rendering.
+
+Stage graph for the document pipeline:
+
+    render (PDF first page, in memory)
+      -> crop (address crop saved and published, one item per text region)
+      -> preprocess (grayscale/contrast/sharpness, optional)
+      -> ocr (one OCR backend per worker thread)
+      -> aggregate (single worker, DataAggregator)
+    publish: extracted_data.json, facets, shards and asset manifest once
+             every stage has drained (plus atlases and pages with --pages)
+
+The taluko and gaam regions are cropped from the in-memory address crop.
+Only the gaam region is known (the one crop_address_image.py uses);
+others are given with --region NAME=LEFT,TOP,WIDTH,HEIGHT. Regions that
+are not run keep their values from the existing output file.
+
+Usage:
+    python pipeline.py
+    python pipeline.py --collection P064 --render-workers 2 --ocr-workers 4
+    python pipeline.py --region taluko=40,50,300,71 --backend fake --limit 20
+
+    from pipeline import Pipeline
+
+    pipeline = Pipeline()
+    pipeline.add_stage('double', lambda n: [n * 2], workers=2)
+    pipeline.add_stage('print', lambda n: print(n), after=['double'])
+    summary = pipeline.run(range(10))
+"""
+
+import io
+import os
+import json
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+from artifact_store import ARTIFACT_DIR, ArtifactStore, artifact_key, file_digest
+from asset_manifest import AssetManifest
+from metrics import METRICS_DIR, MetricsRegistry, get_registry, timed
+
+
+# Queue markers: one _UPSTREAM_DONE per finished upstream stage, one _STOP
+# per sibling worker once a stage has seen all of its upstream finish
+_UPSTREAM_DONE = object()
+_STOP = object()
+
+# Address region of the rendered first page (150 dpi), as in extract_pdf_thumbnails.py
+ADDRESS_REGION = (133, 425, 1058, 393)
+ADDRESS_OUTPUT_DIR = 'public/address-images'
+
+# Text regions within the address crop; gaam as in crop_address_image.py
+TEXT_REGIONS = {
+    'gaam': (800, 50, 226, 71),
+}
+
+# Same Tesseract configuration as OCRProcessor.extract_text
+OCR_CONFIG = '--oem 3 --psm 6'
+
+# Same defaults as gujarati_text_extractor.preprocess_image; denoise is
+# (diameter, sigma_color, sigma_space) of a bilateral filter, or None
+PREPROCESS_PARAMS = {'contrast': 1.5, 'brightness': 1.1, 'sharpness': 1.2, 'denoise': None}
+
+
+class Stage:
+    """A named step with its worker count, input queue and counters."""
+
+    def __init__(self, name: str, func: Callable, workers: int, queue_size: int,
+                 upstream: List[str]):
+        """
+        Initialize the stage.
+
+        Args:
+            name: Stage name, used in the summary and error records
+            func: Called with each item; returns an iterable of output items or None
+            workers: Number of worker threads
+            queue_size: Maximum number of items waiting in the input queue
+            upstream: Names of the stages feeding this one
+        """
+        self.name = name
+        self.func = func
+        self.workers = workers
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.upstream = upstream
+        self.downstream = []
+        self.lock = threading.Lock()
+
+        self.pending_upstream = 0
+        self.running_workers = 0
+        self.items_in = 0
+        self.items_out = 0
+        self.errors = 0
+        self.busy_time = 0.0
+        self.max_queue = 0
+        self.first_start = None
+        self.last_end = None
+
+    def put(self, item) -> None:
+        """Enqueue an item, blocking while the queue is full."""
+        self.queue.put(item)
+        depth = self.queue.qsize()
+        if depth > self.max_queue:
+            self.max_queue = depth
+
+
+class Pipeline:
+    """Runs stages concurrently, connected by bounded queues."""
+
+    def __init__(self, error_logger=None, item_name: Optional[Callable] = None,
+                 metrics: Optional[MetricsRegistry] = None):
+        """
+        Initialize an empty pipeline.
+
+        Args:
+            error_logger: ErrorLogger that receives stage failures (the stage
+                          name is used as the error type); printed when omitted
+            item_name: Returns the name of an item for error records
+                       (default: item['image_name'] for dicts, str(item) otherwise)
+            metrics: Registry receiving per-item stage timings and counts
+                     (default: metrics.get_registry())
+        """
+        self.error_logger = error_logger
+        self.item_name = item_name or _default_item_name
+        self.metrics = metrics
+        self.stages: Dict[str, Stage] = {}
+        self._log_lock = threading.Lock()
+        self._start_time = 0.0
+        self._elapsed_time = 0.0
+
+    def add_stage(self, name: str, func: Callable, workers: int = 1, queue_size: int = 8,
+                  after: Optional[List[str]] = None) -> Stage:
+        """
+        Add a stage.
+
+        A stage can only follow stages that were added before it, so the
+        graph is acyclic. Stages without upstream stages receive the items
+        passed to run(); a stage with several downstream stages sends each
+        of its outputs to all of them.
+
+        Args:
+            name: Unique stage name
+            func: Called with each item; returns an iterable of output items
+                  (one item in, any number out) or None
+            workers: Number of worker threads
+            queue_size: Maximum number of items waiting for this stage; a full
+                        queue blocks the upstream workers (backpressure)
+            after: Names of the stages feeding this one (default: the source)
+
+        Returns:
+            The new Stage
+
+        Raises:
+            ValueError: If the name is taken, an upstream stage is unknown,
+                        or workers/queue_size is not positive
+        """
+        if name in self.stages:
+            raise ValueError(f"Stage '{name}' already exists")
+        for upstream in after or []:
+            if upstream not in self.stages:
+                raise ValueError(f"Stage '{name}' follows unknown stage '{upstream}'")
+        if workers < 1 or queue_size < 1:
+            raise ValueError(f"Stage '{name}' needs at least one worker and queue slot")
+
+        stage = Stage(name, func, workers, queue_size, list(after or []))
+        for upstream in stage.upstream:
+            self.stages[upstream].downstream.append(stage)
+        self.stages[name] = stage
+        return stage
+
+    def run(self, items: Iterable) -> Dict:
+        """
+        Feed items through the stages and wait until every stage has drained.
+
+        Args:
+            items: Source items; consumed lazily, so a generator only runs as
+                   far ahead as the first queues allow
+
+        Returns:
+            Summary from get_summary()
+        """
+        sources = [stage for stage in self.stages.values() if not stage.upstream]
+        if not sources:
+            raise ValueError("Pipeline has no stages")
+
+        for stage in self.stages.values():
+            # The feeder counts as the one upstream of the source stages
+            stage.pending_upstream = len(stage.upstream) or 1
+            stage.running_workers = stage.workers
+
+        self._start_time = time.perf_counter()
+        threads = [
+            threading.Thread(target=self._work, args=(stage,), name=f"{stage.name}-{index}", daemon=True)
+            for stage in self.stages.values()
+            for index in range(stage.workers)
+        ]
+        for thread in threads:
+            thread.start()
+
+        try:
+            for item in items:
+                for stage in sources:
+                    stage.put(item)
+        finally:
+            for stage in sources:
+                stage.put(_UPSTREAM_DONE)
+
+        for thread in threads:
+            thread.join()
+        self._elapsed_time = time.perf_counter() - self._start_time
+        metrics = self.metrics or get_registry()
+        for stage in self.stages.values():
+            metrics.set('pipeline_queue_peak', stage.max_queue, stage=stage.name)
+        return self.get_summary()
+
+    def get_summary(self) -> Dict:
+        """
+        Return per-stage counters from the last run.
+
+        Times are seconds since the run started, so overlapping first/last
+        times show stages running concurrently. Utilization is busy time
+        over the stage's worker-seconds.
+
+        Returns:
+            {'elapsed_time', 'stages': [{'name', 'workers', 'items_in',
+             'items_out', 'errors', 'busy_time', 'utilization', 'max_queue',
+             'queue_size', 'first_start', 'last_end'}]}
+        """
+        elapsed_time = self._elapsed_time
+        start_time = self._start_time
+        stages = []
+        for stage in self.stages.values():
+            capacity = stage.workers * elapsed_time
+            stages.append({
+                'name': stage.name,
+                'workers': stage.workers,
+                'items_in': stage.items_in,
+                'items_out': stage.items_out,
+                'errors': stage.errors,
+                'busy_time': stage.busy_time,
+                'utilization': stage.busy_time / capacity if capacity else 0.0,
+                'max_queue': stage.max_queue,
+                'queue_size': stage.queue.maxsize,
+                'first_start': None if stage.first_start is None else stage.first_start - start_time,
+                'last_end': None if stage.last_end is None else stage.last_end - start_time,
+            })
+        return {'elapsed_time': elapsed_time, 'stages': stages}
+
+    def _work(self, stage: Stage) -> None:
+        """Worker loop: process items until the stage's upstream is finished."""
+        try:
+            while True:
+                item = stage.queue.get()
+                if item is _STOP:
+                    return
+                if item is _UPSTREAM_DONE:
+                    with stage.lock:
+                        stage.pending_upstream -= 1
+                        finished = stage.pending_upstream == 0
+                    if finished:
+                        for _ in range(stage.workers - 1):
+                            stage.queue.put(_STOP)
+                        return
+                    continue
+                self._process(stage, item)
+        finally:
+            with stage.lock:
+                stage.running_workers -= 1
+                last_worker = stage.running_workers == 0
+            if last_worker:
+                for downstream in stage.downstream:
+                    downstream.put(_UPSTREAM_DONE)
+
+    def _process(self, stage: Stage, item) -> None:
+        """Run the stage function on one item and forward its outputs."""
+        started = time.perf_counter()
+        with stage.lock:
+            stage.items_in += 1
+            if stage.first_start is None:
+                stage.first_start = started
+
+        outcome = 'success'
+        try:
+            outputs = list(stage.func(item) or [])
+        except Exception as e:
+            outputs = []
+            outcome = 'failed'
+            with stage.lock:
+                stage.errors += 1
+            message = str(e) or type(e).__name__
+            with self._log_lock:
+                if self.error_logger is not None:
+                    self.error_logger.log_error(self.item_name(item), stage.name, message,
+                                                duration=time.perf_counter() - started)
+                else:
+                    print(f"ERROR [{stage.name}] {self.item_name(item)}: {message}")
+
+        finished = time.perf_counter()
+        with stage.lock:
+            stage.busy_time += finished - started
+            stage.items_out += len(outputs)
+            stage.last_end = finished
+        metrics = self.metrics or get_registry()
+        metrics.observe('pipeline_stage_seconds', finished - started, stage=stage.name)
+        metrics.inc('pipeline_items_total', stage=stage.name, outcome=outcome)
+
+        # Outside the lock: put() blocks while a downstream queue is full
+        for output in outputs:
+            for downstream in stage.downstream:
+                downstream.put(output)
+
+
+def _default_item_name(item) -> str:
+    """Name an item for error records."""
+    if isinstance(item, dict) and 'image_name' in item:
+        return item['image_name']
+    return str(item)
+
+
+def print_summary(summary: Dict) -> None:
+    """
+    Print the per-stage table of a pipeline summary.
+
+    Args:
+        summary: Result of Pipeline.run()
+    """
+    print(f"{'Stage':<12} {'Workers':>7} {'In':>6} {'Out':>6} {'Errors':>6} "
+          f"{'Busy s':>8} {'Util':>5} {'Queue':>7} {'First s':>8} {'Last s':>8}")
+    print("-" * 85)
+    for stage in summary['stages']:
+        first = '-' if stage['first_start'] is None else f"{stage['first_start']:.2f}"
+        last = '-' if stage['last_end'] is None else f"{stage['last_end']:.2f}"
+        print(f"{stage['name']:<12} {stage['workers']:>7} {stage['items_in']:>6} "
+              f"{stage['items_out']:>6} {stage['errors']:>6} {stage['busy_time']:>8.2f} "
+              f"{stage['utilization']:>5.0%} {stage['max_queue']:>3}/{stage['queue_size']:<3} "
+              f"{first:>8} {last:>8}")
+    print("-" * 85)
+    print(f"Total time: {summary['elapsed_time']:.2f} seconds")
+
+
+def parse_region(value: str) -> tuple:
+    """
+    Parse a NAME=LEFT,TOP,WIDTH,HEIGHT text region.
+
+    Args:
+        value: Region string, e.g. "gaam=800,50,226,71"
+
+    Returns:
+        tuple: (name, (left, top, width, height))
+
+    Raises:
+        ValueError: If the value is malformed
+    """
+    name, _, box = value.partition('=')
+    try:
+        left, top, width, height = (int(part) for part in box.split(','))
+    except ValueError:
+        raise ValueError(f"Invalid region '{value}', expected NAME=LEFT,TOP,WIDTH,HEIGHT")
+    if name not in ('taluko', 'gaam'):
+        raise ValueError(f"Invalid region name '{name}', expected taluko or gaam")
+    return name, (left, top, width, height)
+
+
+def discover_documents(source_dirs: List[str], limit: Optional[int] = None) -> List[Dict]:
+    """
+    List the PDFs to process, in collection and filename order.
+
+    Args:
+        source_dirs: Collection directories holding PDFs, e.g. ["P064"]
+        limit: Process at most this many documents
+
+    Returns:
+        List of {'image_name', 'collection', 'pdf_path'} items
+    """
+    documents = []
+    for source_dir in source_dirs:
+        collection = Path(source_dir).name.upper()
+        for pdf_path in sorted(Path(source_dir).glob('*.pdf')):
+            documents.append({'image_name': pdf_path.stem, 'collection': collection,
+                              'pdf_path': pdf_path})
+    return documents[:limit] if limit is not None else documents
+
+
+def load_existing_entries(data_aggregator, output_file: str) -> int:
+    """
+    Seed an aggregator with the entries of an existing output file.
+
+    Args:
+        data_aggregator: DataAggregator to fill
+        output_file: Path of a previous extracted_data.json
+
+    Returns:
+        Number of entries loaded (0 if the file is missing or unreadable)
+    """
+    try:
+        with open(output_file, 'r', encoding='utf-8') as f:
+            existing = json.load(f)
+    except (OSError, ValueError):
+        return 0
+
+    for image_name, entry in existing.items():
+        if entry.get('taluko') is not None:
+            data_aggregator.add_taluko_entry(image_name, entry['taluko'])
+        if entry.get('gaam') is not None:
+            data_aggregator.add_gaam_entry(image_name, entry['gaam'])
+    return len(existing)
+
+
+def build_document_pipeline(data_aggregator, asset_manifest: Optional[AssetManifest], make_backend: Callable,
+                            regions: Optional[Dict[str, tuple]] = None, dpi: int = 150,
+                            preprocess: bool = True, address_dir: Optional[str] = ADDRESS_OUTPUT_DIR,
+                            address_region: tuple = ADDRESS_REGION,
+                            workers: Optional[Dict[str, int]] = None, queue_size: int = 8,
+                            error_logger=None, artifact_store=None, backend_key: str = '',
+                            preprocess_params: Optional[Dict] = None) -> Pipeline:
+    """
+    Build the render -> crop -> preprocess -> ocr -> aggregate pipeline.
+
+    With an artifact store, the render stage first derives the key of every
+    artifact of a document (address crop, its JPEG and placeholder, region
+    crops, preprocessed images, OCR text) from the PDF hash and the
+    parameters, then only produces what is missing: a document whose OCR
+    text and address JPEG are stored is never rendered, and a changed
+    region box re-runs only that region's crop, preprocessing and OCR.
+
+    Args:
+        data_aggregator: DataAggregator receiving the OCR text
+        asset_manifest: Publishes each address crop with its placeholder (None: not published)
+        make_backend: Called with a region name to create an OCR backend;
+                      called once per OCR worker thread and region
+        regions: {region name: (left, top, width, height)} within the address crop
+        dpi: Render resolution; the crop regions assume 150
+        preprocess: Apply gujarati_text_extractor.preprocess_image before OCR
+        address_dir: Directory for <collection>/<image>.jpg address crops
+                     (None: crops are not saved, e.g. for benchmarks)
+        address_region: (left, top, width, height) of the address on the page
+        workers: {stage name: worker count}; missing stages get one worker
+        queue_size: Input queue size of every stage
+        error_logger: ErrorLogger for stage failures
+        artifact_store: ArtifactStore to look artifacts up in before computing
+                        them (None: everything is computed)
+        backend_key: Identifies the OCR backend in the OCR text keys
+        preprocess_params: preprocess_image keyword arguments overriding
+                           PREPROCESS_PARAMS; part of the preprocessed image keys
+
+    Returns:
+        Pipeline ready to run() on discover_documents() items
+    """
+    from extract_pdf_thumbnails import PLACEHOLDER_WIDTH, crop_region, make_placeholder, render_first_page
+    from gujarati_text_extractor import preprocess_image
+
+    regions = TEXT_REGIONS if regions is None else regions
+    workers = workers or {}
+    preprocess_params = dict(PREPROCESS_PARAMS, **(preprocess_params or {}))
+    manifest_lock = threading.Lock()
+    local = threading.local()
+
+    def cached(kind, key, compute, codec):
+        if artifact_store is None:
+            return compute()
+        return artifact_store.cached(kind, key, compute, codec)
+
+    def stored(key):
+        return artifact_store is not None and artifact_store.has(key)
+
+    def get_keys(pdf_path):
+        page = artifact_key('page', {'pdf': file_digest(pdf_path), 'dpi': dpi})
+        address = artifact_key('crop', {'image': page, 'box': list(address_region)})
+        jpeg = artifact_key('jpeg', {'image': page, 'page_quality': 85, 'box': list(address_region),
+                                     'quality': 85})
+        keys = {
+            'page': page,
+            'address': address,
+            'jpeg': jpeg,
+            'placeholder': artifact_key('placeholder', {'image': jpeg, 'width': PLACEHOLDER_WIDTH}),
+            'regions': {},
+        }
+        for region, box in regions.items():
+            crop_key = artifact_key('crop', {'image': address, 'box': list(box)})
+            prepared_key = crop_key
+            if preprocess:
+                prepared_key = artifact_key('preprocess', {'image': crop_key, 'params': preprocess_params})
+            keys['regions'][region] = {
+                'crop': crop_key,
+                'preprocess': prepared_key,
+                'ocr': artifact_key('ocr', {'image': prepared_key, 'backend': backend_key,
+                                            'language': 'guj', 'config': OCR_CONFIG}),
+            }
+        return keys
+
+    def render(item):
+        keys = item['keys'] = get_keys(item['pdf_path'])
+
+        # Work back from the OCR text to the first stored artifact
+        item['crop_regions'] = [
+            region for region, region_keys in keys['regions'].items()
+            if not stored(region_keys['ocr']) and not stored(region_keys['preprocess'])
+        ]
+        address_needed = any(
+            not stored(keys['regions'][region]['crop']) for region in item['crop_regions']
+        )
+        jpeg_needed = address_dir is not None and not stored(keys['jpeg'])
+        # Page rasters are not stored: rendering one (about 40 ms) is cheaper
+        # than encoding and decoding it as PNG
+        if (address_needed and not stored(keys['address'])) or jpeg_needed:
+            item['image'] = render_first_page(item['pdf_path'], dpi)
+        return [item]
+
+    def crop(item):
+        keys = item['keys']
+        page = item.pop('image', None)
+        address = []
+
+        def get_address():
+            if not address:
+                address.append(cached('address', keys['address'],
+                                      lambda: crop_region(page, *address_region), 'image'))
+            return address[0]
+
+        if address_dir is not None:
+            # Cut from the page as extract_first_page saves it (a JPEG), so the
+            # address JPEGs match the committed thumbnails byte for byte; the
+            # text regions below are cropped from the clean render
+            content = cached('jpeg', keys['jpeg'],
+                             lambda: encode_jpeg(crop_region(decode_jpeg(encode_jpeg(page)), *address_region)),
+                             'bytes')
+            output_path = Path(address_dir, item['collection'].lower(), f"{item['image_name']}.jpg")
+            write_if_changed(output_path, content)
+            if asset_manifest is not None:
+                # From the saved JPEG, as publish_thumbnails computes it
+                placeholder = cached('placeholder', keys['placeholder'],
+                                     lambda: make_placeholder(decode_jpeg(content)), 'json')
+                with manifest_lock:
+                    asset_manifest.publish(output_path.as_posix(), content, placeholder=placeholder)
+
+        outputs = []
+        for region, box in regions.items():
+            output = {'image_name': item['image_name'], 'region': region, 'keys': keys['regions'][region]}
+            if region in item['crop_regions']:
+                output['image'] = cached('crop', output['keys']['crop'],
+                                         lambda: crop_region(get_address(), *box), 'image')
+            outputs.append(output)
+        return outputs
+
+    def prepare(item):
+        keys = item['keys']
+        if 'image' in item:
+            if preprocess:
+                image = item['image']
+                item['image'] = cached('preprocess', keys['preprocess'],
+                                       lambda: preprocess_image(image, **preprocess_params), 'image')
+        elif not stored(keys['ocr']):
+            with timed('stage_seconds', stage='load'):
+                item['image'] = artifact_store.load('preprocess', keys['preprocess'], 'image')
+        return [item]
+
+    def ocr(item):
+        def extract():
+            # Backends are not shared between threads (tesserocr keeps per-instance state)
+            backends = getattr(local, 'backends', None)
+            if backends is None:
+                backends = local.backends = {}
+            if item['region'] not in backends:
+                backends[item['region']] = make_backend(item['region'])
+            with timed('stage_seconds', stage='ocr'):
+                text = backends[item['region']].extract(item.pop('image'), language='guj', config=OCR_CONFIG,
+                                                        image_name=item['image_name'])
+            return text.strip()
+
+        item['text'] = cached('ocr', item['keys']['ocr'], extract, 'text')
+        return [item]
+
+    def aggregate(item):
+        getattr(data_aggregator, f"add_{item['region']}_entry")(item['image_name'], item['text'])
+        if error_logger is not None:
+            error_logger.log_success(item['image_name'], stage='ocr')
+
+    pipeline = Pipeline(error_logger=error_logger)
+    pipeline.add_stage('render', render, workers.get('render', 1), queue_size)
+    pipeline.add_stage('crop', crop, workers.get('crop', 1), queue_size, after=['render'])
+    pipeline.add_stage('preprocess', prepare, workers.get('preprocess', 1), queue_size, after=['crop'])
+    pipeline.add_stage('ocr', ocr, workers.get('ocr', 1), queue_size, after=['preprocess'])
+    # A single aggregate worker keeps DataAggregator updates serial
+    pipeline.add_stage('aggregate', aggregate, 1, queue_size, after=['ocr'])
+    return pipeline
+
+
+@timed('stage_seconds', stage='encode')
+def encode_jpeg(image) -> bytes:
+    """Encode an address crop the way extract_pdf_thumbnails.crop_image saves it."""
+    buffer = io.BytesIO()
+    image.save(buffer, "JPEG", quality=85, optimize=True)
+    return buffer.getvalue()
+
+
+@timed('stage_seconds', stage='load')
+def decode_jpeg(content: bytes):
+    """Decode JPEG bytes into a loaded PIL image."""
+    from PIL import Image
+
+    image = Image.open(io.BytesIO(content))
+    image.load()
+    return image
+
+
+@timed('stage_seconds', stage='write')
+def write_if_changed(path: Path, content: bytes) -> bool:
+    """
+    Write a file unless it already has this content.
+
+    Args:
+        path: Output path; parent directories are created
+        content: File bytes
+
+    Returns:
+        True if the file was written
+    """
+    try:
+        if path.read_bytes() == content:
+            return False
+    except OSError:
+        pass
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(content)
+    return True
+
+
+def run_document_pipeline(source_dirs: List[str], regions: Optional[Dict[str, tuple]] = None,
+                          backend: str = 'pytesseract', workers: Optional[Dict[str, int]] = None,
+                          queue_size: int = 8, preprocess: bool = True, dpi: int = 150,
+                          limit: Optional[int] = None, output_file: str = 'extracted_data.json',
+                          shards_dir: str = 'data', address_dir: str = ADDRESS_OUTPUT_DIR,
+                          address_region: tuple = ADDRESS_REGION,
+                          events_file: str = 'ocr_events.jsonl',
+                          artifact_dir: Optional[str] = ARTIFACT_DIR,
+                          preprocess_params: Optional[Dict] = None) -> Dict:
+    """
+    Run the document pipeline over PDF collections and publish the results.
+
+    All collections go through one pipeline, so the worker threads (and the
+    OCR backends they hold) stay warm from one collection to the next.
+
+    Args:
+        source_dirs: PDF collection directories, e.g. ["P064", "P070"]
+        regions: {region name: (left, top, width, height)} within the address crop
+        backend: OCR backend name ('fake' replays the existing output file)
+        workers: {stage name: worker count}
+        queue_size: Input queue size of every stage
+        preprocess: Apply preprocessing before OCR
+        dpi: Render resolution
+        limit: Process at most this many documents (stale crops are then not pruned)
+        output_file: Aggregated JSON output; existing entries are kept for
+                     regions and documents that are not run
+        shards_dir: Directory for the per-collection shards
+        address_dir: Directory for <collection>/<image>.jpg address crops
+        address_region: (left, top, width, height) of the address on the page
+        events_file: JSONL file for per-image events and errors
+        artifact_dir: Artifact store directory (None: compute everything)
+        preprocess_params: preprocess_image keyword arguments (default: PREPROCESS_PARAMS)
+
+    Returns:
+        Pipeline summary with 'successful' and 'failed' OCR entry counts and
+        the artifact store's hit/miss 'artifacts' counters added
+    """
+    from event_log import EventLog
+    from gujarati_ocr_json_extractor import DataAggregator, ErrorLogger, write_outputs
+    from ocr_backends import FakeOCRBackend, create_backend
+
+    regions = dict(TEXT_REGIONS) if regions is None else regions
+    artifact_store = ArtifactStore(artifact_dir) if artifact_dir else None
+    # The fake backend's text comes from the output file, so its content is part of the key
+    backend_key = backend
+    if backend == 'fake' and os.path.exists(output_file):
+        backend_key = f"fake:{file_digest(output_file)}"
+
+    def make_backend(region):
+        if backend == 'fake':
+            return FakeOCRBackend.from_extracted_data(output_file, field=region)
+        return create_backend(backend)
+
+    event_log = EventLog(events_file)
+    error_logger = ErrorLogger(event_log=event_log)
+    try:
+        data_aggregator = DataAggregator()
+        loaded = load_existing_entries(data_aggregator, output_file)
+        asset_manifest = AssetManifest()
+        documents = discover_documents(source_dirs, limit)
+
+        print(f"Documents:  {len(documents)} from {', '.join(source_dirs)}")
+        print(f"Regions:    {', '.join(f'{name}={box}' for name, box in regions.items())}")
+        print(f"Backend:    {backend} (existing entries kept: {loaded})")
+        print(f"Artifacts:  {artifact_dir or 'not cached'}")
+        print("-" * 60)
+
+        pipeline = build_document_pipeline(
+            data_aggregator, asset_manifest, make_backend, regions, dpi=dpi,
+            preprocess=preprocess, address_dir=address_dir, address_region=address_region, workers=workers,
+            queue_size=queue_size, error_logger=error_logger, artifact_store=artifact_store,
+            backend_key=backend_key, preprocess_params=preprocess_params
+        )
+        summary = pipeline.run(documents)
+
+        # Publish once every stage has drained
+        publish_start = time.perf_counter()
+        if limit is None:
+            for source_dir in source_dirs:
+                asset_manifest.prune(f"{address_dir}/{Path(source_dir).name.lower()}/")
+        asset_manifest.save()
+        output_stem = os.path.splitext(output_file)[0]
+        write_outputs(data_aggregator.get_aggregated_data(), output_file, f"{output_stem}.facets.json",
+                      shards_dir, error_logger)
+    finally:
+        event_log.close()
+
+    print("\n" + "=" * 60)
+    print("PIPELINE SUMMARY")
+    print("=" * 60)
+    print_summary(summary)
+    print(f"Publish:    {time.perf_counter() - publish_start:.2f} seconds")
+
+    error_summary = error_logger.get_summary()
+    print(f"OCR entries: {error_summary['successful']} successful, {error_summary['failed']} failed")
+    artifacts = artifact_store.stats() if artifact_store is not None else {}
+    if artifacts:
+        print("Artifacts:   " + ", ".join(
+            f"{kind} {counts['hits']} hit/{counts['misses']} miss" for kind, counts in artifacts.items()))
+    if error_summary['errors']:
+        print(f"Errors recorded in {event_log.path}")
+    print("=" * 60)
+
+    summary['successful'] = error_summary['successful']
+    summary['failed'] = error_summary['failed']
+    summary['artifacts'] = artifacts
+    return summary
+
+
+class PlaceholderRecorder:
+    """
+    Stands in for the asset manifest where it cannot be shared.
+
+    Records the placeholder of each address crop instead of publishing it,
+    so a distributed worker can hand them to the merge step, which is the
+    only writer of asset-manifest.json.
+    """
+
+    def __init__(self):
+        self.placeholders = {}
+
+    def publish(self, logical_path: str, content: Optional[bytes] = None,
+                placeholder: Optional[Dict] = None) -> str:
+        """Record the placeholder of a crop; same signature as AssetManifest.publish()."""
+        self.placeholders[logical_path] = placeholder
+        return logical_path
+
+
+def process_document_batch(documents: List[Dict], regions: Optional[Dict[str, tuple]] = None,
+                           backend: str = 'pytesseract', workers: Optional[Dict[str, int]] = None,
+                           queue_size: int = 8, preprocess: bool = True, dpi: int = 150,
+                           address_dir: str = ADDRESS_OUTPUT_DIR, address_region: tuple = ADDRESS_REGION,
+                           artifact_dir: Optional[str] = ARTIFACT_DIR,
+                           output_file: str = 'extracted_data.json',
+                           preprocess_params: Optional[Dict] = None) -> Dict:
+    """
+    Run one batch of a distributed run through the document pipeline.
+
+    Address crops are written to address_dir (which, like the PDFs and the
+    artifact store, must be on the shared filesystem) but not published;
+    their placeholders are returned for merge_document_results().
+
+    Args:
+        documents: Batch items, {'image_name', 'collection', 'pdf_path'} each
+        regions: {region name: (left, top, width, height)} within the address crop
+        backend: OCR backend name ('fake' replays output_file)
+        workers: {stage name: worker count}
+        queue_size: Input queue size of every stage
+        preprocess: Apply preprocessing before OCR
+        dpi: Render resolution
+        address_dir: Directory for <collection>/<image>.jpg address crops
+        address_region: (left, top, width, height) of the address on the page
+        artifact_dir: Shared artifact store directory (None: compute everything)
+        output_file: Existing aggregated JSON, read by the fake backend
+        preprocess_params: preprocess_image keyword arguments (default: PREPROCESS_PARAMS)
+
+    Returns:
+        dict: {'entries': {image_name: {taluko, gaam}}, 'placeholders': {crop path: placeholder},
+               'errors': [...] (at most MAX_RETAINED_ERRORS), 'failed': error count}
+    """
+    from gujarati_ocr_json_extractor import DataAggregator, ErrorLogger
+    from ocr_backends import FakeOCRBackend, create_backend
+
+    def make_backend(region):
+        if backend == 'fake':
+            return FakeOCRBackend.from_extracted_data(output_file, field=region)
+        return create_backend(backend)
+
+    backend_key = backend
+    if backend == 'fake' and os.path.exists(output_file):
+        backend_key = f"fake:{file_digest(output_file)}"
+
+    data_aggregator = DataAggregator()
+    recorder = PlaceholderRecorder()
+    error_logger = ErrorLogger()
+    pipeline = build_document_pipeline(
+        data_aggregator, recorder, make_backend, regions, dpi=dpi, preprocess=preprocess,
+        address_dir=address_dir, address_region=address_region, workers=workers,
+        queue_size=queue_size, error_logger=error_logger,
+        artifact_store=ArtifactStore(artifact_dir) if artifact_dir else None, backend_key=backend_key,
+        preprocess_params=preprocess_params
+    )
+    pipeline.run([dict(document, pdf_path=Path(document['pdf_path'])) for document in documents])
+    return {
+        'entries': data_aggregator.get_aggregated_data(),
+        'placeholders': recorder.placeholders,
+        'errors': error_logger.errors,
+        'failed': error_logger.failure_count,
+    }
+
+
+def merge_document_results(batch_results: List[Dict], output_file: str = 'extracted_data.json',
+                           shards_dir: str = 'data') -> Dict:
+    """
+    Merge the batch results of a distributed run and publish them.
+
+    Existing entries of output_file are kept for documents and regions the
+    run did not produce, as in run_document_pipeline().
+
+    Args:
+        batch_results: Results of process_document_batch(), e.g. LeaseQueue.merge()
+        output_file: Aggregated JSON output
+        shards_dir: Directory for the per-collection shards
+
+    Returns:
+        dict: {'entries', 'published', 'errors'} counts
+    """
+    from gujarati_ocr_json_extractor import DataAggregator, ErrorLogger, write_outputs
+
+    data_aggregator = DataAggregator()
+    load_existing_entries(data_aggregator, output_file)
+    asset_manifest = AssetManifest()
+    entries = published = errors = 0
+
+    for result in batch_results:
+        for image_name, entry in result['entries'].items():
+            for region in ('taluko', 'gaam'):
+                if entry.get(region) is not None:
+                    getattr(data_aggregator, f"add_{region}_entry")(image_name, entry[region])
+            entries += 1
+        for crop_path, placeholder in result['placeholders'].items():
+            asset_manifest.publish(crop_path, placeholder=placeholder)
+            published += 1
+        errors += result['failed']
+
+    asset_manifest.save()
+    output_stem = os.path.splitext(output_file)[0]
+    write_outputs(data_aggregator.get_aggregated_data(), output_file, f"{output_stem}.facets.json",
+                  shards_dir, ErrorLogger())
+    return {'entries': entries, 'published': published, 'errors': errors}
+
+
+def build_pages(collections: List[str], page_args: Optional[List[str]] = None,
+                thumbnail_dir: str = ADDRESS_OUTPUT_DIR) -> None:
+    """
+    Rebuild the thumbnail atlases, then regenerate the site pages.
+
+    Args:
+        collections: Collection IDs whose atlases to rebuild, e.g. ["P064"]
+        page_args: Command-line arguments for generate_assembly_pages.main()
+        thumbnail_dir: Directory holding <collection>/ thumbnail folders
+    """
+    from build_thumbnail_atlas import build_collection_atlas
+    import generate_assembly_pages
+
+    asset_manifest = AssetManifest()
+    for collection in collections:
+        if not os.path.isdir(os.path.join(thumbnail_dir, collection.lower())):
+            continue
+        result = build_collection_atlas(collection, asset_manifest, thumbnail_dir=thumbnail_dir)
+        print(f"Atlas: {result['tiles']} tiles in {result['sheets']} sheets -> {result['map_path']}")
+    asset_manifest.save()
+    generate_assembly_pages.main(page_args or [])
+
+
+def main():
+    """Run the document pipeline over the PDF collections and publish the results."""
+    import argparse
+
+    from ocr_backends import BACKENDS
+
+    parser = argparse.ArgumentParser(description='Run render -> crop -> preprocess -> OCR -> aggregate -> publish concurrently')
+    parser.add_argument('--collection', action='append',
+                        help='PDF collection directory, e.g. P064 (repeatable; default: P064)')
+    parser.add_argument('--region', action='append', type=parse_region, default=[],
+                        help='Text region within the address crop as NAME=LEFT,TOP,WIDTH,HEIGHT '
+                             f'(repeatable; default: gaam={",".join(map(str, TEXT_REGIONS["gaam"]))})')
+    parser.add_argument('--backend', choices=sorted(BACKENDS), default='pytesseract',
+                        help='OCR backend (fake replays the existing output file)')
+    parser.add_argument('--render-workers', type=int, default=2, help='Render worker threads (default: 2)')
+    parser.add_argument('--crop-workers', type=int, default=1, help='Crop worker threads (default: 1)')
+    parser.add_argument('--preprocess-workers', type=int, default=1, help='Preprocess worker threads (default: 1)')
+    parser.add_argument('--ocr-workers', type=int, default=os.cpu_count() or 1,
+                        help='OCR worker threads (default: CPU count)')
+    parser.add_argument('--queue-size', type=int, default=8, help='Bounded queue size per stage (default: 8)')
+    parser.add_argument('--no-preprocess', action='store_true', help='OCR the raw crops')
+    parser.add_argument('--limit', type=int, help='Process at most this many documents')
+    parser.add_argument('--output', default='extracted_data.json', help='Aggregated JSON output file')
+    parser.add_argument('--cache-dir', default=ARTIFACT_DIR,
+                        help=f'Artifact store for intermediate images and text (default: {ARTIFACT_DIR})')
+    parser.add_argument('--no-cache', action='store_true', help='Compute every artifact without the store')
+    parser.add_argument('--pages', action='store_true',
+                        help='Also rebuild the thumbnail atlases and regenerate the pages')
+    args = parser.parse_args()
+
+    source_dirs = args.collection or ['P064']
+
+    print("Document Pipeline")
+    print("=" * 60)
+
+    run_document_pipeline(
+        source_dirs, dict(args.region) if args.region else None, args.backend,
+        workers={'render': args.render_workers, 'crop': args.crop_workers,
+                 'preprocess': args.preprocess_workers, 'ocr': args.ocr_workers},
+        queue_size=args.queue_size, preprocess=not args.no_preprocess,
+        limit=args.limit, output_file=args.output,
+        artifact_dir=None if args.no_cache else args.cache_dir
+    )
+    if args.pages:
+        build_pages([Path(source_dir).name.upper() for source_dir in source_dirs])
+    json_path, prom_path = get_registry().write(os.path.join(METRICS_DIR, 'pipeline'))
+    print(f"Metrics written to {json_path} and {prom_path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+Preprocessing and Tesseract Parameter Sweep
+
+The factors in preprocess_image (contrast 1.5, brightness 1.1, sharpness
+1.2), the optional bilateral filter and the page segmentation mode were
+chosen by eye. This tool OCRs the region crops of a sample of documents
+with every combination of a grid of settings, across a process pool, and
+scores each combination on:
+
+    cer     character error rate against the hand-checked
+            extracted_data.json (edit distance / reference length,
+            summed over the sample)
+    exact   share of crops read exactly
+    img/s   preprocess + OCR throughput of one process
+
+Crops come from the raw raster cache (raster_cache.py), so each worker
+maps them once instead of rendering PDFs or decoding JPEGs per setting.
+The result is a Pareto table: a combination is on the front (*) if no
+other one is both more accurate and faster. The recommendation is the
+fastest combination whose CER is within the accuracy floor.
+
+Throughput is measured per process while the others run, so compare rows
+of one sweep rather than across machines or process counts.
+
+Usage:
+    python sirgujarat.py sweep --limit 100 --max-cer 0.05
+    python sirgujarat.py sweep --contrast 1.0,1.5,2.0 --denoise none,9:75:75 --psm 6,7
+
+    from preprocess_sweep import DEFAULT_GRID, build_grid, run_sweep, print_pareto_table
+
+    results = run_sweep(documents, {'gaam': (800, 50, 226, 71)}, build_grid(DEFAULT_GRID))
+    print_pareto_table(results, max_cer=0.05)
+"""
+
+import re
+import json
+import time
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+from typing import Dict, List, Optional
+
+from pipeline import OCR_CONFIG, PREPROCESS_PARAMS
+from raster_cache import RASTER_CACHE_DIR, RASTER_CACHE_MAX_BYTES, RasterCache, page_region
+
+
+# Values swept per setting; the current preprocess_image defaults are included
+DEFAULT_GRID = {
+    'contrast': [1.0, 1.5, 2.0],
+    'brightness': [1.0, 1.1],
+    'sharpness': [1.0, 1.2, 2.0],
+    'denoise': [None, (5, 50, 50), (9, 75, 75)],
+    'psm': [6, 7],
+}
+
+
+def current_setting(preprocess_params: Optional[Dict] = None, ocr_config: str = OCR_CONFIG) -> Dict:
+    """
+    Build the setting the pipeline runs with, in the shape of a grid entry.
+
+    Args:
+        preprocess_params: preprocess_image keyword arguments, e.g. from the
+                           [ocr] table (default: PREPROCESS_PARAMS)
+        ocr_config: Tesseract options, read for the page segmentation mode
+
+    Returns:
+        {setting name: value} with the keys of DEFAULT_GRID
+    """
+    match = re.search(r'--psm\s+(\d+)', ocr_config)
+    setting = dict(PREPROCESS_PARAMS, **(preprocess_params or {}))
+    setting['psm'] = int(match.group(1)) if match else None
+    return setting
+
+
+def build_grid(grid: Dict[str, List]) -> List[Dict]:
+    """
+    Expand a grid into every combination of its values.
+
+    Args:
+        grid: {setting name: values}, with the keys of DEFAULT_GRID
+
+    Returns:
+        List of {setting name: value} dictionaries
+    """
+    unknown = set(grid) - set(DEFAULT_GRID)
+    if unknown:
+        raise ValueError(f"Unknown sweep settings: {', '.join(sorted(unknown))}")
+    grid = dict(DEFAULT_GRID, **grid)
+    names = list(DEFAULT_GRID)
+    return [dict(zip(names, values)) for values in product(*(grid[name] for name in names))]
+
+
+def normalize_text(text: Optional[str]) -> str:
+    """NFC-normalize text and collapse whitespace, so only real misreads count."""
+    return ' '.join(unicodedata.normalize('NFC', text or '').split())
+
+
+def edit_distance(reference: str, hypothesis: str) -> int:
+    """Return the Levenshtein distance between two strings, counted in code points."""
+    previous = list(range(len(hypothesis) + 1))
+    for i, ref_char in enumerate(reference, start=1):
+        current = [i]
+        for j, hyp_char in enumerate(hypothesis, start=1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1,
+                               previous[j - 1] + (ref_char != hyp_char)))
+        previous = current
+    return previous[-1]
+
+
+def character_error_rate(reference: str, hypothesis: str) -> float:
+    """Return the edit distance divided by the reference length (1.0 for an empty reference and any output)."""
+    reference, hypothesis = normalize_text(reference), normalize_text(hypothesis)
+    if not reference:
+        return float(bool(hypothesis))
+    return edit_distance(reference, hypothesis) / len(reference)
+
+
+def load_ground_truth(output_file: str, documents: List[Dict], regions: Dict[str, tuple]) -> List[Dict]:
+    """
+    Pair each document region with its hand-checked text.
+
+    Args:
+        output_file: extracted_data.json style file
+        documents: discover_documents() items
+        regions: {region name: box within the address crop}
+
+    Returns:
+        List of {'image_name', 'region', 'pdf_path', 'truth'}; regions without
+        a checked value are left out
+    """
+    with open(output_file, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    samples = []
+    for document in documents:
+        entry = data.get(document['image_name']) or {}
+        for region in regions:
+            truth = normalize_text(entry.get(region))
+            if truth:
+                samples.append({'image_name': document['image_name'], 'region': region,
+                                'pdf_path': str(document['pdf_path']), 'truth': truth})
+    return samples
+
+
+# Per-process state for worker pools, set by _init_worker
+_worker_state = {}
+
+
+def _init_worker(samples, regions, backend, output_file, cache_root, cache_max_bytes, dpi, address_region):
+    """Map the sample crops and create the OCR backends once in each worker process."""
+    from ocr_backends import FakeOCRBackend, create_backend
+
+    cache = RasterCache(cache_root, cache_max_bytes)
+    _worker_state['samples'] = [
+        dict(sample, raster=cache.get(sample['pdf_path'],
+                                      page_region(address_region, regions[sample['region']]), dpi))
+        for sample in samples
+    ]
+    if backend == 'fake':
+        _worker_state['backends'] = {region: FakeOCRBackend.from_extracted_data(output_file, field=region)
+                                     for region in regions}
+    else:
+        shared = create_backend(backend)
+        _worker_state['backends'] = {region: shared for region in regions}
+
+
+def _evaluate(setting: Dict) -> Dict:
+    """OCR every sample crop with one setting and score it."""
+    from PIL import Image
+    from gujarati_text_extractor import preprocess_image
+
+    config = f"--oem 3 --psm {setting['psm']}"
+    errors = chars = exact = 0
+    elapsed = 0.0
+    for sample in _worker_state['samples']:
+        start = time.perf_counter()
+        image = preprocess_image(Image.fromarray(sample['raster']), setting['contrast'],
+                                 setting['brightness'], setting['sharpness'], setting['denoise'])
+        text = _worker_state['backends'][sample['region']].extract(
+            image, language='guj', config=config, image_name=sample['image_name'])
+        elapsed += time.perf_counter() - start
+
+        text = normalize_text(text)
+        errors += edit_distance(sample['truth'], text)
+        chars += len(sample['truth'])
+        exact += text == sample['truth']
+
+    images = len(_worker_state['samples'])
+    return {
+        'setting': setting,
+        'images': images,
+        'cer': errors / chars if chars else 0.0,
+        'exact': exact / images if images else 0.0,
+        'elapsed': elapsed,
+        'images_per_second': images / elapsed if elapsed else 0.0,
+    }
+
+
+def run_sweep(documents: List[Dict], regions: Dict[str, tuple], settings: List[Dict],
+              backend: str = 'pytesseract', processes: int = 1, output_file: str = 'extracted_data.json',
+              cache_root: str = RASTER_CACHE_DIR, cache_max_bytes: int = RASTER_CACHE_MAX_BYTES,
+              dpi: int = 150, address_region: Optional[tuple] = None) -> List[Dict]:
+    """
+    Score every setting on the region crops of the documents.
+
+    Args:
+        documents: discover_documents() items
+        regions: {region name: (left, top, width, height)} within the address crop
+        settings: Combinations from build_grid()
+        backend: OCR backend name ('fake' replays output_file, so every CER is 0)
+        processes: Worker processes (1 evaluates in this process)
+        output_file: Hand-checked extracted_data.json
+        cache_root: Raster cache directory
+        cache_max_bytes: Raster cache size cap
+        dpi: Render resolution
+        address_region: Address box on the page (default: pipeline.ADDRESS_REGION)
+
+    Returns:
+        One result per setting, in settings order: {'setting', 'images', 'cer',
+        'exact', 'elapsed', 'images_per_second'}
+    """
+    if address_region is None:
+        from pipeline import ADDRESS_REGION as address_region
+
+    samples = load_ground_truth(output_file, documents, regions)
+    # Fill the cache here, so the workers only map the crops
+    cache = RasterCache(cache_root, cache_max_bytes)
+    for sample in samples:
+        cache.get(sample['pdf_path'], page_region(address_region, regions[sample['region']]), dpi)
+
+    init_args = (samples, regions, backend, output_file, cache_root, cache_max_bytes, dpi,
+                 tuple(address_region))
+    if processes > 1 and len(settings) > 1:
+        with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker,
+                                 initargs=init_args) as executor:
+            return list(executor.map(_evaluate, settings))
+
+    _init_worker(*init_args)
+    return [_evaluate(setting) for setting in settings]
+
+
+def pareto_front(results: List[Dict]) -> List[int]:
+    """
+    Return the indices of results no other result beats on both CER and speed.
+
+    A result is dominated if another one has a lower or equal CER and a
+    higher or equal throughput, and is strictly better on at least one.
+    """
+    front = []
+    for index, result in enumerate(results):
+        dominated = any(
+            other['cer'] <= result['cer'] and other['images_per_second'] >= result['images_per_second']
+            and (other['cer'] < result['cer'] or other['images_per_second'] > result['images_per_second'])
+            for other in results
+        )
+        if not dominated:
+            front.append(index)
+    return front
+
+
+def choose_setting(results: List[Dict], max_cer: float) -> Optional[Dict]:
+    """Return the fastest result with a CER within max_cer, or None if none qualifies."""
+    candidates = [result for result in results if result['cer'] <= max_cer]
+    return max(candidates, key=lambda result: result['images_per_second']) if candidates else None
+
+
+def format_setting(setting: Dict) -> str:
+    """Format a setting compactly, e.g. 'c1.5 b1.1 s1.2 bilateral=none psm6'."""
+    denoise = 'none' if setting['denoise'] is None else ':'.join(str(v) for v in setting['denoise'])
+    return (f"c{setting['contrast']} b{setting['brightness']} s{setting['sharpness']} "
+            f"bilateral={denoise} psm{setting['psm']}")
+
+
+def print_pareto_table(results: List[Dict], max_cer: float = 0.05, limit: Optional[int] = 20,
+                       current: Optional[Dict] = None) -> None:
+    """
+    Print the results ranked by CER, marking the Pareto front and the recommendation.
+
+    Args:
+        results: run_sweep() results
+        max_cer: Accuracy floor for the recommendation
+        limit: Print at most this many rows besides the front (None: all)
+        current: Setting marked "(current)" (default: current_setting())
+    """
+    current = current or current_setting()
+    front = set(pareto_front(results))
+    chosen = choose_setting(results, max_cer)
+    ranked = sorted(range(len(results)),
+                    key=lambda i: (results[i]['cer'], -results[i]['images_per_second']))
+    shown = [i for i in ranked if i in front] + [i for i in ranked if i not in front][:limit]
+    shown.sort(key=ranked.index)
+
+    print(f"{'':2} {'setting':<40} {'cer':>7} {'exact':>6} {'img/s':>8}")
+    print("-" * 66)
+    for index in shown:
+        result = results[index]
+        marks = ('*' if index in front else ' ') + ('>' if result is chosen else ' ')
+        note = '  (current)' if result['setting'] == current else ''
+        print(f"{marks} {format_setting(result['setting']):<40} {result['cer']:>7.2%} "
+              f"{result['exact']:>6.1%} {result['images_per_second']:>8.1f}{note}")
+    print("-" * 66)
+    print(f"* Pareto front ({len(front)} of {len(results)} combinations)")
+    if chosen is None:
+        print(f"No combination is within the accuracy floor of {max_cer:.2%} CER")
+    else:
+        print(f"> Fastest within {max_cer:.2%} CER: {format_setting(chosen['setting'])}")
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Raw Raster Cache for Preprocessing and OCR Experiments
+
+Trying new enhance_contrast/enhance_brightness/enhance_sharpness factors
+or OCR settings should not mean re-rendering PDFs or re-decoding lossy
+address JPEGs. This cache keeps rendered grayscale crops uncompressed as
+.npy files, keyed by the PDF's SHA-256, the crop box and the DPI. A
+cached crop opens with np.load(mmap_mode='r'), so loading costs a page
+fault rather than a decode, and the pixels are exactly the rendered ones.
+
+Boxes are in page pixels at the given DPI; page_region() converts a text
+region of the address crop (e.g. gaam) to page coordinates. The cache
+has a size cap. Every hit refreshes the file's modification time, and
+when a write takes the cache over its cap, the least recently used files
+are deleted down to 90% of the cap.
+
+Layout (under .cache/rasters by default, not committed):
+    ab/abcdef0123....npy     uint8 array of shape (height, width)
+
+Usage:
+    python sirgujarat.py rasters --limit 200      # fill the cache
+
+    from raster_cache import RasterCache, page_region
+
+    cache = RasterCache(max_bytes=256 * 1024 * 1024)
+    gaam = cache.get('P064/P0640001.pdf', page_region(ADDRESS_REGION, (800, 50, 226, 71)))
+    image = Image.fromarray(gaam)                 # shares the mapped pixels
+"""
+
+import os
+import threading
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+
+from artifact_store import artifact_key, file_digest
+
+
+RASTER_CACHE_DIR = '.cache/rasters'
+RASTER_CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+# Fraction of the cap that eviction brings the cache down to, so that a
+# full cache does not evict on every write
+EVICT_TO = 0.9
+
+
+def page_region(address_region: tuple, box: tuple) -> tuple:
+    """
+    Convert a box within the address crop to page coordinates.
+
+    Args:
+        address_region: (left, top, width, height) of the address on the page
+        box: (left, top, width, height) within the address crop
+
+    Returns:
+        (left, top, width, height) on the page
+    """
+    return (address_region[0] + box[0], address_region[1] + box[1], box[2], box[3])
+
+
+class RasterCache:
+    """Stores rendered grayscale crops as memory-mappable .npy files with LRU eviction."""
+
+    def __init__(self, root: str = RASTER_CACHE_DIR, max_bytes: int = RASTER_CACHE_MAX_BYTES):
+        """
+        Initialize the cache.
+
+        Args:
+            root: Directory holding the .npy files (created on first write)
+            max_bytes: Size cap of the cache directory
+        """
+        if max_bytes < 1:
+            raise ValueError("max_bytes must be positive")
+        self.root = root
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._size = None
+        self._digests = {}
+        self._stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+    def key(self, pdf_path: str, region: tuple, dpi: int = 150) -> str:
+        """Return the key of a crop; the PDF digest is computed once per path."""
+        path = os.fspath(pdf_path)
+        if path not in self._digests:
+            self._digests[path] = file_digest(path)
+        return artifact_key('raster', {'pdf': self._digests[path], 'box': list(region), 'dpi': dpi})
+
+    def path(self, key: str) -> str:
+        """Return the file path of a cached crop."""
+        return os.path.join(self.root, key[:2], f"{key}.npy")
+
+    def get(self, pdf_path: str, region: tuple, dpi: int = 150) -> np.ndarray:
+        """
+        Return a grayscale crop of a PDF's first page, rendering it on a miss.
+
+        Args:
+            pdf_path: Path to the PDF
+            region: (left, top, width, height) in page pixels at the DPI
+            dpi: Render resolution
+
+        Returns:
+            Read-only uint8 array of shape (height, width), memory-mapped
+            from the cache file
+        """
+        path = self.path(self.key(pdf_path, region, dpi))
+        try:
+            array = np.load(path, mmap_mode='r')
+        except FileNotFoundError:
+            self._count('misses')
+            self.put(path, self._render(pdf_path, region, dpi))
+            return np.load(path, mmap_mode='r')
+
+        self._count('hits')
+        # The modification time is the LRU clock
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        return array
+
+    def put(self, path: str, array: np.ndarray) -> None:
+        """
+        Write a crop atomically, then evict if the cache is over its cap.
+
+        Args:
+            path: Cache file path from path()
+            array: uint8 array to store
+        """
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, 'wb') as f:
+            np.save(f, array)
+        os.replace(temp_path, path)
+
+        size = os.path.getsize(path)
+        with self._lock:
+            if self._size is None:
+                self._size = self.size()
+            else:
+                self._size += size
+            if self._size > self.max_bytes:
+                self._size = self._evict(int(self.max_bytes * EVICT_TO))
+
+    def size(self) -> int:
+        """Return the total size of the cached files in bytes."""
+        return sum(entry['size'] for entry in self._entries())
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit, miss and eviction counts since the cache was opened."""
+        with self._lock:
+            return dict(self._stats)
+
+    def _render(self, pdf_path: str, region: tuple, dpi: int) -> np.ndarray:
+        """Render a crop with PyMuPDF."""
+        from extract_pdf_thumbnails import render_region_gray
+
+        pixmap = render_region_gray(pdf_path, region, dpi)
+        # samples (bytes) rather than samples_mv: the array outlives the pixmap
+        return np.frombuffer(pixmap.samples, dtype=np.uint8).reshape(pixmap.height, pixmap.width)
+
+    def _evict(self, target: int) -> int:
+        """Delete the least recently used files until the cache is at most target bytes."""
+        entries = sorted(self._entries(), key=lambda entry: entry['used'])
+        size = sum(entry['size'] for entry in entries)
+        for entry in entries:
+            if size <= target:
+                break
+            try:
+                # Arrays already mapped by callers stay valid after the unlink
+                os.remove(entry['path'])
+            except FileNotFoundError:
+                pass
+            size -= entry['size']
+            self._stats['evictions'] += 1
+        return size
+
+    def _entries(self) -> List[Dict]:
+        """List the cached files with their size and last use."""
+        entries = []
+        if not os.path.isdir(self.root):
+            return entries
+        for directory in os.scandir(self.root):
+            if not directory.is_dir():
+                continue
+            for entry in os.scandir(directory.path):
+                if entry.name.endswith('.npy'):
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    entries.append({'path': entry.path, 'size': stat.st_size, 'used': stat.st_mtime})
+        return entries
+
+    def _count(self, outcome: str) -> None:
+        """Increment a hit or miss counter."""
+        with self._lock:
+            self._stats[outcome] += 1
+
+
+def iter_region_rasters(cache: RasterCache, documents: List[Dict], regions: Dict[str, tuple],
+                        dpi: int = 150, address_region: Optional[tuple] = None) -> Iterator[tuple]:
+    """
+    Yield the cached crops of text regions for a list of documents.
+
+    Args:
+        cache: RasterCache to read through
+        documents: discover_documents() items
+        regions: {region name: (left, top, width, height)} within the address crop
+        dpi: Render resolution
+        address_region: Address box on the page (default: pipeline.ADDRESS_REGION)
+
+    Yields:
+        (image_name, region name, read-only uint8 array)
+    """
+    if address_region is None:
+        from pipeline import ADDRESS_REGION as address_region
+
+    for document in documents:
+        for region, box in regions.items():
+            yield (document['image_name'], region,
+                   cache.get(document['pdf_path'], page_region(address_region, box), dpi))
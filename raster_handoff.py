@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+"""
+Shared-Memory Raster Handoff between Render and OCR Processes
+
+Runs rendering and OCR in separate process pools without pickling page
+images or writing them to files. The address regions travel through a
+ring of fixed-size slots in one multiprocessing.shared_memory block:
+
+    render processes                          OCR processes
+      acquire a free slot  <-- free queue <--   release the slot
+      render the address region in grayscale
+      copy the pixmap into the slot
+      publish (slot, shape, name) --> ready queue --> view the slot as a
+                                                      NumPy array (no copy),
+                                                      crop the text regions
+
+Only slot numbers and a few bytes of metadata cross the process boundary.
+The renderer makes one copy (PyMuPDF cannot render into a caller's
+buffer); the OCR side views the slot in place and copies only the small
+text-region crops it hands to the OCR backend. A full ring blocks the
+renderers, so memory stays bounded at slots x region size.
+
+Every process counts rasters, copies and copied bytes, busy time and the
+time spent waiting on the ring (renderers waiting for a free slot means
+OCR is the bottleneck; OCR waiting for a ready slot means rendering is).
+Each process also records its stage timings in a fresh metrics registry,
+which it sends back when it finishes so the parent's default registry
+covers the whole run.
+
+Usage:
+    python sirgujarat.py bench --render-processes 2 --ocr-processes 4
+
+    from raster_handoff import run_handoff_pipeline, print_handoff_summary
+
+    summary = run_handoff_pipeline(documents, {'gaam': (800, 50, 226, 71)}, backend='fake',
+                                   render_processes=2, ocr_processes=4)
+    print_handoff_summary(summary)
+"""
+
+import os
+import time
+import queue
+import multiprocessing
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from metrics import MetricsRegistry, get_registry, set_registry
+from pipeline import ADDRESS_REGION, OCR_CONFIG, PREPROCESS_PARAMS
+
+
+class RasterRing:
+    """
+    Fixed-size slots in shared memory, handed out through a free and a ready queue.
+
+    The creating process owns the block and must unlink() it; worker
+    processes receive the ring as a Process argument and attach by name.
+    """
+
+    def __init__(self, slots: int, shape: tuple, context=None):
+        """
+        Create the ring.
+
+        Args:
+            slots: Number of rasters that can be in flight at once
+            shape: (height, width) of the largest raster, one byte per pixel
+            context: multiprocessing context for the queues (default: the default context)
+        """
+        if slots < 1:
+            raise ValueError("A raster ring needs at least one slot")
+        context = context or multiprocessing.get_context()
+        self.slots = slots
+        self.shape = tuple(shape)
+        self.slot_size = self.shape[0] * self.shape[1]
+        self._shm = shared_memory.SharedMemory(create=True, size=slots * self.slot_size)
+        self._owner = True
+        self._free = context.Queue()
+        self._ready = context.Queue()
+        for slot in range(slots):
+            self._free.put(slot)
+
+    def __getstate__(self) -> Dict:
+        """Pickle the ring by the name of its block (used by the spawn start method)."""
+        state = dict(self.__dict__)
+        state['_shm'] = self._shm.name
+        state['_owner'] = False
+        return state
+
+    def __setstate__(self, state: Dict) -> None:
+        """Attach to the block of an existing ring."""
+        self.__dict__.update(state)
+        # Child processes share the creator's resource tracker, so attaching
+        # does not add a second registration; the creator unlinks the block
+        self._shm = shared_memory.SharedMemory(name=state['_shm'])
+
+    @property
+    def name(self) -> str:
+        """Name of the shared memory block."""
+        return self._shm.name
+
+    def acquire(self, timeout: Optional[float] = None) -> int:
+        """
+        Take a free slot, blocking while every slot is in flight.
+
+        Raises:
+            queue.Empty: If no slot became free within the timeout
+        """
+        return self._free.get(timeout=timeout)
+
+    def write(self, slot: int, samples, height: int, width: int) -> np.ndarray:
+        """
+        Copy one raster into a slot.
+
+        Args:
+            slot: Slot from acquire()
+            samples: Buffer of height * width bytes, e.g. a pixmap's samples_mv
+            height: Raster height
+            width: Raster width
+
+        Returns:
+            The slot's view of the raster
+        """
+        if height > self.shape[0] or width > self.shape[1]:
+            raise ValueError(f"Raster {width}x{height} does not fit a {self.shape[1]}x{self.shape[0]} slot")
+        view = self.view(slot, height, width)
+        view[...] = np.frombuffer(samples, dtype=np.uint8, count=height * width).reshape(height, width)
+        return view
+
+    def view(self, slot: int, height: int, width: int) -> np.ndarray:
+        """Return a slot's raster as a NumPy array backed by the shared memory (no copy)."""
+        offset = slot * self.slot_size
+        return np.ndarray((height, width), dtype=np.uint8, buffer=self._shm.buf, offset=offset)
+
+    def publish(self, slot: int, meta: Dict) -> None:
+        """Hand a written slot to the readers; meta must include 'height' and 'width'."""
+        self._ready.put((slot, meta))
+
+    def receive(self, timeout: Optional[float] = None):
+        """
+        Take the next written slot.
+
+        Returns:
+            (slot, meta), or None once end() has been called for this reader
+
+        Raises:
+            queue.Empty: If nothing arrived within the timeout
+        """
+        return self._ready.get(timeout=timeout)
+
+    def release(self, slot: int) -> None:
+        """Return a slot to the free queue once its raster is no longer used."""
+        self._free.put(slot)
+
+    def end(self, readers: int) -> None:
+        """Tell each reader that no more rasters are coming."""
+        for _ in range(readers):
+            self._ready.put(None)
+
+    def close(self) -> None:
+        """Detach from the block; the owner also unlinks it."""
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+
+
+def _new_stats() -> Dict:
+    """Per-process counters."""
+    return {'processes': 1, 'rasters': 0, 'copies': 0, 'bytes_copied': 0,
+            'busy_time': 0.0, 'wait_time': 0.0, 'errors': 0}
+
+
+def _render_worker(ring: RasterRing, tasks, results, dpi: int, address_region: tuple) -> None:
+    """Render the address region of each document into a ring slot."""
+    from extract_pdf_thumbnails import render_region_gray
+
+    # A forked process inherits the parent's registry; start empty so only
+    # this process's metrics are sent back
+    set_registry(MetricsRegistry())
+    stats = _new_stats()
+    try:
+        while True:
+            document = tasks.get()
+            if document is None:
+                break
+
+            wait_start = time.perf_counter()
+            slot = ring.acquire()
+            start = time.perf_counter()
+            stats['wait_time'] += start - wait_start
+            try:
+                pixmap = render_region_gray(document['pdf_path'], address_region, dpi)
+                ring.write(slot, pixmap.samples_mv, pixmap.height, pixmap.width)
+            except Exception as e:
+                ring.release(slot)
+                stats['errors'] += 1
+                results.put(('error', document['image_name'], 'render', str(e)))
+                continue
+            finally:
+                stats['busy_time'] += time.perf_counter() - start
+
+            stats['rasters'] += 1
+            stats['copies'] += 1
+            stats['bytes_copied'] += pixmap.height * pixmap.width
+            ring.publish(slot, {'image_name': document['image_name'],
+                                'height': pixmap.height, 'width': pixmap.width})
+    finally:
+        results.put(('done', 'render', stats, get_registry().to_dict()))
+
+
+def _ocr_worker(ring: RasterRing, results, regions: Dict[str, tuple], backend: str,
+                preprocess: bool, output_file: str, preprocess_params: Dict) -> None:
+    """Crop the text regions from each ring slot and OCR them."""
+    from PIL import Image
+    from gujarati_text_extractor import preprocess_image
+    from ocr_backends import FakeOCRBackend, create_backend
+
+    # One backend per region, as the fake backend replays one field
+    if backend == 'fake':
+        backends = {region: FakeOCRBackend.from_extracted_data(output_file, field=region) for region in regions}
+    else:
+        shared = create_backend(backend)
+        backends = {region: shared for region in regions}
+
+    set_registry(MetricsRegistry())
+    stats = _new_stats()
+    try:
+        while True:
+            wait_start = time.perf_counter()
+            message = ring.receive()
+            start = time.perf_counter()
+            stats['wait_time'] += start - wait_start
+            if message is None:
+                break
+
+            slot, meta = message
+            try:
+                raster = ring.view(slot, meta['height'], meta['width'])
+                for region, (left, top, width, height) in regions.items():
+                    try:
+                        # The slice is a view into shared memory; the backend
+                        # needs its own image, so this region is the only copy
+                        image = Image.fromarray(raster[top:top + height, left:left + width])
+                        stats['copies'] += 1
+                        stats['bytes_copied'] += image.width * image.height
+                        if preprocess:
+                            image = preprocess_image(image, **preprocess_params)
+                        text = backends[region].extract(image, language='guj', config=OCR_CONFIG,
+                                                        image_name=meta['image_name'])
+                        results.put(('entry', meta['image_name'], region, text.strip()))
+                    except Exception as e:
+                        stats['errors'] += 1
+                        results.put(('error', meta['image_name'], f"ocr:{region}", str(e)))
+                del raster
+            finally:
+                ring.release(slot)
+                stats['rasters'] += 1
+                stats['busy_time'] += time.perf_counter() - start
+    finally:
+        for instance in set(backends.values()):
+            instance.close()
+        results.put(('done', 'ocr', stats, get_registry().to_dict()))
+
+
+def run_handoff_pipeline(documents: List[Dict], regions: Dict[str, tuple], backend: str = 'pytesseract',
+                         render_processes: int = 1, ocr_processes: int = 1, slots: Optional[int] = None,
+                         dpi: int = 150, address_region: tuple = ADDRESS_REGION, preprocess: bool = True,
+                         output_file: str = 'extracted_data.json',
+                         preprocess_params: Optional[Dict] = None) -> Dict:
+    """
+    OCR documents with separate render and OCR process pools joined by a RasterRing.
+
+    Args:
+        documents: discover_documents() items
+        regions: {region name: (left, top, width, height)} within the address crop
+        backend: OCR backend name ('fake' replays output_file)
+        render_processes: Render processes
+        ocr_processes: OCR processes
+        slots: Ring slots (default: two per process)
+        dpi: Render resolution
+        address_region: (left, top, width, height) of the address on the page
+        preprocess: Apply gujarati_text_extractor.preprocess_image before OCR
+        output_file: Existing aggregated JSON, read by the fake backend
+        preprocess_params: preprocess_image keyword arguments (default: PREPROCESS_PARAMS)
+
+    Returns:
+        dict: {'documents', 'entries': {image_name: {region: text}}, 'errors',
+               'elapsed_time', 'slots', 'slot_bytes', 'render': stats, 'ocr': stats}
+               where stats sum the counters of the pool's processes; the
+               workers' metrics are merged into the default registry
+
+    Raises:
+        RuntimeError: If a worker process dies without reporting
+    """
+    if render_processes < 1 or ocr_processes < 1:
+        raise ValueError("Both pools need at least one process")
+    slots = slots or 2 * (render_processes + ocr_processes)
+    context = multiprocessing.get_context()
+    ring = RasterRing(slots, (address_region[3], address_region[2]), context)
+    tasks = context.Queue()
+    results = context.Queue()
+
+    for document in documents:
+        tasks.put({'image_name': document['image_name'], 'pdf_path': os.fspath(document['pdf_path'])})
+    for _ in range(render_processes):
+        tasks.put(None)
+
+    renderers = [context.Process(target=_render_worker, args=(ring, tasks, results, dpi, address_region))
+                 for _ in range(render_processes)]
+    readers = [context.Process(target=_ocr_worker,
+                               args=(ring, results, regions, backend, preprocess, output_file,
+                                     dict(PREPROCESS_PARAMS, **(preprocess_params or {}))))
+               for _ in range(ocr_processes)]
+
+    summary = {'documents': len(documents), 'entries': {}, 'errors': [], 'slots': slots,
+               'slot_bytes': ring.slot_size, 'render': _new_stats(), 'ocr': _new_stats()}
+    for pool in ('render', 'ocr'):
+        summary[pool]['processes'] = 0
+
+    start_time = time.perf_counter()
+    try:
+        for process in renderers + readers:
+            process.start()
+
+        # Drain results while waiting, so no worker blocks on a full results pipe
+        finished = {'render': 0, 'ocr': 0}
+        while finished['ocr'] < ocr_processes:
+            try:
+                message = results.get(timeout=1.0)
+            except queue.Empty:
+                dead = [p for p in renderers + readers if p.exitcode not in (None, 0)]
+                if dead:
+                    raise RuntimeError(f"Worker process {dead[0].pid} exited with code {dead[0].exitcode}")
+                continue
+
+            if message[0] == 'entry':
+                _, image_name, region, text = message
+                summary['entries'].setdefault(image_name, {})[region] = text
+            elif message[0] == 'error':
+                _, image_name, stage, error = message
+                summary['errors'].append({'image_name': image_name, 'stage': stage, 'message': error})
+            else:
+                _, pool, stats, metrics = message
+                for name, value in stats.items():
+                    summary[pool][name] += value
+                get_registry().merge(metrics)
+                finished[pool] += 1
+                if pool == 'render' and finished['render'] == render_processes:
+                    ring.end(ocr_processes)
+
+        for process in renderers + readers:
+            process.join()
+    finally:
+        for process in renderers + readers:
+            if process.is_alive():
+                process.terminate()
+        ring.close()
+
+    summary['elapsed_time'] = time.perf_counter() - start_time
+    return summary
+
+
+def print_handoff_summary(summary: Dict) -> None:
+    """Print throughput, copy counts and ring waits of a run_handoff_pipeline() summary."""
+    elapsed = summary['elapsed_time']
+    rendered = summary['render']['rasters']
+    print(f"Handoff:    {summary['slots']} slots x {summary['slot_bytes'] / 1024:.0f} KB shared memory")
+    for pool in ('render', 'ocr'):
+        stats = summary[pool]
+        rasters = stats['rasters'] or 1
+        capacity = elapsed * stats['processes'] or 1
+        print(f"  {pool:<7} {stats['processes']:>2} proc  {stats['rasters']:>5} rasters  "
+              f"{stats['copies'] / rasters:.1f} copies/raster  "
+              f"{stats['bytes_copied'] / rasters / 1024:>6.1f} KB copied/raster  "
+              f"busy {100 * stats['busy_time'] / capacity:3.0f}%  "
+              f"waiting {100 * stats['wait_time'] / capacity:3.0f}%  {stats['errors']} errors")
+    if elapsed:
+        print(f"Throughput: {rendered / elapsed:.1f} rasters/second, "
+              f"{rendered * summary['slot_bytes'] / elapsed / 1e6:.1f} MB/second through the ring "
+              f"({elapsed:.2f} seconds)")
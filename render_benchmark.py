@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Rendering Benchmark Suite
+
+Measures what extract_first_page costs under different settings, on a
+fixed set of PDFs (the first N of each collection, so runs on different
+commits see the same files). Two sweeps:
+
+    settings   every combination of DPI, colourspace (rgb/gray) and JPEG
+               optimize=True/False, one document at a time, with the time
+               of each document split into the stage timers (see metrics.py)
+               of render_first_page and save_jpeg:
+                   open     fitz.open
+                   render   rasterizing the first page to a pixmap
+                   convert  pixmap -> PIL image
+                   encode   JPEG encoding (quality 85)
+                   write    writing the file
+    scaling    the production settings (150 dpi, rgb, optimize) with 1, 2,
+               4... workers, in a thread pool (as the render pipeline
+               stage) and in a process pool
+
+The production settings run extract_first_page itself; the other
+combinations call the same render_first_page and save_jpeg with another
+colourspace or optimize value.
+
+Reports are saved as JSON (by default .cache/benchmarks/render-<commit>.json)
+with one entry per settings label, e.g. "dpi150-rgb-optimize", and can be
+compared with the report of an earlier commit; the comparison fails if a
+configuration's throughput dropped by more than the tolerance.
+
+Usage:
+    python sirgujarat.py render-bench
+    python sirgujarat.py render-bench --dpi 150,300 --workers 1,2 --per-collection 5
+    python sirgujarat.py render-bench --compare .cache/benchmarks/render-ac89d21.json
+
+    from render_benchmark import run_render_benchmark, print_render_report, select_pdfs
+
+    report = run_render_benchmark(select_pdfs(['P064', 'P070'], 10))
+    print_render_report(report)
+"""
+
+import os
+import time
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import product
+from typing import Dict, List, Optional
+
+from bench_report import ResourceUsage, latency_summary, report_header
+from metrics import MetricsRegistry, get_registry, set_registry
+
+
+STAGES = ('open', 'render', 'convert', 'encode', 'write')
+
+DEFAULT_DPIS = [100, 150, 200, 300]
+DEFAULT_COLORSPACES = ['rgb', 'gray']
+DEFAULT_OPTIMIZE = [True, False]
+DEFAULT_WORKERS = [1, 2, 4]
+
+# What extract_first_page does today; the scaling sweep runs with these
+PRODUCTION_SETTINGS = {'dpi': 150, 'colorspace': 'rgb', 'optimize': True}
+
+# As extract_pdf_thumbnails.save_jpeg
+JPEG_QUALITY = 85
+
+
+def select_pdfs(source_dirs: List[str], per_collection: int = 10) -> List[str]:
+    """
+    Return the first PDFs of each collection directory, in name order.
+
+    Args:
+        source_dirs: Collection directories, e.g. ["P064", "P070"]
+        per_collection: PDFs taken from each
+
+    Returns:
+        PDF paths
+    """
+    pdfs = []
+    for source_dir in source_dirs:
+        names = sorted(name for name in os.listdir(source_dir) if name.lower().endswith('.pdf'))
+        pdfs.extend(os.path.join(source_dir, name) for name in names[:per_collection])
+    return pdfs
+
+
+def settings_label(settings: Dict) -> str:
+    """Name a settings combination, e.g. 'dpi150-rgb-optimize'."""
+    return f"dpi{settings['dpi']}-{settings['colorspace']}-{'optimize' if settings['optimize'] else 'plain'}"
+
+
+def render_document(pdf_path: str, output_path: str, dpi: int = 150, colorspace: str = 'rgb',
+                    optimize: bool = True) -> int:
+    """
+    Render a PDF's first page to JPEG with extract_first_page's functions.
+
+    The stages are timed into the default metrics registry.
+
+    Args:
+        pdf_path: Source PDF
+        output_path: JPEG to write
+        dpi: Render resolution
+        colorspace: 'rgb' or 'gray'
+        optimize: Pass optimize=True to the JPEG encoder
+
+    Returns:
+        JPEG size in bytes
+
+    Raises:
+        RuntimeError: If extract_first_page fails
+    """
+    from extract_pdf_thumbnails import extract_first_page, render_first_page, save_jpeg
+
+    if colorspace == 'rgb' and optimize:
+        success, error_message = extract_first_page(pdf_path, output_path, dpi)
+        if not success:
+            raise RuntimeError(error_message)
+    else:
+        save_jpeg(render_first_page(pdf_path, dpi, colorspace=colorspace), output_path, optimize=optimize)
+    return os.path.getsize(output_path)
+
+
+def _render_job(job) -> Dict:
+    """
+    Run render_document for one (pdf_path, output_path, settings, isolated) job; used by the worker pools.
+
+    Isolated jobs (in pool processes) time into a registry of their own and
+    return its snapshot for the parent to merge.
+    """
+    pdf_path, output_path, settings, isolated = job
+    if isolated:
+        set_registry(MetricsRegistry())
+    start = time.perf_counter()
+    size = render_document(pdf_path, output_path, **settings)
+    return {
+        'seconds': time.perf_counter() - start,
+        'bytes': size,
+        'metrics': get_registry().to_dict() if isolated else None,
+    }
+
+
+def _run_configuration(pdfs: List[str], output_dir: str, settings: Dict, workers: int = 1,
+                       pool: str = 'thread', repeat: int = 1) -> Dict:
+    """Render every PDF repeat times with one configuration and summarize the timings."""
+    isolated = workers > 1 and pool == 'process'
+    jobs = [(pdf, os.path.join(output_dir, f"{index}.jpg"), settings, isolated)
+            for _ in range(repeat) for index, pdf in enumerate(pdfs)]
+    # The stage timers report to the default registry; pool processes send
+    # theirs back. The warm-up's timings are discarded.
+    previous = get_registry()
+    registry = MetricsRegistry()
+    executor = None
+    try:
+        # Warm up: load fonts and codecs before timing
+        set_registry(MetricsRegistry())
+        _render_job(jobs[0][:3] + (False,))
+
+        if workers > 1:
+            executor_class = ProcessPoolExecutor if pool == 'process' else ThreadPoolExecutor
+            executor = executor_class(max_workers=workers)
+            # Start the workers before timing
+            list(executor.map(time.sleep, [0] * workers))
+
+        set_registry(registry)
+        usage = ResourceUsage()
+        start = time.perf_counter()
+        try:
+            if executor is None:
+                results = [_render_job(job) for job in jobs]
+            else:
+                results = list(executor.map(_render_job, jobs))
+        finally:
+            elapsed = time.perf_counter() - start
+    finally:
+        set_registry(previous)
+        if executor is not None:
+            executor.shutdown()
+    # After shutdown, so the CPU time of reaped pool processes is included
+    resources = usage.stop()
+
+    for result in results:
+        if result['metrics']:
+            registry.merge(result['metrics'])
+    stage_seconds = {entry['labels']['stage']: entry['sum']
+                     for entry in registry.to_dict()['histograms'].get('stage_seconds', [])}
+    return {
+        'settings': settings,
+        'workers': workers,
+        'pool': pool if workers > 1 else 'none',
+        'documents': len(results),
+        'elapsed_time': elapsed,
+        'docs_per_second': len(results) / elapsed if elapsed else 0.0,
+        'stages_ms': {stage: 1000 * stage_seconds.get(stage, 0.0) / len(results) for stage in STAGES},
+        'latency_ms': latency_summary([result['seconds'] for result in results]),
+        'jpeg_kb': sum(result['bytes'] for result in results) / len(results) / 1024,
+        'cpu_time': (None if resources['cpu_time'] is None
+                     else resources['cpu_time'] + resources['child_cpu_time']),
+    }
+
+
+def run_render_benchmark(pdfs: List[str], dpis: List[int] = DEFAULT_DPIS,
+                         colorspaces: List[str] = DEFAULT_COLORSPACES, optimize: List[bool] = DEFAULT_OPTIMIZE,
+                         workers: List[int] = DEFAULT_WORKERS, pools: List[str] = ('thread', 'process'),
+                         repeat: int = 1, output_dir: Optional[str] = None) -> Dict:
+    """
+    Run the settings and scaling sweeps.
+
+    Args:
+        pdfs: PDFs from select_pdfs()
+        dpis: Render resolutions
+        colorspaces: 'rgb' and/or 'gray'
+        optimize: JPEG optimize values
+        workers: Worker counts for the scaling sweep
+        pools: 'thread' and/or 'process' pools for the scaling sweep
+        repeat: Times each PDF is rendered per configuration
+        output_dir: Where JPEGs are written (default: a temporary directory, removed afterwards)
+
+    Returns:
+        dict: report_header() fields plus 'settings' ({label: result}) and
+              'scaling' ({'<pool>-<workers>': result}), where each result has
+              'docs_per_second', 'stages_ms' (mean per document), 'latency_ms',
+              'jpeg_kb' and 'cpu_time'
+    """
+    for colorspace in colorspaces:
+        if colorspace not in ('rgb', 'gray'):
+            raise ValueError(f"Unknown colourspace '{colorspace}', expected rgb or gray")
+    if not pdfs:
+        raise ValueError("No PDFs to benchmark")
+
+    report = report_header('render', {
+        'pdfs': [pdf.replace(os.sep, '/') for pdf in pdfs],
+        'dpis': list(dpis), 'colorspaces': list(colorspaces), 'optimize': list(optimize),
+        'workers': list(workers), 'pools': list(pools), 'repeat': repeat, 'jpeg_quality': JPEG_QUALITY,
+    })
+    work_dir = output_dir or tempfile.mkdtemp(prefix='render-bench-')
+    try:
+        report['settings'] = {}
+        for dpi, colorspace, optimize_jpeg in product(dpis, colorspaces, optimize):
+            settings = {'dpi': dpi, 'colorspace': colorspace, 'optimize': optimize_jpeg}
+            report['settings'][settings_label(settings)] = _run_configuration(
+                pdfs, work_dir, settings, repeat=repeat)
+
+        report['scaling'] = {}
+        for pool, count in product(pools, workers):
+            name = 'serial-1' if count == 1 else f"{pool}-{count}"
+            if name not in report['scaling']:
+                report['scaling'][name] = _run_configuration(
+                    pdfs, work_dir, PRODUCTION_SETTINGS, workers=count, pool=pool, repeat=repeat)
+    finally:
+        if output_dir is None:
+            shutil.rmtree(work_dir, ignore_errors=True)
+    return report
+
+
+def regression_metrics(baseline: Dict) -> List[tuple]:
+    """Return the (metric, 'higher') pairs compare_reports() checks: throughput of every configuration in the baseline."""
+    return ([(f"settings.{label}.docs_per_second", 'higher') for label in baseline.get('settings', {})]
+            + [(f"scaling.{name}.docs_per_second", 'higher') for name in baseline.get('scaling', {})])
+
+
+def print_render_report(report: Dict) -> None:
+    """Print the settings and scaling tables of a render benchmark report."""
+    config = report['config']
+    print(f"Render benchmark at {report['commit']}: {len(config['pdfs'])} PDFs x {config['repeat']}")
+    print()
+    header = ''.join(f"{stage:>8}" for stage in STAGES)
+    print(f"{'settings':<24}{header}{'total':>8}{'p95':>8}{'doc/s':>8}{'KB':>7}")
+    print("-" * 95)
+    for label, result in report['settings'].items():
+        marker = '*' if result['settings'] == PRODUCTION_SETTINGS else ' '
+        stages = ''.join(f"{result['stages_ms'][stage]:>8.1f}" for stage in STAGES)
+        print(f"{marker}{label:<23}{stages}{result['latency_ms']['mean']:>8.1f}{result['latency_ms']['p95']:>8.1f}"
+              f"{result['docs_per_second']:>8.1f}{result['jpeg_kb']:>7.0f}")
+    print("-" * 95)
+    print("Milliseconds per document; * = current extract_first_page settings")
+
+    if report['scaling']:
+        serial = report['scaling'].get('serial-1', {}).get('docs_per_second')
+        print()
+        print(f"{'scaling':<16}{'doc/s':>8}{'speedup':>9}{'p95 ms':>9}{'cpu s':>8}")
+        print("-" * 50)
+        for name, result in report['scaling'].items():
+            speedup = f"{result['docs_per_second'] / serial:>8.2f}x" if serial else f"{'':>9}"
+            cpu = f"{result['cpu_time']:>8.2f}" if result['cpu_time'] is not None else f"{'':>8}"
+            print(f"{name:<16}{result['docs_per_second']:>8.1f}{speedup}{result['latency_ms']['p95']:>9.1f}{cpu}")
+        print("-" * 50)
+        print(f"{settings_label(PRODUCTION_SETTINGS)}; cpu s includes pool processes")
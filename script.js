@@ -10,6 +10,9 @@
 const CONFIG = {
     imageDirectory: 'public/address-images/p064/',
     pdfDirectory: 'P064/',
+    // Size of the cropped address images, so lazy-loaded cards keep their height
+    thumbnailWidth: 1058,
+    thumbnailHeight: 393,
     lazyLoadThreshold: 200,
     searchDebounceDelay: 300,
 };
@@ -22,6 +25,8 @@ let galleryState = {
     allImages: [],
     filteredImages: [],
     imageMetadata: {},
+    documentUrls: {},
+    constituencyData: null,
     searchTerm: '',
     lazyLoadObserver: null,
     filterState: {
@@ -194,16 +199,49 @@ async function initializeGallery() {
  */
 async function fetchImageList() {
     try {
+        // Constituency pages preload their own data slice; use it when present
+        const dataUrl = getConstituencyDataUrl();
+        if (dataUrl) {
+            try {
+                const constituencyData = await loadConstituencyData(dataUrl);
+                if (constituencyData.images.length === 0) {
+                    throw new Error('no thumbnails in this constituency');
+                }
+                galleryState.constituencyData = constituencyData;
+                galleryState.documentUrls = galleryState.constituencyData.documentUrls;
+                galleryState.allImages = galleryState.constituencyData.images;
+                galleryState.filteredImages = [...galleryState.allImages];
+                console.log(`Loaded ${galleryState.allImages.length} images from ${dataUrl}`);
+                return;
+            } catch (error) {
+                console.warn('[Constituency Data] Falling back to the full collection:', error);
+            }
+        }
+        
         // Generate list of images from P0640001 to P0640601
         const imageCount = 601;
         const images = [];
         
+        // The page preloads the collection's atlas map (its hashed URL is
+        // written by the page build), so these cards are drawn from a few
+        // sprite sheets too instead of one request per thumbnail
+        const atlasUrl = getAtlasUrl();
+        const atlas = atlasUrl ? loadAtlas(atlasUrl) : null;
+        const documentUrls = {};
+        
         for (let i = 1; i <= imageCount; i++) {
             const paddedNumber = String(i).padStart(4, '0');
             const filename = `P064${paddedNumber}.jpg`;
             images.push(filename);
+            documentUrls[filename] = {
+                image: `/${CONFIG.imageDirectory}${filename}`,
+                color: null,
+                atlas,
+                pdf: null
+            };
         }
         
+        galleryState.documentUrls = documentUrls;
         galleryState.allImages = images;
         galleryState.filteredImages = [...images];
         
@@ -214,24 +252,184 @@ async function fetchImageList() {
     }
 }
 
+/**
+ * Get the URL of the constituency data file preloaded by this page
+ * @returns {string|null} The data file URL, or null on pages without one
+ */
+function getConstituencyDataUrl() {
+    const link = document.querySelector('link[data-constituency-data]');
+    return link ? link.getAttribute('href') : null;
+}
+
+/**
+ * Get the URL of the atlas map preloaded by this page
+ * @returns {string|null} The coordinate map URL, or null on pages without one
+ */
+function getAtlasUrl() {
+    const link = document.querySelector('link[data-atlas]');
+    return link ? link.getAttribute('href') : null;
+}
+
+/**
+ * Expand inclusive document ID ranges
+ * @param {Array<Array<string>>} ranges - e.g. [["P0640001", "P0640003"]]
+ * @returns {Array<string>} e.g. ["P0640001", "P0640002", "P0640003"]
+ */
+function expandIdRanges(ranges) {
+    const ids = [];
+    
+    ranges.forEach(([first, last]) => {
+        const match = first.match(/^(.*?)(\d+)$/);
+        if (!match || first === last) {
+            ids.push(first);
+            return;
+        }
+        
+        const [, prefix, digits] = match;
+        const end = parseInt(last.slice(prefix.length), 10);
+        for (let number = parseInt(digits, 10); number <= end; number++) {
+            ids.push(prefix + String(number).padStart(digits.length, '0'));
+        }
+    });
+    
+    return ids;
+}
+
+/**
+ * Load a constituency data file written by generate_assembly_pages.py
+ * @param {string} url - Data file URL
+ * @returns {Promise<Object>} locationData (same shape as extracted_data.json),
+ *     images with thumbnails, and thumbnail/PDF URLs, placeholder colour and
+ *     a promise of the collection's atlas map per image
+ */
+async function loadConstituencyData(url) {
+    const response = await fetch(url);
+    if (!response.ok) {
+        throw new Error(`Failed to fetch constituency data: ${response.status} ${response.statusText}`);
+    }
+    const data = await response.json();
+    
+    const locationData = {};
+    data.facets.talukos.forEach((taluko) => {
+        taluko.gaams.forEach((gaam) => {
+            expandIdRanges(gaam.ranges).forEach((docId) => {
+                locationData[docId] = { taluko: taluko.name, gaam: gaam.name };
+            });
+        });
+        // Documents with a taluko but no gaam
+        expandIdRanges(taluko.unassigned ? taluko.unassigned.ranges : []).forEach((docId) => {
+            locationData[docId] = { taluko: taluko.name, gaam: null };
+        });
+    });
+    expandIdRanges(data.facets.unassigned.ranges).forEach((docId) => {
+        locationData[docId] = { taluko: null, gaam: null };
+    });
+    
+    // Sprite-sheet atlases let the grid draw every card from a few requests.
+    // They are not awaited here: cards render first and take their tiles
+    // once the map arrives (see applyAtlasTile)
+    const atlases = Object.values(data.collections).map((collection) =>
+        collection.atlas_url ? loadAtlas(collection.atlas_url) : null
+    );
+    
+    const images = [];
+    const documentUrls = {};
+    Object.values(data.collections).forEach((collection, collectionIndex) => {
+        const atlas = atlases[collectionIndex];
+        const pdfs = new Set(expandIdRanges(collection.pdfs));
+        // Content-hashed copies are cached as immutable; fall back to the bare file
+        const hashes = collection.thumbnail_hashes || [];
+        const colors = collection.thumbnail_colors || [];
+        expandIdRanges(collection.thumbnails).forEach((docId, index) => {
+            const filename = `${docId}.jpg`;
+            images.push(filename);
+            documentUrls[filename] = {
+                image: hashes[index]
+                    ? collection.thumbnail_asset_url.replace('{id}', docId).replace('{hash}', hashes[index])
+                    : collection.thumbnail_url.replace('{id}', docId),
+                color: colors[index] || null,
+                atlas,
+                pdf: pdfs.has(docId) ? collection.pdf_url.replace('{id}', docId) : null
+            };
+        });
+    });
+    
+    return { locationData, images, documentUrls };
+}
+
+/**
+ * Load a sprite-sheet coordinate map written by build_thumbnail_atlas.py
+ * @param {string} url - Coordinate map URL
+ * @returns {Promise<Object|null>} The map, or null if it cannot be loaded
+ *     (cards then load their own thumbnails)
+ */
+async function loadAtlas(url) {
+    try {
+        const response = await fetch(url);
+        if (!response.ok) {
+            throw new Error(`${response.status} ${response.statusText}`);
+        }
+        return await response.json();
+    } catch (error) {
+        console.warn(`[Atlas] Failed to load ${url}:`, error);
+        return null;
+    }
+}
+
+/**
+ * Get the CSS background that shows one document's tile of an atlas
+ * @param {Object} atlas - Coordinate map
+ * @param {string} docId - Document ID, e.g. "P0640001"
+ * @returns {Object|null} {image, size, position, aspectRatio} or null if the
+ *     document has no tile
+ */
+function getAtlasTile(atlas, docId) {
+    const position = atlas.tiles[docId];
+    if (!position) {
+        return null;
+    }
+    
+    const [sheetIndex, x, y] = position;
+    const sheet = atlas.sheets[sheetIndex];
+    const { width, height } = atlas.tile;
+    // Percentages keep the tile aligned at any card width
+    const percent = (offset, sheetSize, tileSize) =>
+        sheetSize > tileSize ? `${(offset / (sheetSize - tileSize)) * 100}%` : '0%';
+    
+    return {
+        image: sheet.url,
+        size: `${(sheet.width / width) * 100}% ${(sheet.height / height) * 100}%`,
+        position: `${percent(x, sheet.width, width)} ${percent(y, sheet.height, height)}`,
+        aspectRatio: `${width} / ${height}`
+    };
+}
+
 /**
  * Load and parse location data from extracted_data.json
  */
 async function loadLocationData() {
     try {
-        console.log('[Location Data] Loading from extracted_data.json...');
-        
-        // Fetch the JSON file
-        const response = await fetch('extracted_data.json');
+        let locationData;
         
-        // Check if fetch was successful
-        if (!response.ok) {
-            throw new Error(`Failed to fetch location data: ${response.status} ${response.statusText}`);
+        if (galleryState.constituencyData) {
+            // Already loaded with this page's constituency data
+            console.log('[Location Data] Using constituency data');
+            locationData = galleryState.constituencyData.locationData;
+        } else {
+            console.log('[Location Data] Loading from extracted_data.json...');
+            
+            // Fetch the JSON file
+            const response = await fetch('extracted_data.json');
+            
+            // Check if fetch was successful
+            if (!response.ok) {
+                throw new Error(`Failed to fetch location data: ${response.status} ${response.statusText}`);
+            }
+            
+            // Parse JSON
+            locationData = await response.json();
         }
         
-        // Parse JSON
-        const locationData = await response.json();
-        
         // Validate that we got an object
         if (!locationData || typeof locationData !== 'object') {
             throw new Error('Invalid location data format: expected an object');
@@ -420,6 +618,9 @@ function populateGaamDropdown(selectedTaluko = null) {
  * Generate image card elements dynamically
  */
 function generateImageCards(images) {
+    if (thumbnailObserver) {
+        thumbnailObserver.disconnect();
+    }
     elements.galleryGrid.innerHTML = '';
     
     images.forEach((filename) => {
@@ -436,20 +637,29 @@ function createImageCard(filename) {
     card.className = 'image-card';
     card.setAttribute('data-filename', filename);
     
-    const imagePath = `/public/address-images/p064/${filename}`;
-    const pdfPath = `${CONFIG.pdfDirectory}${filename.replace('.jpg', '.pdf')}`;
+    const urls = galleryState.documentUrls[filename];
+    const imagePath = urls ? urls.image : `/public/address-images/p064/${filename}`;
+    const pdfPath = urls && urls.pdf ? urls.pdf : `${CONFIG.pdfDirectory}${filename.replace('.jpg', '.pdf')}`;
     
     // Extract metadata
     const metadata = extractImageMetadata(filename);
     galleryState.imageMetadata[filename] = metadata;
     
+    // Placeholder colour shows until the lazy-loaded image arrives
+    const placeholderStyle = urls && urls.color ? ` style="background-color: ${urls.color}"` : '';
+    
+    // An atlas tile replaces the per-document image request; it is applied
+    // when the card scrolls into view and the atlas map has loaded
+    const useAtlas = Boolean(urls && urls.atlas);
+    const imageHtml = useAtlas
+        ? `<div class="atlas-tile" role="img" aria-label="${metadata.documentNumber}"
+                style="aspect-ratio: ${CONFIG.thumbnailWidth} / ${CONFIG.thumbnailHeight}"></div>`
+        : createThumbnailHtml(imagePath, metadata.documentNumber);
+    
     // Create card HTML
     card.innerHTML = `
-        <div class="image-wrapper">
-            <img 
-                src="${imagePath}" 
-                alt="${metadata.documentNumber}"
-            >
+        <div class="image-wrapper"${placeholderStyle}>
+            ${imageHtml}
         </div>
         <div class="card-metadata">
             <div class="card-filename">${metadata.documentNumber}</div>
@@ -471,9 +681,79 @@ function createImageCard(filename) {
         handleImageClick(filename, pdfPath);
     });
     
+    if (useAtlas) {
+        observeThumbnail(card);
+    }
+    
     return card;
 }
 
+/**
+ * Create the HTML of a lazy-loaded thumbnail image
+ */
+function createThumbnailHtml(imagePath, documentNumber) {
+    return `<img 
+                src="${imagePath}" 
+                alt="${documentNumber}"
+                width="${CONFIG.thumbnailWidth}"
+                height="${CONFIG.thumbnailHeight}"
+                loading="lazy"
+                decoding="async"
+            >`;
+}
+
+// Applies atlas tiles to cards as they approach the viewport
+let thumbnailObserver = null;
+
+/**
+ * Apply a card's atlas tile once it is near the viewport
+ * @param {HTMLElement} card - Image card with an .atlas-tile element
+ */
+function observeThumbnail(card) {
+    if (!('IntersectionObserver' in window)) {
+        applyAtlasTile(card);
+        return;
+    }
+    if (!thumbnailObserver) {
+        thumbnailObserver = new IntersectionObserver((entries, observer) => {
+            entries.forEach((entry) => {
+                if (entry.isIntersecting) {
+                    observer.unobserve(entry.target);
+                    applyAtlasTile(entry.target);
+                }
+            });
+        }, { rootMargin: '200px' });
+    }
+    thumbnailObserver.observe(card);
+}
+
+/**
+ * Show a card's atlas tile, waiting for the atlas map if it is still loading
+ * @param {HTMLElement} card - Image card with an .atlas-tile element
+ */
+async function applyAtlasTile(card) {
+    const filename = card.getAttribute('data-filename');
+    const urls = galleryState.documentUrls[filename];
+    const atlas = await urls.atlas;
+    const element = card.querySelector('.atlas-tile');
+    if (!element) {
+        return;
+    }
+    
+    const tile = atlas ? getAtlasTile(atlas, filename.replace('.jpg', '')) : null;
+    if (tile) {
+        Object.assign(element.style, {
+            backgroundImage: `url('${tile.image}')`,
+            backgroundSize: tile.size,
+            backgroundPosition: tile.position,
+            aspectRatio: tile.aspectRatio
+        });
+    } else {
+        // No map or no tile for this document: load its own thumbnail
+        element.outerHTML = createThumbnailHtml(urls.image, element.getAttribute('aria-label'));
+    }
+}
+
 /**
  * Extract metadata from image filename
  */
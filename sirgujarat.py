@@ -0,0 +1,788 @@
+#!/usr/bin/env python3
+"""
+sirgujarat Command-Line Interface
+
+One entry point for every stage of the site build, driven by a shared
+TOML configuration (sirgujarat.toml) instead of paths hard-coded in each
+script:
+
+    python sirgujarat.py render      # PDF first pages -> public/images/<collection>/
+    python sirgujarat.py crop        # pages -> address crops (published) -> region crops
+    python sirgujarat.py ocr         # render/crop/preprocess/OCR/aggregate concurrently,
+                                     # then write and publish extracted_data.json
+    python sirgujarat.py aggregate   # rewrite facets, shards and published data files
+    python sirgujarat.py pages       # thumbnail atlases and site pages
+    python sirgujarat.py bench       # time the document pipeline without writing output
+    python sirgujarat.py bench --render-processes 2 --ocr-processes 4
+                                     # ... with render and OCR process pools sharing
+                                     # rasters through shared memory
+    python sirgujarat.py rasters     # fill the raw raster cache for experiments
+    python sirgujarat.py sweep       # rank preprocessing/Tesseract settings by CER and speed
+    python sirgujarat.py ocr-bench   # OCR speed, latency, CPU, memory and accuracy report
+    python sirgujarat.py render-bench
+                                     # first-page render cost by DPI, colourspace, JPEG
+                                     # optimize and worker count
+    python sirgujarat.py cluster plan|work|status|merge
+                                     # share one ocr run between hosts via lease files
+                                     # in cluster.work_dir on a shared filesystem
+
+Every subcommand runs over all configured collections in one invocation;
+render and ocr push them through a single pipeline, so worker threads and
+OCR backends stay warm from one collection to the next.
+
+Every run ends by writing its counters and per-stage timing histograms
+(see metrics.py) to <cache.metrics>/<command>/metrics.json and, in the
+Prometheus text format, metrics.prom.
+
+Global options:
+    --config PATH        Configuration file (default: sirgujarat.toml if present)
+    --collection ID      Only these collections (repeatable)
+    --metrics            Also print the timing histograms at the end
+
+Configuration (every key is optional; defaults shown in DEFAULT_CONFIG):
+
+    collections = ["P064", "P070"]
+
+    [paths]
+    pdf_root = "."                          # PDFs in <pdf_root>/<collection>/
+    pages = "public/images"                 # full-page renders
+    address_images = "public/address-images"
+    region_images = "public-{region}"       # region crops, e.g. public-gaam
+    output = "extracted_data.json"
+    shards = "data"
+    events = "ocr_events.jsonl"
+
+    [render]
+    dpi = 150
+    address = [133, 425, 1058, 393]         # left, top, width, height
+
+    [regions]                               # within the address crop
+    gaam = [800, 50, 226, 71]
+
+    [ocr]
+    backend = "pytesseract"
+    preprocess = true
+    contrast = 1.5                          # preprocessing enhancement factors
+    brightness = 1.1
+    sharpness = 1.2
+    denoise = []                            # [diameter, sigma_color, sigma_space] of a
+                                            # bilateral filter; empty to skip it
+
+    [workers]                               # 0 = CPU count
+    render = 2
+    crop = 1
+    preprocess = 1
+    ocr = 0
+    pages = 0
+    queue_size = 8
+
+    [cache]
+    artifacts = ".cache/artifacts"          # content-addressed intermediates
+    build_manifest = "build_manifest.json"
+    rasters = ".cache/rasters"              # uncompressed grayscale crops (.npy)
+    rasters_max_mb = 512                    # least recently used crops evicted above this
+    benchmarks = ".cache/benchmarks"        # benchmark reports, one per commit
+    metrics = ".cache/metrics"              # <command>/metrics.json and metrics.prom of the last run
+
+    [cluster]
+    work_dir = ".cache/cluster"             # shared by every host of a run
+    batch_size = 25
+    lease_ttl = 60.0                        # seconds without a heartbeat before reclaiming
+"""
+
+import os
+import copy
+import json
+from pathlib import Path
+from typing import Dict, List, Optional
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    import tomli as tomllib
+
+
+CONFIG_PATH = 'sirgujarat.toml'
+
+DEFAULT_CONFIG = {
+    'collections': ['P064'],
+    'paths': {
+        'pdf_root': '.',
+        'pages': 'public/images',
+        'address_images': 'public/address-images',
+        'region_images': 'public-{region}',
+        'output': 'extracted_data.json',
+        'shards': 'data',
+        'events': 'ocr_events.jsonl',
+    },
+    'render': {
+        'dpi': 150,
+        'address': [133, 425, 1058, 393],
+    },
+    'regions': {
+        'gaam': [800, 50, 226, 71],
+    },
+    'ocr': {
+        'backend': 'pytesseract',
+        'preprocess': True,
+        'contrast': 1.5,
+        'brightness': 1.1,
+        'sharpness': 1.2,
+        'denoise': [],
+    },
+    'workers': {
+        'render': 2,
+        'crop': 1,
+        'preprocess': 1,
+        'ocr': 0,
+        'pages': 0,
+        'queue_size': 8,
+    },
+    'cache': {
+        'artifacts': '.cache/artifacts',
+        'build_manifest': 'build_manifest.json',
+        'rasters': '.cache/rasters',
+        'rasters_max_mb': 512,
+        'benchmarks': '.cache/benchmarks',
+        'metrics': '.cache/metrics',
+    },
+    'cluster': {
+        'work_dir': '.cache/cluster',
+        'batch_size': 25,
+        'lease_ttl': 60.0,
+    },
+}
+
+REGION_NAMES = ('taluko', 'gaam')
+
+
+def load_config(path: Optional[str] = None) -> Dict:
+    """
+    Load the configuration, filling in defaults for missing keys.
+
+    Args:
+        path: TOML file to read; when omitted, sirgujarat.toml is used if it
+              exists and the defaults otherwise
+
+    Returns:
+        Validated configuration dictionary
+
+    Raises:
+        OSError: If an explicitly given file cannot be read
+        ValueError: If the file is not valid TOML or has unknown or invalid settings
+    """
+    config = copy.deepcopy(DEFAULT_CONFIG)
+    if path is None and os.path.exists(CONFIG_PATH):
+        path = CONFIG_PATH
+    if path is None:
+        return config
+
+    with open(path, 'rb') as f:
+        try:
+            loaded = tomllib.load(f)
+        except tomllib.TOMLDecodeError as e:
+            raise ValueError(f"{path}: {e}")
+
+    for key, value in loaded.items():
+        if key not in config:
+            raise ValueError(f"{path}: unknown setting '{key}'")
+        if isinstance(config[key], dict) and not isinstance(value, dict):
+            raise ValueError(f"{path}: '{key}' must be a table")
+        if key == 'regions':
+            # The regions table replaces the default one, so a config can drop gaam
+            config[key] = value
+        elif isinstance(config[key], dict):
+            unknown = sorted(set(value) - set(config[key]))
+            if unknown:
+                raise ValueError(f"{path}: unknown setting '{key}.{unknown[0]}'")
+            config[key].update(value)
+        else:
+            config[key] = value
+
+    validate_config(config, path)
+    return config
+
+
+def validate_config(config: Dict, source: str = 'config') -> None:
+    """
+    Check value types and ranges of a configuration.
+
+    Args:
+        config: Configuration dictionary
+        source: Name used in error messages
+
+    Raises:
+        ValueError: If a setting is invalid
+    """
+    collections = config['collections']
+    if not isinstance(collections, list) or not all(isinstance(c, str) and c for c in collections):
+        raise ValueError(f"{source}: 'collections' must be a list of collection IDs")
+
+    boxes = dict(config['regions'], **{'render.address': config['render']['address']})
+    for name, box in boxes.items():
+        if name != 'render.address' and name not in REGION_NAMES:
+            raise ValueError(f"{source}: unknown region '{name}', expected one of {', '.join(REGION_NAMES)}")
+        if (not isinstance(box, list) or len(box) != 4
+                or not all(isinstance(v, int) and v >= 0 for v in box) or 0 in box[2:]):
+            raise ValueError(f"{source}: region '{name}' must be [left, top, width, height]")
+
+    for name, count in config['workers'].items():
+        if not isinstance(count, int) or count < 0 or (name == 'queue_size' and count == 0):
+            raise ValueError(f"{source}: 'workers.{name}' must be a non-negative integer")
+
+    ocr = config['ocr']
+    for name in ('contrast', 'brightness', 'sharpness'):
+        if isinstance(ocr[name], bool) or not isinstance(ocr[name], (int, float)) or ocr[name] < 0:
+            raise ValueError(f"{source}: 'ocr.{name}' must be a non-negative number")
+    denoise = ocr['denoise']
+    if not isinstance(denoise, list) or len(denoise) not in (0, 3) or not all(isinstance(v, int) for v in denoise):
+        raise ValueError(f"{source}: 'ocr.denoise' must be [] or [diameter, sigma_color, sigma_space]")
+
+    rasters_max_mb = config['cache']['rasters_max_mb']
+    if not isinstance(rasters_max_mb, int) or rasters_max_mb < 1:
+        raise ValueError(f"{source}: 'cache.rasters_max_mb' must be a positive integer")
+
+    cluster = config['cluster']
+    if not isinstance(cluster['batch_size'], int) or cluster['batch_size'] < 1:
+        raise ValueError(f"{source}: 'cluster.batch_size' must be a positive integer")
+    if not isinstance(cluster['lease_ttl'], (int, float)) or cluster['lease_ttl'] <= 0:
+        raise ValueError(f"{source}: 'cluster.lease_ttl' must be a positive number of seconds")
+
+
+def get_workers(config: Dict, stage: str) -> int:
+    """Return the worker count of a stage, with 0 meaning the CPU count."""
+    return config['workers'][stage] or os.cpu_count() or 1
+
+
+def get_preprocess_params(config: Dict) -> Dict:
+    """Return the preprocess_image keyword arguments of the [ocr] table."""
+    ocr = config['ocr']
+    return {
+        'contrast': ocr['contrast'],
+        'brightness': ocr['brightness'],
+        'sharpness': ocr['sharpness'],
+        'denoise': tuple(ocr['denoise']) or None,
+    }
+
+
+def get_pdf_dirs(config: Dict) -> List[str]:
+    """Return the PDF directory of each configured collection."""
+    return [os.path.join(config['paths']['pdf_root'], collection) for collection in config['collections']]
+
+
+def command_render(config: Dict, args) -> None:
+    """Render the first page of every PDF to the pages directory."""
+    from extract_pdf_thumbnails import extract_first_page
+    from pipeline import Pipeline, discover_documents, print_summary
+
+    pages_dir = config['paths']['pages']
+    dpi = config['render']['dpi']
+
+    def render(item):
+        output_path = Path(pages_dir, item['collection'].lower(), f"{item['image_name']}.jpg")
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        success, error_message = extract_first_page(item['pdf_path'], output_path, dpi)
+        if not success:
+            raise RuntimeError(error_message)
+
+    documents = discover_documents(get_pdf_dirs(config), args.limit)
+    print(f"Rendering {len(documents)} PDFs to {pages_dir}/ at {dpi} dpi")
+    pipeline = Pipeline()
+    pipeline.add_stage('render', render, get_workers(config, 'render'), config['workers']['queue_size'])
+    print_summary(pipeline.run(documents))
+
+
+def command_crop(config: Dict, args) -> None:
+    """Crop the address region from the rendered pages, then the text regions from the addresses."""
+    from asset_manifest import AssetManifest
+    from crop_address_image import crop_all_images
+    from extract_pdf_thumbnails import process_image_cropping
+
+    paths = config['paths']
+    asset_manifest = AssetManifest()
+    for collection in config['collections']:
+        folder = collection.lower()
+        address_dir = f"{paths['address_images']}/{folder}"
+        result = process_image_cropping(f"{paths['pages']}/{folder}", address_dir,
+                                        *config['render']['address'], asset_manifest=asset_manifest)
+        asset_manifest.prune(f"{address_dir}/")
+        print(f"{collection}: {result['success']} address crops, {result['failed']} failed")
+
+        for region, box in config['regions'].items():
+            crop_all_images(address_dir, paths['region_images'].format(region=region), *box)
+    asset_manifest.save()
+    print(f"Asset manifest: {asset_manifest.path}")
+
+
+def get_pipeline_options(config: Dict) -> Dict:
+    """Return the document pipeline keyword arguments shared by ocr and cluster work."""
+    return {
+        'regions': {name: tuple(box) for name, box in config['regions'].items()},
+        'workers': {stage: get_workers(config, stage) for stage in ('render', 'crop', 'preprocess', 'ocr')},
+        'queue_size': config['workers']['queue_size'],
+        'preprocess': config['ocr']['preprocess'],
+        'preprocess_params': get_preprocess_params(config),
+        'dpi': config['render']['dpi'],
+        'address_dir': config['paths']['address_images'],
+        'address_region': tuple(config['render']['address']),
+    }
+
+
+def command_ocr(config: Dict, args) -> None:
+    """Run the concurrent document pipeline and publish the aggregated data."""
+    from pipeline import run_document_pipeline
+
+    paths = config['paths']
+    run_document_pipeline(
+        get_pdf_dirs(config),
+        backend=args.backend or config['ocr']['backend'],
+        limit=args.limit,
+        output_file=paths['output'],
+        shards_dir=paths['shards'],
+        events_file=paths['events'],
+        artifact_dir=None if args.no_cache else config['cache']['artifacts'],
+        **get_pipeline_options(config)
+    )
+
+
+def command_aggregate(config: Dict, args) -> None:
+    """Rewrite the facet index, shards and published copies of the aggregated data."""
+    from gujarati_ocr_json_extractor import ErrorLogger, write_outputs
+
+    output_file = config['paths']['output']
+    with open(output_file, 'r', encoding='utf-8') as f:
+        aggregated_data = json.load(f)
+    write_outputs(aggregated_data, output_file, f"{os.path.splitext(output_file)[0]}.facets.json",
+                  config['paths']['shards'], ErrorLogger())
+
+
+def command_pages(config: Dict, args) -> None:
+    """Rebuild the thumbnail atlases and regenerate the site pages."""
+    from pipeline import build_pages
+
+    page_args = ['--workers', str(get_workers(config, 'pages')),
+                 '--build-manifest', config['cache']['build_manifest']]
+    if args.force:
+        page_args.append('--force')
+    build_pages(config['collections'], page_args, thumbnail_dir=config['paths']['address_images'])
+
+
+def command_bench(config: Dict, args) -> None:
+    """Time the document pipeline on the first documents without writing any output."""
+    from artifact_store import ArtifactStore
+    from gujarati_ocr_json_extractor import DataAggregator
+    from ocr_backends import FakeOCRBackend, create_backend
+    from pipeline import build_document_pipeline, discover_documents, print_summary
+
+    backend = args.backend or config['ocr']['backend']
+
+    def make_backend(region):
+        if backend == 'fake':
+            return FakeOCRBackend.from_extracted_data(config['paths']['output'], field=region)
+        return create_backend(backend)
+
+    documents = discover_documents(get_pdf_dirs(config), args.limit)
+    if args.render_processes or args.ocr_processes:
+        from raster_handoff import print_handoff_summary, run_handoff_pipeline
+
+        print(f"Benchmarking {len(documents)} documents with the {backend} backend "
+              f"in separate render and OCR processes")
+        summary = run_handoff_pipeline(
+            documents, {name: tuple(box) for name, box in config['regions'].items()}, backend,
+            render_processes=args.render_processes or 1, ocr_processes=args.ocr_processes or 1,
+            slots=args.slots, dpi=config['render']['dpi'], address_region=tuple(config['render']['address']),
+            preprocess=config['ocr']['preprocess'], output_file=config['paths']['output'],
+            preprocess_params=get_preprocess_params(config)
+        )
+        print_handoff_summary(summary)
+        for error in summary['errors']:
+            print(f"ERROR [{error['stage']}] {error['image_name']}: {error['message']}")
+        return
+
+    pipeline = build_document_pipeline(
+        DataAggregator(), None, make_backend,
+        regions={name: tuple(box) for name, box in config['regions'].items()},
+        dpi=config['render']['dpi'], preprocess=config['ocr']['preprocess'],
+        preprocess_params=get_preprocess_params(config), address_dir=None, address_region=tuple(config['render']['address']),
+        workers={stage: get_workers(config, stage) for stage in ('render', 'crop', 'preprocess', 'ocr')},
+        queue_size=config['workers']['queue_size'],
+        artifact_store=ArtifactStore(config['cache']['artifacts']) if args.cache else None,
+        backend_key=backend
+    )
+    print(f"Benchmarking {len(documents)} documents with the {backend} backend")
+    summary = pipeline.run(documents)
+    print_summary(summary)
+    if summary['elapsed_time']:
+        print(f"Throughput: {len(documents) / summary['elapsed_time']:.1f} documents/second")
+
+
+def open_raster_cache(config: Dict):
+    """Return the configured RasterCache."""
+    from raster_cache import RasterCache
+
+    return RasterCache(config['cache']['rasters'], config['cache']['rasters_max_mb'] * 1024 * 1024)
+
+
+def command_rasters(config: Dict, args) -> None:
+    """Fill the raw raster cache with the region crops used by preprocessing and OCR experiments."""
+    import time
+    from pipeline import discover_documents
+    from raster_cache import iter_region_rasters
+
+    cache = open_raster_cache(config)
+    documents = discover_documents(get_pdf_dirs(config), args.limit)
+    regions = {name: tuple(box) for name, box in config['regions'].items()}
+
+    start = time.perf_counter()
+    crops = sum(1 for _ in iter_region_rasters(cache, documents, regions, config['render']['dpi'],
+                                               tuple(config['render']['address'])))
+    elapsed = time.perf_counter() - start
+
+    stats = cache.stats()
+    print(f"{crops} crops of {len(documents)} documents in {elapsed:.2f} seconds: "
+          f"{stats['hits']} cached, {stats['misses']} rendered, {stats['evictions']} evicted")
+    print(f"{cache.root}: {cache.size() / 1024 / 1024:.1f} of {config['cache']['rasters_max_mb']} MB")
+
+
+def parse_sweep_values(text: str, kind) -> List:
+    """Parse a comma-separated list of sweep values; bilateral filters are DIAMETER:SIGMA_COLOR:SIGMA_SPACE or none."""
+    values = []
+    for value in text.split(','):
+        value = value.strip()
+        if kind == 'denoise':
+            values.append(None if value.lower() == 'none' else tuple(int(v) for v in value.split(':')))
+        else:
+            values.append(kind(value))
+    return values
+
+
+def command_sweep(config: Dict, args) -> None:
+    """Rank preprocessing and Tesseract settings by character error rate and speed."""
+    from pipeline import discover_documents
+    from preprocess_sweep import build_grid, current_setting, print_pareto_table, run_sweep
+
+    grid = {}
+    for name, kind in (('contrast', float), ('brightness', float), ('sharpness', float),
+                       ('denoise', 'denoise'), ('psm', int)):
+        text = getattr(args, name)
+        if text:
+            try:
+                grid[name] = parse_sweep_values(text, kind)
+            except ValueError:
+                raise SystemExit(f"Invalid --{name} values: {text}")
+    settings = build_grid(grid)
+    backend = args.backend or config['ocr']['backend']
+    documents = discover_documents(get_pdf_dirs(config), args.limit)
+
+    print(f"Sweeping {len(settings)} combinations over {len(documents)} documents "
+          f"with the {backend} backend")
+    results = run_sweep(
+        documents, {name: tuple(box) for name, box in config['regions'].items()}, settings, backend,
+        processes=args.processes or get_workers(config, 'ocr'), output_file=config['paths']['output'],
+        cache_root=config['cache']['rasters'], cache_max_bytes=config['cache']['rasters_max_mb'] * 1024 * 1024,
+        dpi=config['render']['dpi'], address_region=tuple(config['render']['address'])
+    )
+    print_pareto_table(results, args.max_cer, current=current_setting(get_preprocess_params(config)))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"Results written to {args.output}")
+
+
+def command_ocr_bench(config: Dict, args) -> None:
+    """Measure OCR throughput, latency, CPU time, memory and accuracy on a sample of crops."""
+    from bench_report import compare_reports, load_report, print_regressions, save_report
+    from ocr_benchmark import REGRESSION_METRICS, print_ocr_report, run_ocr_benchmark, select_sample
+    from pipeline import discover_documents
+
+    # Read the baseline first: it may be the path this run's report is written to
+    baseline = load_report(args.compare) if args.compare else None
+    documents = select_sample(discover_documents(get_pdf_dirs(config)), args.limit, args.seed)
+    report = run_ocr_benchmark(
+        documents, {name: tuple(box) for name, box in config['regions'].items()},
+        backend=args.backend or config['ocr']['backend'], preprocess=config['ocr']['preprocess'],
+        output_file=config['paths']['output'], cache_root=config['cache']['rasters'],
+        cache_max_bytes=config['cache']['rasters_max_mb'] * 1024 * 1024, dpi=config['render']['dpi'],
+        address_region=tuple(config['render']['address']),
+        sample={'collections': config['collections'], 'limit': args.limit, 'seed': args.seed},
+        preprocess_params=get_preprocess_params(config)
+    )
+    print_ocr_report(report)
+    path = save_report(report, args.output or os.path.join(config['cache']['benchmarks'], 'ocr-{commit}.json'))
+    print(f"Report written to {path}")
+
+    if baseline is not None:
+        regressions = compare_reports(report, baseline, REGRESSION_METRICS, args.tolerance)
+        print_regressions(regressions, args.compare, args.tolerance)
+        if regressions:
+            raise SystemExit(1)
+
+
+def command_render_bench(config: Dict, args) -> None:
+    """Measure first-page rendering by DPI, colourspace, JPEG settings and worker count."""
+    from bench_report import compare_reports, load_report, print_regressions, save_report
+    from render_benchmark import (DEFAULT_COLORSPACES, DEFAULT_DPIS, DEFAULT_WORKERS, print_render_report,
+                                  regression_metrics, run_render_benchmark, select_pdfs)
+
+    try:
+        dpis = parse_sweep_values(args.dpi, int) if args.dpi else DEFAULT_DPIS
+        workers = parse_sweep_values(args.workers, int) if args.workers else DEFAULT_WORKERS
+    except ValueError:
+        raise SystemExit("--dpi and --workers take comma-separated integers")
+    colorspaces = args.colorspace.split(',') if args.colorspace else DEFAULT_COLORSPACES
+    optimize = {'both': [True, False], 'on': [True], 'off': [False]}[args.optimize]
+
+    baseline = load_report(args.compare) if args.compare else None
+    pdfs = select_pdfs(get_pdf_dirs(config), args.per_collection)
+    print(f"Benchmarking rendering of {len(pdfs)} PDFs from {', '.join(config['collections'])}")
+    report = run_render_benchmark(pdfs, dpis, colorspaces, optimize, workers, repeat=args.repeat)
+    print_render_report(report)
+    path = save_report(report, args.output or os.path.join(config['cache']['benchmarks'], 'render-{commit}.json'))
+    print(f"Report written to {path}")
+
+    if baseline is not None:
+        regressions = compare_reports(report, baseline, regression_metrics(baseline), args.tolerance)
+        print_regressions(regressions, args.compare, args.tolerance)
+        if regressions:
+            raise SystemExit(1)
+
+
+def run_cluster_worker(config: Dict, work_dir: str, backend: str, worker_id: Optional[str] = None) -> Dict:
+    """
+    Process batches of a distributed run until it is done.
+
+    Args:
+        config: Configuration dictionary
+        work_dir: Shared work directory of the run
+        backend: OCR backend name
+        worker_id: Unique worker name (default: host-pid-random)
+
+    Returns:
+        Worker summary from lease_runner.run_worker()
+    """
+    from functools import partial
+    from lease_runner import LeaseQueue, run_worker
+    from pipeline import process_document_batch
+
+    queue = LeaseQueue(work_dir, worker_id, lease_ttl=config['cluster']['lease_ttl'])
+    process_batch = partial(process_document_batch, backend=backend,
+                            artifact_dir=config['cache']['artifacts'],
+                            output_file=config['paths']['output'], **get_pipeline_options(config))
+    summary = run_worker(queue, process_batch)
+    print(f"Worker {summary['worker']}: {summary['batches']} batches, {summary['items']} documents, "
+          f"{summary['reclaimed']} reclaimed, {len(summary['failed'])} failed "
+          f"({summary['elapsed_time']:.1f} seconds)")
+    return summary
+
+
+def run_cluster_process(config: Dict, work_dir: str, backend: str, results) -> None:
+    """Run a cluster worker in a child process and send its metrics back on results."""
+    from metrics import MetricsRegistry, get_registry, set_registry
+
+    # A forked process inherits the parent's registry; start empty so only
+    # this process's metrics are sent back
+    set_registry(MetricsRegistry())
+    run_cluster_worker(config, work_dir, backend)
+    results.put(get_registry().to_dict())
+
+
+def command_cluster(config: Dict, args) -> None:
+    """Share one ocr run between processes and hosts through lease files on a shared directory."""
+    from lease_runner import LeaseQueue
+    from pipeline import discover_documents, merge_document_results
+
+    work_dir = args.work_dir or config['cluster']['work_dir']
+    queue = LeaseQueue(work_dir, lease_ttl=config['cluster']['lease_ttl'])
+
+    if args.action == 'plan':
+        documents = [dict(document, pdf_path=document['pdf_path'].as_posix())
+                     for document in discover_documents(get_pdf_dirs(config), args.limit)]
+        batches = queue.plan(documents, config['cluster']['batch_size'])
+        print(f"Planned {len(documents)} documents in {batches} batches in {work_dir}")
+
+    elif args.action == 'work':
+        backend = args.backend or config['ocr']['backend']
+        if args.processes > 1:
+            import multiprocessing
+            from queue import Empty
+            from metrics import get_registry
+
+            context = multiprocessing.get_context()
+            results = context.Queue()
+            processes = [context.Process(target=run_cluster_process, args=(config, work_dir, backend, results))
+                         for _ in range(args.processes)]
+            for process in processes:
+                process.start()
+
+            # Drain the metrics while waiting, so no child blocks on a full pipe.
+            # A child that crashed sends nothing; once every child has exited
+            # all snapshots are in the pipe
+            reported = 0
+            while reported < len(processes):
+                try:
+                    get_registry().merge(results.get(timeout=1.0))
+                    reported += 1
+                except Empty:
+                    if all(process.exitcode is not None for process in processes) and results.empty():
+                        break
+            for process in processes:
+                process.join()
+
+            failed = [process.exitcode for process in processes if process.exitcode != 0]
+            if failed:
+                raise SystemExit(f"{len(failed)} of {len(processes)} worker processes failed "
+                                 f"(exit codes {', '.join(str(code) for code in failed)})")
+        else:
+            run_cluster_worker(config, work_dir, backend, args.worker_id)
+
+    elif args.action == 'status':
+        status = queue.status()
+        print(f"{work_dir}: {status['done']}/{status['total']} batches done, {status['leased']} leased, "
+              f"{status['expired']} expired, {status['pending']} pending")
+
+    elif args.action == 'merge':
+        status = queue.status()
+        if status['done'] < status['total'] and not args.partial:
+            raise SystemExit(f"Only {status['done']}/{status['total']} batches are done "
+                             f"(pass --partial to merge them anyway)")
+        result = merge_document_results(queue.merge(), config['paths']['output'], config['paths']['shards'])
+        print(f"Merged {result['entries']} entries from {status['done']} batches, "
+              f"published {result['published']} crops, {result['errors']} errors")
+
+
+COMMANDS = {
+    'render': command_render,
+    'crop': command_crop,
+    'ocr': command_ocr,
+    'aggregate': command_aggregate,
+    'pages': command_pages,
+    'bench': command_bench,
+    'rasters': command_rasters,
+    'sweep': command_sweep,
+    'ocr-bench': command_ocr_bench,
+    'render-bench': command_render_bench,
+    'cluster': command_cluster,
+}
+
+
+def build_parser():
+    """Build the argument parser with one subparser per command."""
+    import argparse
+    from ocr_backends import BACKENDS
+
+    parser = argparse.ArgumentParser(prog='sirgujarat', description='Build the sirgujarat site')
+    parser.add_argument('--config', help=f'TOML configuration file (default: {CONFIG_PATH} if present)')
+    parser.add_argument('--collection', action='append',
+                        help='Only process this collection, e.g. P070 (repeatable)')
+    parser.add_argument('--metrics', action='store_true',
+                        help='Print the per-stage timing histograms and counters at the end')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    for name, command in COMMANDS.items():
+        subparser = subparsers.add_parser(name, help=command.__doc__.split('.')[0])
+        if name in ('render', 'ocr', 'bench', 'rasters', 'sweep', 'ocr-bench'):
+            default_limit = {'bench': 50, 'sweep': 100, 'ocr-bench': 200}.get(name)
+            subparser.add_argument('--limit', type=int, default=default_limit,
+                                   help='Process at most this many documents'
+                                        + (f' (default: {default_limit})' if default_limit else ''))
+        if name in ('ocr', 'bench', 'sweep', 'ocr-bench'):
+            subparser.add_argument('--backend', choices=sorted(BACKENDS),
+                                   help='OCR backend (default: from the configuration)')
+        if name == 'ocr':
+            subparser.add_argument('--no-cache', action='store_true',
+                                   help='Compute every artifact without the artifact store')
+        if name == 'bench':
+            subparser.add_argument('--cache', action='store_true',
+                                   help='Look artifacts up in the artifact store (measures a warm run)')
+            subparser.add_argument('--render-processes', type=int,
+                                   help='Render in this many processes and hand rasters to OCR '
+                                        'processes through shared memory')
+            subparser.add_argument('--ocr-processes', type=int,
+                                   help='OCR processes reading rasters from shared memory')
+            subparser.add_argument('--slots', type=int,
+                                   help='Shared-memory raster slots (default: two per process)')
+        if name == 'pages':
+            subparser.add_argument('--force', action='store_true',
+                                   help='Render every page even if the inputs are unchanged')
+        if name == 'sweep':
+            for setting in ('contrast', 'brightness', 'sharpness'):
+                subparser.add_argument(f'--{setting}', help=f'Comma-separated {setting} factors')
+            subparser.add_argument('--denoise',
+                                   help='Comma-separated bilateral filters, DIAMETER:SIGMA_COLOR:SIGMA_SPACE or none')
+            subparser.add_argument('--psm', help='Comma-separated Tesseract page segmentation modes')
+            subparser.add_argument('--max-cer', type=float, default=0.05,
+                                   help='Accuracy floor for the recommendation (default: 0.05)')
+            subparser.add_argument('--processes', type=int,
+                                   help='Worker processes (default: workers.ocr)')
+            subparser.add_argument('--output', help='Also write the results as JSON')
+        if name == 'ocr-bench':
+            subparser.add_argument('--seed', type=int,
+                                   help='Sample documents at random with this seed (default: the first ones)')
+        if name == 'render-bench':
+            subparser.add_argument('--per-collection', type=int, default=10,
+                                   help='PDFs taken from each collection (default: 10)')
+            subparser.add_argument('--dpi', help='Comma-separated resolutions (default: 100,150,200,300)')
+            subparser.add_argument('--colorspace', help='rgb, gray or rgb,gray (default: both)')
+            subparser.add_argument('--optimize', choices=['both', 'on', 'off'], default='both',
+                                   help='JPEG optimize settings to compare (default: both)')
+            subparser.add_argument('--workers', help='Comma-separated worker counts (default: 1,2,4)')
+            subparser.add_argument('--repeat', type=int, default=1,
+                                   help='Times each PDF is rendered per configuration (default: 1)')
+        if name in ('ocr-bench', 'render-bench'):
+            prefix = name.split('-')[0]
+            subparser.add_argument('--output', help='Report path; {commit} is replaced '
+                                                    f'(default: <cache.benchmarks>/{prefix}-{{commit}}.json)')
+            subparser.add_argument('--compare', metavar='REPORT',
+                                   help='Fail if worse than this earlier report beyond the tolerance')
+            subparser.add_argument('--tolerance', type=float, default=0.05,
+                                   help='Allowed relative regression (default: 0.05)')
+        if name == 'cluster':
+            subparser.add_argument('action', choices=['plan', 'work', 'status', 'merge'])
+            subparser.add_argument('--work-dir', help='Shared work directory (default: cluster.work_dir)')
+            subparser.add_argument('--limit', type=int, help='plan: at most this many documents')
+            subparser.add_argument('--backend', choices=sorted(BACKENDS),
+                                   help='work: OCR backend (default: from the configuration)')
+            subparser.add_argument('--processes', type=int, default=1,
+                                   help='work: worker processes to start on this host (default: 1)')
+            subparser.add_argument('--worker-id', help='work: worker name (default: host-pid-random)')
+            subparser.add_argument('--partial', action='store_true',
+                                   help='merge: merge the finished batches of an incomplete run')
+    return parser
+
+
+def main(argv=None):
+    """
+    Run a sirgujarat subcommand.
+
+    Args:
+        argv: Command-line arguments (default: sys.argv[1:])
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    try:
+        config = load_config(args.config)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+
+    if args.collection:
+        config['collections'] = args.collection
+    try:
+        COMMANDS[args.command](config, args)
+    finally:
+        write_metrics(config, args)
+
+
+def write_metrics(config: Dict, args) -> None:
+    """Dump the metrics of this run to <cache.metrics>/<command>/, printing them with --metrics."""
+    from metrics import get_registry
+
+    registry = get_registry()
+    if args.metrics:
+        print()
+        registry.print_summary()
+    json_path, prom_path = registry.write(os.path.join(config['cache']['metrics'], args.command))
+    print(f"Metrics written to {json_path} and {prom_path}")
+
+
+if __name__ == '__main__':
+    main()
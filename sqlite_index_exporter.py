@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+SQLite Index Exporter
+
+Builds a read-only SQLite database from DataAggregator output (or an existing
+extracted_data.json) with normalized taluko and gaam tables, a documents
+table keyed by document ID and collection, and an FTS5 full-text index over
+the Gujarati text.
+
+Usage:
+    python sqlite_index_exporter.py [--input extracted_data.json] [--output extracted_data.sqlite]
+
+Example lookups:
+    SELECT d.id FROM documents d JOIN gaams g ON g.id = d.gaam_id WHERE g.name = 'ઉવારસદ';
+    SELECT document_id FROM documents_fts WHERE documents_fts MATCH 'ગાંધી*';
+"""
+
+import os
+import json
+import sqlite3
+from typing import Dict, List, Optional
+
+from gujarati_ocr_json_extractor import ErrorLogger, get_collection_id
+
+
+# Gujarati combining marks (candrabindu, anusvara, visarga, nukta, vowel
+# signs, virama). The default unicode61 tokenizer treats these as separators
+# and would split every word at its vowel signs.
+GUJARATI_TOKEN_CHARS = ''.join(
+    chr(code) for code in
+    list(range(0x0A81, 0x0A84)) + [0x0ABC] + list(range(0x0ABE, 0x0ACE)) + [0x0AE2, 0x0AE3]
+)
+
+SCHEMA = f"""
+CREATE TABLE talukos (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+
+CREATE TABLE gaams (
+    id INTEGER PRIMARY KEY,
+    taluko_id INTEGER REFERENCES talukos(id),
+    name TEXT NOT NULL,
+    UNIQUE (taluko_id, name)
+);
+
+CREATE TABLE documents (
+    id TEXT NOT NULL,
+    collection TEXT NOT NULL,
+    taluko_id INTEGER REFERENCES talukos(id),
+    gaam_id INTEGER REFERENCES gaams(id),
+    taluko_text TEXT,
+    gaam_text TEXT,
+    PRIMARY KEY (collection, id)
+) WITHOUT ROWID;
+
+CREATE VIRTUAL TABLE documents_fts USING fts5(
+    document_id UNINDEXED,
+    collection UNINDEXED,
+    taluko,
+    gaam,
+    tokenize = "unicode61 remove_diacritics 0 tokenchars '{GUJARATI_TOKEN_CHARS}'"
+);
+"""
+
+# Secondary indexes are created after the bulk insert, which is much faster
+# than maintaining them row by row.
+INDEXES = """
+CREATE INDEX idx_documents_id ON documents(id);
+CREATE INDEX idx_documents_taluko ON documents(taluko_id, collection, id);
+CREATE INDEX idx_documents_gaam ON documents(gaam_id, collection, id);
+CREATE INDEX idx_gaams_name ON gaams(name);
+"""
+
+
+class SQLiteIndexExporter:
+    """Exports aggregated taluko/gaam data to an SQLite database."""
+
+    def __init__(self, error_logger: Optional[ErrorLogger] = None):
+        """
+        Initialize SQLiteIndexExporter with optional error logger.
+
+        Args:
+            error_logger: ErrorLogger instance for logging errors
+        """
+        self.error_logger = error_logger
+
+    def export(self, data: Dict, db_path: str) -> bool:
+        """
+        Build the SQLite database for the given aggregated data.
+
+        The database is built in a temporary file inside one transaction and
+        then moved into place, so readers never see a partial database.
+
+        Args:
+            data: Dictionary mapping image names to their taluko and gaam data
+                  Format: {image_name: {taluko: "text", gaam: "text"}}
+            db_path: Path of the SQLite database to create (replaced if present)
+
+        Returns:
+            True if the database was written successfully, False otherwise
+        """
+        tmp_path = f"{db_path}.tmp"
+        connection = None
+
+        try:
+            output_dir = os.path.dirname(db_path)
+            if output_dir:
+                os.makedirs(output_dir, exist_ok=True)
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+            connection = sqlite3.connect(tmp_path)
+            connection.execute('PRAGMA journal_mode = OFF')
+            connection.execute('PRAGMA synchronous = OFF')
+
+            with connection:
+                connection.executescript(SCHEMA)
+                self._insert_rows(connection, data)
+                connection.executescript(INDEXES)
+                connection.execute("INSERT INTO documents_fts(documents_fts) VALUES ('optimize')")
+
+            connection.execute('ANALYZE')
+            connection.execute('VACUUM')
+            connection.close()
+            connection = None
+
+            os.replace(tmp_path, db_path)
+            return True
+
+        except sqlite3.Error as e:
+            self._log_error(f"SQLite error building {db_path}: {str(e)}")
+            return False
+
+        except OSError as e:
+            self._log_error(f"OS error writing {db_path}: {str(e)}")
+            return False
+
+        finally:
+            if connection is not None:
+                connection.close()
+            if os.path.exists(tmp_path):
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+
+    def _insert_rows(self, connection: sqlite3.Connection, data: Dict) -> None:
+        """Normalize talukos and gaams and bulk insert all rows."""
+        taluko_ids = {}
+        gaam_ids = {}
+        documents = []
+        fts_rows = []
+
+        for image_name in sorted(data):
+            entry = data[image_name] or {}
+            taluko = (entry.get('taluko') or '').strip() or None
+            gaam = (entry.get('gaam') or '').strip() or None
+            collection = get_collection_id(image_name)
+
+            taluko_id = None
+            if taluko is not None:
+                taluko_id = taluko_ids.setdefault(taluko, len(taluko_ids) + 1)
+
+            gaam_id = None
+            if gaam is not None:
+                gaam_id = gaam_ids.setdefault((taluko_id, gaam), len(gaam_ids) + 1)
+
+            documents.append((image_name, collection, taluko_id, gaam_id,
+                              entry.get('taluko'), entry.get('gaam')))
+            fts_rows.append((image_name, collection, taluko or '', gaam or ''))
+
+        connection.executemany(
+            'INSERT INTO talukos (id, name) VALUES (?, ?)',
+            [(taluko_id, name) for name, taluko_id in taluko_ids.items()]
+        )
+        connection.executemany(
+            'INSERT INTO gaams (id, taluko_id, name) VALUES (?, ?, ?)',
+            [(gaam_id, taluko_id, name) for (taluko_id, name), gaam_id in gaam_ids.items()]
+        )
+        connection.executemany(
+            'INSERT INTO documents (id, collection, taluko_id, gaam_id, taluko_text, gaam_text) '
+            'VALUES (?, ?, ?, ?, ?, ?)',
+            documents
+        )
+        connection.executemany(
+            'INSERT INTO documents_fts (document_id, collection, taluko, gaam) VALUES (?, ?, ?, ?)',
+            fts_rows
+        )
+
+    def _log_error(self, message: str) -> None:
+        """Record an export error if an error logger is configured."""
+        if self.error_logger:
+            self.error_logger.log_error('N/A', 'output', message)
+
+
+def open_read_only(db_path: str) -> sqlite3.Connection:
+    """
+    Open an exported database read-only.
+
+    Args:
+        db_path: Path to the SQLite database
+
+    Returns:
+        sqlite3.Connection that rejects writes
+    """
+    uri = f"file:{os.path.abspath(db_path)}?mode=ro&immutable=1"
+    return sqlite3.connect(uri, uri=True)
+
+
+def find_documents_by_gaam(connection: sqlite3.Connection, gaam: str,
+                           taluko: Optional[str] = None) -> List[str]:
+    """
+    Return the IDs of all documents in a village.
+
+    Args:
+        connection: Connection to an exported database
+        gaam: Gaam name in Gujarati
+        taluko: Optional taluko name to disambiguate villages with the same name
+
+    Returns:
+        Sorted list of document IDs
+    """
+    query = (
+        'SELECT d.id FROM documents d '
+        'JOIN gaams g ON g.id = d.gaam_id '
+        'LEFT JOIN talukos t ON t.id = g.taluko_id '
+        'WHERE g.name = ?'
+    )
+    params = [gaam]
+    if taluko is not None:
+        query += ' AND t.name = ?'
+        params.append(taluko)
+    query += ' ORDER BY d.collection, d.id'
+    return [row[0] for row in connection.execute(query, params)]
+
+
+def search_documents(connection: sqlite3.Connection, match_query: str) -> List[str]:
+    """
+    Full-text search over taluko and gaam text.
+
+    Args:
+        connection: Connection to an exported database
+        match_query: FTS5 MATCH expression (e.g. 'ગાંધી*' or 'gaam:ઉવારસદ')
+
+    Returns:
+        List of matching document IDs, best matches first
+    """
+    rows = connection.execute(
+        'SELECT document_id FROM documents_fts WHERE documents_fts MATCH ? ORDER BY rank',
+        (match_query,)
+    )
+    return [row[0] for row in rows]
+
+
+def main():
+    """Export extracted_data.json to an SQLite database."""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='Build an SQLite index from extracted taluko/gaam data'
+    )
+    parser.add_argument(
+        '--input',
+        default='extracted_data.json',
+        help='Aggregated JSON data file (default: extracted_data.json)'
+    )
+    parser.add_argument(
+        '--output',
+        default='extracted_data.sqlite',
+        help='SQLite database to create (default: extracted_data.sqlite)'
+    )
+    args = parser.parse_args()
+
+    print("SQLite Index Exporter")
+    print("=" * 50)
+
+    error_logger = ErrorLogger()
+
+    try:
+        with open(args.input, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"[ERROR] Failed to read {args.input}: {e}")
+        return
+
+    print(f"Loaded {len(data)} documents from {args.input}")
+
+    exporter = SQLiteIndexExporter(error_logger=error_logger)
+    if exporter.export(data, args.output):
+        print(f"[SUCCESS] SQLite index created: {args.output}")
+    else:
+        print(f"[ERROR] Failed to create SQLite index: {args.output}")
+
+    print("=" * 50)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Tests for the content-addressed artifact store.
+"""
+
+import os
+import sys
+import hashlib
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from PIL import Image
+
+from artifact_store import ArtifactStore, artifact_key, file_digest
+
+
+def test_artifact_key():
+    """Test that keys depend on kind and every parameter, not on their order."""
+    key = artifact_key('crop', {'image': 'abc', 'box': [800, 50, 226, 71]})
+
+    assert len(key) == 64
+    assert key == artifact_key('crop', {'box': [800, 50, 226, 71], 'image': 'abc'})
+    assert key != artifact_key('crop', {'image': 'abc', 'box': [800, 50, 226, 70]})
+    assert key != artifact_key('preprocess', {'image': 'abc', 'box': [800, 50, 226, 71]})
+    print("✓ Test passed: Keys derived from kind and parameters")
+
+
+def test_cached_computes_once():
+    """Test that a stored artifact is not computed again."""
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return "ગામ"
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        store = ArtifactStore(tmpdir)
+        key = artifact_key('ocr', {'image': 'abc'})
+        assert not store.has(key)
+
+        assert store.cached('ocr', key, compute, 'text') == "ગામ"
+        assert store.cached('ocr', key, compute, 'text') == "ગામ"
+        assert store.has(key)
+        assert os.path.exists(os.path.join(tmpdir, key[:2], key))
+        assert ArtifactStore(tmpdir).load('ocr', key, 'text') == "ગામ"
+
+        try:
+            store.load('ocr', artifact_key('ocr', {'image': 'missing'}))
+            assert False, "Missing artifact should raise KeyError"
+        except KeyError:
+            pass
+
+    assert len(calls) == 1
+    assert store.stats() == {'ocr': {'hits': 1, 'misses': 1}}
+    print("✓ Test passed: Artifact computed once and reused")
+
+
+def test_codecs_round_trip():
+    """Test that images and JSON come back unchanged."""
+    image = Image.new('RGB', (20, 10), (10, 20, 30))
+    image.putpixel((3, 4), (200, 100, 0))
+    placeholder = {'color': '#0a141e', 'preview': 'data:image/png;base64,AAAA'}
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        store = ArtifactStore(tmpdir)
+        store.cached('crop', 'a' * 64, lambda: image, 'image')
+        store.cached('placeholder', 'b' * 64, lambda: placeholder, 'json')
+        loaded = store.load('crop', 'a' * 64, 'image')
+
+        assert loaded.size == image.size and list(loaded.getdata()) == list(image.getdata())
+        assert store.load('placeholder', 'b' * 64, 'json') == placeholder
+
+        path = os.path.join(tmpdir, 'file.bin')
+        with open(path, 'wb') as f:
+            f.write(b'pdf')
+        assert file_digest(path) == hashlib.sha256(b'pdf').hexdigest()
+
+    print("✓ Test passed: Codecs round-trip")
+
+
+if __name__ == "__main__":
+    print("Testing artifact store")
+    print("=" * 60)
+
+    test_artifact_key()
+    test_cached_computes_once()
+    test_codecs_round_trip()
+
+    print("\n" + "=" * 60)
+    print("All tests passed!")
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Tests for content-hashed asset publishing and reference rewriting.
+"""
+
+import os
+import sys
+import json
+import hashlib
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from asset_manifest import (
+    AssetManifest,
+    hashed_asset_path,
+    logical_asset_path,
+    rewrite_asset_references
+)
+
+
+def test_hashed_and_logical_paths():
+    """Test that hashed paths map back to their logical path."""
+    digest = hashlib.sha256(b"body { }").hexdigest()
+    hashed = hashed_asset_path("styles.css", digest)
+
+    assert hashed == f"assets/styles.{digest[:10]}.css"
+    assert logical_asset_path(hashed) == "styles.css"
+    assert logical_asset_path("/" + hashed) == "styles.css"
+    assert logical_asset_path("/public/address-images/p064/P0640001.jpg") == "public/address-images/p064/P0640001.jpg"
+    print("✓ Test passed: Hashed paths map back to logical paths")
+
+
+def test_publish_replaces_previous_copy():
+    """Test that republishing changed content writes a new copy and removes the old one."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        with open(os.path.join(tmpdir, "styles.css"), "wb") as f:
+            f.write(b"body { color: red; }")
+
+        manifest = AssetManifest(root=tmpdir)
+        first = manifest.publish("styles.css")
+        assert os.path.exists(os.path.join(tmpdir, first))
+        assert manifest.save()
+        assert not manifest.save()
+
+        second = manifest.publish("styles.css", b"body { color: blue; }")
+        assert second != first
+        assert os.path.exists(os.path.join(tmpdir, second))
+        assert not os.path.exists(os.path.join(tmpdir, first))
+        assert manifest.save()
+
+        with open(os.path.join(tmpdir, "asset-manifest.json"), "r", encoding="utf-8") as f:
+            saved = json.load(f)
+        reloaded = AssetManifest(root=tmpdir)
+
+    assert saved["assets"]["styles.css"]["file"] == second
+    assert reloaded.url("styles.css") == "/" + second
+    assert reloaded.url("missing.css") == "/missing.css"
+    print("✓ Test passed: Republishing replaces the previous copy")
+
+
+def test_placeholder_kept_for_unchanged_content():
+    """Test that a placeholder survives republishing the same bytes but not new ones."""
+    placeholder = {"color": "#efefef", "preview": "data:image/png;base64,AAAA"}
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        manifest = AssetManifest(root=tmpdir)
+        manifest.publish("public/p064/P0640001.jpg", b"jpeg", placeholder=placeholder)
+        manifest.publish("public/p064/P0640001.jpg", b"jpeg")
+        assert manifest.placeholders() == {"public/p064/P0640001.jpg": placeholder}
+
+        manifest.publish("public/p064/P0640001.jpg", b"new jpeg")
+        assert manifest.placeholders() == {}
+
+    print("✓ Test passed: Placeholder kept for unchanged content")
+
+
+def test_make_placeholder():
+    """Test the placeholder computed for a thumbnail."""
+    from PIL import Image
+    from extract_pdf_thumbnails import make_placeholder
+
+    image = Image.new("RGB", (1058, 393), (240, 240, 240))
+    image.paste((20, 20, 20), (0, 0, 100, 50))
+    placeholder = make_placeholder(image)
+
+    assert placeholder["color"] == "#f0f0f0"
+    assert placeholder["preview"].startswith(("data:image/webp;base64,", "data:image/png;base64,"))
+    assert len(placeholder["preview"]) < 400
+    print("✓ Test passed: Placeholder computed from thumbnail")
+
+
+def test_prune_missing_assets():
+    """Test that assets whose bare file is gone are dropped with their copies."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        os.makedirs(os.path.join(tmpdir, "public", "p064"))
+        for name in ("P0640001.jpg", "P0640002.jpg"):
+            with open(os.path.join(tmpdir, "public", "p064", name), "wb") as f:
+                f.write(name.encode("utf-8"))
+
+        manifest = AssetManifest(root=tmpdir)
+        manifest.publish("public/p064/P0640001.jpg")
+        removed_copy = manifest.publish("public/p064/P0640002.jpg")
+        os.remove(os.path.join(tmpdir, "public", "p064", "P0640002.jpg"))
+
+        assert manifest.prune("public/p064/") == 1
+        assert sorted(manifest.assets) == ["public/p064/P0640001.jpg"]
+        assert not os.path.exists(os.path.join(tmpdir, removed_copy))
+
+    print("✓ Test passed: Missing assets pruned")
+
+
+def test_materialize_from_bare_files():
+    """Test that the deploy build recreates the hashed copies and rejects stale bare files."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        with open(os.path.join(tmpdir, "styles.css"), "wb") as f:
+            f.write(b"body { }")
+        manifest = AssetManifest(root=tmpdir)
+        copy = manifest.publish("styles.css")
+        manifest.save()
+
+        # A fresh checkout has the manifest and bare files but no copies
+        os.remove(os.path.join(tmpdir, copy))
+        deployed = AssetManifest(root=tmpdir)
+        assert deployed.materialize() == 1
+        with open(os.path.join(tmpdir, copy), "rb") as f:
+            assert f.read() == b"body { }"
+        assert deployed.materialize() == 0
+
+        os.remove(os.path.join(tmpdir, copy))
+        with open(os.path.join(tmpdir, "styles.css"), "wb") as f:
+            f.write(b"body { color: red; }")
+        try:
+            deployed.materialize()
+            assert False, "Changed bare file should raise ValueError"
+        except ValueError as e:
+            assert "styles.css (changed)" in str(e)
+
+    print("✓ Test passed: Hashed copies materialized from bare files")
+
+
+def test_rewrite_asset_references():
+    """Test that bare and previously hashed references point at the current copy."""
+    asset_urls = {
+        "styles.css": "/assets/styles.1111111111.css",
+        "public/p064/P0640001.jpg": "/assets/public/p064/P0640001.2222222222.jpg",
+    }
+    html = ('<link rel="stylesheet" href="styles.css">'
+            '<img src="/public/p064/P0640001.jpg">'
+            '<a href="https://example.com/styles.css">x</a>'
+            '<a href="other.html">y</a>')
+
+    rewritten = rewrite_asset_references(html, asset_urls)
+    assert 'href="/assets/styles.1111111111.css"' in rewritten
+    assert 'src="/assets/public/p064/P0640001.2222222222.jpg"' in rewritten
+    assert 'href="https://example.com/styles.css"' in rewritten
+    assert 'href="other.html"' in rewritten
+
+    # A page rewritten by an earlier build picks up the new hash
+    updated = dict(asset_urls, **{"styles.css": "/assets/styles.3333333333.css"})
+    assert 'href="/assets/styles.3333333333.css"' in rewrite_asset_references(rewritten, updated)
+    assert rewrite_asset_references(html, {}) == html
+    print("✓ Test passed: Asset references rewritten")
+
+
+if __name__ == "__main__":
+    print("Testing asset manifest")
+    print("=" * 60)
+
+    test_hashed_and_logical_paths()
+    test_publish_replaces_previous_copy()
+    test_placeholder_kept_for_unchanged_content()
+    test_make_placeholder()
+    test_prune_missing_assets()
+    test_materialize_from_bare_files()
+    test_rewrite_asset_references()
+
+    print("\n" + "=" * 60)
+    print("All tests passed!")
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Tests for the thumbnail sprite-sheet atlas builder.
+"""
+
+import os
+import sys
+import json
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from PIL import Image
+
+from asset_manifest import AssetManifest
+from build_thumbnail_atlas import (
+    build_collection_atlas,
+    get_sheet_layout,
+    pack_atlas,
+    parse_size
+)
+
+
+def make_thumbnails(directory, count, color=(200, 200, 200)):
+    """Create count small JPEG thumbnails named P0640001.jpg, ... and return their paths."""
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for number in range(1, count + 1):
+        path = os.path.join(directory, f"P064{number:04d}.jpg")
+        Image.new("RGB", (106, 40), color).save(path, "JPEG")
+        paths.append(path)
+    return paths
+
+
+def test_parse_size_and_layout():
+    """Test size parsing and the number of tiles per sheet."""
+    assert parse_size("320x119") == (320, 119)
+    assert get_sheet_layout((320, 119), (2560, 1904)) == (8, 16)
+
+    for value in ("320", "0x10", "axb"):
+        try:
+            parse_size(value)
+            assert False, f"{value} should be rejected"
+        except ValueError:
+            pass
+
+    try:
+        get_sheet_layout((400, 100), (300, 300))
+        assert False, "Oversized tile should be rejected"
+    except ValueError:
+        pass
+
+    print("✓ Test passed: Sizes parsed and sheet layout computed")
+
+
+def test_pack_atlas_layout():
+    """Test that tiles fill sheets row by row and the last sheet is trimmed."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        paths = make_thumbnails(os.path.join(tmpdir, "p064"), 7)
+        prefix = os.path.join(tmpdir, "atlases", "p064", "p064")
+
+        atlas = pack_atlas(paths, prefix, tile_size=(20, 10), sheet_size=(40, 20))
+        assert [sheet["tiles"] for sheet in atlas["sheets"]] == [4, 3]
+        assert atlas["tiles"]["P0640001"] == [0, 0, 0]
+        assert atlas["tiles"]["P0640002"] == [0, 20, 0]
+        assert atlas["tiles"]["P0640003"] == [0, 0, 10]
+        assert atlas["tiles"]["P0640007"] == [1, 0, 10]
+        assert (atlas["sheets"][1]["width"], atlas["sheets"][1]["height"]) == (40, 20)
+
+        with Image.open(atlas["sheets"][0]["path"]) as sheet:
+            assert sheet.size == (40, 20)
+
+        # A smaller rebuild removes the sheets it no longer needs
+        atlas = pack_atlas(paths[:3], prefix, tile_size=(20, 10), sheet_size=(40, 20))
+        assert len(atlas["sheets"]) == 1
+        assert not os.path.exists(f"{prefix}-2.jpg")
+
+    print("✓ Test passed: Tiles packed into trimmed sheets")
+
+
+def test_build_collection_atlas_publishes_map():
+    """Test that the coordinate map references the hashed sheets."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        thumbnail_dir = os.path.join(tmpdir, "public", "address-images")
+        atlas_dir = os.path.join(tmpdir, "public", "atlases")
+        make_thumbnails(os.path.join(thumbnail_dir, "p064"), 3)
+
+        cwd = os.getcwd()
+        os.chdir(tmpdir)
+        try:
+            asset_manifest = AssetManifest()
+            result = build_collection_atlas("P064", asset_manifest, (20, 10), (40, 20),
+                                            "public/address-images", "public/atlases")
+            with open(os.path.join(atlas_dir, "p064.json"), "r", encoding="utf-8") as f:
+                coordinate_map = json.load(f)
+        finally:
+            os.chdir(cwd)
+
+    assert result["tiles"] == 3 and result["sheets"] == 1
+    assert coordinate_map["tile"] == {"width": 20, "height": 10}
+    assert coordinate_map["sheets"][0]["url"].startswith("/assets/public/atlases/p064/p064-1.")
+    assert sorted(asset_manifest.assets) == ["public/atlases/p064.json", "public/atlases/p064/p064-1.jpg"]
+    print("✓ Test passed: Coordinate map published with hashed sheets")
+
+
+if __name__ == "__main__":
+    print("Testing thumbnail atlas builder")
+    print("=" * 60)
+
+    test_parse_size_and_layout()
+    test_pack_atlas_layout()
+    test_build_collection_atlas_publishes_map()
+
+    print("\n" + "=" * 60)
+    print("All tests passed!")
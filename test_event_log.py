@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Tests for EventLog and its integration with ErrorLogger.
+"""
+
+import io
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from event_log import EventLog, read_events
+from gujarati_ocr_json_extractor import MAX_RETAINED_ERRORS, ErrorLogger
+
+
+def test_records_written_as_jsonl():
+    """Test that records are buffered and written as JSONL."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "events.jsonl")
+        event_log = EventLog(path, buffer_size=10, console_interval=None)
+
+        event_log.success("P0640001", "ocr", duration=0.25)
+        event_log.error("P0640002", "ocr", "ocr", "Tesseract failed", duration=0.1)
+
+        # Still buffered
+        assert read_events(path) == []
+
+        event_log.close()
+        events = read_events(path)
+
+    assert len(events) == 2
+    assert events[0]["event"] == "success"
+    assert events[0]["image"] == "P0640001"
+    assert events[0]["duration"] == 0.25
+    assert events[1]["error_type"] == "ocr"
+    assert events[1]["message"] == "Tesseract failed"
+    assert "timestamp" in events[1]
+    print("✓ Test passed: Records written as buffered JSONL")
+
+
+def test_buffer_flushes_when_full():
+    """Test that a full buffer is flushed to disk."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "events.jsonl")
+        event_log = EventLog(path, buffer_size=3, console_interval=None)
+
+        for number in range(4):
+            event_log.success(f"P064{number:04d}", "ocr")
+
+        assert len(read_events(path)) == 3
+        event_log.close()
+        assert len(read_events(path)) == 4
+
+    print("✓ Test passed: Buffer flushed when full")
+
+
+def test_console_summary_rate_limited():
+    """Test that the console gets summaries, not one line per event."""
+    stream = io.StringIO()
+
+    with EventLog(console_interval=3600, stream=stream) as event_log:
+        for number in range(50):
+            event_log.error(f"P064{number:04d}", "ocr", "ocr", "failed")
+
+    lines = stream.getvalue().splitlines()
+    assert len(lines) == 1
+    assert "50 error" in lines[0]
+    assert event_log.summary()["error_counts"] == {"ocr": 50}
+    print("✓ Test passed: Console summary rate limited")
+
+
+def test_error_logger_uses_event_log():
+    """Test that ErrorLogger forwards to the event log and keeps its summary contract."""
+    stream = io.StringIO()
+    event_log = EventLog(console_interval=None, stream=stream)
+    error_logger = ErrorLogger(event_log=event_log, max_retained_errors=2)
+
+    error_logger.log_success("P0640001", "ocr", 0.5)
+    for number in range(3):
+        error_logger.log_error(f"P064{number:04d}", "ocr", "failed")
+
+    summary = error_logger.get_summary()
+    assert summary["total_processed"] == 4
+    assert summary["successful"] == 1
+    assert summary["failed"] == 3
+    assert len(summary["errors"]) == 2
+    assert summary["errors"][0] == {"image_name": "P0640000", "error_type": "ocr", "message": "failed"}
+
+    assert event_log.counts == {"success": 1, "error": 3}
+    assert stream.getvalue() == ""
+    print("✓ Test passed: ErrorLogger forwards to event log")
+
+
+def test_error_logger_bounded_by_default():
+    """Test that an ErrorLogger without a cap keeps at most MAX_RETAINED_ERRORS errors."""
+    error_logger = ErrorLogger(event_log=EventLog(console_interval=None, stream=io.StringIO()))
+    for number in range(MAX_RETAINED_ERRORS + 10):
+        error_logger.log_error(f"P064{number:04d}", "ocr", "failed")
+
+    assert len(error_logger.errors) == MAX_RETAINED_ERRORS
+    assert error_logger.get_summary()["failed"] == MAX_RETAINED_ERRORS + 10
+    print("✓ Test passed: ErrorLogger bounded by default")
+
+
+if __name__ == "__main__":
+    print("Testing EventLog")
+    print("=" * 60)
+
+    test_records_written_as_jsonl()
+    test_buffer_flushes_when_full()
+    test_console_summary_rate_limited()
+    test_error_logger_uses_event_log()
+    test_error_logger_bounded_by_default()
+
+    print("\n" + "=" * 60)
+    print("All tests passed!")
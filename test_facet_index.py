@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Tests for FacetIndexBuilder and Gujarati collation order.
+"""
+
+import os
+import sys
+import json
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from gujarati_ocr_json_extractor import (
+    FacetIndexBuilder,
+    JSONOutputWriter,
+    gujarati_sort_key
+)
+
+
+def test_compress_id_ranges():
+    """Test that consecutive document IDs collapse into ranges."""
+    builder = FacetIndexBuilder()
+
+    ids = ["P0640003", "P0640001", "P0640002", "P0640007", "P0640009", "P0640008"]
+    ranges = builder.compress_id_ranges(ids)
+
+    assert ranges == [["P0640001", "P0640003"], ["P0640007", "P0640009"]]
+    print("✓ Test passed: Consecutive IDs compressed into ranges")
+
+
+def test_compress_id_ranges_different_prefixes():
+    """Test that IDs from different collections never share a range."""
+    builder = FacetIndexBuilder()
+
+    ranges = builder.compress_id_ranges(["P0640601", "P0700001", "P0700002"])
+
+    assert ranges == [["P0640601", "P0640601"], ["P0700001", "P0700002"]]
+    print("✓ Test passed: Collection prefixes kept apart")
+
+
+def test_gujarati_sort_key():
+    """Test that LLA sorts after HA and composed forms match."""
+    words = ["ળ", "હ", "ક", "અ"]
+    assert sorted(words, key=gujarati_sort_key) == ["અ", "ક", "હ", "ળ"]
+    assert gujarati_sort_key(None) == ()
+    assert gujarati_sort_key(" ગામ ") == gujarati_sort_key("ગામ")
+    print("✓ Test passed: Gujarati collation order")
+
+
+def test_build_facet_index():
+    """Test facet index structure, counts and ordering."""
+    data = {
+        "P0640001": {"taluko": "સીટી", "gaam": "ઓગણજ"},
+        "P0640002": {"taluko": "સીટી", "gaam": "ઓગણજ"},
+        "P0640003": {"taluko": "ગાંધીનગર", "gaam": "ઉવારસદ"},
+        "P0640004": {"taluko": "સીટી", "gaam": "અમદાવાદ"},
+        "P0640005": {"taluko": "સીટી", "gaam": "ઓગણજ"},
+        "P0640006": {"taluko": None, "gaam": "ઓગણજ"},
+        "P0640007": {"taluko": "સીટી", "gaam": " "},
+        "P0640008": {"taluko": "દસક્રોઈ", "gaam": None},
+    }
+
+    index = FacetIndexBuilder().build(data)
+
+    assert index["total"] == 8
+    assert [t["name"] for t in index["talukos"]] == ["ગાંધીનગર", "દસક્રોઈ", "સીટી"]
+
+    # Documents without a gaam still count towards their taluko
+    city = index["talukos"][2]
+    assert city["count"] == 5
+    assert city["unassigned"] == {"count": 1, "ranges": [["P0640007", "P0640007"]]}
+    assert index["talukos"][1] == {"name": "દસક્રોઈ", "count": 1, "gaams": [],
+                                   "unassigned": {"count": 1, "ranges": [["P0640008", "P0640008"]]}}
+    assert index["talukos"][0]["unassigned"] == {"count": 0, "ranges": []}
+    assert [g["name"] for g in city["gaams"]] == ["અમદાવાદ", "ઓગણજ"]
+    assert city["gaams"][1]["count"] == 3
+    assert city["gaams"][1]["ranges"] == [["P0640001", "P0640002"], ["P0640005", "P0640005"]]
+
+    assert index["unassigned"] == {"count": 1, "ranges": [["P0640006", "P0640006"]]}
+    print("✓ Test passed: Facet index built correctly")
+
+
+def test_facet_index_matches_extracted_data():
+    """Test that the facet index accounts for every document in extracted_data.json."""
+    if not os.path.exists("extracted_data.json"):
+        print("SKIP: extracted_data.json not found")
+        return
+
+    with open("extracted_data.json", "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    index = FacetIndexBuilder().build(data)
+
+    total = sum(t["count"] for t in index["talukos"]) + index["unassigned"]["count"]
+    assert total == len(data)
+    print(f"✓ Test passed: {len(index['talukos'])} talukos cover {total} documents")
+
+
+def test_write_compact_facet_index():
+    """Test that the facet index is written as compact JSON."""
+    index = FacetIndexBuilder().build({"P0640001": {"taluko": "સીટી", "gaam": "ઓગણજ"}})
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        output_path = os.path.join(tmpdir, "extracted_data.facets.json")
+        assert JSONOutputWriter().write_json(index, output_path, compact=True)
+
+        with open(output_path, "r", encoding="utf-8") as f:
+            content = f.read()
+
+    assert "\n" not in content
+    assert json.loads(content) == index
+    print("✓ Test passed: Compact facet index written")
+
+
+def run_all_tests():
+    """Run all test cases."""
+    print("Testing FacetIndexBuilder")
+    print("=" * 60)
+
+    try:
+        test_compress_id_ranges()
+        test_compress_id_ranges_different_prefixes()
+        test_gujarati_sort_key()
+        test_build_facet_index()
+        test_facet_index_matches_extracted_data()
+        test_write_compact_facet_index()
+
+        print("\n" + "=" * 60)
+        print("All tests passed! ✓")
+        return 0
+    except AssertionError as e:
+        print(f"\n✗ Test failed: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(run_all_tests())
@@ -0,0 +1,439 @@
+#!/usr/bin/env python3
+"""
+Tests for the precompiled page template in generate_assembly_pages.
+
+The compiled renderer must produce exactly the bytes the sequential
+replace_* helpers produce.
+"""
+
+import os
+import sys
+import json
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from asset_manifest import AssetManifest
+from generate_assembly_pages import (
+    PageTemplate,
+    compile_template,
+    generate_page,
+    generate_title,
+    generate_description,
+    generate_h1,
+    replace_title,
+    replace_meta_tag,
+    replace_canonical,
+    replace_h1,
+    replace_json_ld,
+    replace_og_image,
+    insert_assembly_links,
+    insert_constituency_data,
+    build_constituency_data,
+    load_template,
+    load_assemblies,
+    build_pages,
+    build_assembly_nav,
+    is_build_current,
+    write_if_changed,
+    minify_html,
+    minify_css,
+    split_sitemap_urls,
+    build_sitemaps,
+    load_sitemap_lastmods
+)
+
+
+BASE_URL = 'https://sir-2002.gujrera.com/'
+
+SAMPLE_TEMPLATE = '''<html><head>
+    <meta name="description" content="old">
+    <meta property="og:title" content="old">
+    <meta property="og:description" content="old">
+    <meta property="og:url" content="old">
+    <meta property="og:image" content="old">
+    <meta property="og:image:width" content="1200">
+    <meta name="twitter:title" content="old">
+    <meta name="twitter:description" content="old">
+    <meta name="twitter:image" content="old">
+    <title>Old
+    title</title>
+    <link rel="canonical" href="old">
+    <script type="application/ld+json">
+    {"name": "old", "description": "old", "url": "old", "publisher": {"name": "keep", "url": "keep"}}
+    </script>
+</head><body>
+    <h1>Old</h1>
+    <h1>Second</h1>
+
+    <!-- CTA Section for Fillable Form -->
+</body></html>'''
+
+ASSEMBLIES = [
+    {"number": 1, "name": "Abdasa", "full_name": "1-Abdasa", "slug": "abdasa"},
+    {"number": 4, "name": "Mundra (SC)", "full_name": "4-Mundra (SC)", "slug": "mundra-sc"},
+    {"number": 64, "name": "Sarkhej", "full_name": "64-Sarkhej", "slug": "sarkhej"},
+]
+
+
+def legacy_generate_page(html, assembly, assemblies_list, base_url=BASE_URL, data_file=None):
+    """Reference implementation: apply the replace_* helpers in sequence."""
+    title = generate_title(assembly['name'])
+    description = generate_description(assembly['name'])
+    h1 = generate_h1(assembly['name'])
+    page_url = f"{base_url}{assembly['slug']}.html"
+
+    html = replace_title(html, title)
+    html = replace_meta_tag(html, 'description', 'name', description)
+    html = replace_meta_tag(html, 'og:title', 'property', title)
+    html = replace_meta_tag(html, 'og:description', 'property', description)
+    html = replace_meta_tag(html, 'og:url', 'property', page_url)
+    html = replace_meta_tag(html, 'twitter:title', 'name', title)
+    html = replace_meta_tag(html, 'twitter:description', 'name', description)
+    html = replace_canonical(html, page_url)
+    html = replace_h1(html, h1)
+    html = replace_json_ld(html, assembly['name'], description, base_url)
+    html = replace_og_image(html, base_url)
+    html = insert_assembly_links(html, assemblies_list, assembly['slug'], base_url)
+    html = insert_constituency_data(html, data_file)
+    return html
+
+
+def test_sample_template_matches_legacy():
+    """Test that the compiled template matches the sequential replacements."""
+    for assembly in ASSEMBLIES:
+        expected = legacy_generate_page(SAMPLE_TEMPLATE, assembly, ASSEMBLIES)
+        actual = generate_page(SAMPLE_TEMPLATE, assembly, ASSEMBLIES, BASE_URL)
+        assert actual == expected, f"Mismatch for {assembly['slug']}"
+
+    print("✓ Test passed: Compiled template matches legacy output")
+
+
+def test_constituency_data_preload_matches_legacy():
+    """Test that the data preload slot matches the sequential replacements."""
+    data_file = 'data/constituencies/sarkhej.0123456789.json'
+    expected = legacy_generate_page(SAMPLE_TEMPLATE, ASSEMBLIES[2], ASSEMBLIES, data_file=data_file)
+    actual = generate_page(SAMPLE_TEMPLATE, ASSEMBLIES[2], ASSEMBLIES, BASE_URL, data_file)
+    assert actual == expected
+    assert f'<link rel="preload" href="{data_file}" as="fetch"' in actual
+
+    # Rendering a page with a preload again replaces or removes it in place
+    other = generate_page(actual, ASSEMBLIES[0], ASSEMBLIES, BASE_URL)
+    assert other == generate_page(SAMPLE_TEMPLATE, ASSEMBLIES[0], ASSEMBLIES, BASE_URL)
+    assert generate_page(actual, ASSEMBLIES[2], ASSEMBLIES, BASE_URL, data_file) == actual
+
+    print("✓ Test passed: Constituency data preload slot")
+
+
+def test_build_constituency_data():
+    """Test that collections are joined to the constituency with the same number."""
+    documents = {
+        "P0640001": {"taluko": "ગાંધીનગર", "gaam": "ઉવારસદ"},
+        "P0640002": {"taluko": "ગાંધીનગર", "gaam": "ઉવારસદ"},
+        "P0640003": {"taluko": None, "gaam": None},
+        "P9990001": {"taluko": "x", "gaam": "y"},
+    }
+    collection_files = {
+        "P064": {"pdfs": ["P0640001.pdf", "P0640002.pdf"], "thumbnails": ["P0640001.jpg"]},
+        "P070": {"pdfs": ["P0700001.pdf", "P0700002.pdf"], "thumbnails": []},
+    }
+
+    data_files = build_constituency_data(ASSEMBLIES, documents, collection_files)
+    assert sorted(data_files) == ['sarkhej']
+
+    path, content = data_files['sarkhej']
+    assert path.startswith('data/constituencies/sarkhej.') and path.endswith('.json')
+    data = json.loads(content)
+    assert data['constituency'] == {'number': 64, 'name': 'Sarkhej', 'slug': 'sarkhej'}
+    assert data['facets']['total'] == 3
+    assert data['facets']['talukos'][0]['gaams'][0]['ranges'] == [['P0640001', 'P0640002']]
+    assert data['facets']['unassigned']['ranges'] == [['P0640003', 'P0640003']]
+    assert data['collections']['P064']['thumbnails'] == [['P0640001', 'P0640001']]
+    assert data['collections']['P064']['pdf_url'] == '/P064/{id}.pdf'
+
+    # P070 joins 70-Shahpur once that constituency is in the list, but
+    # without thumbnails there is no gallery to slice
+    shahpur = {"number": 70, "name": "Shahpur", "full_name": "70-Shahpur", "slug": "shahpur"}
+    data_files = build_constituency_data(ASSEMBLIES + [shahpur], documents, collection_files)
+    assert sorted(data_files) == ['sarkhej']
+
+    collection_files["P070"]["thumbnails"] = ["P0700001.jpg"]
+    data_files = build_constituency_data(ASSEMBLIES + [shahpur], documents, collection_files)
+    shahpur_data = json.loads(data_files['shahpur'][1])
+    assert shahpur_data['facets']['unassigned']['ranges'] == [['P0700001', 'P0700002']]
+
+    # Published thumbnails get a hashed URL pattern and per-file hashes
+    assert 'thumbnail_hashes' not in data['collections']['P064']
+    with tempfile.TemporaryDirectory() as tmpdir:
+        asset_manifest = AssetManifest(root=tmpdir)
+        asset_manifest.publish('public/address-images/p064/P0640001.jpg', b'thumbnail')
+        data_files = build_constituency_data(ASSEMBLIES, documents, collection_files, asset_manifest)
+
+    collection = json.loads(data_files['sarkhej'][1])['collections']['P064']
+    digest = asset_manifest.assets['public/address-images/p064/P0640001.jpg']['sha256']
+    assert collection['thumbnail_asset_url'] == '/assets/public/address-images/p064/{id}.{hash}.jpg'
+    assert collection['thumbnail_hashes'] == [digest[:10]]
+
+    print("✓ Test passed: Collections joined to constituencies")
+
+
+def test_template_parsed_once():
+    """Test that the template cache returns the same parsed template."""
+    assert compile_template(SAMPLE_TEMPLATE) is compile_template(SAMPLE_TEMPLATE)
+
+    template = PageTemplate(SAMPLE_TEMPLATE)
+    assert 'links' in template.slot_names
+    assert 'json_ld:name' in template.slot_names
+    # Only the first <h1> and first JSON-LD "name" are slots
+    assert sum(1 for s in template.segments if s == ('h1',)) == 1
+    assert sum(1 for s in template.segments if s == ('json_ld:name',)) == 1
+    print("✓ Test passed: Template parsed into segments once")
+
+
+def test_render_bytes_matches_render():
+    """Test that byte rendering is the UTF-8 encoding of text rendering."""
+    template = PageTemplate(SAMPLE_TEMPLATE.replace("Second", "ગાંધીનગર"))
+    values = {name: f"<{name}>" for name in template.slot_names}
+
+    assert template.render_bytes(values) == template.render(values).encode('utf-8')
+    print("✓ Test passed: render_bytes matches render")
+
+
+def test_real_template_matches_legacy():
+    """Test byte-identical output against the real template for a few assemblies."""
+    template = load_template()
+    assemblies = load_assemblies()
+    if not template or not assemblies:
+        print("SKIP: anand.html or assembly_constituencies.json not found")
+        return
+
+    for assembly in assemblies[::45]:
+        expected = legacy_generate_page(template, assembly, assemblies)
+        actual = generate_page(template, assembly, assemblies, BASE_URL)
+        assert actual == expected, f"Mismatch for {assembly['slug']}"
+
+    print("✓ Test passed: Real template output unchanged")
+
+
+def test_shared_navigation():
+    """Test that every page lists every constituency as plain links."""
+    page = generate_page(SAMPLE_TEMPLATE, ASSEMBLIES[2], ASSEMBLIES, BASE_URL)
+
+    for assembly in ASSEMBLIES:
+        assert f'href="{assembly["slug"]}.html"' in page
+    assert '<a aria-current="page" href="sarkhej.html">' in page
+    assert page.count('aria-current') == 1
+    assert 'style=' not in page.split('assembly-nav-grid')[1]
+    assert 'data-nav-src' not in page and '<script' not in page.split('assembly-nav')[1]
+    # Items are built once and shared by every page
+    assert build_assembly_nav(list(ASSEMBLIES)) is build_assembly_nav(ASSEMBLIES)
+
+    print("✓ Test passed: Pages list every constituency")
+
+
+def test_links_section_replaced_in_place():
+    """Test that rendering a generated page again does not add another links section."""
+    first = generate_page(SAMPLE_TEMPLATE, ASSEMBLIES[0], ASSEMBLIES, BASE_URL)
+    second = generate_page(first, ASSEMBLIES[0], ASSEMBLIES, BASE_URL)
+
+    assert second == first
+    assert second.count('<!-- Other Assembly Constituencies Links -->') == 1
+
+    # Duplicated sections left by older generator runs are collapsed
+    doubled = first.replace('<!-- CTA Section', first[first.index('    <!-- Other'):first.index('</section>') + 10] + '\n<!-- CTA Section')
+    assert doubled.count('<!-- Other Assembly Constituencies Links -->') == 2
+    assert generate_page(doubled, ASSEMBLIES[0], ASSEMBLIES, BASE_URL).count('<!-- Other Assembly') == 1
+
+    print("✓ Test passed: Links section replaced in place")
+
+
+def test_build_pages_write_if_changed():
+    """Test that an unchanged rebuild writes nothing."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        first = build_pages(SAMPLE_TEMPLATE, ASSEMBLIES, tmpdir, BASE_URL)
+        assert all(result.written for result in first)
+
+        pages = {result.filename: {'sha256': result.sha256, 'bytes': result.bytes} for result in first}
+        second = build_pages(SAMPLE_TEMPLATE, ASSEMBLIES, tmpdir, BASE_URL, previous_pages=pages)
+        assert not any(result.written for result in second)
+
+        # Without a manifest the file bytes are compared directly
+        third = build_pages(SAMPLE_TEMPLATE, ASSEMBLIES, tmpdir, BASE_URL)
+        assert not any(result.written for result in third)
+
+        # Only the page whose content changed is rewritten
+        changed = [dict(a) for a in ASSEMBLIES]
+        changed[2]['name'] = 'Sarkhej (New)'
+        fourth = build_pages(SAMPLE_TEMPLATE, changed, tmpdir, BASE_URL, previous_pages=pages)
+        assert [result.filename for result in fourth if result.written] == ['sarkhej.html']
+
+    print("✓ Test passed: Only changed pages written")
+
+
+def test_build_pages_worker_pool():
+    """Test that the worker pool produces the same pages as a serial build."""
+    with tempfile.TemporaryDirectory() as serial_dir, tempfile.TemporaryDirectory() as pool_dir:
+        serial = build_pages(SAMPLE_TEMPLATE, ASSEMBLIES, serial_dir, BASE_URL, workers=1)
+        pooled = build_pages(SAMPLE_TEMPLATE, ASSEMBLIES, pool_dir, BASE_URL, workers=2)
+
+        assert [r[:3] for r in serial] == [r[:3] for r in pooled]
+        for name in [result.filename for result in serial]:
+            with open(os.path.join(serial_dir, name), 'rb') as a, open(os.path.join(pool_dir, name), 'rb') as b:
+                assert a.read() == b.read()
+
+    print("✓ Test passed: Worker pool output matches serial build")
+
+
+def test_minify_html():
+    """Test that minification keeps text, attribute values and scripts intact."""
+    html = """<!DOCTYPE html>
+<html>
+  <head>
+    <!-- comment -->
+    <style>
+      /* it's a comment */
+      .a  >  .b { color : red ; content: "x ; y" ; }
+    </style>
+    <script type="application/ld+json">
+    {"name":  "ગાંધીનગર",   "url": "https://example.com/"}
+    </script>
+  </head>
+  <body>
+    <p   class="x"   title="two  spaces">Hello   <b>big</b>   world !</p>
+    <div style="display: none;  margin : 0 ;"></div>
+    <pre>  keep
+    this  </pre>
+    <script>
+      var  s = "a   b";
+    </script>
+  </body>
+</html>
+"""
+    minified = minify_html(html)
+
+    assert '<!-- comment -->' not in minified
+    assert '<p class="x" title="two  spaces">Hello <b>big</b> world !</p>' in minified
+    assert '<div style="display:none;margin:0"></div>' in minified
+    assert '.a>.b{color:red;content:"x ; y"}' in minified
+    assert '{"name":"ગાંધીનગર","url":"https://example.com/"}' in minified
+    assert '<pre>  keep\n    this  </pre>' in minified
+    assert 'var  s = "a   b";' in minified
+    assert len(minified) < len(html)
+    assert minify_html(minified) == minified
+
+    assert minify_css('a { b : c ; }') == 'a{b:c}'
+    assert minify_css('a :hover { b : c }') == 'a :hover{b:c}'
+    print("✓ Test passed: HTML minified safely")
+
+
+def test_minified_pages():
+    """Test that built pages are minified except the source pages."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        results = build_pages(SAMPLE_TEMPLATE, ASSEMBLIES, tmpdir, BASE_URL,
+                              minify=True, source_pages={'abdasa.html'})
+        by_name = {result.filename: result for result in results}
+
+        sarkhej = by_name['sarkhej.html']
+        assert sarkhej.bytes == sarkhej.minified_bytes < sarkhej.source_bytes
+        with open(os.path.join(tmpdir, 'sarkhej.html'), 'rb') as f:
+            assert len(f.read()) == sarkhej.bytes
+
+        # Source pages stay readable
+        abdasa = by_name['abdasa.html']
+        assert abdasa.bytes == abdasa.source_bytes > abdasa.minified_bytes
+        assert sorted(os.listdir(tmpdir)) == sorted(by_name)
+
+    print("✓ Test passed: Minified pages")
+
+
+def test_sitemap_shards():
+    """Test that sitemaps are split at the URL and byte limits."""
+    urls = [(f"{BASE_URL}page-{number}.html", f"2026-01-{number % 28 + 1:02d}T00:00:00+00:00")
+            for number in range(10)]
+
+    shards = split_sitemap_urls(urls, max_urls=4)
+    assert [len(entries) for entries, _ in shards] == [4, 4, 2]
+    assert shards[0][1] == "2026-01-04T00:00:00+00:00"
+
+    by_bytes = split_sitemap_urls(urls, max_bytes=400)
+    assert all(len(entries) >= 1 for entries, _ in by_bytes)
+    assert sum(len(entries) for entries, _ in by_bytes) == 10
+    assert len(by_bytes) > 1
+
+    assert split_sitemap_urls([]) == []
+    print("✓ Test passed: Sitemap shards respect limits")
+
+
+def test_build_sitemaps_incremental():
+    """Test sitemap output, shard reuse and lastmod round trip."""
+    pages = {
+        'index.html': {'updated': '2026-01-01T00:00:00+00:00'},
+        'sarkhej.html': {'updated': '2026-02-01T00:00:00+00:00'},
+        'talukos/ગાંધીનગર.html': {'updated': '2026-03-01T00:00:00+00:00'},
+    }
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        assets = build_sitemaps(pages, tmpdir, BASE_URL)
+        assert sorted(assets) == ['sitemap-1.xml', 'sitemap.xml']
+
+        with open(os.path.join(tmpdir, 'sitemap-1.xml'), encoding='utf-8') as f:
+            sitemap = f.read()
+        assert f'<loc>{BASE_URL}</loc>' in sitemap
+        assert '%E0%AA%97' in sitemap
+        with open(os.path.join(tmpdir, 'sitemap.xml'), encoding='utf-8') as f:
+            assert '<lastmod>2026-03-01T00:00:00+00:00</lastmod>' in f.read()
+
+        # Unchanged shards are reused from the manifest without rendering
+        os.utime(os.path.join(tmpdir, 'sitemap-1.xml'), (0, 0))
+        assert build_sitemaps(pages, tmpdir, BASE_URL, assets) == assets
+        assert os.path.getmtime(os.path.join(tmpdir, 'sitemap-1.xml')) == 0
+
+        assert load_sitemap_lastmods(tmpdir, BASE_URL) == {
+            filename: page['updated'] for filename, page in pages.items()
+        }
+
+    print("✓ Test passed: Sitemaps built incrementally")
+
+
+def test_is_build_current():
+    """Test the no-op rebuild check."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, 'page.html')
+        digest, written = write_if_changed(path, b'<html></html>')
+        assert written
+
+        inputs = {'template': 'a', 'assemblies': 'b'}
+        manifest = {'inputs': inputs, 'pages': {'page.html': {'sha256': digest, 'bytes': 13}}}
+
+        assert is_build_current(manifest, inputs, tmpdir)
+        assert not is_build_current(manifest, {'template': 'changed', 'assemblies': 'b'}, tmpdir)
+        assert not is_build_current(None, inputs, tmpdir)
+
+        os.remove(path)
+        assert not is_build_current(manifest, inputs, tmpdir)
+
+    print("✓ Test passed: Build manifest short-circuit")
+
+
+if __name__ == "__main__":
+    print("Testing generate_assembly_pages")
+    print("=" * 60)
+
+    test_sample_template_matches_legacy()
+    test_constituency_data_preload_matches_legacy()
+    test_build_constituency_data()
+    test_template_parsed_once()
+    test_render_bytes_matches_render()
+    test_real_template_matches_legacy()
+    test_shared_navigation()
+    test_links_section_replaced_in_place()
+    test_build_pages_write_if_changed()
+    test_build_pages_worker_pool()
+    test_minify_html()
+    test_minified_pages()
+    test_sitemap_shards()
+    test_build_sitemaps_incremental()
+    test_is_build_current()
+
+    print("\n" + "=" * 60)
+    print("All tests passed!")
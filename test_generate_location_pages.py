@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Tests for the static taluko and gaam landing pages.
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from generate_location_pages import (
+    location_slug,
+    group_documents,
+    build_location_pages
+)
+
+
+DOCUMENTS = {
+    "P0640003": {"taluko": "ગાંધીનગર", "gaam": "ઉવારસદ"},
+    "P0640001": {"taluko": "ગાંધીનગર", "gaam": "અડાલજ"},
+    "P0640002": {"taluko": " ગાંધીનગર ", "gaam": "અડાલજ"},
+    "P0640004": {"taluko": "દસક્રોઈ", "gaam": "અસલાલી"},
+    "P0640005": {"taluko": None, "gaam": None},
+}
+
+COLLECTION_FILES = {
+    "P064": {
+        "pdfs": ["P0640001.pdf", "P0640002.pdf", "P0640003.pdf"],
+        "thumbnails": ["P0640001.jpg", "P0640003.jpg", "P0640004.jpg"],
+    }
+}
+
+
+def test_location_slug():
+    """Test that slugs keep Gujarati text and replace separators."""
+    assert location_slug("ગાંધીનગર") == "ગાંધીનગર"
+    assert location_slug(" સાબરમતી ગામ/૨ ") == "સાબરમતી-ગામ-૨"
+    assert location_slug("?") == "unknown"
+
+    # A taluko named "index" must not replace the taluko list
+    talukos = group_documents({"P0640001": {"taluko": "index", "gaam": "index"}}, COLLECTION_FILES)
+    assert talukos[0]['slug'] == "index-2" and talukos[0]['gaams'][0]['slug'] == "index"
+    print("✓ Test passed: Location slugs")
+
+
+def test_group_documents():
+    """Test grouping by taluko and gaam in Gujarati order."""
+    talukos = group_documents(DOCUMENTS, COLLECTION_FILES)
+
+    assert [taluko['name'] for taluko in talukos] == ["ગાંધીનગર", "દસક્રોઈ"]
+    gandhinagar = talukos[0]
+    assert gandhinagar['count'] == 3
+    assert [gaam['name'] for gaam in gandhinagar['gaams']] == ["અડાલજ", "ઉવારસદ"]
+
+    adalaj = gandhinagar['gaams'][0]['documents']
+    assert [document['id'] for document in adalaj] == ["P0640001", "P0640002"]
+    assert adalaj[0]['thumbnail'] == "/public/address-images/p064/P0640001.jpg"
+    assert adalaj[1]['thumbnail'] is None
+    assert talukos[1]['gaams'][0]['documents'][0]['pdf'] is None
+    print("✓ Test passed: Documents grouped by taluko and gaam")
+
+
+def test_build_location_pages_incremental():
+    """Test that pages are written once and stale pages are removed."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        results = build_location_pages(DOCUMENTS, COLLECTION_FILES, tmpdir)
+        names = [result.filename for result in results]
+        assert names == [
+            "talukos/index.html",
+            "talukos/ગાંધીનગર.html",
+            "talukos/ગાંધીનગર/અડાલજ.html",
+            "talukos/ગાંધીનગર/ઉવારસદ.html",
+            "talukos/દસક્રોઈ.html",
+            "talukos/દસક્રોઈ/અસલાલી.html",
+        ]
+        assert all(result.written and not result.error for result in results)
+
+        with open(os.path.join(tmpdir, "talukos/ગાંધીનગર/અડાલજ.html"), encoding="utf-8") as f:
+            page = f.read()
+        assert 'loading="eager"' in page and 'href="/P064/P0640001.pdf"' in page
+        assert '<script' not in page
+        assert 'P0640003' not in page
+
+        previous = {result.filename: {'sha256': result.sha256} for result in results}
+        again = build_location_pages(DOCUMENTS, COLLECTION_FILES, tmpdir, previous_pages=previous)
+        assert not any(result.written for result in again)
+
+        # Moving a document rewrites the affected pages and drops the empty gaam
+        moved = dict(DOCUMENTS, P0640004={"taluko": "દસક્રોઈ", "gaam": "બારેજા"})
+        changed = build_location_pages(moved, COLLECTION_FILES, tmpdir, previous_pages=previous)
+        assert sorted(result.filename for result in changed if result.written) == [
+            "talukos/દસક્રોઈ.html",
+            "talukos/દસક્રોઈ/બારેજા.html",
+        ]
+        assert not os.path.exists(os.path.join(tmpdir, "talukos/દસક્રોઈ/અસલાલી.html"))
+
+        # Stale pages are found on disk, without a previous build manifest
+        build_location_pages(DOCUMENTS, COLLECTION_FILES, tmpdir)
+        build_location_pages(moved, COLLECTION_FILES, tmpdir)
+        assert not os.path.exists(os.path.join(tmpdir, "talukos/દસક્રોઈ/અસલાલી.html"))
+        del moved["P0640004"]
+        build_location_pages(moved, COLLECTION_FILES, tmpdir)
+        assert not os.path.exists(os.path.join(tmpdir, "talukos/દસક્રોઈ.html"))
+        assert not os.path.exists(os.path.join(tmpdir, "talukos/દસક્રોઈ"))
+
+    print("✓ Test passed: Landing pages built incrementally")
+
+
+def test_placeholders_and_hashed_thumbnails():
+    """Test that placeholders are inlined and thumbnails point at hashed copies."""
+    thumbnail = "public/address-images/p064/P0640001.jpg"
+    placeholder = {"color": "#efefef", "preview": "data:image/webp;base64,AAAA"}
+    asset_urls = {thumbnail: "/assets/public/address-images/p064/P0640001.0123456789.jpg"}
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        build_location_pages(DOCUMENTS, COLLECTION_FILES, tmpdir, asset_urls=asset_urls,
+                             placeholders={thumbnail: placeholder})
+        with open(os.path.join(tmpdir, "talukos/ગાંધીનગર/અડાલજ.html"), encoding="utf-8") as f:
+            page = f.read()
+
+    assert ('<div class="image-wrapper" style="background:#efefef '
+            'url(data:image/webp;base64,AAAA) center/cover no-repeat">') in page
+    assert 'src="/assets/public/address-images/p064/P0640001.0123456789.jpg"' in page
+    assert 'src="/public/address-images/p064/P0640001.jpg"' not in page
+    print("✓ Test passed: Placeholders inlined for hashed thumbnails")
+
+
+if __name__ == "__main__":
+    print("Testing generate_location_pages")
+    print("=" * 60)
+
+    test_location_slug()
+    test_group_documents()
+    test_build_location_pages_incremental()
+    test_placeholders_and_hashed_thumbnails()
+
+    print("\n" + "=" * 60)
+    print("All tests passed!")
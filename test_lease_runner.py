@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Tests for lease-based work distribution over a shared directory.
+"""
+
+import os
+import sys
+import json
+import time
+import tempfile
+import multiprocessing
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from lease_runner import LeaseQueue, run_worker
+
+
+def square_batch(items):
+    """Batch function for worker processes (module level, so it can be pickled)."""
+    time.sleep(0.05)
+    return [{'item': item, 'square': item * item, 'pid': os.getpid()} for item in items]
+
+
+def worker_process(work_dir):
+    """Run one worker over a work directory."""
+    run_worker(LeaseQueue(work_dir, lease_ttl=5.0), square_batch, poll_interval=0.1)
+
+
+def test_plan_is_idempotent():
+    """Test that planning twice keeps the same batches."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        queue = LeaseQueue(tmpdir)
+        assert queue.plan(list(range(10)), 4) == 3
+        assert queue.plan(list(range(10)), 4) == 3
+        assert queue.batch_ids() == ['000001', '000002', '000003']
+        assert queue.load_batch('000003') == [8, 9]
+        assert queue.status() == {'total': 3, 'done': 0, 'leased': 0, 'expired': 0, 'pending': 3}
+
+    print("✓ Test passed: Planning is idempotent")
+
+
+def test_claim_is_exclusive():
+    """Test that a leased batch is not claimed by a second worker and commits once."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        first = LeaseQueue(tmpdir, 'first')
+        second = LeaseQueue(tmpdir, 'second')
+        first.plan(['a', 'b'], 1)
+
+        assert first.claim() == '000001'
+        assert second.claim() == '000002'
+        assert first.claim(skip={'000001'}) is None
+        assert first.renew('000001') and not second.renew('000001')
+
+        assert second.complete('000002', ['B'])
+        assert not first.complete('000002', ['late'])
+        assert first.complete('000001', ['A'])
+        assert first.claim() is None
+        assert first.merge() == [['A'], ['B']]
+        assert first.status()['done'] == 2
+
+    print("✓ Test passed: Claims are exclusive and commits happen once")
+
+
+def test_expired_lease_reclaimed():
+    """Test that the lease of a dead worker is taken over after its TTL."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        dead = LeaseQueue(tmpdir, 'dead', lease_ttl=0.2)
+        dead.plan([1, 2, 3], 3)
+        assert dead.claim() == '000001'
+
+        alive = LeaseQueue(tmpdir, 'alive', lease_ttl=0.2)
+        assert alive.claim() is None
+        time.sleep(0.3)
+        assert alive.status()['expired'] == 1
+
+        summary = run_worker(alive, square_batch, poll_interval=0.05)
+        assert summary['batches'] == 1 and summary['reclaimed'] == 1
+        assert not dead.renew('000001')
+        assert [r['square'] for r in alive.merge()[0]] == [1, 4, 9]
+
+    print("✓ Test passed: Expired lease reclaimed")
+
+
+def test_failed_batch_left_to_others():
+    """Test that a batch that fails on one worker is released for the others."""
+    def fail(items):
+        raise RuntimeError("broken")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        queue = LeaseQueue(tmpdir, 'failing')
+        queue.plan([1, 2], 2)
+        summary = run_worker(queue, fail, poll_interval=0.05)
+        assert summary['failed'] == ['000001'] and summary['batches'] == 0
+        assert queue.status()['pending'] == 1
+
+        assert run_worker(LeaseQueue(tmpdir), square_batch)['items'] == 2
+
+    print("✓ Test passed: Failed batch released")
+
+
+def test_multiple_processes():
+    """Test that several worker processes process every item exactly once."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        queue = LeaseQueue(tmpdir)
+        queue.plan(list(range(60)), 5)
+
+        processes = [multiprocessing.Process(target=worker_process, args=(tmpdir,)) for _ in range(3)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join(60)
+            assert process.exitcode == 0
+
+        results = [result for batch in queue.merge() for result in batch]
+        assert sorted(result['item'] for result in results) == list(range(60))
+        assert all(result['square'] == result['item'] ** 2 for result in results)
+        assert queue.status()['done'] == 12
+
+        # Every shard belongs to the worker that wrote the done marker
+        markers = [json.load(open(os.path.join(tmpdir, 'done', name)))
+                   for name in os.listdir(os.path.join(tmpdir, 'done'))]
+        assert all(marker['shard'].split(os.sep)[1] == marker['worker'] for marker in markers)
+
+    print(f"✓ Test passed: {len(processes)} processes shared 12 batches")
+
+
+if __name__ == "__main__":
+    print("Testing lease runner")
+    print("=" * 60)
+
+    test_plan_is_idempotent()
+    test_claim_is_exclusive()
+    test_expired_lease_reclaimed()
+    test_failed_batch_left_to_others()
+    test_multiple_processes()
+
+    print("\n" + "=" * 60)
+    print("All tests passed!")
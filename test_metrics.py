@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Tests for the metrics registry.
+"""
+
+import os
+import sys
+import json
+import shutil
+import tempfile
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from metrics import DEFAULT_BUCKETS, MetricsRegistry, get_registry, set_registry, timed
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def test_counters_and_gauges():
+    """Test labelled counters and gauges, from several threads."""
+    registry = MetricsRegistry()
+
+    def count():
+        for _ in range(1000):
+            registry.inc('documents_total', stage='render', outcome='success')
+
+    threads = [threading.Thread(target=count) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    registry.inc('documents_total', 2, stage='render', outcome='failed')
+    registry.set('pipeline_queue_peak', 3, stage='ocr')
+
+    assert registry.value('documents_total', stage='render', outcome='success') == 4000
+    assert registry.value('documents_total', outcome='failed', stage='render') == 2
+    assert registry.value('documents_total', stage='crop', outcome='success') == 0
+    assert registry.total('documents_total', stage='render') == 4002
+    assert registry.value('pipeline_queue_peak', stage='ocr') == 3
+
+    for bad in (lambda: registry.inc('documents_total', -1),
+                lambda: registry.observe('documents_total', 0.1)):
+        try:
+            bad()
+            assert False, "Should raise ValueError"
+        except ValueError:
+            pass
+    print("✓ Test passed: Counters and gauges")
+
+
+def test_histogram_quantiles():
+    """Test bucket counts and percentile estimates of a timing histogram."""
+    registry = MetricsRegistry()
+    for index in range(100):
+        registry.observe('stage_seconds', 0.001 * (index + 1), stage='ocr')
+    registry.observe('stage_seconds', 60.0, stage='slow')
+
+    entry = registry.to_dict()['histograms']['stage_seconds'][0]
+    assert entry['labels'] == {'stage': 'ocr'}
+    assert entry['count'] == 100 and abs(entry['sum'] - 5.05) < 1e-9
+    assert entry['min'] == 0.001 and entry['max'] == 0.1
+    assert entry['buckets'][-1] == ['+Inf', 100]
+    assert [bound for bound, _ in entry['buckets'][:-1]] == list(DEFAULT_BUCKETS)
+    # Estimates stay within the bucket of the exact value
+    assert 0.025 <= entry['p50'] <= 0.05
+    assert 0.05 <= entry['p95'] <= 0.1 and entry['p95'] <= entry['p99'] <= 0.1
+
+    slow = registry.to_dict()['histograms']['stage_seconds'][1]
+    assert slow['labels'] == {'stage': 'slow'} and slow['p50'] == 60.0
+    print("✓ Test passed: Histogram percentiles")
+
+
+def test_timers_and_default_registry():
+    """Test timing with a context manager, a decorator and the default registry."""
+    registry = MetricsRegistry()
+    with registry.time('stage_seconds', stage='encode'):
+        pass
+
+    @registry.time('stage_seconds', stage='ocr')
+    def recognize(text):
+        return text.upper()
+
+    assert recognize('a') == 'A' and recognize('b') == 'B'
+
+    @timed('stage_seconds', stage='write')
+    def fail():
+        raise OSError("disk full")
+
+    previous = get_registry()
+    default = MetricsRegistry()
+    set_registry(default)
+    try:
+        try:
+            fail()
+        except OSError:
+            pass
+    finally:
+        set_registry(previous)
+
+    counts = {entry['labels']['stage']: entry['count'] for entry in registry.to_dict()['histograms']['stage_seconds']}
+    assert counts == {'encode': 1, 'ocr': 2}
+    # The decorator looks the default registry up at call time, and records failed calls
+    assert default.to_dict()['histograms']['stage_seconds'][0]['labels'] == {'stage': 'write'}
+    print("✓ Test passed: Timers")
+
+
+def test_parent_and_merge():
+    """Test that a child registry forwards to its parent and that snapshots merge."""
+    parent = MetricsRegistry()
+    for _ in range(2):
+        child = MetricsRegistry(parent=parent)
+        child.inc('ocr_results_total', outcome='success')
+        child.observe('stage_seconds', 0.02, stage='ocr')
+        assert child.value('ocr_results_total', outcome='success') == 1
+    assert parent.value('ocr_results_total', outcome='success') == 2
+
+    worker = MetricsRegistry()
+    worker.inc('ocr_results_total', 3, outcome='success')
+    worker.observe('stage_seconds', 0.2, stage='ocr')
+    parent.merge(json.loads(json.dumps(worker.to_dict())))
+    assert parent.value('ocr_results_total', outcome='success') == 5
+    entry = parent.to_dict()['histograms']['stage_seconds'][0]
+    assert entry['count'] == 3 and abs(entry['sum'] - 0.24) < 1e-9 and entry['max'] == 0.2
+    print("✓ Test passed: Parent and merge")
+
+
+def test_prometheus_and_write():
+    """Test the Prometheus text format and the dump files."""
+    registry = MetricsRegistry(buckets=(0.01, 0.1))
+    registry.inc('errors_total', error_type='file "system"')
+    registry.set('pipeline_queue_peak', 4, stage='ocr')
+    registry.observe('stage_seconds', 0.05, stage='ocr')
+    registry.observe('stage_seconds', 0.5, stage='ocr')
+
+    text = registry.to_prometheus()
+    assert '# TYPE sirgujarat_errors_total counter' in text
+    assert 'sirgujarat_errors_total{error_type="file \\"system\\""} 1\n' in text
+    assert 'sirgujarat_pipeline_queue_peak{stage="ocr"} 4\n' in text
+    assert '# TYPE sirgujarat_stage_seconds histogram' in text
+    assert 'sirgujarat_stage_seconds_bucket{stage="ocr",le="0.01"} 0\n' in text
+    assert 'sirgujarat_stage_seconds_bucket{stage="ocr",le="0.1"} 1\n' in text
+    assert 'sirgujarat_stage_seconds_bucket{stage="ocr",le="+Inf"} 2\n' in text
+    assert 'sirgujarat_stage_seconds_count{stage="ocr"} 2\n' in text
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        json_path, prom_path = registry.write(os.path.join(tmpdir, 'ocr'))
+        with open(json_path, encoding='utf-8') as f:
+            assert json.load(f) == json.loads(json.dumps(registry.to_dict()))
+        with open(prom_path, encoding='utf-8') as f:
+            assert f.read() == text
+    print("✓ Test passed: Prometheus text and dump")
+
+
+def test_process_pdf_directory_reports_metrics():
+    """Test that extraction and cropping report counts and stage timings to the default registry."""
+    from extract_pdf_thumbnails import process_pdf_directory
+
+    previous = get_registry()
+    registry = MetricsRegistry()
+    set_registry(registry)
+    try:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            source_dir = os.path.join(tmpdir, 'pdfs')
+            os.makedirs(source_dir)
+            for name in ('P0640001.pdf', 'P0640002.pdf'):
+                shutil.copy(os.path.join(REPO_DIR, 'P064', name), source_dir)
+            with open(os.path.join(source_dir, 'broken.pdf'), 'wb') as f:
+                f.write(b'not a pdf')
+
+            for _ in range(2):
+                result = process_pdf_directory(source_dir, os.path.join(tmpdir, 'pages'),
+                                               os.path.join(tmpdir, 'address'))
+                # The summary covers this run only
+                assert result['success'] == 2 and result['failed'] == 1
+                assert result['crop_success'] == 2 and result['crop_failed'] == 0
+    finally:
+        set_registry(previous)
+
+    assert registry.value('documents_total', stage='extract', outcome='success') == 4
+    assert registry.value('documents_total', stage='extract', outcome='failed') == 2
+    assert registry.value('documents_total', stage='crop', outcome='success') == 4
+    counts = {entry['labels']['stage']: entry['count'] for entry in registry.to_dict()['histograms']['stage_seconds']}
+    # Failed opens are timed too
+    assert counts['open'] == 6 and counts['render'] == 4 and counts['convert'] == 4
+    assert counts['crop'] == 4 and counts['load'] == 4
+    assert counts['encode'] == 8 and counts['write'] == 8
+    print("✓ Test passed: process_pdf_directory reports metrics")
+
+
+if __name__ == "__main__":
+    print("Testing metrics registry")
+    print("=" * 60)
+
+    test_counters_and_gauges()
+    test_histogram_quantiles()
+    test_timers_and_default_registry()
+    test_parent_and_merge()
+    test_prometheus_and_write()
+    test_process_pdf_directory_reports_metrics()
+
+    print("\n" + "=" * 60)
+    print("All tests passed!")
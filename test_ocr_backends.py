@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Tests for the pluggable OCR backends, using the fake fixture backend so no
+Tesseract binary is required.
+"""
+
+import os
+import sys
+import json
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from PIL import Image
+
+from ocr_backends import (
+    FakeOCRBackend,
+    create_backend,
+    get_default_backend,
+    set_default_backend
+)
+from gujarati_ocr_json_extractor import OCRProcessor, ErrorLogger
+from gujarati_text_extractor import process_single_image, extract_text_from_image
+
+
+def make_image(directory, name):
+    """Create a small white JPEG test image and return its path."""
+    path = os.path.join(directory, f"{name}.jpg")
+    Image.new("RGB", (40, 20), (255, 255, 255)).save(path, "JPEG")
+    return path
+
+
+def test_fake_backend_extract_many():
+    """Test that the fake backend returns fixture text in input order."""
+    backend = FakeOCRBackend({"P0640001": "ઉવારસદ", "P0640002": "શેરથા"}, default="?")
+
+    texts = backend.extract_many(
+        ["dir/P0640002.jpg", "P0640001.png", "missing.jpg"]
+    )
+
+    assert texts == ["શેરથા", "ઉવારસદ", "?"]
+    assert backend.calls == 3
+    print("✓ Test passed: Fake backend batch extraction")
+
+
+def test_fake_backend_from_extracted_data():
+    """Test building fixtures from an extracted_data.json style file."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        json_path = os.path.join(tmpdir, "extracted_data.json")
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump({"P0640001": {"taluko": "ગાંધીનગર", "gaam": "ઉવારસદ"},
+                       "P0640002": {"taluko": "સીટી", "gaam": None}}, f, ensure_ascii=False)
+
+        taluko_backend = FakeOCRBackend.from_extracted_data(json_path, "taluko")
+        gaam_backend = FakeOCRBackend.from_extracted_data(json_path, "gaam")
+
+    assert taluko_backend.extract("P0640002.jpg") == "સીટી"
+    assert gaam_backend.extract("P0640001.jpg") == "ઉવારસદ"
+    assert gaam_backend.extract("P0640002.jpg") == ""
+    print("✓ Test passed: Fixtures loaded from extracted data")
+
+
+def test_ocr_processor_with_fake_backend():
+    """Test OCRProcessor end to end without Tesseract."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        image_path = make_image(tmpdir, "P0640001")
+        error_logger = ErrorLogger()
+        processor = OCRProcessor(
+            error_logger=error_logger,
+            backend=FakeOCRBackend({"P0640001": "  ગાંધીનગર\n"})
+        )
+
+        assert processor.extract_text(image_path) == "ગાંધીનગર"
+        assert processor.extract_text(os.path.join(tmpdir, "missing.jpg")) is None
+        assert error_logger.failure_count == 1
+
+    print("✓ Test passed: OCRProcessor uses injected backend")
+
+
+def test_text_extractor_with_default_backend():
+    """Test that the module-level default backend is used by the text extractor."""
+    previous = get_default_backend()
+    set_default_backend(FakeOCRBackend({"P0640005": "દસક્રોઈ"}))
+
+    try:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            image_path = make_image(tmpdir, "P0640005")
+            result = process_single_image(image_path, os.path.join(tmpdir, "out", "P0640005.txt"))
+
+            with open(os.path.join(tmpdir, "out", "P0640005.txt"), "r", encoding="utf-8") as f:
+                saved = f.read()
+
+        assert result["success"], result["error"]
+        assert result["text"] == "દસક્રોઈ"
+        assert result["confidence"] == 100.0
+        assert saved == "દસક્રોઈ"
+
+        # Preprocessed images have no filename, so the fixture default applies
+        assert extract_text_from_image(Image.new("L", (10, 10))) == ""
+    finally:
+        set_default_backend(previous)
+
+    print("✓ Test passed: Default backend used by text extractor")
+
+
+def test_create_backend():
+    """Test backend creation by name."""
+    assert isinstance(create_backend("fake", default="x"), FakeOCRBackend)
+
+    try:
+        create_backend("unknown")
+        assert False, "Unknown backend should raise ValueError"
+    except ValueError:
+        pass
+
+    print("✓ Test passed: Backends created by name")
+
+
+if __name__ == "__main__":
+    print("Testing OCR backends")
+    print("=" * 60)
+
+    test_fake_backend_extract_many()
+    test_fake_backend_from_extracted_data()
+    test_ocr_processor_with_fake_backend()
+    test_text_extractor_with_default_backend()
+    test_create_backend()
+
+    print("\n" + "=" * 60)
+    print("All tests passed!")
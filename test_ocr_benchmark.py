@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Tests for the OCR benchmark and the benchmark report helpers.
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_report import compare_reports, latency_summary, load_report, percentile, save_report
+from ocr_benchmark import REGRESSION_METRICS, run_ocr_benchmark, select_sample
+from pipeline import discover_documents
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def test_percentiles():
+    """Test nearest-rank percentiles and the latency summary."""
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 95) == 95
+    assert percentile(values, 99) == 99
+    assert percentile([3.0], 99) == 3.0 and percentile([], 50) == 0.0
+
+    summary = latency_summary([0.010, 0.020, 0.030, 0.040])
+    assert summary['p50'] == 20.0 and summary['max'] == 40.0 and abs(summary['mean'] - 25.0) < 1e-9
+    print("✓ Test passed: Percentiles")
+
+
+def test_compare_reports():
+    """Test that only changes beyond the tolerance in the worse direction are regressions."""
+    baseline = {'images_per_second': 10.0, 'latency_ms': {'p95': 100.0}, 'char_accuracy': 0.90}
+    current = {'images_per_second': 9.8, 'latency_ms': {'p95': 120.0}, 'char_accuracy': 0.95}
+
+    regressions = compare_reports(current, baseline, REGRESSION_METRICS, tolerance=0.05)
+    assert [r['metric'] for r in regressions] == ['latency_ms.p95']
+    assert abs(regressions[0]['change'] - 0.2) < 1e-9
+    assert compare_reports(current, baseline, REGRESSION_METRICS, tolerance=0.25) == []
+    print("✓ Test passed: Regressions detected")
+
+
+def test_select_sample():
+    """Test that samples are stable and kept in document order."""
+    documents = [{'image_name': f"P064{index:04d}"} for index in range(50)]
+    assert select_sample(documents, 5) == documents[:5]
+    seeded = select_sample(documents, 10, seed=7)
+    assert seeded == select_sample(documents, 10, seed=7)
+    assert seeded == sorted(seeded, key=lambda d: d['image_name']) and len(seeded) == 10
+    assert select_sample(documents, None) == documents
+    print("✓ Test passed: Sample selection")
+
+
+def test_ocr_benchmark_report():
+    """Test a benchmark run on real PDFs with the fake backend and its saved report."""
+    documents = discover_documents([os.path.join(REPO_DIR, 'P064')], limit=8)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        report = run_ocr_benchmark(documents, {'gaam': (800, 50, 226, 71)}, backend='fake',
+                                   output_file=os.path.join(REPO_DIR, 'extracted_data.json'),
+                                   cache_root=os.path.join(tmpdir, 'rasters'), preprocess_params={'contrast': 2.0})
+        path = save_report(report, os.path.join(tmpdir, 'ocr-{commit}.json'))
+        saved = load_report(path)
+
+    assert report['benchmark'] == 'ocr' and report['config']['backend'] == 'fake'
+    assert report['config']['preprocess_params'] == {'contrast': 2.0, 'brightness': 1.1, 'sharpness': 1.2,
+                                                     'denoise': None}
+    assert report['images'] == report['regions']['gaam']['images'] > 0
+    assert report['char_accuracy'] == report['field_accuracy'] == 1.0
+    assert report['images_per_second'] > 0 and report['latency_ms']['p99'] >= report['latency_ms']['p50']
+    assert report['mismatches'] == [] and report['errors'] == 0
+    assert path.endswith(f"ocr-{report['commit']}.json") and saved == report
+    print("✓ Test passed: OCR benchmark report")
+
+
+if __name__ == "__main__":
+    print("Testing OCR benchmark")
+    print("=" * 60)
+
+    test_percentiles()
+    test_compare_reports()
+    test_select_sample()
+    test_ocr_benchmark_report()
+
+    print("\n" + "=" * 60)
+    print("All tests passed!")
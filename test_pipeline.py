@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Tests for the pipeline orchestrator.
+"""
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from pipeline import (ADDRESS_REGION, PREPROCESS_PARAMS, TEXT_REGIONS, Pipeline, build_document_pipeline,
+                      discover_documents, parse_region)
+from artifact_store import ArtifactStore
+from asset_manifest import AssetManifest
+from gujarati_ocr_json_extractor import DataAggregator, ErrorLogger
+from ocr_backends import FakeOCRBackend
+
+
+def test_stages_process_every_item():
+    """Test that items flow through fan-out and fan-in stages."""
+    results = []
+    lock = threading.Lock()
+
+    def collect(item):
+        with lock:
+            results.append(item)
+
+    pipeline = Pipeline()
+    pipeline.add_stage('split', lambda n: [n, -n], workers=3, queue_size=2)
+    pipeline.add_stage('double', lambda n: [n * 2], workers=2, after=['split'])
+    pipeline.add_stage('square', lambda n: [n * n], after=['split'])
+    pipeline.add_stage('collect', collect, after=['double', 'square'])
+    summary = pipeline.run(range(1, 21))
+
+    expected = sorted([n * 2 for n in range(-20, 21) if n] + [n * n for n in range(-20, 21) if n])
+    assert sorted(results) == expected
+    stages = {stage['name']: stage for stage in summary['stages']}
+    assert stages['split']['items_in'] == 20 and stages['split']['items_out'] == 40
+    assert stages['collect']['items_in'] == 80 and stages['collect']['items_out'] == 0
+    print("✓ Test passed: Items flow through fan-out and fan-in stages")
+
+
+def test_backpressure_and_overlap():
+    """Test that queues stay bounded and downstream work starts before upstream finishes."""
+    pipeline = Pipeline()
+    pipeline.add_stage('render', lambda n: (time.sleep(0.005), [n])[1], workers=2, queue_size=3)
+    pipeline.add_stage('ocr', lambda n: (time.sleep(0.01), [n])[1], workers=1, queue_size=3, after=['render'])
+    summary = pipeline.run(range(30))
+
+    render, ocr = summary['stages']
+    assert render['max_queue'] <= 3 and ocr['max_queue'] <= 3
+    assert ocr['first_start'] < render['last_end']
+    assert ocr['items_in'] == 30
+    print("✓ Test passed: Queues bounded and stages overlap")
+
+
+def test_errors_are_logged_and_skipped():
+    """Test that a failing item is recorded and the rest continue."""
+    def check(n):
+        if n == 3:
+            raise ValueError("bad page")
+        return [n]
+
+    error_logger = ErrorLogger()
+    pipeline = Pipeline(error_logger=error_logger)
+    pipeline.add_stage('check', check, workers=2)
+    pipeline.add_stage('sink', lambda n: None, after=['check'])
+    summary = pipeline.run(range(5))
+
+    assert summary['stages'][0]['errors'] == 1
+    assert summary['stages'][1]['items_in'] == 4
+    assert error_logger.errors == [{'image_name': '3', 'error_type': 'check', 'message': 'bad page'}]
+    print("✓ Test passed: Failing items logged and skipped")
+
+
+def test_invalid_stages_rejected():
+    """Test stage graph validation and region parsing."""
+    pipeline = Pipeline()
+    pipeline.add_stage('a', lambda item: [item])
+    for kwargs in ({'name': 'a'}, {'name': 'b', 'after': ['missing']}, {'name': 'c', 'workers': 0}):
+        try:
+            pipeline.add_stage(func=lambda item: None, **kwargs)
+            assert False, f"{kwargs} should be rejected"
+        except ValueError:
+            pass
+
+    assert parse_region("gaam=800,50,226,71") == ('gaam', (800, 50, 226, 71))
+    for value in ("gaam=1,2,3", "village=1,2,3,4"):
+        try:
+            parse_region(value)
+            assert False, f"{value} should be rejected"
+        except ValueError:
+            pass
+    print("✓ Test passed: Invalid stages and regions rejected")
+
+
+def test_document_pipeline():
+    """Test the document pipeline on real PDFs with a fake OCR backend."""
+    source_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'P064')
+    names = ['P0640001', 'P0640002', 'P0640003']
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        collection_dir = os.path.join(tmpdir, 'P064')
+        os.makedirs(collection_dir)
+        for name in names:
+            shutil.copy(os.path.join(source_dir, f"{name}.pdf"), collection_dir)
+
+        cwd = os.getcwd()
+        os.chdir(tmpdir)
+        try:
+            data_aggregator = DataAggregator()
+            asset_manifest = AssetManifest()
+            texts = {name: f" ગામ {index} " for index, name in enumerate(names)}
+            seen = {}
+
+            def make_backend(region):
+                backend = FakeOCRBackend(texts)
+                extract = backend.extract
+
+                def record(image, **kwargs):
+                    seen[(kwargs['image_name'], region)] = image.tobytes()
+                    return extract(image, **kwargs)
+
+                backend.extract = record
+                return backend
+
+            pipeline = build_document_pipeline(
+                data_aggregator, asset_manifest, make_backend,
+                workers={'render': 2, 'ocr': 2}
+            )
+            summary = pipeline.run(discover_documents(['P064']))
+            crop_dir = os.path.join('public', 'address-images', 'p064')
+            crops = {name: Path(crop_dir, name).read_bytes() for name in os.listdir(crop_dir)}
+        finally:
+            os.chdir(cwd)
+
+    assert [stage['errors'] for stage in summary['stages']] == [0] * 5
+    assert sorted(crops) == [f"{name}.jpg" for name in names]
+    # Same bytes as the committed thumbnails, so a run does not rewrite them
+    committed_dir = os.path.join(os.path.dirname(source_dir), 'public', 'address-images', 'p064')
+    for name, content in crops.items():
+        with open(os.path.join(committed_dir, name), 'rb') as f:
+            assert f.read() == content, name
+    assert data_aggregator.get_aggregated_data()['P0640002'] == {'taluko': None, 'gaam': 'ગામ 1'}
+    assert all('placeholder' in entry for entry in asset_manifest.assets.values())
+
+    # OCR sees the clean render, not the JPEG the thumbnail is cut from
+    from extract_pdf_thumbnails import crop_region, render_first_page
+    from gujarati_text_extractor import preprocess_image
+    address = crop_region(render_first_page(os.path.join(source_dir, 'P0640001.pdf')), *ADDRESS_REGION)
+    for region, box in TEXT_REGIONS.items():
+        expected = preprocess_image(crop_region(address, *box), **PREPROCESS_PARAMS)
+        assert seen[('P0640001', region)] == expected.tobytes(), region
+    print("✓ Test passed: Documents rendered, cropped, OCRed and aggregated")
+
+
+def test_document_pipeline_reuses_artifacts():
+    """Test that stored artifacts skip work and a changed region re-runs only that region."""
+    source_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'P064')
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        os.makedirs(os.path.join(tmpdir, 'P064'))
+        shutil.copy(os.path.join(source_dir, 'P0640001.pdf'), os.path.join(tmpdir, 'P064'))
+        store = ArtifactStore(os.path.join(tmpdir, 'artifacts'))
+        backend = FakeOCRBackend({'P0640001': 'ગામ'})
+
+        def run(regions, preprocess_params=None):
+            data_aggregator = DataAggregator()
+            pipeline = build_document_pipeline(
+                data_aggregator, None, lambda region: backend, regions,
+                address_dir=os.path.join(tmpdir, 'address-images'),
+                artifact_store=store, backend_key='fake', preprocess_params=preprocess_params
+            )
+            pipeline.run(discover_documents([os.path.join(tmpdir, 'P064')]))
+            return data_aggregator.get_aggregated_data()['P0640001']
+
+        regions = {'gaam': (800, 50, 226, 71), 'taluko': (40, 50, 300, 71)}
+        assert run(regions) == {'taluko': 'ગામ', 'gaam': 'ગામ'}
+        assert backend.calls == 2
+
+        # Everything stored: no OCR, and the page is not rendered again
+        assert run(regions) == {'taluko': 'ગામ', 'gaam': 'ગામ'}
+        assert backend.calls == 2
+        assert store.stats()['address'] == {'hits': 0, 'misses': 1}
+
+        # A changed taluko box re-runs the taluko crop and OCR only
+        run(dict(regions, taluko=(40, 50, 300, 70)))
+        stats = store.stats()
+        assert backend.calls == 3
+        assert stats['address'] == {'hits': 1, 'misses': 1}
+        assert stats['crop'] == {'hits': 0, 'misses': 3}
+        assert stats['ocr'] == {'hits': 3, 'misses': 3}
+
+        # Explicit default parameters share the stored artifacts; other ones
+        # preprocess and OCR both regions again from the stored crops
+        run(regions, {'contrast': 1.5})
+        assert backend.calls == 3
+        run(regions, {'contrast': 2.0})
+        stats = store.stats()
+
+    assert backend.calls == 5
+    assert stats['crop'] == {'hits': 2, 'misses': 3}
+    assert stats['preprocess']['misses'] == 5
+    print("✓ Test passed: Stored artifacts reused and invalidated per region and preprocessing")
+
+
+if __name__ == "__main__":
+    print("Testing pipeline orchestrator")
+    print("=" * 60)
+
+    test_stages_process_every_item()
+    test_backpressure_and_overlap()
+    test_errors_are_logged_and_skipped()
+    test_invalid_stages_rejected()
+    test_document_pipeline()
+    test_document_pipeline_reuses_artifacts()
+
+    print("\n" + "=" * 60)
+    print("All tests passed!")
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Tests for the preprocessing parameter sweep.
+"""
+
+import io
+import os
+import sys
+import tempfile
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from pipeline import discover_documents
+from preprocess_sweep import (DEFAULT_GRID, build_grid, character_error_rate, choose_setting,
+                              current_setting, edit_distance, pareto_front, print_pareto_table, run_sweep)
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def test_character_error_rate():
+    """Test edit distance and CER on Gujarati text."""
+    assert edit_distance("ગામ", "ગામ") == 0
+    assert edit_distance("ગામ", "ગમ") == 1
+    assert edit_distance("kitten", "sitting") == 3
+    assert character_error_rate("ગામ", "ગમ") == 1 / 3
+    assert character_error_rate(" ગામ  નામ ", "ગામ નામ") == 0.0
+    assert character_error_rate("", "") == 0.0 and character_error_rate("", "x") == 1.0
+    print("✓ Test passed: Character error rate")
+
+
+def test_build_grid():
+    """Test that the grid expands to every combination and includes the current settings."""
+    settings = build_grid(DEFAULT_GRID)
+    assert len(settings) == 3 * 2 * 3 * 3 * 2
+    assert current_setting() in settings
+    assert current_setting() == {'contrast': 1.5, 'brightness': 1.1, 'sharpness': 1.2, 'denoise': None, 'psm': 6}
+
+    assert len(build_grid({'psm': [6], 'denoise': [None]})) == 3 * 2 * 3
+    try:
+        build_grid({'gamma': [1.0]})
+        assert False, "Unknown setting should raise ValueError"
+    except ValueError:
+        pass
+    print("✓ Test passed: Grid expanded")
+
+
+def test_pareto_front_and_choice():
+    """Test the Pareto front and the fastest setting within the accuracy floor."""
+    results = [
+        {'cer': 0.02, 'images_per_second': 10.0},   # most accurate
+        {'cer': 0.04, 'images_per_second': 30.0},   # fastest within 5%
+        {'cer': 0.04, 'images_per_second': 20.0},   # dominated by the previous one
+        {'cer': 0.20, 'images_per_second': 50.0},   # fastest overall
+        {'cer': 0.30, 'images_per_second': 40.0},   # dominated
+    ]
+    assert pareto_front(results) == [0, 1, 3]
+    assert choose_setting(results, 0.05) is results[1]
+    assert choose_setting(results, 0.01) is None
+
+    # The configured setting is marked, not the defaults
+    configured = current_setting({'contrast': 2.0, 'denoise': (9, 75, 75)}, '--oem 3 --psm 7')
+    table = [{'setting': setting, 'cer': 0.01, 'exact': 1.0, 'images_per_second': 10.0}
+             for setting in (current_setting(), configured)]
+    output = io.StringIO()
+    with redirect_stdout(output):
+        print_pareto_table(table, current=configured)
+    marked = [line for line in output.getvalue().splitlines() if line.endswith('(current)')]
+    assert len(marked) == 1 and 'c2.0 b1.1 s1.2 bilateral=9:75:75 psm7' in marked[0]
+    print("✓ Test passed: Pareto front and recommendation")
+
+
+def test_run_sweep():
+    """Test a sweep over real PDFs in a process pool with the fake backend."""
+    documents = discover_documents([os.path.join(REPO_DIR, 'P064')], limit=5)
+    settings = build_grid({'contrast': [1.0, 1.5], 'brightness': [1.1], 'sharpness': [1.2],
+                           'denoise': [None, (5, 50, 50)], 'psm': [6]})
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        results = run_sweep(documents, {'gaam': (800, 50, 226, 71)}, settings, backend='fake', processes=2,
+                            output_file=os.path.join(REPO_DIR, 'extracted_data.json'), cache_root=tmpdir)
+
+    assert [result['setting'] for result in results] == settings
+    # The fake backend replays the ground truth, so every setting reads it exactly
+    assert all(result['images'] == 5 and result['cer'] == 0.0 and result['exact'] == 1.0 for result in results)
+    assert all(result['images_per_second'] > 0 for result in results)
+    print("✓ Test passed: Sweep scored every setting")
+
+
+if __name__ == "__main__":
+    print("Testing preprocessing sweep")
+    print("=" * 60)
+
+    test_character_error_rate()
+    test_build_grid()
+    test_pareto_front_and_choice()
+    test_run_sweep()
+
+    print("\n" + "=" * 60)
+    print("All tests passed!")
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Tests for the raw raster cache.
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+
+from extract_pdf_thumbnails import crop_region, render_first_page
+from pipeline import ADDRESS_REGION
+from raster_cache import RasterCache, iter_region_rasters, page_region
+
+PDF_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'P064', 'P0640001.pdf')
+
+
+def test_cached_crop_is_memory_mapped():
+    """Test that a crop is rendered once and then loaded as a read-only memory map."""
+    gaam = page_region(ADDRESS_REGION, (800, 50, 226, 71))
+    assert gaam == (933, 475, 226, 71)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cache = RasterCache(tmpdir)
+        first = cache.get(PDF_PATH, gaam)
+        second = cache.get(PDF_PATH, gaam)
+        assert cache.stats() == {'hits': 1, 'misses': 1, 'evictions': 0}
+
+        assert isinstance(second, np.memmap) and not second.flags['WRITEABLE']
+        assert second.shape == (71, 226) and (first == second).all()
+        expected = np.asarray(crop_region(render_first_page(PDF_PATH), *ADDRESS_REGION).convert('L'))
+        assert (second == expected[50:121, 800:1026]).all()
+
+        assert cache.key(PDF_PATH, gaam, 150) != cache.key(PDF_PATH, gaam, 300)
+        assert os.path.exists(cache.path(cache.key(PDF_PATH, gaam)))
+
+        names = [name for name, _, _ in iter_region_rasters(
+            cache, [{'image_name': 'P0640001', 'pdf_path': PDF_PATH}], {'gaam': (800, 50, 226, 71)})]
+        assert names == ['P0640001'] and cache.stats()['hits'] == 2
+
+    print("✓ Test passed: Crop cached and memory-mapped")
+
+
+def test_least_recently_used_evicted():
+    """Test that writes over the cap evict the least recently used crops."""
+    array = np.zeros((100, 100), dtype=np.uint8)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        # Room for three 10 KB crops
+        cache = RasterCache(tmpdir, max_bytes=35 * 1024)
+        keys = [f"{index:02d}" + 'a' * 62 for index in range(4)]
+        for index, key in enumerate(keys[:3]):
+            cache.put(cache.path(key), array)
+            os.utime(cache.path(key), (time.time() - 100 + index, time.time() - 100 + index))
+        # Use the oldest one again, so the second is now least recently used
+        os.utime(cache.path(keys[0]))
+
+        cache.put(cache.path(keys[3]), array)
+        remaining = [key for key in keys if os.path.exists(cache.path(key))]
+        assert remaining == [keys[0], keys[2], keys[3]]
+        assert cache.stats()['evictions'] == 1
+        assert cache.size() <= 35 * 1024
+
+    print("✓ Test passed: Least recently used crop evicted")
+
+
+if __name__ == "__main__":
+    print("Testing raster cache")
+    print("=" * 60)
+
+    test_cached_crop_is_memory_mapped()
+    test_least_recently_used_evicted()
+
+    print("\n" + "=" * 60)
+    print("All tests passed!")
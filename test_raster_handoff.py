@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared-memory raster handoff.
+"""
+
+import os
+import sys
+import json
+import multiprocessing
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+
+from extract_pdf_thumbnails import crop_region, render_first_page, render_region_gray
+from metrics import MetricsRegistry, get_registry, set_registry
+from pipeline import ADDRESS_REGION, discover_documents
+from raster_handoff import RasterRing, run_handoff_pipeline
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def fill_slots(ring, count):
+    """Write rasters whose pixels all equal their index (runs in a child process)."""
+    for index in range(count):
+        slot = ring.acquire(timeout=10)
+        ring.write(slot, bytes([index]) * 12, 3, 4)
+        ring.publish(slot, {'index': index, 'height': 3, 'width': 4})
+    ring.end(1)
+
+
+def test_ring_hands_rasters_between_processes():
+    """Test that slots written in one process are viewed in another and reused."""
+    ring = RasterRing(2, (3, 4))
+    writer = multiprocessing.Process(target=fill_slots, args=(ring, 7))
+    writer.start()
+    try:
+        seen = []
+        while True:
+            message = ring.receive(timeout=10)
+            if message is None:
+                break
+            slot, meta = message
+            view = ring.view(slot, meta['height'], meta['width'])
+            # The view is backed by the shared memory block, not a copy
+            assert not view.flags['OWNDATA']
+            assert view.shape == (3, 4) and (view == meta['index']).all()
+            seen.append(meta['index'])
+            del view
+            ring.release(slot)
+        writer.join(10)
+    finally:
+        ring.close()
+
+    # Seven rasters passed through two slots, so slots were reclaimed and reused
+    assert seen == list(range(7))
+    assert writer.exitcode == 0
+    print("✓ Test passed: Rasters handed between processes through reused slots")
+
+
+def test_ring_rejects_oversized_raster():
+    """Test that a raster larger than a slot is refused."""
+    ring = RasterRing(1, (3, 4))
+    try:
+        ring.write(ring.acquire(), bytes(20), 4, 5)
+        assert False, "Oversized raster should raise ValueError"
+    except ValueError:
+        pass
+    finally:
+        ring.close()
+    print("✓ Test passed: Oversized raster rejected")
+
+
+def test_region_render_matches_page_crop():
+    """Test that rendering only the address region gives the cropped page's pixels."""
+    pdf_path = os.path.join(REPO_DIR, 'P064', 'P0640001.pdf')
+    pixmap = render_region_gray(pdf_path, ADDRESS_REGION)
+    expected = np.asarray(crop_region(render_first_page(pdf_path), *ADDRESS_REGION).convert('L'))
+
+    region = np.frombuffer(pixmap.samples_mv, dtype=np.uint8).reshape(pixmap.height, pixmap.width)
+    assert region.shape == expected.shape
+    assert (region == expected).all()
+    print("✓ Test passed: Region render matches the page crop")
+
+
+def test_handoff_pipeline():
+    """Test render and OCR process pools on real PDFs with the fake backend."""
+    output_file = os.path.join(REPO_DIR, 'extracted_data.json')
+    documents = discover_documents([os.path.join(REPO_DIR, 'P064')], limit=12)
+
+    previous = get_registry()
+    registry = MetricsRegistry()
+    set_registry(registry)
+    try:
+        summary = run_handoff_pipeline(documents, {'gaam': (800, 50, 226, 71)}, backend='fake',
+                                       render_processes=2, ocr_processes=2, slots=3, output_file=output_file)
+    finally:
+        set_registry(previous)
+
+    with open(output_file, encoding='utf-8') as f:
+        existing = json.load(f)
+    names = [document['image_name'] for document in documents]
+    assert summary['errors'] == []
+    assert sorted(summary['entries']) == sorted(names)
+    assert all(summary['entries'][name]['gaam'] == (existing[name]['gaam'] or '').strip() for name in names)
+    assert summary['render']['processes'] == 2 and summary['ocr']['processes'] == 2
+    assert summary['render']['rasters'] == summary['ocr']['rasters'] == 12
+    # One copy into shared memory per raster, one region-sized copy on the OCR side
+    assert summary['render']['copies'] == 12
+    assert summary['render']['bytes_copied'] == 12 * ADDRESS_REGION[2] * ADDRESS_REGION[3]
+    assert summary['ocr']['bytes_copied'] == 12 * 226 * 71
+    # Each worker's stage timings are merged into the parent's registry
+    counts = {entry['labels']['stage']: entry['count'] for entry in registry.to_dict()['histograms']['stage_seconds']}
+    assert counts['render'] == 12 and counts['preprocess'] == 12
+    print("✓ Test passed: Handoff pipeline OCRed every document")
+
+
+if __name__ == "__main__":
+    print("Testing raster handoff")
+    print("=" * 60)
+
+    test_ring_hands_rasters_between_processes()
+    test_ring_rejects_oversized_raster()
+    test_region_render_matches_page_crop()
+    test_handoff_pipeline()
+
+    print("\n" + "=" * 60)
+    print("All tests passed!")
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Tests for the rendering benchmark suite.
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from PIL import Image
+
+from bench_report import compare_reports
+from metrics import MetricsRegistry, get_registry, set_registry
+from render_benchmark import STAGES, regression_metrics, render_document, run_render_benchmark, select_pdfs
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def test_render_document():
+    """Test that every stage is timed and the JPEG matches the requested settings."""
+    pdf_path = os.path.join(REPO_DIR, 'P064', 'P0640001.pdf')
+
+    previous = get_registry()
+    registry = MetricsRegistry()
+    set_registry(registry)
+    try:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output_path = os.path.join(tmpdir, 'page.jpg')
+            size = render_document(pdf_path, output_path, dpi=100, colorspace='gray', optimize=False)
+            with Image.open(output_path) as image:
+                mode, width = image.mode, image.width
+            # The production settings go through extract_first_page
+            render_document(pdf_path, output_path)
+            with Image.open(output_path) as image:
+                production_mode, production_width = image.mode, image.width
+    finally:
+        set_registry(previous)
+
+    counts = {entry['labels']['stage']: entry['count'] for entry in registry.to_dict()['histograms']['stage_seconds']}
+    assert counts == {stage: 2 for stage in STAGES}
+    assert size > 0
+    assert mode == 'L' and width == 850  # 8.5 in letter page at 100 dpi
+    assert production_mode == 'RGB' and production_width == 1275
+    print("✓ Test passed: Render stages timed")
+
+
+def test_render_benchmark_report():
+    """Test the settings and scaling sweeps on a few PDFs of both collections."""
+    pdfs = select_pdfs([os.path.join(REPO_DIR, 'P064'), os.path.join(REPO_DIR, 'P070')], per_collection=2)
+    assert [os.path.basename(pdf) for pdf in pdfs] == ['P0640001.pdf', 'P0640002.pdf',
+                                                       'P0700001.pdf', 'P0700002.pdf']
+
+    report = run_render_benchmark(pdfs, dpis=[100], colorspaces=['rgb', 'gray'], optimize=[True],
+                                  workers=[1, 2], pools=['thread'])
+
+    assert report['benchmark'] == 'render'
+    assert list(report['settings']) == ['dpi100-rgb-optimize', 'dpi100-gray-optimize']
+    assert list(report['scaling']) == ['serial-1', 'thread-2']
+    for result in list(report['settings'].values()) + list(report['scaling'].values()):
+        assert result['documents'] == 4 and result['docs_per_second'] > 0
+        assert set(result['stages_ms']) == set(STAGES)
+
+    metrics = regression_metrics(report)
+    assert ('settings.dpi100-gray-optimize.docs_per_second', 'higher') in metrics
+    slower = {'settings': {label: dict(result, docs_per_second=result['docs_per_second'] / 2)
+                           for label, result in report['settings'].items()}}
+    assert len(compare_reports(slower, report, metrics)) == 2
+    print("✓ Test passed: Render benchmark report")
+
+
+if __name__ == "__main__":
+    print("Testing render benchmark")
+    print("=" * 60)
+
+    test_render_document()
+    test_render_benchmark_report()
+
+    print("\n" + "=" * 60)
+    print("All tests passed!")
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Tests for ShardedJSONOutputWriter class.
+
+Tests the following functionality:
+- Sharding by collection and by taluko
+- Shard size limits (entries and bytes)
+- Content-hashed filenames and manifest contents
+- Removal of stale shards on rewrite
+"""
+
+import os
+import sys
+import json
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from gujarati_ocr_json_extractor import ShardedJSONOutputWriter
+
+
+def make_test_data():
+    """Build a small two-collection data set."""
+    data = {}
+    for number in range(1, 8):
+        data[f"P064{number:04d}"] = {"taluko": "સીટી" if number % 2 else "ગાંધીનગર", "gaam": "ઓગણજ"}
+    for number in range(1, 4):
+        data[f"P070{number:04d}"] = {"taluko": "દસક્રોઈ", "gaam": None}
+    return data
+
+
+def load_shards(output_dir, shards):
+    """Load and merge the given shard files."""
+    merged = {}
+    for shard in shards:
+        with open(os.path.join(output_dir, shard["file"]), "r", encoding="utf-8") as f:
+            merged.update(json.load(f))
+    return merged
+
+
+def test_shard_by_collection():
+    """Test that each collection gets its own bounded shards."""
+    data = make_test_data()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        writer = ShardedJSONOutputWriter(max_entries=3)
+        manifest = writer.write_shards(data, tmpdir)
+
+        assert manifest is not None
+        assert sorted(manifest["collections"]) == ["P064", "P070"]
+
+        p064 = manifest["collections"]["P064"]
+        assert p064["count"] == 7
+        assert [s["count"] for s in p064["shards"]] == [3, 3, 1]
+        assert p064["shards"][0]["first"] == "P0640001"
+        assert p064["shards"][0]["file"].startswith("P064-000.")
+
+        merged = load_shards(tmpdir, p064["shards"])
+        assert merged == {k: v for k, v in data.items() if k.startswith("P064")}
+
+        with open(os.path.join(tmpdir, "manifest.json"), "r", encoding="utf-8") as f:
+            assert json.load(f) == manifest
+
+    print("✓ Test passed: Shards split by collection and entry limit")
+
+
+def test_shard_by_taluko():
+    """Test that taluko sharding groups documents under each taluko."""
+    data = make_test_data()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        writer = ShardedJSONOutputWriter(shard_by_taluko=True)
+        manifest = writer.write_shards(data, tmpdir)
+
+        talukos = manifest["collections"]["P064"]["talukos"]
+        assert list(talukos) == ["ગાંધીનગર", "સીટી"]
+        assert talukos["સીટી"]["count"] == 4
+
+        merged = load_shards(tmpdir, talukos["સીટી"]["shards"])
+        assert sorted(merged) == ["P0640001", "P0640003", "P0640005", "P0640007"]
+
+    print("✓ Test passed: Shards split by taluko")
+
+
+def test_shard_byte_limit():
+    """Test that shards respect the byte limit."""
+    data = make_test_data()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        writer = ShardedJSONOutputWriter(max_bytes=120)
+        manifest = writer.write_shards(data, tmpdir)
+
+        for collection in manifest["collections"].values():
+            for shard in collection["shards"]:
+                assert shard["bytes"] <= 120 or shard["count"] == 1
+
+    print("✓ Test passed: Shard byte limit respected")
+
+
+def test_content_hash_and_stale_cleanup():
+    """Test that unchanged shards keep their names and stale shards are removed."""
+    data = make_test_data()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        writer = ShardedJSONOutputWriter()
+        first = writer.write_shards(data, tmpdir)
+        second = writer.write_shards(data, tmpdir)
+        assert first == second
+
+        old_file = first["collections"]["P070"]["shards"][0]["file"]
+        data["P0700001"]["gaam"] = "ઓગણજ"
+        third = writer.write_shards(data, tmpdir)
+        new_file = third["collections"]["P070"]["shards"][0]["file"]
+
+        assert new_file != old_file
+        assert not os.path.exists(os.path.join(tmpdir, old_file))
+        assert os.path.exists(os.path.join(tmpdir, new_file))
+        assert third["collections"]["P064"] == first["collections"]["P064"]
+
+    print("✓ Test passed: Content hashes stable and stale shards removed")
+
+
+def run_all_tests():
+    """Run all test cases."""
+    print("Testing ShardedJSONOutputWriter")
+    print("=" * 60)
+
+    try:
+        test_shard_by_collection()
+        test_shard_by_taluko()
+        test_shard_byte_limit()
+        test_content_hash_and_stale_cleanup()
+
+        print("\n" + "=" * 60)
+        print("All tests passed! ✓")
+        return 0
+    except AssertionError as e:
+        print(f"\n✗ Test failed: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(run_all_tests())
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Tests for the sirgujarat command-line interface and its configuration.
+"""
+
+import os
+import sys
+import json
+import tempfile
+import multiprocessing
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import sirgujarat
+from metrics import MetricsRegistry, get_registry, set_registry
+from pipeline import PREPROCESS_PARAMS
+from sirgujarat import DEFAULT_CONFIG, build_parser, get_pdf_dirs, get_preprocess_params, get_workers, load_config
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def write_config(directory, text):
+    """Write a sirgujarat.toml with the given text and return its path."""
+    path = os.path.join(directory, 'sirgujarat.toml')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    return path
+
+
+def test_config_merges_with_defaults():
+    """Test that a partial configuration keeps the defaults it does not set."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = write_config(tmpdir, '''
+collections = ["P064", "P070"]
+
+[paths]
+pdf_root = "pdfs"
+
+[regions]
+taluko = [40, 50, 300, 71]
+
+[workers]
+ocr = 0
+render = 4
+''')
+        config = load_config(path)
+
+    assert config['collections'] == ["P064", "P070"]
+    assert config['paths']['output'] == DEFAULT_CONFIG['paths']['output']
+    assert config['regions'] == {'taluko': [40, 50, 300, 71]}
+    assert get_pdf_dirs(config) == [os.path.join('pdfs', 'P064'), os.path.join('pdfs', 'P070')]
+    assert get_workers(config, 'render') == 4
+    assert get_workers(config, 'ocr') == (os.cpu_count() or 1)
+    assert DEFAULT_CONFIG['paths']['pdf_root'] == '.'
+    print("✓ Test passed: Configuration merged with defaults")
+
+
+def test_invalid_config_rejected():
+    """Test that unknown keys and malformed values are reported."""
+    invalid = [
+        'colections = ["P064"]',
+        '[paths]\nimages = "x"',
+        '[regions]\nvillage = [1, 2, 3, 4]',
+        '[regions]\ngaam = [1, 2, 3]',
+        '[workers]\nocr = -1',
+        '[workers]\nqueue_size = 0',
+        '[ocr]\ncontrast = "high"',
+        '[ocr]\ndenoise = [9, 75]',
+        '[cache]\nrasters_max_mb = 0',
+        '[cluster]\nbatch_size = 0',
+        '[cluster]\nlease_ttl = "60"',
+        'collections = "P064"',
+        'collections = [',
+    ]
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for text in invalid:
+            path = write_config(tmpdir, text)
+            try:
+                load_config(path)
+                assert False, f"{text!r} should be rejected"
+            except ValueError:
+                pass
+
+    print("✓ Test passed: Invalid configuration rejected")
+
+
+def test_repo_config_is_valid():
+    """Test that the committed sirgujarat.toml loads."""
+    config = load_config(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'sirgujarat.toml'))
+    assert 'P064' in config['collections']
+    assert config['regions']['gaam'] == [800, 50, 226, 71]
+    # The committed settings are the pipeline defaults, so stored artifacts stay valid
+    assert get_preprocess_params(config) == PREPROCESS_PARAMS
+    print("✓ Test passed: Repository configuration loads")
+
+
+def test_subcommands_parse():
+    """Test the subcommands and their options."""
+    parser = build_parser()
+
+    args = parser.parse_args(['--collection', 'P070', 'ocr', '--limit', '5', '--backend', 'fake'])
+    assert (args.command, args.collection, args.limit, args.backend) == ('ocr', ['P070'], 5, 'fake')
+    assert parser.parse_args(['bench']).limit == 50
+    assert parser.parse_args(['pages', '--force']).force
+    args = parser.parse_args(['cluster', 'work', '--processes', '4', '--backend', 'fake'])
+    assert (args.action, args.processes, args.work_dir) == ('work', 4, None)
+    assert parser.parse_args(['rasters', '--limit', '10']).limit == 10
+    args = parser.parse_args(['ocr-bench', '--seed', '1', '--compare', 'old.json'])
+    assert (args.command, args.limit, args.seed, args.compare, args.tolerance) == ('ocr-bench', 200, 1, 'old.json', 0.05)
+    args = parser.parse_args(['render-bench', '--dpi', '150', '--optimize', 'on'])
+    assert (args.dpi, args.optimize, args.per_collection, args.tolerance) == ('150', 'on', 10, 0.05)
+    args = parser.parse_args(['sweep', '--psm', '6,7', '--max-cer', '0.1'])
+    assert (args.limit, args.psm, args.max_cer) == (100, '6,7', 0.1)
+    for command in ('render', 'crop', 'aggregate'):
+        assert parser.parse_args([command]).command == command
+    print("✓ Test passed: Subcommands parsed")
+
+
+def test_cluster_work_processes():
+    """Test that worker processes report their metrics and that a crashed one fails the command."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = write_config(tmpdir, f'''
+collections = ["P064"]
+
+[paths]
+pdf_root = {json.dumps(REPO_DIR)}
+address_images = {json.dumps(os.path.join(tmpdir, 'address'))}
+output = {json.dumps(os.path.join(REPO_DIR, 'extracted_data.json'))}
+
+[cache]
+artifacts = {json.dumps(os.path.join(tmpdir, 'artifacts'))}
+metrics = {json.dumps(os.path.join(tmpdir, 'metrics'))}
+
+[cluster]
+work_dir = {json.dumps(os.path.join(tmpdir, 'cluster'))}
+batch_size = 2
+''')
+        previous = get_registry()
+        set_registry(MetricsRegistry())
+        try:
+            sirgujarat.main(['--config', path, 'cluster', 'plan', '--limit', '4'])
+            sirgujarat.main(['--config', path, 'cluster', 'work', '--processes', '2', '--backend', 'fake'])
+            with open(os.path.join(tmpdir, 'metrics', 'cluster', 'metrics.json'), encoding='utf-8') as f:
+                histograms = json.load(f)['histograms']['stage_seconds']
+            counts = {entry['labels']['stage']: entry['count'] for entry in histograms}
+            # Both children's stage timings reach the parent's dump
+            assert counts['render'] == 4 and counts['ocr'] == 4
+
+            if multiprocessing.get_start_method() == 'fork':
+                worker = sirgujarat.run_cluster_worker
+                sirgujarat.run_cluster_worker = lambda *args: os._exit(3)
+                try:
+                    sirgujarat.main(['--config', path, 'cluster', 'work', '--processes', '2'])
+                    assert False, "A crashed worker should fail the command"
+                except SystemExit as e:
+                    assert 'exit codes 3, 3' in str(e)
+                finally:
+                    sirgujarat.run_cluster_worker = worker
+        finally:
+            set_registry(previous)
+    print("✓ Test passed: Cluster worker processes")
+
+
+if __name__ == "__main__":
+    print("Testing sirgujarat CLI")
+    print("=" * 60)
+
+    test_config_merges_with_defaults()
+    test_invalid_config_rejected()
+    test_repo_config_is_valid()
+    test_subcommands_parse()
+    test_cluster_work_processes()
+
+    print("\n" + "=" * 60)
+    print("All tests passed!")
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Tests for SQLiteIndexExporter and its lookup helpers.
+"""
+
+import os
+import sys
+import json
+import sqlite3
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from gujarati_ocr_json_extractor import ErrorLogger
+from sqlite_index_exporter import (
+    SQLiteIndexExporter,
+    open_read_only,
+    find_documents_by_gaam,
+    search_documents
+)
+
+
+TEST_DATA = {
+    "P0640001": {"taluko": "ગાંધીનગર", "gaam": "ઉવારસદ"},
+    "P0640002": {"taluko": "ગાંધીનગર", "gaam": "ઉવારસદ"},
+    "P0640003": {"taluko": "દસક્રોઈ", "gaam": "ઉવારસદ"},
+    "P0700001": {"taluko": "સીટી", "gaam": "અમદાવાદ"},
+    "P0700002": {"taluko": None, "gaam": None},
+}
+
+
+def build_test_db(tmpdir):
+    """Export TEST_DATA into a database inside tmpdir."""
+    db_path = os.path.join(tmpdir, "index.sqlite")
+    assert SQLiteIndexExporter().export(TEST_DATA, db_path)
+    return db_path
+
+
+def test_normalized_tables():
+    """Test that talukos and gaams are normalized."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        connection = open_read_only(build_test_db(tmpdir))
+
+        talukos = connection.execute("SELECT COUNT(*) FROM talukos").fetchone()[0]
+        gaams = connection.execute("SELECT COUNT(*) FROM gaams").fetchone()[0]
+        documents = connection.execute(
+            "SELECT id, collection FROM documents ORDER BY collection, id"
+        ).fetchall()
+        connection.close()
+
+    assert talukos == 3
+    # Same gaam name under two talukos is two villages
+    assert gaams == 3
+    assert documents[0] == ("P0640001", "P064")
+    assert documents[-1] == ("P0700002", "P070")
+    print("✓ Test passed: Taluko and gaam tables normalized")
+
+
+def test_find_documents_by_gaam():
+    """Test village lookups with and without taluko."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        connection = open_read_only(build_test_db(tmpdir))
+
+        assert find_documents_by_gaam(connection, "ઉવારસદ") == ["P0640001", "P0640002", "P0640003"]
+        assert find_documents_by_gaam(connection, "ઉવારસદ", taluko="દસક્રોઈ") == ["P0640003"]
+        assert find_documents_by_gaam(connection, "missing") == []
+        connection.close()
+
+    print("✓ Test passed: Documents found by gaam")
+
+
+def test_full_text_search():
+    """Test FTS lookups over whole Gujarati words and prefixes."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        connection = open_read_only(build_test_db(tmpdir))
+
+        assert sorted(search_documents(connection, "ગાંધી*")) == ["P0640001", "P0640002"]
+        assert search_documents(connection, "gaam:અમદાવાદ") == ["P0700001"]
+        assert sorted(search_documents(connection, "દસક્રોઈ")) == ["P0640003"]
+        connection.close()
+
+    print("✓ Test passed: Full-text search over Gujarati text")
+
+
+def test_read_only_connection():
+    """Test that the exported database cannot be modified through open_read_only."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        connection = open_read_only(build_test_db(tmpdir))
+        try:
+            connection.execute("DELETE FROM documents")
+            assert False, "Write should have been rejected"
+        except sqlite3.OperationalError:
+            pass
+        finally:
+            connection.close()
+
+    print("✓ Test passed: Read-only connection rejects writes")
+
+
+def test_export_replaces_existing_database():
+    """Test that re-exporting replaces the previous database."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db_path = build_test_db(tmpdir)
+        assert SQLiteIndexExporter().export({"P0640009": {"taluko": "સીટી", "gaam": "ઓગણજ"}}, db_path)
+
+        connection = open_read_only(db_path)
+        count = connection.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+        connection.close()
+
+        assert count == 1
+        assert not os.path.exists(db_path + ".tmp")
+
+    print("✓ Test passed: Export replaces existing database")
+
+
+def test_export_error_logged():
+    """Test that an unwritable output path is logged as an error."""
+    error_logger = ErrorLogger()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        blocker = os.path.join(tmpdir, "file")
+        with open(blocker, "w") as f:
+            f.write("x")
+
+        result = SQLiteIndexExporter(error_logger).export(TEST_DATA, os.path.join(blocker, "index.sqlite"))
+
+    assert result is False
+    assert error_logger.failure_count == 1
+    print("✓ Test passed: Export error logged")
+
+
+def test_export_extracted_data():
+    """Test exporting the real extracted_data.json."""
+    if not os.path.exists("extracted_data.json"):
+        print("SKIP: extracted_data.json not found")
+        return
+
+    with open("extracted_data.json", "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db_path = os.path.join(tmpdir, "index.sqlite")
+        assert SQLiteIndexExporter().export(data, db_path)
+
+        connection = open_read_only(db_path)
+        count = connection.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+        connection.close()
+
+    assert count == len(data)
+    print(f"✓ Test passed: {count} documents exported")
+
+
+if __name__ == "__main__":
+    print("Testing SQLiteIndexExporter")
+    print("=" * 60)
+
+    test_normalized_tables()
+    test_find_documents_by_gaam()
+    test_full_text_search()
+    test_read_only_connection()
+    test_export_replaces_existing_database()
+    test_export_error_logged()
+    test_export_extracted_data()
+
+    print("\n" + "=" * 60)
+    print("All tests passed!")